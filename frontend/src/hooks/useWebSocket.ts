@@ -87,6 +87,78 @@ export interface WebSocketData {
   }>
 }
 
+// v2 dashboard protocol (src/web/dashboard_stream.py): a snapshot, then
+// per-topic deltas. Order books carry level diffs ([price, size], size 0 =
+// remove); other topics are JSON Merge Patches (null = delete, arrays replaced).
+interface StreamMessage {
+  v: number
+  type: 'snapshot' | 'delta'
+  seq: number
+  topics: Record<string, Record<string, unknown>>
+}
+
+type BookLevels = [number, number][]
+type Books = Record<string, Record<string, { bids: BookLevels; asks: BookLevels }>>
+
+function applyMergePatch(target: unknown, patch: unknown): unknown {
+  if (patch === null || typeof patch !== 'object' || Array.isArray(patch)) {
+    return patch
+  }
+  const result: Record<string, unknown> =
+    target && typeof target === 'object' && !Array.isArray(target)
+      ? { ...(target as Record<string, unknown>) }
+      : {}
+  for (const [key, value] of Object.entries(patch as Record<string, unknown>)) {
+    if (value === null) {
+      delete result[key]
+    } else {
+      result[key] = applyMergePatch(result[key], value)
+    }
+  }
+  return result
+}
+
+function applyLevelDiff(levels: BookLevels, diff: BookLevels | undefined, descending: boolean): BookLevels {
+  if (!diff) return levels
+  const map = new Map(levels.map(([price, size]) => [price, size]))
+  for (const [price, size] of diff) {
+    if (size === 0) {
+      map.delete(price)
+    } else {
+      map.set(price, size)
+    }
+  }
+  return Array.from(map.entries()).sort((a, b) => (descending ? b[0] - a[0] : a[0] - b[0]))
+}
+
+function applyBookDiff(books: Books, patch: Books): Books {
+  const result: Books = { ...books }
+  for (const [exchange, symbols] of Object.entries(patch)) {
+    result[exchange] = { ...(result[exchange] || {}) }
+    for (const [symbol, diff] of Object.entries(symbols)) {
+      const current = result[exchange][symbol] || { bids: [], asks: [] }
+      result[exchange][symbol] = {
+        bids: applyLevelDiff(current.bids, diff.bids, true),
+        asks: applyLevelDiff(current.asks, diff.asks, false),
+      }
+    }
+  }
+  return result
+}
+
+function applyStreamMessage(prev: WebSocketData | null, msg: StreamMessage): WebSocketData {
+  let data = (msg.type === 'snapshot' || !prev ? {} : { ...prev }) as Record<string, unknown>
+  for (const [topic, section] of Object.entries(msg.topics)) {
+    if (topic === 'orderbooks') {
+      const base = msg.type === 'snapshot' ? {} : ((data.orderbooks as Books) || {})
+      data.orderbooks = applyBookDiff(base, (section.orderbooks || {}) as Books)
+    } else {
+      data = applyMergePatch(data, section) as Record<string, unknown>
+    }
+  }
+  return data as unknown as WebSocketData
+}
+
 interface UseWebSocketOptions {
   reconnectInterval?: number
   onMessage?: (data: WebSocketData) => void
@@ -102,7 +174,7 @@ interface UseWebSocketReturn {
 }
 
 export function useWebSocket(
-  url: string = `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}/ws`,
+  url: string = `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}/ws?v=2`,
   options: UseWebSocketOptions = {}
 ): UseWebSocketReturn {
   const {
@@ -117,6 +189,7 @@ export function useWebSocket(
   const [lastMessage, setLastMessage] = useState<WebSocketData | null>(null)
   const wsRef = useRef<WebSocket | null>(null)
   const reconnectTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null)
+  const stateRef = useRef<WebSocketData | null>(null)
 
   const connect = useCallback(() => {
     // Clear any existing reconnect timeout
@@ -158,7 +231,12 @@ export function useWebSocket(
 
       ws.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data) as WebSocketData
+          const parsed = JSON.parse(event.data)
+          // v2 messages are applied to the locally reconstructed state; v1 are full
+          const data = parsed.v === 2
+            ? applyStreamMessage(stateRef.current, parsed as StreamMessage)
+            : parsed as WebSocketData
+          stateRef.current = data
           setLastMessage(data)
           onMessage?.(data)
         } catch (e) {
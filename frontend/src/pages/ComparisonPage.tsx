@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useCallback } from 'react'
 import { simulationApi } from '../api/client'
 import { useI18n } from '../i18n'
 import './Page.css'
@@ -16,6 +16,16 @@ interface SimulationStatus {
   remaining_seconds?: number
 }
 
+// Messages from /api/simulation/ws: a full snapshot on connect (and when a run
+// starts/stops), then deltas holding only the changed fields per param set.
+interface SimulationStreamMessage extends SimulationStatus {
+  type: 'snapshot' | 'delta'
+  comparison?: Record<string, unknown>[]
+  params?: Record<string, Record<string, unknown>>
+}
+
+const SIM_STREAM_URL = `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}/api/simulation/ws`
+
 function ComparisonPage() {
   const { t } = useI18n()
   const [paramSets, setParamSets] = useState<ParamSet[]>([])
@@ -35,27 +45,53 @@ function ComparisonPage() {
     }
   }
 
-  const loadSimStatus = async () => {
-    try {
-      const response = await simulationApi.status()
-      setSimStatus(response.data)
+  const handleStreamMessage = useCallback((msg: SimulationStreamMessage) => {
+    const { type, comparison: rows, params, ...status } = msg
+    setSimStatus(status)
 
-      if (response.data.running) {
-        const compResponse = await simulationApi.comparison()
-        setComparison(compResponse.data || [])
-      }
-    } catch (error) {
-      console.error('Failed to load status:', error)
+    if (type === 'snapshot') {
+      setComparison(rows || [])
+      return
     }
-  }
+
+    if (params && Object.keys(params).length > 0) {
+      setComparison(prev => prev.map(row => {
+        const changed = params[row.param_set_id as string]
+        return changed ? { ...row, ...changed } : row
+      }))
+    }
+  }, [])
 
   useEffect(() => {
     loadParamSets()
-    loadSimStatus()
 
-    const interval = setInterval(loadSimStatus, 2000)
-    return () => clearInterval(interval)
-  }, [])
+    let ws: WebSocket | null = null
+    let reconnectTimer: ReturnType<typeof setTimeout> | null = null
+    let closed = false
+
+    const connect = () => {
+      ws = new WebSocket(SIM_STREAM_URL)
+      ws.onmessage = (event) => {
+        try {
+          handleStreamMessage(JSON.parse(event.data) as SimulationStreamMessage)
+        } catch (e) {
+          console.error('Failed to parse simulation stream message:', e)
+        }
+      }
+      ws.onclose = () => {
+        if (!closed) {
+          reconnectTimer = setTimeout(connect, 3000)
+        }
+      }
+    }
+    connect()
+
+    return () => {
+      closed = true
+      if (reconnectTimer) clearTimeout(reconnectTimer)
+      ws?.close()
+    }
+  }, [handleStreamMessage])
 
   const handleToggleSelect = (id: string) => {
     setSelectedIds(prev =>
@@ -80,7 +116,6 @@ function ComparisonPage() {
       })
       if (response.data.success) {
         setMessage({ type: 'success', text: t.comparison.started })
-        loadSimStatus()
       } else {
         setMessage({ type: 'error', text: t.comparison.startFailed })
       }
@@ -96,7 +131,6 @@ function ComparisonPage() {
     try {
       await simulationApi.stop()
       setMessage({ type: 'success', text: t.comparison.simStopped })
-      loadSimStatus()
     } catch (error) {
       setMessage({ type: 'error', text: t.comparison.stopFailed })
     } finally {
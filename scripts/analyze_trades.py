@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+交易日誌分析報表
+
+解析 logs/mm_trades_*（JSON lines 與舊版文本皆可），輸出每日 PnL、成交率、
+對沖延遲/滑點分佈與 rebate 統計。解析結果按檔案快取，重跑只解析有變動的檔案。
+
+使用方式：
+    python scripts/analyze_trades.py
+    python scripts/analyze_trades.py --since 2026-01-01 --until 2026-02-01
+    python scripts/analyze_trades.py --csv report.csv
+    python scripts/analyze_trades.py --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# 添加項目根目錄到 path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.monitor.trade_analytics import TradeAnalytics, flatten, report_frame
+
+# 終端表格顯示的欄位
+TABLE_COLUMNS = [
+    ("date", "日期", 10),
+    ("fills", "成交", 6),
+    ("volume_usd", "成交額", 12),
+    ("fill_rate_pct", "成交率%", 8),
+    ("maker_ratio_pct", "Maker%", 7),
+    ("realized_pnl_usd", "已實現PnL", 11),
+    ("rebates_usd", "Rebate", 9),
+    ("fees_usd", "手續費", 9),
+    ("net_pnl_usd", "淨PnL", 10),
+    ("hedges", "對沖", 5),
+    ("hedge_failures", "失敗", 5),
+    ("hedge_latency_ms_p50", "延遲p50", 8),
+    ("hedge_latency_ms_p99", "延遲p99", 8),
+    ("hedge_slippage_bps_p50", "滑點p50", 8),
+    ("hedge_slippage_bps_p90", "滑點p90", 8),
+]
+
+
+def print_table(rows):
+    header = " ".join(title.rjust(width) for _, title, width in TABLE_COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        row = flatten(row)
+        cells = []
+        for key, _, width in TABLE_COLUMNS:
+            value = row.get(key)
+            if value is None:
+                text = "-"
+            elif isinstance(value, float):
+                text = f"{value:,.2f}"
+            else:
+                text = str(value)
+            cells.append(text.rjust(width))
+        print(" ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="交易日誌分析報表")
+    parser.add_argument("--log-dir", type=Path, default=None, help="交易日誌目錄（預設 logs/）")
+    parser.add_argument("--since", help="起始日期（含），例如 2026-01-01")
+    parser.add_argument("--until", help="結束日期（不含），例如 2026-02-01")
+    parser.add_argument("--maker-fee-bps", type=float, default=-1.0, help="舊版日誌的 maker 費率（負數 = rebate）")
+    parser.add_argument("--taker-fee-bps", type=float, default=3.0, help="舊版日誌的 taker 費率")
+    parser.add_argument("--csv", type=Path, help="輸出 CSV（需要 pandas）")
+    parser.add_argument("--json", action="store_true", help="以 JSON 輸出")
+    args = parser.parse_args()
+
+    analytics = TradeAnalytics(
+        log_dir=args.log_dir,
+        maker_fee_bps=args.maker_fee_bps,
+        taker_fee_bps=args.taker_fee_bps,
+    )
+
+    started = time.perf_counter()
+    rows = analytics.daily_report(since=args.since, until=args.until)
+    elapsed = time.perf_counter() - started
+
+    if not rows:
+        print(f"❌ {analytics.log_dir} 沒有符合條件的交易記錄")
+        return
+
+    if args.csv:
+        report_frame(rows).to_csv(args.csv)
+        print(f"✅ 已輸出 {args.csv}")
+    elif args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        print_table(rows)
+
+    print(
+        f"\n{len(rows) - 1} 天，解析 {analytics.stats['parsed']} 個檔案、"
+        f"快取 {analytics.stats['cached']} 個，耗時 {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
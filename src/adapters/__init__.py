@@ -26,6 +26,9 @@ from .base_adapter import (
     Position,
     Balance,
     Order,
+    OrderRequest,
+    CancelRequest,
+    BatchOrderResult,
 )
 from .factory import (
     create_adapter,
@@ -42,6 +45,9 @@ __all__ = [
     "Position",
     "Balance",
     "Order",
+    "OrderRequest",
+    "CancelRequest",
+    "BatchOrderResult",
     
     # 枚舉類型
     "OrderSide",
@@ -5,11 +5,12 @@ This module provides a base adapter interface for integrating different
 perpetual futures exchanges. All exchange-specific adapters should inherit
 from BasePerpAdapter and implement the required methods.
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Union
 from decimal import Decimal
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 from src.utils.symbol_manager import SymbolManager, get_symbol_manager
@@ -248,6 +249,37 @@ class Trade:
         }
 
 
+@dataclass
+class OrderRequest:
+    """批量下單的單筆請求（參數與 place_order 相同）"""
+    symbol: str
+    side: str
+    order_type: str
+    quantity: Decimal
+    price: Optional[Decimal] = None
+    time_in_force: str = "gtc"
+    reduce_only: bool = False
+    client_order_id: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)   # 其他 place_order 參數 (如 post_only)
+
+
+@dataclass
+class CancelRequest:
+    """批量撤單的單筆請求"""
+    symbol: str
+    order_id: Optional[str] = None
+    client_order_id: Optional[str] = None
+
+
+@dataclass
+class BatchOrderResult:
+    """批量操作的單筆結果（與請求列表一一對應）"""
+    request: Union[OrderRequest, CancelRequest]
+    success: bool
+    order: Optional[Order] = None     # 下單成功時的訂單
+    error: Optional[str] = None
+
+
 class BasePerpAdapter(ABC):
     """
     永續合約交易所適配器基類
@@ -258,6 +290,11 @@ class BasePerpAdapter(ABC):
     Symbol 映射由 SymbolManager 統一管理，配置位於 config/symbols.yaml
     """
 
+    # 是否支援原生改單 (amend_order)，不支援時 replace_order 以先掛後撤模擬
+    supports_amend: bool = False
+    # place_orders / cancel_orders 逐筆並發時的最大並發數
+    batch_concurrency: int = 5
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化適配器
@@ -417,6 +454,135 @@ class BasePerpAdapter(ABC):
         """
         pass
     
+    async def amend_order(
+        self,
+        symbol: str,
+        order_id: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+        price: Optional[Decimal] = None,
+        quantity: Optional[Decimal] = None,
+        **kwargs
+    ) -> Order:
+        """
+        原生改單（保留訂單身份，一次往返）
+
+        僅 supports_amend 為 True 的適配器需要實現。
+
+        Args:
+            symbol: 交易對符號
+            order_id: 訂單ID（與client_order_id二選一）
+            client_order_id: 客戶端訂單ID
+            price: 新價格（None = 不變）
+            quantity: 新數量（None = 不變）
+            **kwargs: 其他參數（replace_order 會帶上 side、order_type）
+
+        Returns:
+            Order: 改單後的訂單信息
+
+        Raises:
+            NotImplementedError: 交易所不支援原生改單
+        """
+        raise NotImplementedError(f"{self.exchange_name} does not support amend_order")
+
+    async def replace_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        price: Decimal,
+        order_id: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+        new_client_order_id: Optional[str] = None,
+        order_type: str = "limit",
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        make_before_break: bool = True,
+        **kwargs
+    ) -> Order:
+        """
+        改價/改量（原生改單優先，否則模擬撤單重掛）
+
+        模擬流程（make_before_break=True）：
+        1. 先掛新單 — 失敗直接拋出，舊單不受影響
+        2. 再撤舊單 — 失敗（例如舊單已成交）時撤回新單後拋出，
+           確保調用方只會看到「舊單仍在」或「已換成新單」兩種結果
+        期間同方向短暫存在兩張單，但盤口不會出現空窗。
+
+        make_before_break=False 時先撤後掛（不允許雙單的場景），撤單失敗不會掛新單。
+
+        Args:
+            symbol: 交易對符號
+            side: 訂單方向
+            quantity: 新數量
+            price: 新價格
+            order_id: 舊訂單ID（與client_order_id二選一）
+            client_order_id: 舊訂單客戶端ID
+            new_client_order_id: 新訂單客戶端ID（僅模擬時使用）
+            order_type: 訂單類型
+            time_in_force: 訂單有效期
+            reduce_only: 是否只減倉
+            make_before_break: 是否先掛後撤
+            **kwargs: 傳給 place_order 的其他參數（如 post_only）
+
+        Returns:
+            Order: 替換後的訂單（原生改單時為同一訂單）
+
+        Raises:
+            Exception: 替換失敗時拋出異常，此時舊單仍有效
+        """
+        if self.supports_amend:
+            try:
+                return await self.amend_order(
+                    symbol,
+                    order_id=order_id,
+                    client_order_id=client_order_id,
+                    price=price,
+                    quantity=quantity,
+                    side=side,
+                    order_type=order_type,
+                )
+            except NotImplementedError:
+                pass
+
+        async def place_new() -> Order:
+            return await self.place_order(
+                symbol=symbol,
+                side=side,
+                order_type=order_type,
+                quantity=quantity,
+                price=price,
+                time_in_force=time_in_force,
+                reduce_only=reduce_only,
+                client_order_id=new_client_order_id,
+                **kwargs
+            )
+
+        if not make_before_break:
+            if not await self.cancel_order(symbol, order_id=order_id, client_order_id=client_order_id):
+                raise RuntimeError(f"replace_order: cancel of {client_order_id or order_id} failed")
+            return await place_new()
+
+        new_order = await place_new()
+        try:
+            cancelled = await self.cancel_order(symbol, order_id=order_id, client_order_id=client_order_id)
+            error = None if cancelled else "cancel returned False"
+        except Exception as e:
+            error = str(e)
+
+        if error is not None:
+            # 舊單撤不掉（可能已成交）→ 撤回新單，保持單一訂單
+            try:
+                await self.cancel_order(
+                    symbol,
+                    order_id=new_order.order_id,
+                    client_order_id=new_order.client_order_id,
+                )
+            except Exception:
+                pass
+            raise RuntimeError(f"replace_order: cancel of {client_order_id or order_id} failed: {error}")
+
+        return new_order
+
     @abstractmethod
     async def cancel_all_orders(self, symbol: str) -> int:
         """
@@ -470,6 +636,98 @@ class BasePerpAdapter(ABC):
         """
         pass
 
+    async def get_orderbooks(self, symbols: List[str], limit: int = 20) -> Dict[str, Orderbook]:
+        """
+        批量查詢訂單簿
+
+        預設實作：並發調用 get_orderbook，失敗的交易對不包含在結果中。
+        支援批量接口的交易所可覆寫此方法。
+
+        Args:
+            symbols: 交易對符號列表
+            limit: 訂單簿深度
+
+        Returns:
+            Dict[str, Orderbook]: symbol -> 訂單簿
+        """
+        results = await asyncio.gather(
+            *(self.get_orderbook(symbol, limit) for symbol in symbols),
+            return_exceptions=True
+        )
+        return {
+            symbol: result
+            for symbol, result in zip(symbols, results)
+            if not isinstance(result, Exception)
+        }
+
+    async def place_orders(self, requests: List[OrderRequest]) -> List[BatchOrderResult]:
+        """
+        批量下單
+
+        預設實作：以 batch_concurrency 為上限並發調用 place_order。
+        支援批量接口的交易所可覆寫此方法。
+
+        Args:
+            requests: 下單請求列表
+
+        Returns:
+            List[BatchOrderResult]: 與 requests 順序一致的逐筆結果（不拋出異常）
+        """
+        semaphore = asyncio.Semaphore(max(1, self.batch_concurrency))
+
+        async def place(req: OrderRequest) -> BatchOrderResult:
+            async with semaphore:
+                try:
+                    order = await self.place_order(
+                        symbol=req.symbol,
+                        side=req.side,
+                        order_type=req.order_type,
+                        quantity=req.quantity,
+                        price=req.price,
+                        time_in_force=req.time_in_force,
+                        reduce_only=req.reduce_only,
+                        client_order_id=req.client_order_id,
+                        **req.params
+                    )
+                    return BatchOrderResult(request=req, success=True, order=order)
+                except Exception as e:
+                    return BatchOrderResult(request=req, success=False, error=str(e))
+
+        return list(await asyncio.gather(*(place(req) for req in requests)))
+
+    async def cancel_orders(self, requests: List[CancelRequest]) -> List[BatchOrderResult]:
+        """
+        批量撤單
+
+        預設實作：以 batch_concurrency 為上限並發調用 cancel_order。
+        支援批量接口的交易所可覆寫此方法。
+
+        Args:
+            requests: 撤單請求列表
+
+        Returns:
+            List[BatchOrderResult]: 與 requests 順序一致的逐筆結果（不拋出異常）
+        """
+        semaphore = asyncio.Semaphore(max(1, self.batch_concurrency))
+
+        async def cancel(req: CancelRequest) -> BatchOrderResult:
+            async with semaphore:
+                try:
+                    ok = await self.cancel_order(
+                        req.symbol,
+                        order_id=req.order_id,
+                        client_order_id=req.client_order_id,
+                    )
+                    return BatchOrderResult(
+                        request=req,
+                        success=bool(ok),
+                        error=None if ok else "cancel returned False",
+                    )
+                except Exception as e:
+                    return BatchOrderResult(request=req, success=False, error=str(e))
+
+        return list(await asyncio.gather(*(cancel(req) for req in requests)))
+
     async def health_check(self) -> dict:
         """
         健康檢查
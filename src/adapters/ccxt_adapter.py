@@ -9,9 +9,17 @@ CCXT Exchange Adapter
 - Bybit
 - Gate.io
 - 以及 CCXT 支持的其他 100+ 交易所
+
+非阻塞設計：
+- 使用 ccxt.async_support；安裝了 ccxt.pro (ccxt>=4 內建) 時改用 pro 交易所類，
+  訂單簿由 watch_order_book 推送並緩存，訂單更新由 watch_orders 推送
+- 同一交易所 (及網路) 的 markets 元數據只加載一次，所有實例共用
+- get_orderbooks 在交易所支持時使用 fetch_order_books 批量查詢
 """
+import asyncio
+import time
 import ccxt.async_support as ccxt
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 from decimal import Decimal
 from datetime import datetime
 
@@ -24,9 +32,21 @@ from .base_adapter import (
     OrderType,
     OrderStatus,
     TimeInForce,
-    Orderbook
+    Orderbook,
+    OrderRequest,
+    CancelRequest,
+    BatchOrderResult,
 )
 
+try:
+    import ccxt.pro as ccxtpro
+    _HAS_CCXT_PRO = True
+except ImportError:
+    ccxtpro = None
+    _HAS_CCXT_PRO = False
+
+OrderUpdateCallback = Callable[[Order], Awaitable[None]]
+
 
 class CCXTAdapter(BasePerpAdapter):
     """
@@ -36,6 +56,10 @@ class CCXTAdapter(BasePerpAdapter):
     Symbol 映射由 SymbolManager 統一管理 (config/symbols.yaml)
     """
 
+    # 共用 markets 緩存: (exchange_name, testnet, defaultType) -> {'markets', 'currencies', 'loaded_at'}
+    _markets_cache: Dict[tuple, Dict[str, Any]] = {}
+    _markets_locks: Dict[tuple, asyncio.Lock] = {}
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化 CCXT 適配器
@@ -48,6 +72,10 @@ class CCXTAdapter(BasePerpAdapter):
                 - password: API 密碼（OKX/Bitget 需要）
                 - testnet: 是否使用測試網（可選，默認 False）
                 - options: CCXT 額外選項（可選）
+                - use_websocket: 有 ccxt.pro 時使用 WebSocket 推送（可選，默認 True）
+                - orderbook_max_age_sec: WebSocket 訂單簿緩存最大有效期（可選，默認 5 秒）
+                - markets_ttl_sec: 共用 markets 緩存有效期（可選，默認 3600 秒）
+                - max_concurrent_requests: 批量查詢的最大並發數（可選，默認 5）
         """
         super().__init__(config)
 
@@ -61,8 +89,11 @@ class CCXTAdapter(BasePerpAdapter):
         if not self.api_key or not self.api_secret:
             raise ValueError("配置中必須包含 api_key 和 api_secret")
 
-        # 創建 CCXT 交易所實例
-        exchange_class = getattr(ccxt, self.exchange_name, None)
+        # 創建 CCXT 交易所實例 (ccxt.pro 類繼承 async_support，REST 接口相同)
+        self._use_websocket = config.get("use_websocket", True) and _HAS_CCXT_PRO \
+            and hasattr(ccxtpro, self.exchange_name)
+        exchange_module = ccxtpro if self._use_websocket else ccxt
+        exchange_class = getattr(exchange_module, self.exchange_name, None)
         if not exchange_class:
             raise ValueError(
                 f"CCXT 不支持的交易所: {self.exchange_name}。\n"
@@ -96,11 +127,49 @@ class CCXTAdapter(BasePerpAdapter):
         self.exchange = exchange_class(ccxt_config)
         self._connected = False
 
+        self._markets_key = (self.exchange_name, self.testnet, ccxt_config['options'].get('defaultType'))
+        self._markets_ttl_sec = config.get("markets_ttl_sec", 3600)
+        self._orderbook_max_age_sec = config.get("orderbook_max_age_sec", 5.0)
+        self._request_semaphore = asyncio.Semaphore(config.get("max_concurrent_requests", 5))
+
+        # WebSocket 訂單簿緩存: exchange_symbol -> (ccxt orderbook, received_at)
+        self._book_cache: Dict[str, tuple] = {}
+        self._book_tasks: Dict[str, asyncio.Task] = {}
+
+        # WebSocket 訂單更新
+        self._order_callbacks: List[OrderUpdateCallback] = []
+        self._orders_task: Optional[asyncio.Task] = None
+
+    # ==================== Markets 緩存 ====================
+
+    async def _load_markets_shared(self, reload: bool = False):
+        """加載 markets，同一交易所的所有實例共用一份"""
+        key = self._markets_key
+        cached = self._markets_cache.get(key)
+        if not reload and cached and time.time() - cached['loaded_at'] < self._markets_ttl_sec:
+            self.exchange.set_markets(cached['markets'], cached['currencies'])
+            return
+
+        lock = self._markets_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # 等鎖期間可能已被其他實例加載
+            cached = self._markets_cache.get(key)
+            if not reload and cached and time.time() - cached['loaded_at'] < self._markets_ttl_sec:
+                self.exchange.set_markets(cached['markets'], cached['currencies'])
+                return
+
+            await self.exchange.load_markets(reload)
+            self._markets_cache[key] = {
+                'markets': self.exchange.markets,
+                'currencies': self.exchange.currencies,
+                'loaded_at': time.time(),
+            }
+
     async def connect(self) -> bool:
         """連接到交易所並驗證 API 憑證"""
         try:
-            # 加載市場數據
-            await self.exchange.load_markets()
+            # 加載市場數據 (共用緩存)
+            await self._load_markets_shared()
             print(f"📊 Loaded {len(self.exchange.markets)} markets from {self.exchange_name.upper()}")
 
             # 驗證 API 憑證（查詢餘額）
@@ -115,8 +184,18 @@ class CCXTAdapter(BasePerpAdapter):
             return False
 
     async def disconnect(self) -> bool:
-        """斷開連接並關閉 HTTP 會話"""
+        """斷開連接並關閉 HTTP/WebSocket 會話"""
         try:
+            tasks = list(self._book_tasks.values())
+            if self._orders_task:
+                tasks.append(self._orders_task)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._book_tasks.clear()
+            self._book_cache.clear()
+            self._orders_task = None
+
             await self.exchange.close()
             self._connected = False
             return True
@@ -200,46 +279,36 @@ class CCXTAdapter(BasePerpAdapter):
         price: Optional[Decimal] = None,
         time_in_force: TimeInForce = TimeInForce.GTC,
         reduce_only: bool = False,
-        post_only: bool = False
+        post_only: bool = False,
+        client_order_id: Optional[str] = None,
+        **kwargs
     ) -> Order:
         """
         下單
 
         Args:
             symbol: 交易對符號，格式如 "BTC/USDT:USDT"
-            side: 訂單方向
-            order_type: 訂單類型
+            side: 訂單方向（OrderSide 或字串）
+            order_type: 訂單類型（OrderType 或字串）
             quantity: 數量
             price: 價格（限價單需要）
             time_in_force: 有效期類型
             reduce_only: 只減倉
             post_only: 只做 Maker
+            client_order_id: 客戶端訂單 ID
+            **kwargs: 其他交易所參數，原樣放入 CCXT params
 
         Returns:
             Order: 訂單信息
         """
         try:
-            # 轉換 symbol 為交易所格式
-            exchange_symbol = self.normalize_symbol(symbol)
-            # 轉換為 CCXT 格式
-            ccxt_side = side.value.lower()
-            ccxt_type = order_type.value.lower()
-
-            # 構建參數
-            params = {}
-            if reduce_only:
-                params['reduceOnly'] = True
-            if post_only:
-                params['postOnly'] = True
-
             # 下單
             order = await self.exchange.create_order(
-                symbol=exchange_symbol,
-                type=ccxt_type,
-                side=ccxt_side,
-                amount=float(quantity),
-                price=float(price) if price else None,
-                params=params
+                **self._build_order_args(
+                    symbol, side, order_type, quantity, price,
+                    reduce_only, post_only, client_order_id,
+                    time_in_force=time_in_force, extra_params=kwargs
+                )
             )
 
             return self._parse_order(order, original_symbol=symbol)
@@ -248,6 +317,196 @@ class CCXTAdapter(BasePerpAdapter):
             print(f"❌ Failed to place order on {self.exchange_name}: {e}")
             raise
 
+    @property
+    def supports_amend(self) -> bool:
+        """交易所是否提供 editOrder"""
+        return bool(self.exchange is not None and self.exchange.has.get('editOrder'))
+
+    async def amend_order(
+        self,
+        symbol: str,
+        order_id: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+        price: Optional[Decimal] = None,
+        quantity: Optional[Decimal] = None,
+        **kwargs
+    ) -> Order:
+        """
+        改單（CCXT editOrder）
+
+        Args:
+            symbol: 交易對符號
+            order_id: 訂單 ID
+            client_order_id: 客戶端訂單 ID（order_id 未提供時使用）
+            price: 新價格
+            quantity: 新數量
+            **kwargs: side / order_type，未提供時先查詢原訂單
+
+        Returns:
+            Order: 改單後的訂單信息
+        """
+        exchange_symbol = self.normalize_symbol(symbol)
+        params = {}
+        if not order_id:
+            if not client_order_id:
+                raise ValueError("必須提供 order_id 或 client_order_id")
+            order_id = client_order_id
+            params['clientOrderId'] = client_order_id
+
+        side = kwargs.get('side')
+        order_type = kwargs.get('order_type')
+        if side is None or order_type is None or quantity is None:
+            current = await self.exchange.fetch_order(order_id, exchange_symbol, params)
+            side = side or current['side']
+            order_type = order_type or current['type']
+            if quantity is None:
+                quantity = Decimal(str(current['amount']))
+
+        side = side.value if isinstance(side, OrderSide) else side
+        order_type = order_type.value if isinstance(order_type, OrderType) else order_type
+
+        try:
+            order = await self.exchange.edit_order(
+                order_id,
+                exchange_symbol,
+                order_type.lower(),
+                side.lower(),
+                float(quantity),
+                float(price) if price else None,
+                params
+            )
+            return self._parse_order(order, original_symbol=symbol)
+
+        except Exception as e:
+            print(f"❌ Failed to amend order on {self.exchange_name}: {e}")
+            raise
+
+    def _build_order_args(
+        self,
+        symbol: str,
+        side,
+        order_type,
+        quantity: Decimal,
+        price: Optional[Decimal],
+        reduce_only: bool = False,
+        post_only: bool = False,
+        client_order_id: Optional[str] = None,
+        time_in_force: Any = TimeInForce.GTC,
+        extra_params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """統一格式下單參數 → CCXT create_order 參數（place_order 與 place_orders 共用）"""
+        side = side.value if isinstance(side, OrderSide) else str(side)
+        order_type = order_type.value if isinstance(order_type, OrderType) else str(order_type)
+        tif = (time_in_force.value if isinstance(time_in_force, TimeInForce) else str(time_in_force or "gtc")).lower()
+
+        params = dict(extra_params or {})
+        if reduce_only:
+            params['reduceOnly'] = True
+        if post_only or tif == TimeInForce.PO.value:
+            params['postOnly'] = True
+        elif tif in (TimeInForce.IOC.value, TimeInForce.FOK.value):
+            params['timeInForce'] = tif.upper()
+        if client_order_id:
+            params['clientOrderId'] = client_order_id
+
+        return {
+            'symbol': self.normalize_symbol(symbol),
+            'type': order_type.lower(),
+            'side': side.lower(),
+            'amount': float(quantity),
+            'price': float(price) if price else None,
+            'params': params,
+        }
+
+    async def place_orders(self, requests: List[OrderRequest]) -> List[BatchOrderResult]:
+        """
+        批量下單（交易所支持 createOrders 時一次請求，否則逐筆並發）
+
+        Args:
+            requests: 下單請求列表
+
+        Returns:
+            List[BatchOrderResult]: 與 requests 順序一致的逐筆結果
+        """
+        if not requests or not self.exchange.has.get('createOrders'):
+            return await super().place_orders(requests)
+
+        orders = [
+            self._build_order_args(
+                req.symbol, req.side, req.order_type, req.quantity, req.price,
+                req.reduce_only, req.params.get('post_only', False), req.client_order_id,
+                time_in_force=req.time_in_force,
+                extra_params={k: v for k, v in req.params.items() if k != 'post_only'},
+            )
+            for req in requests
+        ]
+        try:
+            raw_orders = await self.exchange.create_orders(orders)
+        except Exception as e:
+            print(f"❌ Failed to place batch orders on {self.exchange_name}: {e}")
+            return [BatchOrderResult(request=req, success=False, error=str(e)) for req in requests]
+
+        results = []
+        for req, raw in zip(requests, raw_orders):
+            # 批量接口對單筆失敗通常返回無 id 的訂單 (錯誤在 info 內)
+            if not raw.get('id') or raw.get('status') == 'rejected':
+                results.append(BatchOrderResult(request=req, success=False, error=str(raw.get('info'))))
+                continue
+            try:
+                results.append(BatchOrderResult(
+                    request=req, success=True, order=self._parse_order(raw, original_symbol=req.symbol)
+                ))
+            except Exception as e:
+                results.append(BatchOrderResult(request=req, success=False, error=f"parse error: {e}"))
+        return results
+
+    async def cancel_orders(self, requests: List[CancelRequest]) -> List[BatchOrderResult]:
+        """
+        批量撤單（交易所支持 cancelOrders 時按交易對一次請求，否則逐筆並發）
+
+        只有 client_order_id 的請求走逐筆撤單。
+
+        Args:
+            requests: 撤單請求列表
+
+        Returns:
+            List[BatchOrderResult]: 與 requests 順序一致的逐筆結果
+        """
+        if not requests or not self.exchange.has.get('cancelOrders'):
+            return await super().cancel_orders(requests)
+
+        results: Dict[int, BatchOrderResult] = {}
+        by_symbol: Dict[str, List[int]] = {}
+        single: List[int] = []
+        for i, req in enumerate(requests):
+            if req.order_id:
+                by_symbol.setdefault(req.symbol, []).append(i)
+            else:
+                single.append(i)
+
+        async def cancel_group(symbol: str, indexes: List[int]):
+            try:
+                await self.exchange.cancel_orders(
+                    [requests[i].order_id for i in indexes], self.normalize_symbol(symbol)
+                )
+                for i in indexes:
+                    results[i] = BatchOrderResult(request=requests[i], success=True)
+            except Exception as e:
+                print(f"❌ Failed to cancel batch orders on {self.exchange_name}: {e}")
+                for i in indexes:
+                    results[i] = BatchOrderResult(request=requests[i], success=False, error=str(e))
+
+        async def cancel_single():
+            single_results = await super(CCXTAdapter, self).cancel_orders([requests[i] for i in single])
+            for i, result in zip(single, single_results):
+                results[i] = result
+
+        await asyncio.gather(
+            *(cancel_group(symbol, indexes) for symbol, indexes in by_symbol.items()),
+            cancel_single(),
+        )
+        return [results[i] for i in range(len(requests))]
+
     async def cancel_order(
         self,
         symbol: str,
@@ -365,19 +624,161 @@ class CCXTAdapter(BasePerpAdapter):
         try:
             # 轉換為交易所格式
             exchange_symbol = self.normalize_symbol(symbol)
-            ob = await self.exchange.fetch_order_book(exchange_symbol, limit)
 
-            return Orderbook(
-                symbol=symbol,  # 返回原始請求的 symbol
-                bids=[[Decimal(str(b[0])), Decimal(str(b[1]))] for b in ob['bids'][:limit]],
-                asks=[[Decimal(str(a[0])), Decimal(str(a[1]))] for a in ob['asks'][:limit]],
-                timestamp=datetime.fromtimestamp(ob['timestamp'] / 1000) if ob.get('timestamp') else datetime.now()
-            )
+            # 優先使用 WebSocket 推送的緩存
+            ob = self._get_cached_book(exchange_symbol)
+            if ob is None:
+                ob = await self.exchange.fetch_order_book(exchange_symbol, limit)
+
+            return self._parse_orderbook(ob, symbol, limit)
 
         except Exception as e:
             print(f"❌ Failed to get orderbook from {self.exchange_name}: {e}")
             raise
 
+    async def get_orderbooks(self, symbols: List[str], limit: int = 20) -> Dict[str, Orderbook]:
+        """
+        批量獲取訂單簿
+
+        WebSocket 緩存命中的直接返回；其餘在交易所支持時用一次 fetch_order_books，
+        否則以有限並發逐個查詢。
+
+        Args:
+            symbols: 交易對符號列表（統一格式）
+            limit: 深度限制
+
+        Returns:
+            Dict[str, Orderbook]: symbol -> 訂單簿（失敗的交易對不包含在內）
+        """
+        result: Dict[str, Orderbook] = {}
+        missing: Dict[str, str] = {}  # exchange_symbol -> symbol
+        for symbol in symbols:
+            exchange_symbol = self.normalize_symbol(symbol)
+            ob = self._get_cached_book(exchange_symbol)
+            if ob is not None:
+                result[symbol] = self._parse_orderbook(ob, symbol, limit)
+            else:
+                missing[exchange_symbol] = symbol
+
+        if not missing:
+            return result
+
+        if self.exchange.has.get('fetchOrderBooks'):
+            try:
+                books = await self.exchange.fetch_order_books(list(missing), limit)
+                for exchange_symbol, ob in books.items():
+                    symbol = missing.pop(exchange_symbol, None)
+                    if symbol is not None:
+                        result[symbol] = self._parse_orderbook(ob, symbol, limit)
+            except Exception as e:
+                print(f"❌ Batch orderbook fetch failed on {self.exchange_name}, falling back: {e}")
+
+        async def _fetch(exchange_symbol: str):
+            async with self._request_semaphore:
+                return await self.exchange.fetch_order_book(exchange_symbol, limit)
+
+        pending = list(missing.items())
+        books = await asyncio.gather(*(_fetch(es) for es, _ in pending), return_exceptions=True)
+        for (exchange_symbol, symbol), ob in zip(pending, books):
+            if isinstance(ob, Exception):
+                print(f"❌ Failed to get orderbook {symbol} from {self.exchange_name}: {ob}")
+                continue
+            result[symbol] = self._parse_orderbook(ob, symbol, limit)
+
+        return result
+
+    def _parse_orderbook(self, ob: Dict, symbol: str, limit: int) -> Orderbook:
+        """解析 CCXT 訂單簿到統一格式"""
+        return Orderbook(
+            symbol=symbol,  # 返回原始請求的 symbol
+            bids=[[Decimal(str(b[0])), Decimal(str(b[1]))] for b in ob['bids'][:limit]],
+            asks=[[Decimal(str(a[0])), Decimal(str(a[1]))] for a in ob['asks'][:limit]],
+            timestamp=datetime.fromtimestamp(ob['timestamp'] / 1000) if ob.get('timestamp') else datetime.now()
+        )
+
+    # ==================== WebSocket (ccxt.pro) ====================
+
+    def _get_cached_book(self, exchange_symbol: str) -> Optional[Dict]:
+        """
+        讀取 WebSocket 訂單簿緩存（並確保推送已啟動）
+
+        Returns:
+            新鮮的 ccxt 訂單簿，無緩存或過期時返回 None
+        """
+        if not self._use_websocket or not self.exchange.has.get('watchOrderBook'):
+            return None
+
+        task = self._book_tasks.get(exchange_symbol)
+        if task is None or task.done():
+            self._book_tasks[exchange_symbol] = asyncio.create_task(self._watch_order_book(exchange_symbol))
+            return None
+
+        cached = self._book_cache.get(exchange_symbol)
+        if cached is None or time.time() - cached[1] > self._orderbook_max_age_sec:
+            return None
+        return cached[0]
+
+    async def _watch_order_book(self, exchange_symbol: str):
+        """持續接收訂單簿推送，斷線時退避重試"""
+        delay = 1.0
+        try:
+            while True:
+                try:
+                    ob = await self.exchange.watch_order_book(exchange_symbol)
+                    self._book_cache[exchange_symbol] = (ob, time.time())
+                    delay = 1.0
+                except ccxt.NotSupported:
+                    print(f"⚠️ {self.exchange_name.upper()} does not support watch_order_book, using REST")
+                    self._use_websocket = False
+                    return
+                except Exception as e:
+                    print(f"❌ Orderbook stream error on {self.exchange_name} {exchange_symbol}: {e}")
+                    self._book_cache.pop(exchange_symbol, None)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+        except asyncio.CancelledError:
+            pass
+
+    def on_order_update(self, callback: OrderUpdateCallback):
+        """
+        註冊訂單更新回調（需要 ccxt.pro 且交易所支持 watch_orders）
+
+        首次註冊時啟動推送任務。
+        """
+        self._order_callbacks.append(callback)
+        if self._use_websocket and self.exchange.has.get('watchOrders') and self._orders_task is None:
+            self._orders_task = asyncio.create_task(self._watch_orders())
+        return self
+
+    async def _watch_orders(self):
+        """持續接收訂單更新並分發給回調"""
+        delay = 1.0
+        try:
+            while True:
+                try:
+                    orders = await self.exchange.watch_orders()
+                    delay = 1.0
+                except Exception as e:
+                    print(f"❌ Order stream error on {self.exchange_name}: {e}")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+                    continue
+
+                for raw in orders:
+                    order = self._parse_order(raw)
+                    for callback in self._order_callbacks:
+                        try:
+                            await callback(order)
+                        except Exception as e:
+                            print(f"❌ Order update callback error: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    @property
+    def ws_connected(self) -> bool:
+        """是否有正在運行的 WebSocket 推送"""
+        return self._use_websocket and any(not t.done() for t in self._book_tasks.values())
+
     async def set_leverage(self, symbol: str, leverage: int) -> bool:
         """
         設置槓桿倍數
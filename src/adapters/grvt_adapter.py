@@ -6,6 +6,7 @@ API Documentation: https://api-docs.grvt.io/
 
 注意：GRVT SDK 是同步的，所有方法使用 asyncio.to_thread 包裝
 支援 WebSocket 即時推送 (v1.fill, v1.state, v1.position)
+訂單簿優先使用公開行情 WebSocket (v1.book.d, v1.mini.s) 的本地緩存，過期時回退 REST
 """
 import asyncio
 import logging
@@ -31,11 +32,15 @@ from .base_adapter import (
 
 # WebSocket client (conditional import to avoid circular deps)
 try:
-    from .grvt_ws_client import GRVTWebSocketClient, GRVTFillEvent, GRVTOrderStateEvent
+    from .grvt_ws_client import (
+        GRVTWebSocketClient, GRVTMarketDataClient, GRVTFillEvent, GRVTOrderStateEvent, GRVTPositionEvent,
+    )
 except ImportError:
     GRVTWebSocketClient = None
+    GRVTMarketDataClient = None
     GRVTFillEvent = None
     GRVTOrderStateEvent = None
+    GRVTPositionEvent = None
 
 # GRVT SDK imports
 from pysdk.grvt_raw_env import GrvtEnv
@@ -61,7 +66,10 @@ from pysdk.grvt_raw_types import (
 from pysdk.grvt_raw_signing import sign_order
 from eth_account import Account as EthAccount
 
+from ..utils.hot_log import get_hot_logger
+
 logger = logging.getLogger(__name__)
+hot_log = get_hot_logger(__name__)
 
 
 @dataclass
@@ -125,6 +133,7 @@ class GRVTAdapter(BasePerpAdapter):
                 - api_secret: API Secret (私鑰)
                 - testnet: 是否使用測試網（可選，默認 False）
                 - trading_account_id: 交易帳戶 ID（可選）
+                - orderbook_max_age_sec: WebSocket 訂單簿緩存最大有效期（可選，默認 5 秒）
         """
         super().__init__(config)
 
@@ -167,6 +176,13 @@ class GRVTAdapter(BasePerpAdapter):
         # WebSocket callbacks (external handlers)
         self._fill_callbacks: List[Callable[[GRVTFillEvent], Awaitable[None]]] = []
         self._order_state_callbacks: List[Callable[[GRVTOrderStateEvent], Awaitable[None]]] = []
+        self._position_callbacks: List[Callable[[GRVTPositionEvent], Awaitable[None]]] = []
+
+        # Public market-data WebSocket (order book cache, started on first get_orderbook)
+        self._md_client: Optional[GRVTMarketDataClient] = None
+        self._md_task: Optional[asyncio.Task] = None
+        self._md_start_task: Optional[asyncio.Task] = None
+        self._md_max_age_sec = config.get("orderbook_max_age_sec", 5.0)
 
     # ==================== 生命週期 ====================
 
@@ -258,6 +274,21 @@ class GRVTAdapter(BasePerpAdapter):
         self._order_state_callbacks.append(callback)
         return self
 
+    def on_position(self, callback: Callable[[GRVTPositionEvent], Awaitable[None]]):
+        """
+        Register callback for position events (WebSocket)
+
+        Positions are only subscribed when a callback is registered before start_websocket().
+
+        Args:
+            callback: Async function to call when the position changes
+        """
+        if GRVTWebSocketClient is None:
+            logger.warning("WebSocket client not available")
+            return self
+        self._position_callbacks.append(callback)
+        return self
+
     async def start_websocket(self, instruments: List[str] = None) -> bool:
         """
         Start WebSocket connection for real-time updates
@@ -353,15 +384,25 @@ class GRVTAdapter(BasePerpAdapter):
                         logger.error(f"Fill callback error: {e}")
 
             async def _on_order_state(order: GRVTOrderStateEvent):
-                logger.debug(f"[GRVT WS] Order state: {order.order_id} {order.state}")
+                hot_log.count("order_state")
+                hot_log.debug("[GRVT WS] Order state: %s %s", order.order_id, order.state)
                 for cb in self._order_state_callbacks:
                     try:
                         await cb(order)
                     except Exception as e:
                         logger.error(f"Order state callback error: {e}")
 
+            async def _on_position(position: GRVTPositionEvent):
+                hot_log.count("position")
+                for cb in self._position_callbacks:
+                    try:
+                        await cb(position)
+                    except Exception as e:
+                        logger.error(f"Position callback error: {e}")
+
             self._ws_client.on_fill(_on_fill)
             self._ws_client.on_order_state(_on_order_state)
+            self._ws_client.on_position(_on_position)
 
             # Connect
             logger.info("[WebSocket] Attempting to connect...")
@@ -377,6 +418,8 @@ class GRVTAdapter(BasePerpAdapter):
             for inst in instruments:
                 await self._ws_client.subscribe_fills(inst)
                 await self._ws_client.subscribe_order_states(inst)
+                if self._position_callbacks:
+                    await self._ws_client.subscribe_positions(inst)
                 logger.info(f"[WebSocket] Subscribed: {inst}")
 
             # Start message processing loop
@@ -410,6 +453,50 @@ class GRVTAdapter(BasePerpAdapter):
 
         logger.info("GRVT WebSocket stopped")
 
+    async def _start_market_data(self, grvt_symbol: str):
+        """Connect the market-data WebSocket (if needed) and subscribe to an instrument's book"""
+        try:
+            if self._md_client is None:
+                self._md_client = GRVTMarketDataClient(testnet=self.testnet)
+                if not await self._md_client.connect():
+                    logger.warning("[GRVT MD] Market-data WebSocket connect failed, using REST order book")
+                    self._md_client = None
+                    return
+                self._md_task = asyncio.create_task(self._md_client.run())
+
+            if not self._md_client.is_subscribed(grvt_symbol):
+                await self._md_client.subscribe_orderbook(grvt_symbol)
+        except Exception as e:
+            logger.error(f"[GRVT MD] Failed to start market-data stream: {e}")
+
+    def _ensure_market_data(self, grvt_symbol: str):
+        """Start the market-data stream in the background (get_orderbook never waits on it)"""
+        if GRVTMarketDataClient is None:
+            return
+        if self._md_client and self._md_client.is_subscribed(grvt_symbol):
+            return
+        if self._md_start_task and not self._md_start_task.done():
+            return
+        self._md_start_task = asyncio.create_task(self._start_market_data(grvt_symbol))
+
+    async def stop_market_data(self):
+        """Stop market-data WebSocket"""
+        if self._md_start_task:
+            self._md_start_task.cancel()
+            self._md_start_task = None
+
+        if self._md_client:
+            await self._md_client.disconnect()
+            self._md_client = None
+
+        if self._md_task:
+            self._md_task.cancel()
+            try:
+                await self._md_task
+            except asyncio.CancelledError:
+                pass
+            self._md_task = None
+
     @property
     def ws_connected(self) -> bool:
         """Whether WebSocket is connected"""
@@ -417,9 +504,10 @@ class GRVTAdapter(BasePerpAdapter):
 
     def get_ws_stats(self) -> Dict[str, Any]:
         """Get WebSocket statistics"""
-        if self._ws_client:
-            return self._ws_client.get_stats()
-        return {"enabled": False}
+        stats = self._ws_client.get_stats() if self._ws_client else {"enabled": False}
+        if self._md_client:
+            stats["market_data"] = self._md_client.get_stats()
+        return stats
 
     async def disconnect(self) -> bool:
         """斷開連接"""
@@ -427,6 +515,7 @@ class GRVTAdapter(BasePerpAdapter):
             # Stop WebSocket if running
             if self._ws_enabled:
                 await self.stop_websocket()
+            await self.stop_market_data()
 
             self._client = None
             self._connected = False
@@ -671,9 +760,11 @@ class GRVTAdapter(BasePerpAdapter):
         # 轉換參數
         is_bid = side in [OrderSide.BUY, "buy", "long"]
 
-        # 計算名義價值並記錄
-        notional = float(quantity) * float(price) if price else 0
-        logger.info(f"[GRVT Order] {grvt_symbol} {side} qty={quantity} price={price} notional=${notional:.2f}")
+        # 記錄下單 (名義價值只在 INFO 啟用時計算)
+        hot_log.count("place_order")
+        if hot_log.enabled(logging.INFO):
+            hot_log.info("[GRVT Order] %s %s qty=%s price=%s notional=$%.2f",
+                         grvt_symbol, side, quantity, price, quantity * price if price else 0, interval=1.0)
 
         # 構建訂單腿
         legs = [OrderLeg(
@@ -712,7 +803,7 @@ class GRVTAdapter(BasePerpAdapter):
             legs=legs,
             signature=Signature(signer="", r="", s="", v=0, expiration=expiration_ns, nonce=nonce),
             metadata=OrderMetadata(client_order_id=client_order_id),
-            is_market=(order_type == OrderType.MARKET),
+            is_market=(order_type in [OrderType.MARKET, "market"]),
             post_only=post_only,
             reduce_only=reduce_only,
         )
@@ -776,7 +867,7 @@ class GRVTAdapter(BasePerpAdapter):
         # GRVT 響應格式可能是: {"result": {"order": {"order_id": "..."}}}
         # 或 {"result": {"order_id": "..."}}
         order_data = result.get("result", {})
-        logger.debug(f"[GRVT Place] Response: {result}")
+        hot_log.debug("[GRVT Place] Response: %s", result)
 
         # 嘗試多種路徑獲取 order_id
         order_id_result = (
@@ -785,7 +876,8 @@ class GRVTAdapter(BasePerpAdapter):
             or order_data.get("ack", {}).get("order_id")  # 某些 API 用 ack
         )
 
-        logger.info(f"[GRVT Place] Order placed: order_id={order_id_result}, client_order_id={client_order_id}")
+        hot_log.info("[GRVT Place] Order placed: order_id=%s, client_order_id=%s",
+                     order_id_result, client_order_id, interval=1.0)
 
         return Order(
             order_id=order_id_result,
@@ -960,10 +1052,23 @@ class GRVTAdapter(BasePerpAdapter):
     # ==================== 訂單簿 ====================
 
     async def get_orderbook(self, symbol: str, limit: int = 20) -> Orderbook:
-        """獲取訂單簿"""
+        """獲取訂單簿 (優先使用 WebSocket 緩存，過期或未連接時回退 REST)"""
         if not self._client:
             raise Exception("Not connected. Call connect() first.")
 
+        grvt_symbol = self._normalize_symbol(symbol)
+        self._ensure_market_data(grvt_symbol)
+
+        if self._md_client and self._md_client.is_connected:
+            cached = self._md_client.get_cached_orderbook(grvt_symbol, max_age_sec=self._md_max_age_sec)
+            if cached and cached["bids"] and cached["asks"]:
+                return Orderbook(
+                    symbol=symbol,
+                    bids=cached["bids"][:limit],
+                    asks=cached["asks"][:limit],
+                    timestamp=datetime.fromtimestamp(cached["timestamp"])
+                )
+
         return await asyncio.to_thread(self._get_orderbook_sync, symbol, limit)
 
     def _get_orderbook_sync(self, symbol: str, limit: int) -> Orderbook:
@@ -1,11 +1,13 @@
 """
-GRVT WebSocket Client for Real-time Order and Fill Updates
+GRVT WebSocket Clients for Real-time Order, Fill and Market Data Updates
 
 GRVT WebSocket API:
 - Uses JSON-RPC 2.0 format
 - v1.fill stream for fill events
 - v1.state stream for order state updates
 - v1.position stream for position updates
+- v1.book.d stream for incremental order book updates (public, GRVTMarketDataClient)
+- v1.mini.s stream for mini ticker (best bid/ask, mid, mark) (public, GRVTMarketDataClient)
 
 Reference: https://api-docs.grvt.io/
 """
@@ -113,11 +115,23 @@ class GRVTPositionEvent:
     timestamp: datetime
 
 
+@dataclass
+class GRVTMiniTicker:
+    """GRVT Mini Ticker from WebSocket (v1.mini.s)"""
+    instrument: str
+    best_bid: Decimal
+    best_ask: Decimal
+    mid_price: Decimal
+    mark_price: Decimal
+    timestamp: datetime
+
+
 # Callback type definitions
 FillCallback = Callable[[GRVTFillEvent], Awaitable[None]]
 OrderStateCallback = Callable[[GRVTOrderStateEvent], Awaitable[None]]
 PositionCallback = Callable[[GRVTPositionEvent], Awaitable[None]]
 ErrorCallback = Callable[[str, Any], Awaitable[None]]
+TickerCallback = Callable[[GRVTMiniTicker], Awaitable[None]]
 
 
 class GRVTWebSocketClient:
@@ -229,11 +243,7 @@ class GRVTWebSocketClient:
             if self._session is None:
                 self._session = aiohttp.ClientSession()
 
-            # Build headers with authentication
-            headers = {
-                "Cookie": f"gravity={self.api_key}",
-                "X-Grvt-Account-Id": self.trading_account_id,
-            }
+            headers = self._connect_headers()
 
             logger.info(f"[WS Connect] URL: {self.ws_url}")
             logger.info(f"[WS Connect] Account ID: {self.trading_account_id}")
@@ -277,6 +287,13 @@ class GRVTWebSocketClient:
             self._connected = False
             return False
 
+    def _connect_headers(self) -> Dict[str, str]:
+        """Build connection headers with authentication"""
+        return {
+            "Cookie": f"gravity={self.api_key}",
+            "X-Grvt-Account-Id": self.trading_account_id,
+        }
+
     async def disconnect(self):
         """Disconnect WebSocket"""
         self._running = False
@@ -366,9 +383,7 @@ class GRVTWebSocketClient:
             raise Exception("WebSocket not connected")
 
         self._msg_id += 1
-
-        # Build selector: "subAccountId-instrument"
-        selector = f"{self.trading_account_id}-{instrument}"
+        selector = self._selector(stream, instrument)
 
         message = {
             "jsonrpc": "2.0",
@@ -383,13 +398,17 @@ class GRVTWebSocketClient:
         await self._ws.send_json(message)
         logger.debug(f"Sent subscribe: {stream} selector={selector}")
 
+    def _selector(self, stream: str, instrument: str) -> str:
+        """Build subscription selector: subAccountId-instrument"""
+        return f"{self.trading_account_id}-{instrument}"
+
     async def unsubscribe(self, stream: str, instrument: str):
         """Unsubscribe from a stream"""
         if not self._connected or not self._ws:
             return
 
         self._msg_id += 1
-        selector = f"{self.trading_account_id}-{instrument}"
+        selector = self._selector(stream, instrument)
 
         message = {
             "jsonrpc": "2.0",
@@ -474,26 +493,31 @@ class GRVTWebSocketClient:
                         logger.error(f"Error callback failed: {e}")
                 return
 
-            # Handle stream data
-            if "params" in message:
-                params = message["params"]
-                stream = params.get("stream", "")
-                feed = params.get("feed", {})
-
-                if stream == "v1.fill":
-                    await self._handle_fill(feed)
-                elif stream == "v1.state":
-                    await self._handle_order_state(feed)
-                elif stream == "v1.position":
-                    await self._handle_position(feed)
-                else:
-                    logger.debug(f"Unknown stream: {stream}")
+            # Handle stream data (JSON-RPC "params" envelope, or bare feed message)
+            params = message.get("params")
+            if params is None and "feed" in message:
+                params = message
+            if params is not None:
+                await self._handle_stream(params.get("stream", ""), params)
 
         except json.JSONDecodeError as e:
             logger.error(f"GRVT WebSocket JSON parse error: {e}")
         except Exception as e:
             logger.error(f"GRVT WebSocket message handler error: {e}")
 
+    async def _handle_stream(self, stream: str, params: Dict[str, Any]):
+        """Dispatch stream data to its handler"""
+        feed = params.get("feed", {})
+
+        if stream == "v1.fill":
+            await self._handle_fill(feed)
+        elif stream == "v1.state":
+            await self._handle_order_state(feed)
+        elif stream == "v1.position":
+            await self._handle_position(feed)
+        else:
+            logger.debug(f"Unknown stream: {stream}")
+
     async def _handle_fill(self, data: Dict[str, Any]):
         """Handle fill event"""
         try:
@@ -635,3 +659,243 @@ class GRVTWebSocketClient:
             "last_message_time": self._last_message_time,
             "uptime_seconds": time.time() - self._connect_time if self._connect_time else 0,
         }
+
+
+class GRVTMarketDataClient(GRVTWebSocketClient):
+    """
+    GRVT public market-data WebSocket client
+
+    Features:
+    - Incremental order book (v1.book.d): snapshot on subscribe, then deltas
+      applied to a local book (size 0 removes a level); sequence gaps trigger
+      a re-subscribe for a fresh snapshot
+    - Mini ticker (v1.mini.s): best bid/ask, mid and mark price
+    - Cached book served in the same form as the StandX client
+      ({"bids": [[price, size], ...], "asks": [...], "timestamp": float})
+    - Same reconnect/resubscribe handling as the private client (no auth needed)
+    """
+
+    WS_URL_MARKET_DATA_MAINNET = "wss://market-data.grvt.io/ws/full"
+    WS_URL_MARKET_DATA_TESTNET = "wss://market-data.testnet.grvt.io/ws/full"
+
+    BOOK_STREAM = "v1.book.d"
+    TICKER_STREAM = "v1.mini.s"
+
+    def __init__(
+        self,
+        testnet: bool = False,
+        book_rate_ms: int = 100,
+        ticker_rate_ms: int = 500,
+        reconnect_delay: int = 5,
+        max_reconnect_delay: int = 60,
+    ):
+        """
+        Initialize GRVT market-data client
+
+        Args:
+            testnet: Use testnet endpoints
+            book_rate_ms: Order book delta update rate
+            ticker_rate_ms: Mini ticker update rate
+            reconnect_delay: Initial reconnect delay in seconds
+            max_reconnect_delay: Maximum reconnect delay
+        """
+        super().__init__(
+            api_key="",
+            trading_account_id="",
+            testnet=testnet,
+            reconnect_delay=reconnect_delay,
+            max_reconnect_delay=max_reconnect_delay,
+        )
+        self.ws_url = self.WS_URL_MARKET_DATA_TESTNET if testnet else self.WS_URL_MARKET_DATA_MAINNET
+        self.book_rate_ms = book_rate_ms
+        self.ticker_rate_ms = ticker_rate_ms
+
+        # Local books: instrument -> {"bids": {price: size}, "asks": {price: size}, "sequence": int, "timestamp": float}
+        self._books: Dict[str, Dict[str, Any]] = {}
+        # Sorted book cache (rebuilt lazily after each update)
+        self._orderbook_cache: Dict[str, Dict[str, Any]] = {}
+        self._ticker_cache: Dict[str, GRVTMiniTicker] = {}
+
+        self._ticker_callbacks: List[TickerCallback] = []
+
+        # Statistics
+        self._book_updates = 0
+        self._book_resyncs = 0
+        self._book_deltas_dropped = 0
+
+    def on_ticker(self, callback: TickerCallback):
+        """Register mini ticker callback"""
+        self._ticker_callbacks.append(callback)
+        return self
+
+    def _connect_headers(self) -> Dict[str, str]:
+        """Public streams need no authentication"""
+        return {}
+
+    def _selector(self, stream: str, instrument: str) -> str:
+        """Build selector: instrument@rate"""
+        rate = self.book_rate_ms if stream == self.BOOK_STREAM else self.ticker_rate_ms
+        return f"{instrument}@{rate}"
+
+    async def _resubscribe(self):
+        """Drop local books (a fresh snapshot follows the subscription) and re-subscribe"""
+        self._books.clear()
+        self._orderbook_cache.clear()
+        await super()._resubscribe()
+
+    # ==================== Subscription Management ====================
+
+    async def subscribe_orderbook(self, instrument: str = "BTC_USDT_Perp"):
+        """Subscribe to incremental order book and mini ticker for an instrument"""
+        await self._send_subscribe(self.BOOK_STREAM, instrument)
+        self._subscribed_streams.add((self.BOOK_STREAM, instrument))
+        await self._send_subscribe(self.TICKER_STREAM, instrument)
+        self._subscribed_streams.add((self.TICKER_STREAM, instrument))
+        self._subscribed_instruments.add(instrument)
+        logger.info(f"Subscribed to GRVT market data: {instrument}")
+
+    def is_subscribed(self, instrument: str) -> bool:
+        """Whether the instrument's order book is subscribed"""
+        return instrument in self._subscribed_instruments
+
+    # ==================== Cache Access ====================
+
+    def get_cached_orderbook(self, instrument: str, max_age_sec: float = 5.0) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached order book
+
+        Args:
+            instrument: GRVT instrument (e.g., "BTC_USDT_Perp")
+            max_age_sec: Max age in seconds, older books return None
+
+        Returns:
+            {"bids": [[Decimal, Decimal], ...], "asks": [...], "timestamp": float} or None
+        """
+        book = self._books.get(instrument)
+        if not book or time.time() - book["timestamp"] > max_age_sec:
+            return None
+
+        cached = self._orderbook_cache.get(instrument)
+        if cached is None:
+            cached = {
+                "bids": sorted(([p, q] for p, q in book["bids"].items()), key=lambda x: x[0], reverse=True),
+                "asks": sorted(([p, q] for p, q in book["asks"].items()), key=lambda x: x[0]),
+                "timestamp": book["timestamp"],
+            }
+            self._orderbook_cache[instrument] = cached
+        return cached
+
+    def get_cached_ticker(self, instrument: str, max_age_sec: float = 5.0) -> Optional[GRVTMiniTicker]:
+        """Get the cached mini ticker"""
+        ticker = self._ticker_cache.get(instrument)
+        if not ticker or (datetime.now() - ticker.timestamp).total_seconds() > max_age_sec:
+            return None
+        return ticker
+
+    # ==================== Message Processing ====================
+
+    async def _handle_stream(self, stream: str, params: Dict[str, Any]):
+        if stream == self.BOOK_STREAM:
+            await self._handle_book(params)
+        elif stream == self.TICKER_STREAM:
+            await self._handle_ticker(params.get("feed", {}))
+        else:
+            await super()._handle_stream(stream, params)
+
+    async def _handle_book(self, params: Dict[str, Any]):
+        """Apply an order book snapshot/delta to the local book"""
+        try:
+            feed = params.get("feed", {})
+            instrument = feed.get("instrument", "")
+            if not instrument:
+                return
+
+            sequence = int(params.get("sequence_number", 0) or 0)
+            prev_sequence = params.get("prev_sequence_number")
+            book = self._books.get(instrument)
+
+            if sequence == 0:
+                # Snapshot: rebuild the book
+                book = {"bids": {}, "asks": {}, "sequence": sequence, "timestamp": time.time()}
+                self._books[instrument] = book
+            elif book is None:
+                # Delta before the first snapshot (or while resyncing): a partial book
+                # must never be served, so drop it and wait for the snapshot
+                self._book_deltas_dropped += 1
+                return
+            elif prev_sequence is not None and int(prev_sequence) != book["sequence"]:
+                # Missed an update: drop the book and resubscribe for a fresh snapshot
+                logger.warning(
+                    f"[GRVT MD] {instrument} book sequence gap "
+                    f"({book['sequence']} -> {prev_sequence}), resyncing"
+                )
+                self._book_resyncs += 1
+                self._books.pop(instrument, None)
+                self._orderbook_cache.pop(instrument, None)
+                await self.unsubscribe(self.BOOK_STREAM, instrument)
+                await self._send_subscribe(self.BOOK_STREAM, instrument)
+                self._subscribed_streams.add((self.BOOK_STREAM, instrument))
+                return
+
+            for side in ("bids", "asks"):
+                levels = book[side]
+                for level in feed.get(side, []):
+                    price = Decimal(str(level.get("price", "0")))
+                    size = Decimal(str(level.get("size", "0")))
+                    if size == 0:
+                        levels.pop(price, None)
+                    else:
+                        levels[price] = size
+
+            book["sequence"] = sequence
+            book["timestamp"] = time.time()
+            self._orderbook_cache.pop(instrument, None)
+            self._book_updates += 1
+
+        except Exception as e:
+            logger.error(f"Error handling book event: {e}, data={params}")
+
+    async def _handle_ticker(self, data: Dict[str, Any]):
+        """Handle mini ticker event"""
+        try:
+            instrument = data.get("instrument", "")
+            best_bid = Decimal(str(data.get("best_bid_price", "0")))
+            best_ask = Decimal(str(data.get("best_ask_price", "0")))
+            mid_price = data.get("mid_price")
+
+            ticker = GRVTMiniTicker(
+                instrument=instrument,
+                best_bid=best_bid,
+                best_ask=best_ask,
+                mid_price=Decimal(str(mid_price)) if mid_price else (best_bid + best_ask) / 2,
+                mark_price=Decimal(str(data.get("mark_price", "0"))),
+                timestamp=datetime.now(),
+            )
+            self._ticker_cache[instrument] = ticker
+
+            for callback in self._ticker_callbacks:
+                try:
+                    await callback(ticker)
+                except Exception as e:
+                    logger.error(f"Ticker callback error: {e}")
+
+        except Exception as e:
+            logger.error(f"Error handling ticker event: {e}, data={data}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client statistics"""
+        stats = super().get_stats()
+        stats.update({
+            "book_updates": self._book_updates,
+            "book_resyncs": self._book_resyncs,
+            "book_deltas_dropped": self._book_deltas_dropped,
+            "books": {
+                instrument: {
+                    "bid_levels": len(book["bids"]),
+                    "ask_levels": len(book["asks"]),
+                    "age_sec": round(time.time() - book["timestamp"], 2),
+                }
+                for instrument, book in self._books.items()
+            },
+        })
+        return stats
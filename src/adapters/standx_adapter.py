@@ -18,10 +18,12 @@ from eth_account import Account
 
 from .base_adapter import BasePerpAdapter, Balance, Position, Order, OrderSide, OrderType, OrderStatus, Orderbook, SymbolInfo, Trade
 from .order_validator import validate_and_normalize_order
-from .standx_ws_client import StandXWebSocketClient, OrderUpdate
+from .standx_ws_client import StandXWebSocketClient, OrderUpdate, PositionUpdate, PriceUpdate, PublicTrade
 from ..auth import AsyncStandXAuth
+from ..utils.hot_log import get_hot_logger
 
 logger = logging.getLogger(__name__)
+hot_log = get_hot_logger(__name__)
 
 # 敏感資訊 key 列表（用於日誌遮罩）
 SENSITIVE_KEYS = {"api_key", "secret", "signature", "authorization", "private_key", "ed25519", "token"}
@@ -128,6 +130,9 @@ class StandXAdapter(BasePerpAdapter):
         self._ws_task: Optional[asyncio.Task] = None
         self._fill_callbacks: List[Any] = []
         self._order_state_callbacks: List[Any] = []
+        self._position_callbacks: List[Any] = []
+        self._price_callbacks: List[Any] = []
+        self._public_trade_callbacks: List[Any] = []
 
         # 代理配置（用於女巫防護）
         self.proxy_url = config.get("proxy_url")
@@ -858,6 +863,44 @@ class StandXAdapter(BasePerpAdapter):
         self._order_state_callbacks.append(callback)
         logger.info(f"[StandX WS] Registered order state callback: {callback.__name__}")
 
+    def on_position(self, callback):
+        """
+        註冊倉位推送回調
+
+        Args:
+            callback: async def callback(position_update: PositionUpdate)
+        """
+        self._position_callbacks.append(callback)
+        logger.info(f"[StandX WS] Registered position callback: {callback.__name__}")
+
+    def on_price(self, callback):
+        """
+        註冊 mark price 回調 (price 頻道，WebSocket 啟動後才有推送)
+
+        Args:
+            callback: async def callback(price_update: PriceUpdate)
+        """
+        self._price_callbacks.append(callback)
+
+    def remove_price_callback(self, callback):
+        """移除 mark price 回調"""
+        if callback in self._price_callbacks:
+            self._price_callbacks.remove(callback)
+
+    def on_public_trade(self, callback):
+        """
+        註冊公開成交回調
+
+        Args:
+            callback: async def callback(symbol, price, qty, taker_side)
+        """
+        self._public_trade_callbacks.append(callback)
+
+    def remove_public_trade_callback(self, callback):
+        """移除公開成交回調"""
+        if callback in self._public_trade_callbacks:
+            self._public_trade_callbacks.remove(callback)
+
     async def start_websocket(self, instruments: List[str] = None) -> bool:
         """
         啟動 WebSocket 連接
@@ -901,7 +944,9 @@ class StandXAdapter(BasePerpAdapter):
             # 註冊內部回調（轉發到外部回調）
             async def internal_fill_callback(order_update: OrderUpdate):
                 """內部成交回調 - 轉發到外部"""
-                logger.info(f"[StandX WS] Fill event: {order_update.side} {order_update.filled_qty} @ {order_update.avg_fill_price or order_update.price}")
+                hot_log.count("fill_event")
+                hot_log.info("[StandX WS] Fill event: %s %s @ %s", order_update.side,
+                             order_update.filled_qty, order_update.avg_fill_price or order_update.price, interval=1.0)
                 for callback in self._fill_callbacks:
                     try:
                         await callback(order_update)
@@ -910,15 +955,45 @@ class StandXAdapter(BasePerpAdapter):
 
             async def internal_order_callback(order_update: OrderUpdate):
                 """內部訂單回調 - 轉發到外部"""
-                logger.debug(f"[StandX WS] Order state: {order_update.client_order_id} -> {order_update.status}")
+                hot_log.count("order_state")
+                hot_log.debug("[StandX WS] Order state: %s -> %s", order_update.client_order_id, order_update.status)
                 for callback in self._order_state_callbacks:
                     try:
                         await callback(order_update)
                     except Exception as e:
                         logger.error(f"[StandX WS] Order state callback error: {e}")
 
+            async def internal_position_callback(position_update: PositionUpdate):
+                """內部倉位回調 - 轉發到外部"""
+                hot_log.count("position")
+                hot_log.debug("[StandX WS] Position: %s size=%s", position_update.symbol, position_update.size)
+                for callback in self._position_callbacks:
+                    try:
+                        await callback(position_update)
+                    except Exception as e:
+                        logger.error(f"[StandX WS] Position callback error: {e}")
+
+            async def internal_price_callback(price_update: PriceUpdate):
+                """內部價格回調 - 轉發到外部"""
+                for callback in self._price_callbacks:
+                    try:
+                        await callback(price_update)
+                    except Exception as e:
+                        logger.error(f"[StandX WS] Price callback error: {e}")
+
+            async def internal_public_trade_callback(trade: PublicTrade):
+                """內部公開成交回調 - 轉發到外部"""
+                for callback in self._public_trade_callbacks:
+                    try:
+                        await callback(trade.symbol, trade.price, trade.qty, trade.taker_side)
+                    except Exception as e:
+                        logger.error(f"[StandX WS] Public trade callback error: {e}")
+
             self._ws_client.on_fill(internal_fill_callback)
             self._ws_client.on_order(internal_order_callback)
+            self._ws_client.on_position(internal_position_callback)
+            self._ws_client.on_price(internal_price_callback)
+            self._ws_client.on_public_trade(internal_public_trade_callback)
 
             # 連接 WebSocket
             logger.info("[StandX WS] Connecting to WebSocket...")
@@ -21,7 +21,10 @@ from datetime import datetime
 import aiohttp
 from aiohttp_socks import ProxyConnector, ProxyType
 
+from ..utils.hot_log import get_hot_logger
+
 logger = logging.getLogger(__name__)
+hot_log = get_hot_logger(__name__)
 
 
 @dataclass
@@ -52,6 +55,16 @@ class OrderUpdate:
     timestamp: datetime
 
 
+@dataclass
+class PublicTrade:
+    """公開成交事件 (public_trade 頻道)"""
+    symbol: str
+    price: Decimal
+    qty: Decimal
+    taker_side: str     # 主動方: "buy" 吃賣單, "sell" 吃買單
+    timestamp: datetime
+
+
 @dataclass
 class PositionUpdate:
     """倉位更新事件"""
@@ -68,6 +81,7 @@ PriceCallback = Callable[[PriceUpdate], Awaitable[None]]
 OrderCallback = Callable[[OrderUpdate], Awaitable[None]]
 PositionCallback = Callable[[PositionUpdate], Awaitable[None]]
 FillCallback = Callable[[OrderUpdate], Awaitable[None]]
+PublicTradeCallback = Callable[[PublicTrade], Awaitable[None]]
 
 
 class StandXWebSocketClient:
@@ -114,6 +128,7 @@ class StandXWebSocketClient:
         self._order_callbacks: List[OrderCallback] = []
         self._position_callbacks: List[PositionCallback] = []
         self._fill_callbacks: List[FillCallback] = []
+        self._public_trade_callbacks: List[PublicTradeCallback] = []
 
         # 訂閱的符號
         self._subscribed_symbols: set = set()
@@ -143,6 +158,10 @@ class StandXWebSocketClient:
         """註冊成交回調 (訂單完全或部分成交)"""
         self._fill_callbacks.append(callback)
 
+    def on_public_trade(self, callback: PublicTradeCallback):
+        """註冊公開成交回調 (市場逐筆成交)"""
+        self._public_trade_callbacks.append(callback)
+
     # ==================== Orderbook 緩存 ====================
 
     def get_cached_orderbook(self, symbol: str, max_age_sec: float = 5.0) -> Optional[Dict[str, Any]]:
@@ -373,6 +392,16 @@ class StandXWebSocketClient:
         await self._ws.send_json(price_message)
         logger.info(f"[StandX WS] Subscribed to price for {symbol}")
 
+        # 公開逐筆成交 (模擬器排隊模型使用)
+        trade_message = {
+            "subscribe": {
+                "channel": "public_trade",
+                "symbol": symbol
+            }
+        }
+        await self._ws.send_json(trade_message)
+        logger.info(f"[StandX WS] Subscribed to public_trade for {symbol}")
+
     async def subscribe_orders(self):
         """訂閱訂單更新 (已在 auth 時訂閱)"""
         if not self._authenticated:
@@ -453,6 +482,8 @@ class StandXWebSocketClient:
                 await self._handle_order(message)
             elif channel == "trade":
                 await self._handle_trade(message)
+            elif channel == "public_trade":
+                await self._handle_public_trade(message)
             elif channel == "position":
                 await self._handle_position(message)
             elif channel == "balance":
@@ -554,8 +585,10 @@ class StandXWebSocketClient:
                 timestamp=datetime.now(),
             )
 
-            logger.info(f"[StandX WS] Order update: {order_update.order_id} {order_update.status} "
-                       f"filled={order_update.filled_qty}/{order_update.qty}")
+            hot_log.count("order_update")
+            hot_log.info("[StandX WS] Order update: %s %s filled=%s/%s",
+                         order_update.order_id, order_update.status,
+                         order_update.filled_qty, order_update.qty, interval=1.0)
 
             # 觸發訂單回調
             for callback in self._order_callbacks:
@@ -596,7 +629,9 @@ class StandXWebSocketClient:
                 timestamp=datetime.now(),
             )
 
-            logger.info(f"[StandX WS] Trade: {order_update.side} {order_update.filled_qty} @ {order_update.price}")
+            hot_log.count("trade")
+            hot_log.info("[StandX WS] Trade: %s %s @ %s",
+                         order_update.side, order_update.filled_qty, order_update.price, interval=1.0)
 
             # 觸發成交回調
             for callback in self._fill_callbacks:
@@ -608,6 +643,38 @@ class StandXWebSocketClient:
         except Exception as e:
             logger.error(f"[StandX WS] Trade handler error: {e}")
 
+    async def _handle_public_trade(self, message: Dict):
+        """處理公開逐筆成交"""
+        if not self._public_trade_callbacks:
+            return
+
+        try:
+            data = message.get("data", message)
+            trades = data if isinstance(data, list) else [data]
+
+            for item in trades:
+                if "is_buyer_taker" in item:
+                    taker_side = "buy" if item.get("is_buyer_taker") else "sell"
+                else:
+                    taker_side = str(item.get("side", "")).lower()
+
+                trade = PublicTrade(
+                    symbol=item.get("symbol", message.get("symbol", "")),
+                    price=Decimal(str(item.get("price", 0))),
+                    qty=Decimal(str(item.get("qty", 0))),
+                    taker_side=taker_side,
+                    timestamp=datetime.now(),
+                )
+
+                for callback in self._public_trade_callbacks:
+                    try:
+                        await callback(trade)
+                    except Exception as e:
+                        logger.error(f"[StandX WS] Public trade callback error: {e}")
+
+        except Exception as e:
+            logger.error(f"[StandX WS] Public trade handler error: {e}")
+
     async def _handle_position(self, message: Dict):
         """處理倉位更新"""
         try:
@@ -634,8 +701,8 @@ class StandXWebSocketClient:
     async def _handle_balance(self, message: Dict):
         """處理餘額更新"""
         # 目前只記錄，不觸發回調
-        data = message.get("data", message)
-        logger.debug(f"[StandX WS] Balance update: {data}")
+        hot_log.count("balance")
+        hot_log.debug("[StandX WS] Balance update: %s", message.get("data", message))
 
     # ==================== 狀態查詢 ====================
 
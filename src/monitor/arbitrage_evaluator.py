@@ -0,0 +1,181 @@
+"""
+套利機會評估器 (深度 + 手續費)
+Depth- and Fee-aware Arbitrage Evaluator
+
+頂檔價差只說明「第一筆」有利潤，真正能成交多少、平均價多少要看整個訂單簿。
+本模組逐檔走訪買方的賣單簿 (asks) 與賣方的買單簿 (bids)，扣除雙邊 taker 手續費，
+求出最大可獲利數量與預期 VWAP 利潤。
+
+- 每個訂單簿只轉換一次為累計深度陣列 (累計數量、累計成交額)，之後任意數量的
+  成本/VWAP 都可用二分查找在 O(log n) 內得到
+- 最大可獲利數量: 雙指針沿兩邊累計深度的分界點前進，直到邊際淨利潤 <= 0
+"""
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+# 各交易所 taker 手續費 (bps)，未列出的使用 default_taker_fee_bps
+# GRVT / StandX 與 MarketMakerConfig.taker_fee_bps / hedge_fee_bps 一致
+DEFAULT_TAKER_FEE_BPS: Dict[str, float] = {
+    'GRVT': 3.0,
+    'STANDX': 2.0,
+}
+
+
+class DepthProfile:
+    """單邊訂單簿的累計深度 (float)"""
+
+    __slots__ = ('prices', 'cum_qty', 'cum_notional')
+
+    def __init__(self, levels: Sequence[Sequence]):
+        """
+        Args:
+            levels: [[price, size], ...]，按最優價排序 (asks 升序 / bids 降序)
+        """
+        self.prices: List[float] = []
+        self.cum_qty: List[float] = []
+        self.cum_notional: List[float] = []
+
+        qty = 0.0
+        notional = 0.0
+        for price, size in levels:
+            p = float(price)
+            q = float(size)
+            if q <= 0:
+                continue
+            qty += q
+            notional += p * q
+            self.prices.append(p)
+            self.cum_qty.append(qty)
+            self.cum_notional.append(notional)
+
+    @property
+    def total_qty(self) -> float:
+        return self.cum_qty[-1] if self.cum_qty else 0.0
+
+    def notional(self, qty: float) -> Optional[float]:
+        """成交 qty 所需的成交額，深度不足返回 None"""
+        if qty <= 0:
+            return 0.0
+        if qty > self.total_qty:
+            return None
+        i = bisect_left(self.cum_qty, qty)
+        prev_qty = self.cum_qty[i - 1] if i > 0 else 0.0
+        prev_notional = self.cum_notional[i - 1] if i > 0 else 0.0
+        return prev_notional + (qty - prev_qty) * self.prices[i]
+
+    def vwap(self, qty: float) -> Optional[float]:
+        """成交 qty 的平均價，深度不足返回 None"""
+        notional = self.notional(qty)
+        if notional is None or qty <= 0:
+            return None
+        return notional / qty
+
+
+@dataclass
+class SizedArbitrage:
+    """按深度與手續費評估後的套利結果"""
+    quantity: float          # 最大可獲利數量 (已套用上限)
+    buy_vwap: float
+    sell_vwap: float
+    gross_profit: float      # 未扣手續費
+    fees: float
+    net_profit: float
+    net_edge_bps: float      # 淨利潤 / 買入成交額
+
+    @property
+    def edge(self) -> float:
+        """每單位 VWAP 價差"""
+        return self.sell_vwap - self.buy_vwap
+
+
+class ArbitrageEvaluator:
+    """
+    套利機會評估器
+
+    使用方式:
+        evaluator = ArbitrageEvaluator()
+        result = evaluator.evaluate('GRVT', asks_profile, 'STANDX', bids_profile, max_qty=0.1)
+    """
+
+    def __init__(
+        self,
+        taker_fee_bps: Optional[Dict[str, float]] = None,
+        default_taker_fee_bps: float = 5.0,
+        min_net_profit: float = 0.0
+    ):
+        """
+        Args:
+            taker_fee_bps: 各交易所 taker 手續費 (bps)，鍵為大寫交易所名稱
+            default_taker_fee_bps: 未配置交易所的手續費
+            min_net_profit: 淨利潤低於此值視為無機會
+        """
+        self.taker_fee_bps = {k.upper(): v for k, v in (taker_fee_bps or DEFAULT_TAKER_FEE_BPS).items()}
+        self.default_taker_fee_bps = default_taker_fee_bps
+        self.min_net_profit = min_net_profit
+
+    def fee_rate(self, exchange: str) -> float:
+        """交易所 taker 費率 (小數)"""
+        return self.taker_fee_bps.get(exchange.upper(), self.default_taker_fee_bps) / 10000
+
+    def evaluate(
+        self,
+        buy_exchange: str,
+        asks: DepthProfile,
+        sell_exchange: str,
+        bids: DepthProfile,
+        max_qty: Optional[float] = None
+    ) -> Optional[SizedArbitrage]:
+        """
+        評估「在 buy_exchange 吃 asks、在 sell_exchange 吃 bids」
+
+        Args:
+            buy_exchange: 買入交易所
+            asks: 買入交易所的 asks 累計深度
+            sell_exchange: 賣出交易所
+            bids: 賣出交易所的 bids 累計深度
+            max_qty: 數量上限 (None = 不限)
+
+        Returns:
+            SizedArbitrage，無淨利潤時返回 None
+        """
+        buy_fee = self.fee_rate(buy_exchange)
+        sell_fee = self.fee_rate(sell_exchange)
+
+        # 雙指針: 每一步前進到兩邊累計深度中較近的分界點
+        qty = 0.0
+        i = j = 0
+        while i < len(asks.prices) and j < len(bids.prices):
+            # 邊際淨利潤 <= 0 時停止
+            if bids.prices[j] * (1 - sell_fee) <= asks.prices[i] * (1 + buy_fee):
+                break
+            boundary = min(asks.cum_qty[i], bids.cum_qty[j])
+            if max_qty is not None and boundary >= max_qty:
+                qty = max_qty
+                break
+            qty = boundary
+            if asks.cum_qty[i] == boundary:
+                i += 1
+            if bids.cum_qty[j] == boundary:
+                j += 1
+
+        if qty <= 0:
+            return None
+
+        buy_notional = asks.notional(qty)
+        sell_notional = bids.notional(qty)
+        gross = sell_notional - buy_notional
+        fees = buy_notional * buy_fee + sell_notional * sell_fee
+        net = gross - fees
+        if net <= self.min_net_profit:
+            return None
+
+        return SizedArbitrage(
+            quantity=qty,
+            buy_vwap=buy_notional / qty,
+            sell_vwap=sell_notional / qty,
+            gross_profit=gross,
+            fees=fees,
+            net_profit=net,
+            net_edge_bps=net / buy_notional * 10000,
+        )
@@ -0,0 +1,268 @@
+"""
+市場數據中心
+Market Data Hub
+
+每個 (交易所, 交易對) 只有一個訂單簿數據源，由本模組統一輪詢，
+其他模組 (控制台廣播、訂單簿監控、策略分析、多交易所監控) 都從這裡讀取，
+不再各自請求交易所。
+
+- 每個數據源一個輪詢任務，Decimal -> float 只轉換一次
+- 同時計算衍生統計: 中間價、價差、掛單量、買賣比
+- 一段時間沒有讀取者的數據源自動停止 (按需啟動)
+- 支持更新回調 (fan-out)
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.adapters.base_adapter import BasePerpAdapter, Orderbook
+
+logger = logging.getLogger(__name__)
+
+BookKey = Tuple[str, str]  # (exchange, symbol)
+BookListener = Callable[["BookSnapshot"], None]
+
+
+@dataclass
+class BookSnapshot:
+    """訂單簿快照 (含預先計算的統計數據)"""
+    exchange: str
+    symbol: str
+    orderbook: Orderbook                      # 原始 Decimal 訂單簿
+    bids: List[List[float]]                   # [[price, size], ...]
+    asks: List[List[float]]
+    updated_at: float                         # time.time()
+
+    best_bid: float = 0.0
+    best_ask: float = 0.0
+    mid_price: float = 0.0
+    spread: float = 0.0
+    spread_pct: float = 0.0
+    bid_volume: float = 0.0                   # 前 stats_depth 檔買單總量
+    ask_volume: float = 0.0
+    imbalance: Optional[float] = None         # bid_volume / ask_volume
+
+    @classmethod
+    def from_orderbook(cls, exchange: str, symbol: str, orderbook: Orderbook, stats_depth: int = 20) -> "BookSnapshot":
+        """由 Orderbook 建立快照並計算統計"""
+        bids = [[float(p), float(q)] for p, q in orderbook.bids]
+        asks = [[float(p), float(q)] for p, q in orderbook.asks]
+        snapshot = cls(
+            exchange=exchange,
+            symbol=symbol,
+            orderbook=orderbook,
+            bids=bids,
+            asks=asks,
+            updated_at=time.time(),
+        )
+
+        if bids and asks:
+            snapshot.best_bid = bids[0][0]
+            snapshot.best_ask = asks[0][0]
+            snapshot.mid_price = (snapshot.best_bid + snapshot.best_ask) / 2
+            snapshot.spread = snapshot.best_ask - snapshot.best_bid
+            snapshot.spread_pct = snapshot.spread / snapshot.best_bid * 100 if snapshot.best_bid else 0.0
+
+        snapshot.bid_volume = sum(q for _, q in bids[:stats_depth])
+        snapshot.ask_volume = sum(q for _, q in asks[:stats_depth])
+        if snapshot.ask_volume > 0:
+            snapshot.imbalance = snapshot.bid_volume / snapshot.ask_volume
+        return snapshot
+
+    @property
+    def age(self) -> float:
+        """距上次更新的秒數"""
+        return time.time() - self.updated_at
+
+    def top(self, depth: int) -> Tuple[List[List[float]], List[List[float]]]:
+        """取前 depth 檔"""
+        return self.bids[:depth], self.asks[:depth]
+
+
+@dataclass
+class _BookFeed:
+    """單一 (交易所, 交易對) 的數據源"""
+    key: BookKey
+    task: Optional[asyncio.Task] = None
+    snapshot: Optional[BookSnapshot] = None
+    last_read: float = field(default_factory=time.time)
+    first_update: asyncio.Event = field(default_factory=asyncio.Event)
+    failures: int = 0
+
+
+class MarketDataHub:
+    """
+    訂單簿共享中心
+
+    使用方式:
+        hub = MarketDataHub(lambda: adapters)
+        snapshot = await hub.get_book('STANDX', 'BTC-USD')   # 首次會啟動數據源並等待第一筆
+        snapshot = hub.peek('STANDX', 'BTC-USD')             # 只讀緩存，不等待
+    """
+
+    def __init__(
+        self,
+        adapters_getter: Callable[[], Dict[str, BasePerpAdapter]],
+        poll_interval: float = 1.0,
+        depth: int = 50,
+        stats_depth: int = 20,
+        idle_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            adapters_getter: 返回最新 adapters 字典的函數 (重連後自動使用新 adapter)
+            poll_interval: 輪詢間隔（秒）
+            depth: 訂單簿深度
+            stats_depth: 掛單量/買賣比統計的檔數
+            idle_timeout: 無讀取者多久後停止數據源（秒）
+        """
+        self.adapters_getter = adapters_getter
+        self.poll_interval = poll_interval
+        self.depth = depth
+        self.stats_depth = stats_depth
+        self.idle_timeout = idle_timeout
+
+        self._feeds: Dict[BookKey, _BookFeed] = {}
+        self._listeners: List[BookListener] = []
+
+        # 統計
+        self.stats = {
+            'fetches': 0,
+            'failures': 0,
+            'reads': 0,
+        }
+
+    # ==================== 讀取 ====================
+
+    def peek(self, exchange: str, symbol: str) -> Optional[BookSnapshot]:
+        """
+        讀取最新快照（不等待）
+
+        會啟動數據源（若尚未啟動），因此下次讀取即可獲得數據。
+        """
+        if exchange not in self.adapters_getter():
+            return None
+        feed = self._ensure_feed(exchange, symbol)
+        feed.last_read = time.time()
+        self.stats['reads'] += 1
+        return feed.snapshot
+
+    async def get_book(self, exchange: str, symbol: str, timeout: float = 5.0) -> Optional[BookSnapshot]:
+        """
+        讀取最新快照，數據源剛啟動時等待第一筆數據
+
+        Args:
+            exchange: 交易所名稱 (大寫，如 'STANDX')
+            symbol: 交易對
+            timeout: 等待第一筆數據的超時（秒）
+
+        Returns:
+            BookSnapshot，交易所不存在或超時返回 None
+        """
+        snapshot = self.peek(exchange, symbol)
+        if snapshot is not None:
+            return snapshot
+
+        feed = self._feeds.get((exchange, symbol))
+        if feed is None:
+            return None
+        try:
+            await asyncio.wait_for(feed.first_update.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return feed.snapshot
+
+    # ==================== 訂閱 ====================
+
+    def add_listener(self, callback: BookListener):
+        """註冊更新回調（每次有新快照時調用，同步函數）"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: BookListener):
+        """移除更新回調"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ==================== 數據源管理 ====================
+
+    def _ensure_feed(self, exchange: str, symbol: str) -> _BookFeed:
+        key = (exchange, symbol)
+        feed = self._feeds.get(key)
+        if feed is None:
+            feed = _BookFeed(key=key)
+            self._feeds[key] = feed
+        if feed.task is None or feed.task.done():
+            # (重新) 啟動: 閒置期間的舊快照已過期
+            feed.snapshot = None
+            feed.first_update.clear()
+            feed.task = asyncio.create_task(self._poll(feed))
+        return feed
+
+    async def _poll(self, feed: _BookFeed):
+        """輪詢單一數據源，閒置超時後停止"""
+        exchange, symbol = feed.key
+        try:
+            while time.time() - feed.last_read < self.idle_timeout:
+                adapter = self.adapters_getter().get(exchange)
+                if adapter is None:
+                    # 交易所未連接 (或已移除)，不再輪詢
+                    break
+
+                try:
+                    orderbook = await adapter.get_orderbook(symbol, limit=self.depth)
+                    self.stats['fetches'] += 1
+                    if orderbook and orderbook.bids and orderbook.asks:
+                        self._publish(feed, BookSnapshot.from_orderbook(exchange, symbol, orderbook, self.stats_depth))
+                        feed.failures = 0
+                except Exception as e:
+                    feed.failures += 1
+                    self.stats['failures'] += 1
+                    if feed.failures == 1 or feed.failures % 30 == 0:
+                        logger.warning(f"[MarketDataHub] {exchange} {symbol} 訂單簿獲取失敗 ({feed.failures}): {e}")
+
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            feed.task = None
+
+    def _publish(self, feed: _BookFeed, snapshot: BookSnapshot):
+        feed.snapshot = snapshot
+        feed.first_update.set()
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"[MarketDataHub] listener error: {e}")
+
+    def invalidate(self, exchange: str = None):
+        """丟棄快照（交易所重連時調用），數據源會在下次讀取時重新啟動"""
+        for key, feed in list(self._feeds.items()):
+            if exchange is None or key[0] == exchange:
+                if feed.task:
+                    feed.task.cancel()
+                del self._feeds[key]
+
+    async def stop(self):
+        """停止所有數據源"""
+        tasks = [feed.task for feed in self._feeds.values() if feed.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._feeds.clear()
+
+    def get_stats(self) -> Dict:
+        """數據中心統計"""
+        return {
+            **self.stats,
+            'feeds': {
+                f"{exchange}:{symbol}": {
+                    'active': feed.task is not None,
+                    'age': round(feed.snapshot.age, 2) if feed.snapshot else None,
+                    'failures': feed.failures,
+                }
+                for (exchange, symbol), feed in self._feeds.items()
+            },
+        }
@@ -3,9 +3,14 @@
 Multi-Exchange Real-time Monitoring System
 
 實時監控多個交易所的價格、訂單簿和套利機會
+
+套利檢測由訂單簿更新觸發 (ArbitrageDetector)：只重新計算涉及該交易所/交易對的組合，
+每個交易對維護跨交易所的最佳買/賣價堆，並發布機會的新增/更新/移除差異。
+頂檔交叉成立後再以 ArbitrageEvaluator 按完整深度與手續費計算可獲利數量。
 """
 import asyncio
-from typing import Dict, List, Optional
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 from dataclasses import dataclass, field
@@ -14,6 +19,8 @@ import json
 
 from src.adapters.factory import create_adapter
 from src.adapters.base_adapter import BasePerpAdapter, Orderbook
+from src.monitor.market_data_hub import MarketDataHub
+from src.monitor.arbitrage_evaluator import ArbitrageEvaluator, DepthProfile
 
 
 @dataclass
@@ -29,6 +36,24 @@ class MarketData:
     spread_pct: Decimal
     timestamp: datetime
     orderbook: Optional[Orderbook] = None
+    _ask_depth: Optional[DepthProfile] = field(default=None, repr=False, compare=False)
+    _bid_depth: Optional[DepthProfile] = field(default=None, repr=False, compare=False)
+
+    @property
+    def ask_depth(self) -> DepthProfile:
+        """asks 累計深度 (首次使用時計算)"""
+        if self._ask_depth is None:
+            levels = self.orderbook.asks if self.orderbook else [[self.best_ask, self.ask_size]]
+            self._ask_depth = DepthProfile(levels)
+        return self._ask_depth
+
+    @property
+    def bid_depth(self) -> DepthProfile:
+        """bids 累計深度 (首次使用時計算)"""
+        if self._bid_depth is None:
+            levels = self.orderbook.bids if self.orderbook else [[self.best_bid, self.bid_size]]
+            self._bid_depth = DepthProfile(levels)
+        return self._bid_depth
 
 
 @dataclass
@@ -46,14 +71,230 @@ class ArbitrageOpportunity:
     max_quantity: Decimal
     timestamp: datetime
 
+    # 深度與手續費評估結果 (max_quantity 為最大可獲利數量)
+    buy_vwap: Optional[Decimal] = None
+    sell_vwap: Optional[Decimal] = None
+    fees: Optional[Decimal] = None
+    net_profit: Optional[Decimal] = None
+    net_edge_bps: Optional[Decimal] = None
+
     def __str__(self):
-        return (
+        text = (
             f"🔥 {self.symbol} Arbitrage:\n"
             f"  Buy:  {self.buy_exchange.upper():10s} @ ${self.buy_price:10.2f} (size: {self.buy_size})\n"
             f"  Sell: {self.sell_exchange.upper():10s} @ ${self.sell_price:10.2f} (size: {self.sell_size})\n"
             f"  💰 Profit: ${self.profit:8.2f} ({self.profit_pct:6.4f}%)\n"
             f"  📊 Max Qty: {self.max_quantity}"
         )
+        if self.net_profit is not None:
+            text += (
+                f"\n  📐 VWAP: {self.buy_vwap:.2f} -> {self.sell_vwap:.2f}, "
+                f"Net: ${self.net_profit:.2f} ({self.net_edge_bps:.1f} bps, fees ${self.fees:.2f})"
+            )
+        return text
+
+
+OpportunityKey = Tuple[str, str, str]  # (symbol, buy_exchange, sell_exchange)
+
+
+@dataclass
+class ArbitrageDelta:
+    """一次更新造成的套利機會變化"""
+    added: List[ArbitrageOpportunity] = field(default_factory=list)
+    updated: List[ArbitrageOpportunity] = field(default_factory=list)
+    removed: List[ArbitrageOpportunity] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.removed)
+
+
+OpportunityListener = Callable[[ArbitrageDelta], None]
+
+
+class _SymbolQuotes:
+    """單一交易對在各交易所的報價，以及最佳買/賣價堆 (延遲刪除)"""
+
+    def __init__(self):
+        self.markets: Dict[str, MarketData] = {}
+        self.versions: Dict[str, int] = {}
+        self.bid_heap: List[Tuple[Decimal, int, str]] = []   # (-best_bid, version, exchange)
+        self.ask_heap: List[Tuple[Decimal, int, str]] = []   # (best_ask, version, exchange)
+        self._version = 0
+
+    def update(self, market: MarketData):
+        self._version += 1
+        self.markets[market.exchange] = market
+        self.versions[market.exchange] = self._version
+        heapq.heappush(self.bid_heap, (-market.best_bid, self._version, market.exchange))
+        heapq.heappush(self.ask_heap, (market.best_ask, self._version, market.exchange))
+        # 過期條目太多時重建，避免堆無限增長
+        if len(self.bid_heap) > 4 * len(self.markets) + 16:
+            self._rebuild()
+
+    def remove(self, exchange: str):
+        self.markets.pop(exchange, None)
+        self.versions.pop(exchange, None)
+
+    def _rebuild(self):
+        self.bid_heap = [(-m.best_bid, self.versions[ex], ex) for ex, m in self.markets.items()]
+        self.ask_heap = [(m.best_ask, self.versions[ex], ex) for ex, m in self.markets.items()]
+        heapq.heapify(self.bid_heap)
+        heapq.heapify(self.ask_heap)
+
+    def _top(self, heap: List[Tuple[Decimal, int, str]]) -> Optional[MarketData]:
+        while heap:
+            _, version, exchange = heap[0]
+            if self.versions.get(exchange) == version:
+                return self.markets[exchange]
+            heapq.heappop(heap)
+        return None
+
+    def best_bid(self) -> Optional[MarketData]:
+        """買價最高的交易所"""
+        return self._top(self.bid_heap)
+
+    def best_ask(self) -> Optional[MarketData]:
+        """賣價最低的交易所"""
+        return self._top(self.ask_heap)
+
+
+class ArbitrageDetector:
+    """
+    事件驅動的套利檢測器
+
+    每次訂單簿更新調用 update():
+    - 先用最佳買/賣價堆判斷該交易對是否存在任何交叉 (O(log n))，沒有則直接清空
+    - 有交叉時只重新評估涉及更新交易所的組合 (O(n)，而非所有交易對的 O(n²))
+    - 閾值比較用乘法 (bid > ask * (1 + min_pct/100))，只對成立的組合做 Decimal 除法
+    - 提供 evaluator 時，頂檔成立的組合再按深度與手續費評估，無淨利潤則不算機會
+    """
+
+    def __init__(self, min_profit_pct: float = 0.1, evaluator: Optional[ArbitrageEvaluator] = None):
+        self.min_profit_pct = min_profit_pct
+        self.evaluator = evaluator
+        self._threshold = 1 + Decimal(str(min_profit_pct)) / 100
+
+        self._quotes: Dict[str, _SymbolQuotes] = defaultdict(_SymbolQuotes)
+        self._active: Dict[OpportunityKey, ArbitrageOpportunity] = {}
+        self._listeners: List[OpportunityListener] = []
+
+        # 統計
+        self.stats = {
+            'updates': 0,
+            'evaluations': 0,
+            'added': 0,
+            'removed': 0,
+        }
+
+    def add_listener(self, callback: OpportunityListener):
+        """註冊機會變化回調（同步函數，有變化時調用）"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: OpportunityListener):
+        """移除機會變化回調"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @property
+    def opportunities(self) -> List[ArbitrageOpportunity]:
+        """當前所有套利機會 (按利潤率降序)"""
+        return sorted(self._active.values(), key=lambda o: o.profit_pct, reverse=True)
+
+    def update(self, market: MarketData) -> ArbitrageDelta:
+        """
+        處理一筆市場數據更新
+
+        Returns:
+            ArbitrageDelta: 本次更新造成的機會變化
+        """
+        self.stats['updates'] += 1
+        quotes = self._quotes[market.symbol]
+        quotes.update(market)
+
+        delta = ArbitrageDelta()
+        best_bid = quotes.best_bid()
+        best_ask = quotes.best_ask()
+        if best_bid.best_bid <= best_ask.best_ask * self._threshold:
+            # 全市場最佳買價與最佳賣價都沒有足夠交叉，任何組合都不可能有機會
+            self._clear_symbol(market.symbol, delta)
+            return self._emit(delta)
+
+        for exchange, other in quotes.markets.items():
+            if exchange == market.exchange:
+                continue
+            self._evaluate(market, other, delta)
+            self._evaluate(other, market, delta)
+
+        return self._emit(delta)
+
+    def remove(self, exchange: str, symbol: Optional[str] = None) -> ArbitrageDelta:
+        """移除交易所 (或其某個交易對) 的報價及相關機會"""
+        delta = ArbitrageDelta()
+        symbols = [symbol] if symbol else list(self._quotes)
+        for sym in symbols:
+            if sym in self._quotes:
+                self._quotes[sym].remove(exchange)
+        for key in [k for k in self._active if k[0] in symbols and exchange in k[1:]]:
+            delta.removed.append(self._active.pop(key))
+        return self._emit(delta)
+
+    def _evaluate(self, buy: MarketData, sell: MarketData, delta: ArbitrageDelta):
+        """評估「在 buy 買入、在 sell 賣出」的組合"""
+        self.stats['evaluations'] += 1
+        key = (buy.symbol, buy.exchange, sell.exchange)
+
+        sized = None
+        if sell.best_bid > buy.best_ask * self._threshold and self.evaluator:
+            sized = self.evaluator.evaluate(buy.exchange, buy.ask_depth, sell.exchange, sell.bid_depth)
+            crossed = sized is not None
+        else:
+            crossed = sell.best_bid > buy.best_ask * self._threshold
+
+        if crossed:
+            profit = sell.best_bid - buy.best_ask
+            opportunity = ArbitrageOpportunity(
+                buy_exchange=buy.exchange,
+                sell_exchange=sell.exchange,
+                symbol=buy.symbol,
+                buy_price=buy.best_ask,
+                sell_price=sell.best_bid,
+                profit=profit,
+                profit_pct=profit / buy.best_ask * 100,
+                buy_size=buy.ask_size,
+                sell_size=sell.bid_size,
+                max_quantity=min(buy.ask_size, sell.bid_size),
+                timestamp=datetime.now()
+            )
+            if sized is not None:
+                opportunity.max_quantity = Decimal(str(sized.quantity))
+                opportunity.buy_vwap = Decimal(str(sized.buy_vwap))
+                opportunity.sell_vwap = Decimal(str(sized.sell_vwap))
+                opportunity.fees = Decimal(str(sized.fees))
+                opportunity.net_profit = Decimal(str(sized.net_profit))
+                opportunity.net_edge_bps = Decimal(str(sized.net_edge_bps))
+            if key in self._active:
+                delta.updated.append(opportunity)
+            else:
+                delta.added.append(opportunity)
+            self._active[key] = opportunity
+        elif key in self._active:
+            delta.removed.append(self._active.pop(key))
+
+    def _clear_symbol(self, symbol: str, delta: ArbitrageDelta):
+        for key in [k for k in self._active if k[0] == symbol]:
+            delta.removed.append(self._active.pop(key))
+
+    def _emit(self, delta: ArbitrageDelta) -> ArbitrageDelta:
+        if not delta:
+            return delta
+        self.stats['added'] += len(delta.added)
+        self.stats['removed'] += len(delta.removed)
+        for callback in self._listeners:
+            try:
+                callback(delta)
+            except Exception as e:
+                print(f"❌ Arbitrage listener error: {e}")
+        return delta
 
 
 class MultiExchangeMonitor:
@@ -64,7 +305,9 @@ class MultiExchangeMonitor:
         adapters: Dict[str, BasePerpAdapter],
         symbols: List[str],
         update_interval: float = 2.0,
-        min_profit_pct: float = 0.1  # 最小套利利潤 0.1%
+        min_profit_pct: float = 0.1,  # 最小套利利潤 0.1%
+        market_data_hub: Optional[MarketDataHub] = None,
+        evaluator: Optional[ArbitrageEvaluator] = None
     ):
         """
         初始化監控器
@@ -74,18 +317,23 @@ class MultiExchangeMonitor:
             symbols: 要監控的交易對列表
             update_interval: 更新間隔（秒）
             min_profit_pct: 最小套利利潤百分比
+            market_data_hub: 共享訂單簿數據源 (提供時從中讀取，不再自行請求交易所)
+            evaluator: 深度與手續費評估器 (預設使用 DEFAULT_TAKER_FEE_BPS)
         """
         self.adapters = adapters
         self.symbols = symbols
         self.update_interval = update_interval
         self.min_profit_pct = min_profit_pct
+        self.market_data_hub = market_data_hub
 
         # 市場數據緩存
         self.market_data: Dict[str, Dict[str, MarketData]] = defaultdict(dict)
         # {exchange: {symbol: MarketData}}
 
-        # 套利機會緩存
-        self.arbitrage_opportunities: List[ArbitrageOpportunity] = []
+        # 套利檢測 (由訂單簿更新觸發)
+        self.evaluator = evaluator or ArbitrageEvaluator()
+        self.detector = ArbitrageDetector(min_profit_pct, self.evaluator)
+        self.detector.add_listener(self._on_opportunity_delta)
 
         # 統計數據
         self.stats = {
@@ -119,9 +367,9 @@ class MultiExchangeMonitor:
             )
             self._tasks.append(task)
 
-        # 創建套利檢測任務
-        arbitrage_task = asyncio.create_task(self._detect_arbitrage())
-        self._tasks.append(arbitrage_task)
+        # 數據中心有新快照時立即處理 (輪詢任務只負責保持數據源活躍)
+        if self.market_data_hub:
+            self.market_data_hub.add_listener(self._on_hub_snapshot)
 
         # 創建統計顯示任務
         stats_task = asyncio.create_task(self._display_stats())
@@ -132,6 +380,9 @@ class MultiExchangeMonitor:
         print("\n🛑 Stopping monitor...")
         self._running = False
 
+        if self.market_data_hub:
+            self.market_data_hub.remove_listener(self._on_hub_snapshot)
+
         # 取消所有任務
         for task in self._tasks:
             task.cancel()
@@ -153,11 +404,17 @@ class MultiExchangeMonitor:
                     await asyncio.sleep(self.update_interval)
                     continue
 
-                # 並行獲取所有交易對的訂單簿
-                tasks = [
-                    current_adapter.get_orderbook(symbol, limit=10)
-                    for symbol in self.symbols
-                ]
+                # 並行獲取所有交易對的訂單簿 (有數據中心時讀取共享快照)
+                if self.market_data_hub:
+                    tasks = [
+                        self._get_hub_orderbook(exchange_name, symbol)
+                        for symbol in self.symbols
+                    ]
+                else:
+                    tasks = [
+                        current_adapter.get_orderbook(symbol, limit=10)
+                        for symbol in self.symbols
+                    ]
                 orderbooks = await asyncio.gather(*tasks, return_exceptions=True)
 
                 # 處理每個訂單簿
@@ -165,31 +422,7 @@ class MultiExchangeMonitor:
                     if isinstance(orderbook, Exception):
                         self.stats['failed_updates'][exchange_name] += 1
                         continue
-
-                    # 計算市場數據
-                    if orderbook.bids and orderbook.asks:
-                        best_bid = orderbook.bids[0][0]
-                        best_ask = orderbook.asks[0][0]
-                        bid_size = orderbook.bids[0][1]
-                        ask_size = orderbook.asks[0][1]
-                        spread = best_ask - best_bid
-                        spread_pct = (spread / best_bid * 100)
-
-                        market_data = MarketData(
-                            exchange=exchange_name,
-                            symbol=symbol,
-                            best_bid=best_bid,
-                            best_ask=best_ask,
-                            bid_size=bid_size,
-                            ask_size=ask_size,
-                            spread=spread,
-                            spread_pct=spread_pct,
-                            timestamp=datetime.now(),
-                            orderbook=orderbook
-                        )
-
-                        self.market_data[exchange_name][symbol] = market_data
-                        self.stats['total_updates'] += 1
+                    self._process_orderbook(exchange_name, symbol, orderbook)
 
             except Exception as e:
                 print(f"❌ {exchange_name} monitoring error: {e}")
@@ -197,90 +430,85 @@ class MultiExchangeMonitor:
 
             await asyncio.sleep(self.update_interval)
 
-    async def _detect_arbitrage(self):
-        """檢測套利機會"""
-        while self._running:
-            try:
-                opportunities = []
-
-                # 對每個交易對
-                for symbol in self.symbols:
-                    # 獲取所有交易所的市場數據
-                    markets = []
-                    for exchange_name in self.adapters.keys():
-                        if symbol in self.market_data[exchange_name]:
-                            markets.append(self.market_data[exchange_name][symbol])
-
-                    # 需要至少 2 個交易所有數據
-                    if len(markets) < 2:
-                        continue
+    def _process_orderbook(self, exchange_name: str, symbol: str, orderbook: Orderbook):
+        """更新市場數據並觸發套利檢測"""
+        # 共享快照未更新時跳過
+        existing = self.market_data[exchange_name].get(symbol)
+        if existing is not None and existing.orderbook is orderbook:
+            return
+
+        if not (orderbook.bids and orderbook.asks):
+            return
 
-                    # 檢查所有交易所對
-                    for i in range(len(markets)):
-                        for j in range(i + 1, len(markets)):
-                            market_a = markets[i]
-                            market_b = markets[j]
-
-                            # 檢查 A 買 B 賣
-                            profit_ab = market_b.best_bid - market_a.best_ask
-                            profit_pct_ab = (profit_ab / market_a.best_ask * 100)
-
-                            if profit_pct_ab > self.min_profit_pct:
-                                max_qty = min(market_a.ask_size, market_b.bid_size)
-                                opportunity = ArbitrageOpportunity(
-                                    buy_exchange=market_a.exchange,
-                                    sell_exchange=market_b.exchange,
-                                    symbol=symbol,
-                                    buy_price=market_a.best_ask,
-                                    sell_price=market_b.best_bid,
-                                    profit=profit_ab,
-                                    profit_pct=profit_pct_ab,
-                                    buy_size=market_a.ask_size,
-                                    sell_size=market_b.bid_size,
-                                    max_quantity=max_qty,
-                                    timestamp=datetime.now()
-                                )
-                                opportunities.append(opportunity)
-                                self.stats['total_opportunities'] += 1
-
-                            # 檢查 B 買 A 賣
-                            profit_ba = market_a.best_bid - market_b.best_ask
-                            profit_pct_ba = (profit_ba / market_b.best_ask * 100)
-
-                            if profit_pct_ba > self.min_profit_pct:
-                                max_qty = min(market_b.ask_size, market_a.bid_size)
-                                opportunity = ArbitrageOpportunity(
-                                    buy_exchange=market_b.exchange,
-                                    sell_exchange=market_a.exchange,
-                                    symbol=symbol,
-                                    buy_price=market_b.best_ask,
-                                    sell_price=market_a.best_bid,
-                                    profit=profit_ba,
-                                    profit_pct=profit_pct_ba,
-                                    buy_size=market_b.ask_size,
-                                    sell_size=market_a.bid_size,
-                                    max_quantity=max_qty,
-                                    timestamp=datetime.now()
-                                )
-                                opportunities.append(opportunity)
-                                self.stats['total_opportunities'] += 1
-
-                # 更新套利機會列表
-                self.arbitrage_opportunities = opportunities
-
-                # 顯示套利機會
-                if opportunities:
-                    print(f"\n{'='*80}")
-                    print(f"💰 ARBITRAGE OPPORTUNITIES DETECTED: {len(opportunities)}")
-                    print(f"{'='*80}")
-                    for opp in opportunities:
-                        print(f"\n{opp}")
-                    print(f"{'='*80}\n")
+        best_bid = orderbook.bids[0][0]
+        best_ask = orderbook.asks[0][0]
+        spread = best_ask - best_bid
+
+        market_data = MarketData(
+            exchange=exchange_name,
+            symbol=symbol,
+            best_bid=best_bid,
+            best_ask=best_ask,
+            bid_size=orderbook.bids[0][1],
+            ask_size=orderbook.asks[0][1],
+            spread=spread,
+            spread_pct=(spread / best_bid * 100),
+            timestamp=datetime.now(),
+            orderbook=orderbook
+        )
 
-            except Exception as e:
-                print(f"❌ Arbitrage detection error: {e}")
+        self.market_data[exchange_name][symbol] = market_data
+        self.stats['total_updates'] += 1
+        self.detector.update(market_data)
+
+    def _on_hub_snapshot(self, snapshot):
+        """數據中心更新回調"""
+        if not self._running:
+            return
+        if snapshot.exchange not in self.adapters or snapshot.symbol not in self.symbols:
+            return
+        try:
+            self._process_orderbook(snapshot.exchange, snapshot.symbol, snapshot.orderbook)
+        except Exception as e:
+            print(f"❌ {snapshot.exchange} update error: {e}")
+
+    async def _get_hub_orderbook(self, exchange_name: str, symbol: str) -> Orderbook:
+        """從共享數據中心讀取訂單簿"""
+        snapshot = await self.market_data_hub.get_book(exchange_name, symbol)
+        if snapshot is None:
+            raise Exception(f"No orderbook data for {exchange_name} {symbol}")
+        return snapshot.orderbook
+
+    @property
+    def arbitrage_opportunities(self) -> List[ArbitrageOpportunity]:
+        """當前套利機會 (按利潤率降序)"""
+        return self.detector.opportunities
+
+    def add_opportunity_listener(self, callback: OpportunityListener):
+        """註冊套利機會變化回調 (同步函數，在訂單簿更新的同一調用鏈中觸發)"""
+        self.detector.add_listener(callback)
+
+    def remove_opportunity_listener(self, callback: OpportunityListener):
+        """移除套利機會變化回調"""
+        self.detector.remove_listener(callback)
+
+    def _on_opportunity_delta(self, delta: ArbitrageDelta):
+        """顯示新出現的套利機會"""
+        if not delta.added:
+            return
+        self.stats['total_opportunities'] += len(delta.added)
+        print(f"\n{'='*80}")
+        print(f"💰 NEW ARBITRAGE OPPORTUNITIES: {len(delta.added)}")
+        print(f"{'='*80}")
+        for opp in delta.added:
+            print(f"\n{opp}")
+        print(f"{'='*80}\n")
 
-            await asyncio.sleep(self.update_interval / 2)  # 檢測頻率更高
+    def remove_exchange(self, exchange_name: str):
+        """移除交易所及其市場數據、相關套利機會"""
+        self.adapters.pop(exchange_name, None)
+        self.market_data.pop(exchange_name, None)
+        self.detector.remove(exchange_name)
 
     async def _display_stats(self):
         """顯示統計信息"""
@@ -0,0 +1,447 @@
+"""
+背景風控監測
+Risk Monitor
+
+爆倉保護原本附著在控制台廣播 (broadcast_data) 上: 只有前端連線時才以 5 秒 TTL 查詢
+get_balance / get_positions 計算 margin ratio 與清算距離，觸發時機取決於下一個廣播週期。
+本模組獨立於 UI 運行:
+
+- 串流重算: 每筆 mark price (StandX WS price 頻道；無推送時退回執行器的最新價格)
+  都以快取的餘額/倉位重算各帳戶風險，不發任何請求
+    equity = equity_ref + position_ref × (mark - mark_ref)
+    margin_ratio = used_margin / equity，清算距離 = |mark - liq_price| / mark
+  used_margin 與清算價取自最近一次 REST，倉位不變時兩者不隨價格變化
+- REST 只在倉位變化 (成交) 或慢速計時器 (refresh_interval_sec) 時刷新
+- 超過危險閾值時在同一個價格事件內排程 emergency_close_all (冷卻期內不重複)
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _symbol_base(symbol: str) -> str:
+    """BTC-USD / BTC_USDT_Perp → BTC"""
+    return symbol.upper().replace("-", "_").replace("/", "_").split("_")[0]
+
+
+@dataclass
+class RiskThresholds:
+    """爆倉保護閾值 (與 ConfigManager.get_liquidation_protection_config 相同欄位)"""
+    enabled: bool = False
+    margin_ratio_threshold: float = 80.0   # 危險 margin ratio (百分比)
+    liq_distance_threshold: float = 5.0    # 危險清算距離 (百分比)
+
+    def classify(self, margin_ratio: float, liq_distance_pct: Optional[float]) -> str:
+        """風險等級: safe / warning / danger (警告閾值為危險閾值的 62.5% 與 2 倍距離)"""
+        danger_margin_ratio = self.margin_ratio_threshold / 100
+        if margin_ratio > danger_margin_ratio or (
+            liq_distance_pct is not None and liq_distance_pct < self.liq_distance_threshold
+        ):
+            return 'danger'
+        if margin_ratio > danger_margin_ratio * 0.625 or (
+            liq_distance_pct is not None and liq_distance_pct < self.liq_distance_threshold * 2
+        ):
+            return 'warning'
+        return 'safe'
+
+
+@dataclass
+class RiskAccount:
+    """單一帳戶的風險狀態 (REST 快取 + 串流重算)"""
+    name: str                   # 前端 mm_positions 的鍵 ('standx' / 'hedge')
+    adapter_key: str            # adapters 字典鍵
+    symbol: str
+    role: str                   # 'primary' / 'hedge'，決定 emergency_close_all 平哪個帳戶
+
+    # REST 快取
+    equity: float = 0.0
+    used_margin: float = 0.0
+    unrealized_pnl: float = 0.0
+    position: float = 0.0       # 刷新時的倉位 (正=long)
+    liq_price: Optional[float] = None
+    mark_ref: Optional[float] = None
+    refreshed_at: float = 0.0
+    error: Optional[str] = None
+
+    # 串流重算結果
+    mark_price: Optional[float] = None
+    live_equity: float = 0.0
+    live_pnl: float = 0.0
+    margin_ratio: float = 0.0
+    liq_distance_pct: Optional[float] = None
+    risk_level: str = 'safe'
+
+    @property
+    def ready(self) -> bool:
+        return self.refreshed_at > 0
+
+    def apply_rest(self, balance, position, fallback_mark: Optional[float]):
+        """寫入 REST 查詢結果"""
+        self.equity = float(balance.equity)
+        self.used_margin = float(balance.used_margin)
+        self.unrealized_pnl = float(balance.unrealized_pnl)
+        self.position = 0.0
+        self.liq_price = None
+        self.mark_ref = fallback_mark
+        if position is not None:
+            size = float(position.size)
+            self.position = size if position.side == "long" else -size
+            if position.mark_price and float(position.mark_price) > 0:
+                self.mark_ref = float(position.mark_price)
+            if position.liquidation_price:
+                self.liq_price = float(position.liquidation_price)
+        self.refreshed_at = time.time()
+        self.error = None
+
+    def recompute(self, mark: Optional[float], thresholds: RiskThresholds):
+        """以 mark price 重算權益、margin ratio、清算距離與風險等級"""
+        if not self.ready:
+            return
+        if mark is None or mark <= 0:
+            mark = self.mark_ref
+        move = self.position * (mark - self.mark_ref) if mark and self.mark_ref else 0.0
+        self.mark_price = mark
+        self.live_equity = self.equity + move
+        self.live_pnl = self.unrealized_pnl + move
+        if self.live_equity > 0:
+            self.margin_ratio = self.used_margin / self.live_equity
+        else:
+            # 權益耗盡但仍有保證金佔用 → 視為 100%
+            self.margin_ratio = 1.0 if self.used_margin > 0 else 0.0
+        if self.liq_price and mark:
+            self.liq_distance_pct = abs(mark - self.liq_price) / mark * 100
+        else:
+            self.liq_distance_pct = None
+        self.risk_level = thresholds.classify(self.margin_ratio, self.liq_distance_pct)
+
+    def to_dict(self, live_position: float) -> Dict[str, Any]:
+        """序列化 (欄位與控制台 mm_positions 相同)"""
+        if not self.ready:
+            return {
+                'btc': live_position,
+                'error': self.error or '尚未取得風險數據',
+                'equity': 0,
+                'pnl': 0,
+                'margin_ratio': 0,
+            }
+        data = {
+            'btc': live_position,
+            'equity': self.live_equity,
+            'pnl': self.live_pnl,
+            'used_margin': self.used_margin,
+            'margin_ratio': self.margin_ratio,
+            'liq_price': self.liq_price,
+            'liq_distance_pct': self.liq_distance_pct,
+            'mark_price': self.mark_price,
+            'risk_level': self.risk_level,
+            'refreshed_at': self.refreshed_at,
+        }
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+def default_accounts() -> List[RiskAccount]:
+    """預設監測帳戶: StandX 主帳戶與 StandX 對沖帳戶"""
+    return [
+        RiskAccount(name='standx', adapter_key='STANDX', symbol='BTC-USD', role='primary'),
+        RiskAccount(name='hedge', adapter_key='STANDX_HEDGE', symbol='BTC-USD', role='hedge'),
+    ]
+
+
+class RiskMonitor:
+    """
+    背景風控監測任務
+
+    使用方式:
+        monitor = RiskMonitor(get_adapters, get_mm_executor, config_manager.get_liquidation_protection_config)
+        await monitor.start()
+        monitor.snapshot()           # 各帳戶風險 (供控制台顯示)
+        monitor.request_refresh()    # 成交後要求 REST 刷新
+    """
+
+    def __init__(
+        self,
+        adapters_getter: Callable[[], Dict[str, Any]],
+        executor_getter: Callable[[], Any],
+        config_getter: Optional[Callable[[], Dict[str, Any]]] = None,
+        accounts: Optional[List[RiskAccount]] = None,
+        refresh_interval_sec: float = 30.0,
+        min_refresh_gap_sec: float = 1.0,
+        check_interval_sec: float = 0.5,
+        stale_mark_sec: float = 2.0,
+        cooldown_sec: float = 60.0,
+    ):
+        """
+        Args:
+            adapters_getter: 返回 adapters 字典 (交易所重連後 adapter 會更換)
+            executor_getter: 返回做市商執行器 (未啟動時為 None)
+            config_getter: 返回爆倉保護配置 dict (enabled / margin_ratio_threshold / liq_distance_threshold)
+            accounts: 監測帳戶，預設 default_accounts()
+            refresh_interval_sec: 無成交時 REST 刷新間隔
+            min_refresh_gap_sec: 連續成交時兩次 REST 刷新的最短間隔
+            check_interval_sec: 倉位變化檢查與價格退回的間隔
+            stale_mark_sec: WS mark price 超過此秒數未更新時改用執行器最新價格
+            cooldown_sec: 緊急平倉觸發後的冷卻期
+        """
+        self._adapters_getter = adapters_getter
+        self._executor_getter = executor_getter
+        self._config_getter = config_getter
+        self.accounts: Dict[str, RiskAccount] = {a.name: a for a in (accounts or default_accounts())}
+        self.thresholds = RiskThresholds()
+        self.refresh_interval_sec = refresh_interval_sec
+        self.min_refresh_gap_sec = min_refresh_gap_sec
+        self.check_interval_sec = check_interval_sec
+        self.stale_mark_sec = stale_mark_sec
+        self.cooldown_sec = cooldown_sec
+
+        # 觸發狀態 (冷卻期內不重複觸發)
+        self.triggered = False
+        self.last_trigger_time = 0.0
+        self._closing = False
+
+        self._marks: Dict[str, float] = {}            # symbol base -> mark price
+        self._last_mark_time = 0.0
+        self._last_positions: Dict[str, float] = {}   # role -> 上次檢查時的執行器倉位
+        self._price_sources: Dict[int, Any] = {}      # id(adapter) -> adapter (已註冊 on_price)
+        self._last_refresh = 0.0
+        self._refresh_event: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._close_task: Optional[asyncio.Task] = None
+
+        self.stats: Dict[str, int] = {
+            'marks': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'fill_refreshes': 0,
+            'triggers': 0,
+        }
+
+    # ==================== 生命週期 ====================
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._refresh_event = asyncio.Event()
+        self._refresh_event.set()     # 啟動時立即刷新一次
+        self._tasks = [
+            asyncio.create_task(self._refresh_loop()),
+            asyncio.create_task(self._check_loop()),
+        ]
+        logger.info("[RiskMonitor] 背景風控監測已啟動")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        for adapter in self._price_sources.values():
+            if hasattr(adapter, 'remove_price_callback'):
+                adapter.remove_price_callback(self.on_price_update)
+        self._price_sources.clear()
+
+    def update_config(self, config: Dict[str, Any]):
+        """套用爆倉保護配置 (API 更新後立即生效，不等下一次刷新)"""
+        self.thresholds = RiskThresholds(
+            enabled=bool(config.get('enabled', False)),
+            margin_ratio_threshold=float(config.get('margin_ratio_threshold', 80.0)),
+            liq_distance_threshold=float(config.get('liq_distance_threshold', 5.0)),
+        )
+        for account in self.accounts.values():
+            account.recompute(self._marks.get(_symbol_base(account.symbol)), self.thresholds)
+
+    def request_refresh(self):
+        """要求盡快以 REST 刷新餘額與倉位 (例如成交後)"""
+        if self._refresh_event is not None:
+            self._refresh_event.set()
+
+    # ==================== 價格串流 ====================
+
+    async def on_price_update(self, price_update):
+        """StandX WS price 頻道回調"""
+        mark = price_update.mark_price
+        if mark:
+            self.on_mark_price(price_update.symbol, float(mark))
+
+    def on_mark_price(self, symbol: str, mark: float, streamed: bool = True):
+        """新的 mark price: 重算同標的帳戶並檢查是否觸發平倉"""
+        base = _symbol_base(symbol)
+        self._marks[base] = mark
+        if streamed:
+            self._last_mark_time = time.time()
+        self.stats['marks'] += 1
+        for account in self.accounts.values():
+            if _symbol_base(account.symbol) == base:
+                account.recompute(mark, self.thresholds)
+        self._evaluate()
+
+    def _attach_price_sources(self, adapters: Dict[str, Any]):
+        """為監測帳戶的 adapter 註冊 mark price 回調 (adapter 更換後重新註冊)"""
+        for account in self.accounts.values():
+            adapter = adapters.get(account.adapter_key)
+            if adapter is None or id(adapter) in self._price_sources or not hasattr(adapter, 'on_price'):
+                continue
+            adapter.on_price(self.on_price_update)
+            self._price_sources[id(adapter)] = adapter
+
+    # ==================== 觸發 ====================
+
+    def _evaluate(self):
+        """任一帳戶危險時排程緊急平倉 (同步呼叫，不等待平倉完成)"""
+        danger = [a for a in self.accounts.values() if a.ready and a.risk_level == 'danger']
+        if not danger:
+            if self.triggered:
+                logger.info("[LiquidationProtection] 風險已解除，重置觸發狀態")
+                self.triggered = False
+            return
+
+        if not self.thresholds.enabled or self._closing:
+            return
+        executor = self._executor_getter()
+        if not executor or not executor._running:
+            return
+        now = time.time()
+        if now - self.last_trigger_time <= self.cooldown_sec:
+            return
+
+        self._closing = True
+        self._close_task = asyncio.create_task(self._emergency_close(executor, danger))
+
+    async def _emergency_close(self, executor, danger: List[RiskAccount]):
+        labels = {'primary': '主帳戶', 'hedge': '對沖帳戶'}
+        reason = "; ".join(
+            f"{labels.get(a.role, a.name)}: margin={a.margin_ratio * 100:.1f}%, "
+            f"liq_dist={f'{a.liq_distance_pct:.2f}' if a.liq_distance_pct is not None else 'N/A'}"
+            for a in danger
+        )
+        roles = {a.role for a in danger}
+        logger.warning(f"[LiquidationProtection] 檢測到爆倉風險! {reason}")
+        try:
+            result = await executor.emergency_close_all(
+                reason=reason,
+                close_primary='primary' in roles,
+                close_hedge='hedge' in roles,
+            )
+            logger.warning(f"[LiquidationProtection] 緊急平倉結果: {result}")
+            self.last_trigger_time = time.time()
+            self.triggered = True
+            self.stats['triggers'] += 1
+        except Exception as e:
+            logger.error(f"[LiquidationProtection] 緊急平倉失敗: {e}")
+        finally:
+            self._closing = False
+            self.request_refresh()
+
+    # ==================== 背景任務 ====================
+
+    def _live_positions(self) -> Dict[str, float]:
+        """執行器本地追蹤的倉位 (WS 驅動，無 REST 成本)"""
+        executor = self._executor_getter()
+        if not executor:
+            return {}
+        state = executor.state
+        return {
+            'primary': float(state.get_standx_position()),
+            'hedge': float(state.get_hedge_position()),
+        }
+
+    async def _check_loop(self):
+        """倉位變化 → 要求刷新；WS 價格中斷時改用執行器最新價格"""
+        while True:
+            try:
+                await asyncio.sleep(self.check_interval_sec)
+
+                positions = self._live_positions()
+                if positions and self._last_positions and positions != self._last_positions:
+                    self.stats['fill_refreshes'] += 1
+                    self.request_refresh()
+                self._last_positions = positions
+
+                if time.time() - self._last_mark_time > self.stale_mark_sec:
+                    executor = self._executor_getter()
+                    price = executor.state.get_last_price() if executor else None
+                    if price:
+                        self.on_mark_price(executor.config.symbol, float(price), streamed=False)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[RiskMonitor] Check error: {e}")
+
+    async def _refresh_loop(self):
+        """REST 刷新: 成交觸發或每 refresh_interval_sec 一次"""
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._refresh_event.wait(), timeout=self.refresh_interval_sec)
+                except asyncio.TimeoutError:
+                    pass
+                gap = self._last_refresh + self.min_refresh_gap_sec - time.time()
+                if gap > 0:
+                    await asyncio.sleep(gap)
+                self._refresh_event.clear()
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[RiskMonitor] Refresh error: {e}")
+
+    async def refresh(self):
+        """以 REST 刷新所有帳戶的餘額與倉位，並重新評估"""
+        self._last_refresh = time.time()
+        if self._config_getter:
+            self.update_config(self._config_getter())
+        adapters = self._adapters_getter() or {}
+        self._attach_price_sources(adapters)
+
+        accounts = list(self.accounts.values())
+        await asyncio.gather(*(self._refresh_account(a, adapters.get(a.adapter_key)) for a in accounts))
+        self.stats['refreshes'] += 1
+        for account in accounts:
+            account.recompute(self._marks.get(_symbol_base(account.symbol)), self.thresholds)
+        self._evaluate()
+
+    async def _refresh_account(self, account: RiskAccount, adapter):
+        if adapter is None:
+            account.error = f'{account.adapter_key} 未連接'
+            account.refreshed_at = 0.0
+            return
+        try:
+            balance = await adapter.get_balance()
+            positions = await adapter.get_positions(account.symbol)
+            account.apply_rest(balance, positions[0] if positions else None, self._marks.get(_symbol_base(account.symbol)))
+        except Exception as e:
+            self.stats['refresh_errors'] += 1
+            account.error = str(e)
+            logger.debug(f"[RiskMonitor] 查詢 {account.adapter_key} 風險數據失敗: {e}")
+
+    # ==================== 查詢 ====================
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """各帳戶風險 (btc 欄位為執行器即時倉位)"""
+        positions = self._live_positions()
+        return {
+            name: account.to_dict(positions.get(account.role, account.position))
+            for name, account in self.accounts.items()
+        }
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            'triggered': self.triggered,
+            'last_trigger_time': self.last_trigger_time,
+            'cooldown_sec': self.cooldown_sec,
+            'thresholds': {
+                'enabled': self.thresholds.enabled,
+                'margin_ratio_threshold': self.thresholds.margin_ratio_threshold,
+                'liq_distance_threshold': self.thresholds.liq_distance_threshold,
+            },
+            **self.stats,
+        }
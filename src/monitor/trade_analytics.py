@@ -0,0 +1,547 @@
+"""
+交易日誌分析
+Trade Journal Analytics
+
+把 logs/mm_trades_* 交易日誌解析成欄式 NumPy 陣列，計算每日報表:
+- 已實現 PnL (主帳戶成交 + 對沖成交合併為同一本帳，平均成本法)
+- 成交率 (成交數 / 下單數)、maker 比例
+- 對沖延遲與滑點分佈 (p50 / p90 / p99)
+- 手續費與 rebate
+
+支援兩種日誌格式 (可混合):
+- 結構化 JSON lines (mm_trades_*.jsonl，見 src/utils/trade_journal.py)
+- 舊版文本 (mm_trades_*.log): "2026-01-18 10:30:15 | FILL | exchange=grvt | side=buy | ..."
+
+逐行串流解析，只保留報表需要的欄位；每個檔案的解析結果以 (mtime, size) 為鍵
+快取成 .npz (logs/.analytics_cache/)，未變動的檔案重跑報表時直接載入，
+一個月的日誌重算只需解析當天仍在寫入的檔案。
+
+使用方式:
+    analytics = TradeAnalytics()
+    rows = analytics.daily_report(since="2026-01-01")
+    df = analytics.daily_frame()                       # 需要 pandas
+
+命令列:
+    python scripts/analyze_trades.py --since 2026-01-01 --csv report.csv
+"""
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.trade_journal import DEFAULT_LOG_DIR, FILE_PREFIX, parse_legacy_message
+
+# pandas 為可選依賴 (daily_frame / CSV 輸出)
+try:
+    import pandas as pd
+    _HAS_PANDAS = True
+except ImportError:
+    pd = None
+    _HAS_PANDAS = False
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+
+# 每個表的欄位 (全部為 float64；布林以 1/0 表示，未知為 NaN)
+FILL_COLUMNS = ('ts', 'side', 'price', 'qty', 'is_maker', 'fee_bps')
+ORDER_COLUMNS = ('ts', 'count')
+HEDGE_COLUMNS = ('ts', 'side', 'qty', 'ref_price', 'fill_price', 'slippage_bps', 'latency_ms', 'fee', 'success')
+
+# 計入「下單數」的事件
+_ORDER_EVENTS = {'PLACE_BID', 'PLACE_ASK', 'REPLACE'}
+# 舊版日誌的對沖事件 (檔案內有 HEDGE_RESULT 時忽略，避免重複)
+_LEGACY_HEDGE_EVENTS = {'HEDGE_SUCCESS', 'HEDGE_FAILED', 'HEDGE_BATCH'}
+# 需要完整解析欄位的事件
+_FIELD_EVENTS = {'FILL', 'FILL_ON_CANCEL', 'LADDER', 'HEDGE_RESULT'} | _LEGACY_HEDGE_EVENTS
+_HEDGE_SUCCESS_STATUS = {'filled', 'partial'}   # HedgeStatus 值
+
+
+def _float(value, default: float = np.nan) -> float:
+    """欄位值 → float (None / 空字串 / 無法解析時返回 default)"""
+    if value is None or value == '' or value == 'None':
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _bool(value) -> float:
+    """True/False/None (或其字串) → 1.0 / 0.0 / NaN"""
+    if value is True or value == 'True' or value == 'true':
+        return 1.0
+    if value is False or value == 'False' or value == 'false':
+        return 0.0
+    return np.nan
+
+
+def _side(value) -> float:
+    return 1.0 if value == 'buy' else -1.0 if value == 'sell' else np.nan
+
+
+def _journal_ts(text: str) -> float:
+    """
+    日誌時間字串 → 秒
+
+    日誌時間為本地時間 (無時區)，此處當作 UTC 轉換，使 ts // 86400 直接對應本地日期。
+    """
+    return (datetime.fromisoformat(text) - _EPOCH).total_seconds()
+
+
+def parse_line(line: str) -> Optional[Tuple[float, str, Dict]]:
+    """
+    解析一行日誌
+
+    Returns:
+        (ts, event, fields)，空行或無法解析時返回 None
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line[0] == '{':
+            entry = json.loads(line)
+            return _journal_ts(entry.pop('ts')), entry.pop('event', 'MESSAGE'), entry
+        ts_text, sep, message = line.partition(' | ')
+        if not sep:
+            return None
+        event, fields = parse_legacy_message(message)
+        return _journal_ts(ts_text), event, fields
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _peek(line: str) -> Optional[Tuple[str, str]]:
+    """
+    不完整解析、只取出 (時間字串, 事件名)
+
+    TradeJournal 輸出的 JSON 固定以 ts、event 開頭，文本格式為 "時間 | 事件 | ..."；
+    絕大多數行 (下單事件) 只需要這兩個值，省去 json.loads。無法快速判斷時返回 None。
+    """
+    if line.startswith('{"ts":'):
+        ts_start = line.find('"', 6) + 1
+        ts_end = line.find('"', ts_start)
+        key = line.find('"event":', ts_end)
+        if ts_start <= 0 or ts_end < 0 or key < 0:
+            return None
+        event_start = line.find('"', key + 8) + 1
+        return line[ts_start:ts_end], line[event_start:line.find('"', event_start)]
+    if line.startswith('{'):
+        return None
+    parts = line.split(' | ', 2)
+    if len(parts) < 2:
+        return None
+    return parts[0], parts[1].strip()
+
+
+@dataclass
+class JournalTables:
+    """欄式交易日誌 (每個表是 欄位名 → float64 陣列)"""
+    fills: Dict[str, np.ndarray] = field(default_factory=lambda: _empty(FILL_COLUMNS))
+    orders: Dict[str, np.ndarray] = field(default_factory=lambda: _empty(ORDER_COLUMNS))
+    hedges: Dict[str, np.ndarray] = field(default_factory=lambda: _empty(HEDGE_COLUMNS))
+
+    TABLES = ('fills', 'orders', 'hedges')
+
+    @classmethod
+    def concat(cls, parts: Iterable['JournalTables']) -> 'JournalTables':
+        """合併多個檔案的結果 (按時間排序)"""
+        parts = list(parts)
+        result = cls()
+        for name in cls.TABLES:
+            tables = [getattr(p, name) for p in parts]
+            if not tables:
+                continue
+            merged = {col: np.concatenate([t[col] for t in tables]) for col in tables[0]}
+            order = np.argsort(merged['ts'], kind='stable')
+            setattr(result, name, {col: values[order] for col, values in merged.items()})
+        return result
+
+    def between(self, since: Optional[float], until: Optional[float]) -> 'JournalTables':
+        """時間篩選 [since, until)"""
+        result = JournalTables()
+        for name in self.TABLES:
+            table = getattr(self, name)
+            mask = np.ones(len(table['ts']), dtype=bool)
+            if since is not None:
+                mask &= table['ts'] >= since
+            if until is not None:
+                mask &= table['ts'] < until
+            setattr(result, name, {col: values[mask] for col, values in table.items()})
+        return result
+
+    def to_npz(self) -> Dict[str, np.ndarray]:
+        return {f"{name}.{col}": values for name in self.TABLES for col, values in getattr(self, name).items()}
+
+    @classmethod
+    def from_npz(cls, data) -> 'JournalTables':
+        result = cls()
+        for name, columns in (('fills', FILL_COLUMNS), ('orders', ORDER_COLUMNS), ('hedges', HEDGE_COLUMNS)):
+            setattr(result, name, {col: data[f"{name}.{col}"] for col in columns})
+        return result
+
+
+def _empty(columns: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    return {col: np.empty(0, dtype=np.float64) for col in columns}
+
+
+class _TableBuilder:
+    """逐行累積欄位 (Python list)，最後一次轉成陣列"""
+
+    def __init__(self, columns: Tuple[str, ...]):
+        self.columns = columns
+        self.rows: List[Tuple[float, ...]] = []
+
+    def add(self, *values: float):
+        self.rows.append(values)
+
+    def build(self) -> Dict[str, np.ndarray]:
+        if not self.rows:
+            return _empty(self.columns)
+        data = np.array(self.rows, dtype=np.float64)
+        return {col: data[:, i] for i, col in enumerate(self.columns)}
+
+
+def parse_journal(lines: Iterable[str]) -> JournalTables:
+    """串流解析一個日誌檔"""
+    fills = _TableBuilder(FILL_COLUMNS)
+    orders = _TableBuilder(ORDER_COLUMNS)
+    hedges = _TableBuilder(HEDGE_COLUMNS)
+    legacy_hedges = _TableBuilder(HEDGE_COLUMNS)
+
+    for line in lines:
+        peeked = _peek(line)
+        if peeked is not None:
+            event = peeked[1]
+            if event in _ORDER_EVENTS:
+                try:
+                    orders.add(_journal_ts(peeked[0]), 1.0)
+                except (ValueError, TypeError):
+                    pass
+                continue
+            if event not in _FIELD_EVENTS:
+                continue
+
+        parsed = parse_line(line)
+        if parsed is None:
+            continue
+        ts, event, f = parsed
+
+        if event == 'FILL' or event == 'FILL_ON_CANCEL':
+            fills.add(
+                ts, _side(f.get('side')), _float(f.get('price')), _float(f.get('qty')),
+                _bool(f.get('is_maker')), _float(f.get('fee_bps')),
+            )
+        elif event in _ORDER_EVENTS:
+            orders.add(ts, 1.0)
+        elif event == 'LADDER':
+            count = _float(f.get('placed'), 0.0) + _float(f.get('replaced'), 0.0)
+            if count:
+                orders.add(ts, count)
+        elif event == 'HEDGE_RESULT':
+            success = f.get('success', str(f.get('status', '')).lower() in _HEDGE_SUCCESS_STATUS)
+            hedges.add(
+                ts, _side(f.get('side')), _float(f.get('fill_qty'), _float(f.get('qty'))),
+                _float(f.get('ref_price')), _float(f.get('fill_price')),
+                _float(f.get('slippage_bps')), _float(f.get('latency_ms')),
+                _float(f.get('fee_paid'), 0.0), 1.0 if _bool(success) == 1.0 else 0.0,
+            )
+        elif event in _LEGACY_HEDGE_EVENTS:
+            if event == 'HEDGE_BATCH':
+                success = str(f.get('status', '')).lower() in _HEDGE_SUCCESS_STATUS
+                legacy_hedges.add(
+                    ts, _side(f.get('side')), _float(f.get('qty')), _float(f.get('ref_price')),
+                    _float(f.get('fill_price')), np.nan, np.nan, 0.0, 1.0 if success else 0.0,
+                )
+            else:
+                legacy_hedges.add(
+                    ts, _side(f.get('side')), _float(f.get('qty')), _float(f.get('source_price')),
+                    _float(f.get('price')), _float(f.get('slippage_bps')), _float(f.get('latency_ms')),
+                    0.0, 1.0 if event == 'HEDGE_SUCCESS' else 0.0,
+                )
+
+    return JournalTables(
+        fills=fills.build(),
+        orders=orders.build(),
+        hedges=hedges.build() if hedges.rows else legacy_hedges.build(),
+    )
+
+
+# ==================== 指標 ====================
+
+def realized_pnl(side: np.ndarray, price: np.ndarray, qty: np.ndarray) -> np.ndarray:
+    """
+    平均成本法逐筆已實現 PnL
+
+    Args:
+        side: +1 買 / -1 賣 (按時間排序)
+
+    Returns:
+        每筆成交實現的 PnL (開倉/加倉為 0)
+    """
+    pnl = np.zeros(len(side))
+    position = 0.0
+    avg_cost = 0.0
+    for i in range(len(side)):
+        signed = side[i] * qty[i]
+        if np.isnan(signed) or np.isnan(price[i]):
+            continue
+        if position == 0 or (position > 0) == (signed > 0):
+            total = position + signed
+            avg_cost = (avg_cost * position + price[i] * signed) / total if total else 0.0
+            position = total
+            continue
+        closed = min(abs(signed), abs(position))
+        direction = 1.0 if position > 0 else -1.0
+        pnl[i] = (price[i] - avg_cost) * closed * direction
+        position += signed
+        if abs(position) < 1e-12:
+            position = 0.0
+            avg_cost = 0.0
+        elif (position > 0) != (direction > 0):
+            avg_cost = price[i]      # 反向開倉，剩餘部分以本筆價格為成本
+    return pnl
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, Optional[float]]:
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {'mean': None, 'p50': None, 'p90': None, 'p99': None, 'max': None}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        'mean': round(float(values.mean()), 2),
+        'p50': round(float(p50), 2),
+        'p90': round(float(p90), 2),
+        'p99': round(float(p99), 2),
+        'max': round(float(values.max()), 2),
+    }
+
+
+def hedge_slippage_cost_bps(hedges: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    對沖滑點成本 (bps，正數 = 比參考價差)
+
+    有參考價與成交價時直接計算，否則沿用對沖引擎的 slippage_bps (其正數為有利，需反號)。
+    """
+    ref = hedges['ref_price']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cost = (hedges['fill_price'] - ref) / ref * 10000 * hedges['side']
+    fallback = -hedges['slippage_bps']
+    return np.where(np.isnan(cost), fallback, cost)
+
+
+def book_pnl(tables: JournalTables) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    主帳戶成交與成功的對沖合併為同一本帳，計算逐筆已實現 PnL
+
+    Returns:
+        (ts, pnl)，按時間排序
+    """
+    fills = tables.fills
+    hedges = tables.hedges
+    successful = hedges['success'] == 1.0
+    ts = np.concatenate([fills['ts'], hedges['ts'][successful]])
+    order = np.argsort(ts, kind='stable')
+    pnl = realized_pnl(
+        np.concatenate([fills['side'], hedges['side'][successful]])[order],
+        np.concatenate([fills['price'], hedges['fill_price'][successful]])[order],
+        np.concatenate([fills['qty'], hedges['qty'][successful]])[order],
+    )
+    return ts[order], pnl
+
+
+def compute_report(
+    tables: JournalTables,
+    maker_fee_bps: float,
+    taker_fee_bps: float,
+    realized: Optional[float] = None,
+) -> Dict:
+    """
+    計算一段時間的指標
+
+    Args:
+        tables: 已篩選的日誌
+        maker_fee_bps / taker_fee_bps: 舊版日誌沒有 fee_bps 欄位時使用的費率
+        realized: 該時段的已實現 PnL (None = 以本段日誌單獨計算；跨日報表應由整段帳本算好傳入)
+    """
+    fills = tables.fills
+    hedges = tables.hedges
+    successful = hedges['success'] == 1.0
+
+    notional = fills['price'] * fills['qty']
+    fee_bps = np.where(
+        np.isnan(fills['fee_bps']),
+        np.where(fills['is_maker'] == 1.0, maker_fee_bps, taker_fee_bps),
+        fills['fee_bps'],
+    )
+    fees = notional * fee_bps / 10000
+
+    if realized is None:
+        realized = float(book_pnl(tables)[1].sum())
+
+    fill_count = len(fills['ts'])
+    orders_placed = float(tables.orders['count'].sum())
+    maker_known = ~np.isnan(fills['is_maker'])
+    rebates = float(-fees[fees < 0].sum())
+    fees_paid = float(fees[fees > 0].sum())
+    hedge_fees = float(np.nansum(hedges['fee']))
+    gross = realized
+
+    return {
+        'fills': fill_count,
+        'buy_qty': round(float(np.nansum(fills['qty'][fills['side'] > 0])), 6),
+        'sell_qty': round(float(np.nansum(fills['qty'][fills['side'] < 0])), 6),
+        'volume_usd': round(float(np.nansum(notional)), 2),
+        'orders_placed': int(orders_placed),
+        'fill_rate_pct': round(fill_count / orders_placed * 100, 2) if orders_placed else None,
+        'maker_ratio_pct': (
+            round(float((fills['is_maker'][maker_known] == 1.0).mean() * 100), 2) if maker_known.any() else None
+        ),
+        'realized_pnl_usd': round(gross, 4),
+        'rebates_usd': round(rebates, 4),
+        'fees_usd': round(fees_paid, 4),
+        'hedge_fees_usd': round(hedge_fees, 4),
+        'net_pnl_usd': round(gross + rebates - fees_paid - hedge_fees, 4),
+        'hedges': int(len(hedges['ts'])),
+        'hedge_failures': int((~successful).sum()),
+        'hedge_latency_ms': _percentiles(hedges['latency_ms'][successful]),
+        'hedge_slippage_bps': _percentiles(hedge_slippage_cost_bps(hedges)[successful]),
+    }
+
+
+# ==================== 檔案與快取 ====================
+
+class TradeAnalytics:
+    """
+    交易日誌分析器
+
+    每個檔案的解析結果快取為 {cache_dir}/{檔名}.npz，鍵為 (mtime_ns, size)。
+    """
+
+    def __init__(
+        self,
+        log_dir: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        maker_fee_bps: float = -1.0,
+        taker_fee_bps: float = 3.0,
+    ):
+        """
+        Args:
+            log_dir: 交易日誌目錄
+            cache_dir: 解析快取目錄 (None = log_dir/.analytics_cache)
+            maker_fee_bps / taker_fee_bps: 舊版日誌沒有 fee_bps 時使用 (預設同 MMConfig)
+        """
+        self.log_dir = Path(log_dir) if log_dir else DEFAULT_LOG_DIR
+        self.cache_dir = Path(cache_dir) if cache_dir else self.log_dir / ".analytics_cache"
+        self.maker_fee_bps = maker_fee_bps
+        self.taker_fee_bps = taker_fee_bps
+        self.stats = {'parsed': 0, 'cached': 0}
+
+    def journal_files(self) -> List[Path]:
+        """所有交易日誌檔 (按修改時間排序)"""
+        files = [p for p in self.log_dir.glob(f"{FILE_PREFIX}*") if p.suffix in ('.log', '.jsonl')]
+        return sorted(files, key=lambda p: p.stat().st_mtime)
+
+    def load_file(self, path: Path) -> JournalTables:
+        """解析單一檔案 (未變動時從快取載入)"""
+        stat = path.stat()
+        key = np.array([CACHE_VERSION, stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+        cache_file = self.cache_dir / f"{path.name}.npz"
+
+        if cache_file.exists():
+            try:
+                with np.load(cache_file) as data:
+                    if np.array_equal(data['_key'], key):
+                        self.stats['cached'] += 1
+                        return JournalTables.from_npz(data)
+            except Exception as e:
+                logger.debug(f"Ignoring unreadable analytics cache {cache_file.name}: {e}")
+
+        with open(path, encoding='utf-8', errors='replace') as f:
+            tables = parse_journal(f)
+        self.stats['parsed'] += 1
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            np.savez(cache_file, _key=key, **tables.to_npz())
+        except Exception as e:
+            logger.warning(f"Failed to write analytics cache {cache_file.name}: {e}")
+        return tables
+
+    def load(self, since: Optional[str] = None, until: Optional[str] = None) -> JournalTables:
+        """
+        載入時間範圍內的日誌
+
+        Args:
+            since / until: 日期或時間字串 (ISO 格式，本地時間)，until 不含；
+                已實現 PnL 的持倉成本從 since 起算
+        """
+        since_ts = _journal_ts(since) if since else None
+        until_ts = _journal_ts(until) if until else None
+        parts = []
+        for path in self.journal_files():
+            # 最後修改早於 since 的檔案不可能包含範圍內的記錄
+            if since_ts is not None and path.stat().st_mtime < since_ts - SECONDS_PER_DAY:
+                continue
+            parts.append(self.load_file(path))
+        return JournalTables.concat(parts).between(since_ts, until_ts)
+
+    def daily_report(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Dict]:
+        """每日報表 (每天一個 dict，最後一列為合計)"""
+        tables = self.load(since, until)
+        all_ts = np.concatenate([getattr(tables, name)['ts'] for name in JournalTables.TABLES])
+        if not len(all_ts):
+            return []
+
+        # 持倉成本跨日延續：整段帳本只算一次，再按日加總
+        pnl_ts, pnl = book_pnl(tables)
+        pnl_days = pnl_ts // SECONDS_PER_DAY
+
+        rows = []
+        for day in np.unique(all_ts // SECONDS_PER_DAY):
+            start = float(day * SECONDS_PER_DAY)
+            report = compute_report(
+                tables.between(start, start + SECONDS_PER_DAY),
+                self.maker_fee_bps,
+                self.taker_fee_bps,
+                realized=float(pnl[pnl_days == day].sum()),
+            )
+            date = datetime.fromtimestamp(start, tz=timezone.utc).strftime('%Y-%m-%d')
+            rows.append({'date': date, **report})
+
+        # 合計另外計算 (分佈需用全部樣本)
+        rows.append({
+            'date': 'total',
+            **compute_report(tables, self.maker_fee_bps, self.taker_fee_bps, realized=float(pnl.sum())),
+        })
+        return rows
+
+    def daily_frame(self, since: Optional[str] = None, until: Optional[str] = None):
+        """每日報表 DataFrame (巢狀分佈展開為 hedge_latency_ms_p50 等欄位)"""
+        return report_frame(self.daily_report(since, until))
+
+
+def report_frame(rows: List[Dict]):
+    """daily_report() 結果 → DataFrame (以日期為索引)"""
+    if not _HAS_PANDAS:
+        raise ImportError("pandas is required for report_frame()")
+    return pd.DataFrame([flatten(row) for row in rows]).set_index('date')
+
+
+def flatten(row: Dict) -> Dict:
+    """展開巢狀欄位 {'a': {'p50': 1}} → {'a_p50': 1}"""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            for sub, v in value.items():
+                flat[f"{key}_{sub}"] = v
+        else:
+            flat[key] = value
+    return flat
@@ -11,6 +11,7 @@ from .simulation_executor import SimulationExecutor
 from .simulation_runner import SimulationRunner
 from .result_logger import ResultLogger
 from .comparison_engine import ComparisonEngine
+from .run_catalog import RunCatalog
 
 # Singleton instance
 _param_set_manager = None
@@ -32,5 +33,6 @@ __all__ = [
     'SimulationRunner',
     'ResultLogger',
     'ComparisonEngine',
+    'RunCatalog',
     'get_param_set_manager',
 ]
@@ -7,7 +7,6 @@ Provides rankings, recommendations, and analytics.
 
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from pathlib import Path
 import logging
 
 from .result_logger import ResultLogger
@@ -85,11 +84,11 @@ class ComparisonEngine:
         Returns:
             Sorted list of param set metrics
         """
-        results = self.result_logger.get_run_results(run_id)
-        if results is None or results['comparison'] is None:
+        summary = self.result_logger.get_comparison_summary(run_id)
+        if summary is None:
             return []
 
-        comparison = results['comparison'].get('comparison', {})
+        comparison = summary.get('comparison', {})
         table = comparison.get('comparison_table', [])
 
         # Sort by specified metric
@@ -144,16 +143,33 @@ class ComparisonEngine:
         Returns:
             Recommendation object or None
         """
-        if weights is None:
-            weights = self.DEFAULT_WEIGHTS
-
-        results = self.result_logger.get_run_results(run_id)
-        if results is None or results['comparison'] is None:
+        summary = self.result_logger.get_comparison_summary(run_id)
+        if summary is None:
             return None
 
-        comparison = results['comparison'].get('comparison', {})
+        comparison = summary.get('comparison', {})
         table = comparison.get('comparison_table', [])
 
+        return self.recommend_from_table(table, weights)
+
+    def recommend_from_table(
+        self,
+        table: List[Dict],
+        weights: Dict[str, float] = None
+    ) -> Optional[Recommendation]:
+        """
+        Score a comparison table and pick the best parameter set.
+
+        Args:
+            table: Comparison table rows
+            weights: Custom weights (defaults to DEFAULT_WEIGHTS)
+
+        Returns:
+            Recommendation object or None
+        """
+        if weights is None:
+            weights = self.DEFAULT_WEIGHTS
+
         if not table:
             return None
 
@@ -209,21 +225,21 @@ class ComparisonEngine:
         Returns:
             List of metrics from each run
         """
-        comparison = []
+        # One query against the cross-run metrics table instead of reloading each run
+        rows = self.result_logger.query_metrics(run_ids=run_ids, param_set_id=param_set_id)
+        by_run = {row['run_id']: row for row in rows}
 
+        meta_keys = ('run_id', 'directory', 'started_at', 'param_set_id', 'param_set_name')
+        comparison = []
         for run_id in run_ids:
-            results = self.result_logger.get_run_results(run_id)
-            if results is None:
-                continue
-
-            ps_result = results['param_sets'].get(param_set_id)
-            if ps_result is None:
+            row = by_run.get(run_id)
+            if row is None:
                 continue
 
             comparison.append({
                 'run_id': run_id,
-                'started_at': results['metadata'].get('started_at') if results['metadata'] else None,
-                'metrics': ps_result.get('metrics', {})
+                'started_at': row.get('started_at'),
+                'metrics': {k: v for k, v in row.items() if k not in meta_keys}
             })
 
         return comparison
@@ -243,23 +259,16 @@ class ComparisonEngine:
         Returns:
             Dict mapping param_set_id to list of (run_id, value) tuples
         """
-        trends = {}
+        rows = self.result_logger.query_metrics(run_ids=run_ids, columns=[metric])
+        run_order = {run_id: i for i, run_id in enumerate(run_ids)}
+        rows.sort(key=lambda r: run_order.get(r['run_id'], 0))
 
-        for run_id in run_ids:
-            results = self.result_logger.get_run_results(run_id)
-            if results is None or results['comparison'] is None:
-                continue
-
-            comparison = results['comparison'].get('comparison', {})
-            table = comparison.get('comparison_table', [])
-
-            for entry in table:
-                ps_id = entry.get('param_set_id')
-                value = entry.get(metric, 0)
-
-                if ps_id not in trends:
-                    trends[ps_id] = []
-                trends[ps_id].append((run_id, value))
+        trends = {}
+        for row in rows:
+            value = row.get(metric)
+            trends.setdefault(row['param_set_id'], []).append(
+                (row['run_id'], value if value is not None else 0)
+            )
 
         return trends
 
@@ -286,11 +295,11 @@ class ComparisonEngine:
         Returns:
             Summary statistics dict
         """
-        results = self.result_logger.get_run_results(run_id)
-        if results is None or results['comparison'] is None:
+        summary = self.result_logger.get_comparison_summary(run_id)
+        if summary is None:
             return {}
 
-        comparison = results['comparison'].get('comparison', {})
+        comparison = summary.get('comparison', {})
         table = comparison.get('comparison_table', [])
 
         if not table:
@@ -313,6 +322,6 @@ class ComparisonEngine:
         return {
             'run_id': run_id,
             'param_set_count': len(table),
-            'duration_seconds': results['comparison'].get('duration_seconds', 0),
+            'duration_seconds': summary.get('duration_seconds', 0),
             'metric_stats': stats
         }
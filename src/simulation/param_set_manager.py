@@ -25,6 +25,7 @@ class SimulationConfig:
     """Simulation run settings."""
     duration_minutes: int = 60
     tick_interval_ms: int = 100
+    stream_interval_ms: int = 500  # Push rate of the live progress stream
 
 
 class ParamSetManager:
@@ -55,7 +56,8 @@ class ParamSetManager:
         sim_config = self._raw_config.get('simulation', {})
         self._simulation_config = SimulationConfig(
             duration_minutes=sim_config.get('duration_minutes', 60),
-            tick_interval_ms=sim_config.get('tick_interval_ms', 100)
+            tick_interval_ms=sim_config.get('tick_interval_ms', 100),
+            stream_interval_ms=sim_config.get('stream_interval_ms', 500)
         )
 
         # Load base config
@@ -193,7 +195,8 @@ class ParamSetManager:
         return {
             'simulation': {
                 'duration_minutes': self._simulation_config.duration_minutes,
-                'tick_interval_ms': self._simulation_config.tick_interval_ms
+                'tick_interval_ms': self._simulation_config.tick_interval_ms,
+                'stream_interval_ms': self._simulation_config.stream_interval_ms
             },
             'base_config': self._base_config,
             'param_sets': [
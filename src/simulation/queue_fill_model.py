@@ -0,0 +1,188 @@
+"""
+Queue Fill Model
+
+Queue-position-aware fill simulation for simulated maker orders.
+
+Instead of filling whenever the touch crosses our price, each resting order
+tracks the quantity queued ahead of it at its price level:
+- On placement, queue ahead = displayed qty at our price (we join the back)
+- Trade prints at our price consume the queue ahead first, then fill us
+- Trade prints through our price (or the opposite side crossing it) fill us
+- Depth reductions cap the queue ahead at the displayed level qty
+  (risk-averse: cancels are assumed to come from behind us)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from decimal import Decimal
+
+from .shared_market_feed import MarketTick
+
+_ZERO = Decimal("0")
+
+
+@dataclass
+class QueueState:
+    """Per-order queue state at its price level."""
+    order_id: str
+    side: str               # "buy" or "sell"
+    price: Decimal
+    remaining_qty: Decimal
+    queue_ahead: Decimal    # Quantity ahead of us at our price level
+    initial_queue: Decimal  # Queue ahead when the order was placed
+
+
+@dataclass
+class QueueFill:
+    """A fill produced by the queue model."""
+    order_id: str
+    side: str
+    price: Decimal
+    qty: Decimal
+    reason: str             # 'trade' | 'trade_through' | 'cross'
+    complete: bool          # True if the order is now fully filled
+
+
+class QueueFillModel:
+    """
+    Tracks queue position for each simulated resting order.
+
+    Work per tick is O(orders + trades): each order only looks up its own
+    price level via MarketTick.level_qty (built once per tick and shared by
+    all simulators), so the book is never rescanned per order.
+    """
+
+    def __init__(self):
+        self._orders: Dict[str, QueueState] = {}
+
+        # Statistics
+        self.trade_fills = 0
+        self.cross_fills = 0
+        self.partial_fills = 0
+
+    def add_order(self, order_id: str, side: str, price: Decimal, qty: Decimal, tick: MarketTick):
+        """
+        Start tracking a newly placed order.
+
+        Args:
+            order_id: Simulated order ID
+            side: "buy" or "sell"
+            price: Order price
+            qty: Order quantity
+            tick: Tick at placement time (used for displayed queue ahead)
+        """
+        queue_ahead = tick.level_qty(side, price) or _ZERO
+        self._orders[order_id] = QueueState(
+            order_id=order_id,
+            side=side,
+            price=price,
+            remaining_qty=qty,
+            queue_ahead=queue_ahead,
+            initial_queue=queue_ahead,
+        )
+
+    def remove_order(self, order_id: str):
+        """Stop tracking an order (cancelled, rebalanced or filled)."""
+        self._orders.pop(order_id, None)
+
+    def clear(self):
+        """Stop tracking all orders."""
+        self._orders.clear()
+
+    def get_queue_state(self, order_id: str) -> Optional[QueueState]:
+        """Get queue state for an order."""
+        return self._orders.get(order_id)
+
+    def on_tick(self, tick: MarketTick) -> List[QueueFill]:
+        """
+        Advance queue positions with a new tick and return resulting fills.
+
+        Args:
+            tick: Market tick (depth + trade prints since the previous tick)
+
+        Returns:
+            List of fills (partial or complete); completed orders are removed
+        """
+        fills: List[QueueFill] = []
+
+        for state in list(self._orders.values()):
+            fill = self._process_order(state, tick)
+            if fill is None:
+                continue
+            fills.append(fill)
+            if fill.complete:
+                del self._orders[state.order_id]
+
+        return fills
+
+    def _process_order(self, state: QueueState, tick: MarketTick) -> Optional[QueueFill]:
+        """Apply trades, crossing and depth changes to one order."""
+        is_buy = state.side == "buy"
+
+        # 1. Opposite side crossed our price: the level was swept, fully filled
+        if is_buy:
+            crossed = tick.ask_price <= state.price
+        else:
+            crossed = tick.bid_price >= state.price
+        if crossed:
+            self.cross_fills += 1
+            return self._fill(state, state.remaining_qty, 'cross')
+
+        # 2. Trade prints: only aggressors on the other side hit our level
+        traded_at_level = _ZERO
+        for price, qty, taker_side in tick.trades:
+            if taker_side == state.side:
+                continue
+            if (is_buy and price < state.price) or (not is_buy and price > state.price):
+                # Traded through our price - the whole level was consumed
+                self.trade_fills += 1
+                return self._fill(state, state.remaining_qty, 'trade_through')
+            if price == state.price:
+                traded_at_level += qty
+
+        if traded_at_level > 0:
+            excess = traded_at_level - state.queue_ahead
+            state.queue_ahead = max(_ZERO, state.queue_ahead - traded_at_level)
+            if excess > 0:
+                self.trade_fills += 1
+                return self._fill(state, min(excess, state.remaining_qty), 'trade')
+
+        # 3. Depth reduction: we can't have more ahead than is displayed
+        level_qty = tick.level_qty(state.side, state.price)
+        if level_qty is not None and level_qty < state.queue_ahead:
+            state.queue_ahead = level_qty
+
+        return None
+
+    def _fill(self, state: QueueState, qty: Decimal, reason: str) -> QueueFill:
+        """Apply a fill of qty to the order."""
+        state.remaining_qty -= qty
+        complete = state.remaining_qty <= 0
+        if not complete:
+            self.partial_fills += 1
+        return QueueFill(
+            order_id=state.order_id,
+            side=state.side,
+            price=state.price,
+            qty=qty,
+            reason=reason,
+            complete=complete,
+        )
+
+    def get_stats(self) -> Dict:
+        """Get fill model statistics."""
+        return {
+            'tracked_orders': len(self._orders),
+            'trade_fills': self.trade_fills,
+            'cross_fills': self.cross_fills,
+            'partial_fills': self.partial_fills,
+            'queues': {
+                s.order_id: {
+                    'side': s.side,
+                    'queue_ahead': float(s.queue_ahead),
+                    'initial_queue': float(s.initial_queue),
+                    'remaining_qty': float(s.remaining_qty),
+                }
+                for s in self._orders.values()
+            },
+        }
@@ -1,36 +1,97 @@
 """
 Result Logger
 
-Logs simulation results to JSON files for persistence and later analysis.
+Logs simulation results in a columnar layout for persistence and later analysis.
+
+Per-run results are stored as tables (Parquet via pandas when available,
+compact JSON lines otherwise) and a small run index plus a cross-run
+metrics table make listing and cross-run queries cheap even with
+thousands of runs. Runs written by older versions (one pretty-printed
+JSON file per param set) are still readable.
 """
 
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 import logging
 
+# pandas + a parquet engine are optional (fall back to JSON lines tables)
+try:
+    import pandas as pd
+    try:
+        import pyarrow  # noqa: F401
+        _HAS_PARQUET = True
+    except ImportError:
+        _HAS_PARQUET = False
+except ImportError:
+    pd = None
+    _HAS_PARQUET = False
+
 logger = logging.getLogger(__name__)
 
 
 class ResultLogger:
     """
-    Logs simulation results to JSON files.
+    Logs simulation results as columnar tables.
 
     Directory structure:
     results/comparison_runs/
+        runs_index.json             # Small index of run metadata
+        metrics_index.parquet       # One row per (run, param set) with all metrics
         {timestamp}_{run_id}/
             run_metadata.json
-            param_set_{id}.json
+            metrics.parquet         # One row per param set (config/final state as JSON)
+            operations.parquet      # Operation history, one row per operation
             comparison_summary.json
+
+    Tables use the .jsonl extension instead of .parquet when no parquet
+    engine is installed.
     """
 
+    INDEX_FILE = "runs_index.json"
+    METRICS_INDEX = "metrics_index"
+    METRICS_TABLE = "metrics"
+    OPERATIONS_TABLE = "operations"
+
+    # Run metadata fields kept in the index (base_config stays in run_metadata.json)
+    INDEX_FIELDS = (
+        'run_id', 'started_at', 'ended_at', 'duration_minutes', 'duration_seconds',
+        'param_set_ids', 'symbol', 'tick_interval_ms',
+    )
+
     def __init__(self, base_dir: str = None):
         if base_dir is None:
             base_dir = Path(__file__).parent.parent.parent / "results" / "comparison_runs"
         self.base_dir = Path(base_dir)
         self._ensure_base_dir()
 
+        # Lazily loaded run index: directory name -> run metadata
+        self._index: Optional[Dict[str, Dict]] = None
+
+        # Cross-run metrics cache: (mtime, rows)
+        self._metrics_cache: Optional[tuple] = None
+
+        # Write-through listeners, called with the run directory name
+        self._listeners: List[Callable[[str], None]] = []
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """
+        Register a callback invoked after any write to a run.
+
+        Args:
+            callback: Function taking the run directory name
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, directory: str):
+        """Notify listeners that a run was written or deleted."""
+        for callback in self._listeners:
+            try:
+                callback(directory)
+            except Exception as e:
+                logger.warning(f"Result listener error: {e}")
+
     def _ensure_base_dir(self):
         """Create base directory if it doesn't exist."""
         self.base_dir.mkdir(parents=True, exist_ok=True)
@@ -56,6 +117,13 @@ class ResultLogger:
 
     def _get_run_dir(self, run_id: str) -> Optional[Path]:
         """Find the directory for a run ID."""
+        # Check the index first to avoid listing the base directory
+        for dir_name in self._load_index():
+            if dir_name.endswith(run_id):
+                run_dir = self.base_dir / dir_name
+                if run_dir.is_dir():
+                    return run_dir
+
         # Search for directory ending with run_id
         for d in self.base_dir.iterdir():
             if d.is_dir() and d.name.endswith(run_id):
@@ -68,6 +136,78 @@ class ResultLogger:
 
         return None
 
+    # ==================== Run index ====================
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the run index, rebuilding it from run directories if missing."""
+        if self._index is not None:
+            return self._index
+
+        index_file = self.base_dir / self.INDEX_FILE
+        if index_file.exists():
+            try:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+                return self._index
+            except Exception as e:
+                logger.warning(f"Failed to load run index, rebuilding: {e}")
+
+        self._index = self._rebuild_index()
+        self._save_index()
+        return self._index
+
+    def _rebuild_index(self) -> Dict[str, Dict]:
+        """Scan run directories and build the run index (one-time migration)."""
+        index = {}
+        for d in self.base_dir.iterdir():
+            if not d.is_dir():
+                continue
+
+            metadata_file = d / "run_metadata.json"
+            if not metadata_file.exists():
+                continue
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    index[d.name] = self._index_entry(json.load(f))
+            except Exception as e:
+                logger.warning(f"Failed to load metadata from {d}: {e}")
+
+        logger.info(f"Rebuilt run index with {len(index)} runs")
+        return index
+
+    def get_index_mtime(self) -> Optional[float]:
+        """Get the run index file mtime (None if not written yet)."""
+        try:
+            return (self.base_dir / self.INDEX_FILE).stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def reload_index(self):
+        """Drop the in-memory run index so it is re-read from disk."""
+        self._index = None
+        self._metrics_cache = None
+
+    def _index_entry(self, metadata: Dict) -> Dict:
+        """Extract the index fields from run metadata."""
+        return {k: metadata.get(k) for k in self.INDEX_FIELDS if k in metadata}
+
+    def _save_index(self):
+        """Write the run index atomically."""
+        index_file = self.base_dir / self.INDEX_FILE
+        tmp_file = index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False, separators=(',', ':'), default=str)
+        tmp_file.replace(index_file)
+
+    def _update_index(self, run_dir: Path, fields: Dict):
+        """Merge fields into a run's index entry and persist."""
+        index = self._load_index()
+        entry = index.setdefault(run_dir.name, {})
+        entry.update(self._index_entry(fields))
+        self._save_index()
+
+    # ==================== Writing ====================
+
     def log_run_metadata(self, run_id: str, metadata: Dict):
         """
         Log run metadata.
@@ -82,25 +222,78 @@ class ResultLogger:
 
         filepath = run_dir / "run_metadata.json"
         self._write_json(filepath, metadata)
+        self._update_index(run_dir, metadata)
+        self._notify(run_dir.name)
         logger.info(f"Logged run metadata: {filepath}")
 
-    def log_param_set_result(self, run_id: str, param_set_id: str, result: Dict):
+    def log_run_results(self, run_id: str, results: List[Dict]):
         """
-        Log individual parameter set results.
+        Log all parameter set results of a run as columnar tables.
+
+        Rows for param sets already stored for this run are replaced.
 
         Args:
             run_id: Run identifier
-            param_set_id: Parameter set identifier
-            result: Result dictionary
+            results: List of result dicts (param_set_id, param_set_name,
+                description, config, metrics, operation_history, final_state)
         """
         run_dir = self._get_run_dir(run_id)
         if run_dir is None:
             logger.warning(f"Run directory not found for {run_id}")
             return
 
-        filepath = run_dir / f"param_set_{param_set_id}.json"
-        self._write_json(filepath, result)
-        logger.info(f"Logged param set result: {filepath}")
+        metric_rows = []
+        operation_rows = []
+        for result in results:
+            ps_id = result.get('param_set_id')
+            # final_state duplicates metrics and operation_history; store the rest only
+            final_state = {
+                k: v for k, v in (result.get('final_state') or {}).items()
+                if k not in ('metrics', 'operation_history')
+            }
+            row = {
+                'run_id': run_id,
+                'param_set_id': ps_id,
+                'param_set_name': result.get('param_set_name'),
+                'description': result.get('description'),
+                'config_json': json.dumps(result.get('config', {}), ensure_ascii=False, default=str),
+                'final_state_json': json.dumps(final_state, ensure_ascii=False, default=str),
+            }
+            row.update(result.get('metrics', {}))
+            metric_rows.append(row)
+
+            for op in result.get('operation_history', []):
+                operation_rows.append({'param_set_id': ps_id, **op})
+
+        # Merge with rows already stored for this run
+        new_ids = {row['param_set_id'] for row in metric_rows}
+        metric_rows = [
+            r for r in self._read_table(run_dir / self.METRICS_TABLE)
+            if r.get('param_set_id') not in new_ids
+        ] + metric_rows
+        operation_rows = [
+            r for r in self._read_table(run_dir / self.OPERATIONS_TABLE)
+            if r.get('param_set_id') not in new_ids
+        ] + operation_rows
+
+        self._write_table(run_dir / self.METRICS_TABLE, metric_rows)
+        self._write_table(run_dir / self.OPERATIONS_TABLE, operation_rows)
+        self._update_metrics_index(run_dir, run_id, metric_rows)
+        self._notify(run_dir.name)
+        logger.info(f"Logged {len(results)} param set results: {run_dir}")
+
+    def log_param_set_result(self, run_id: str, param_set_id: str, result: Dict):
+        """
+        Log individual parameter set results.
+
+        Prefer log_run_results() to write all param sets of a run at once.
+
+        Args:
+            run_id: Run identifier
+            param_set_id: Parameter set identifier
+            result: Result dictionary
+        """
+        self.log_run_results(run_id, [{'param_set_id': param_set_id, **result}])
 
     def log_comparison_summary(self, run_id: str, summary: Dict):
         """
@@ -117,37 +310,193 @@ class ResultLogger:
 
         filepath = run_dir / "comparison_summary.json"
         self._write_json(filepath, summary)
+        self._update_index(run_dir, {
+            'ended_at': summary.get('ended_at'),
+            'duration_seconds': summary.get('duration_seconds'),
+        })
+        self._notify(run_dir.name)
         logger.info(f"Logged comparison summary: {filepath}")
 
     def _write_json(self, filepath: Path, data: Dict):
-        """Write data to JSON file with pretty formatting."""
+        """Write data to a compact JSON file."""
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=str)
+
+    # ==================== Table storage ====================
+
+    def _table_path(self, stem: Path) -> Path:
+        """Resolve the on-disk path of a table for the active format."""
+        return stem.with_suffix('.parquet' if _HAS_PARQUET else '.jsonl')
+
+    def _write_table(self, stem: Path, rows: List[Dict]):
+        """Write rows as a columnar table."""
+        path = self._table_path(stem)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+
+        if _HAS_PARQUET:
+            pd.DataFrame(rows).to_parquet(tmp_path, index=False)
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False, default=str))
+                    f.write('\n')
+
+        tmp_path.replace(path)
+
+    def _read_table(self, stem: Path) -> List[Dict]:
+        """Read a table written in either format; returns [] if missing."""
+        parquet_path = stem.with_suffix('.parquet')
+        if parquet_path.exists() and _HAS_PARQUET:
+            frame = pd.read_parquet(parquet_path)
+            return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+        jsonl_path = stem.with_suffix('.jsonl')
+        if jsonl_path.exists():
+            with open(jsonl_path, 'r', encoding='utf-8') as f:
+                return [json.loads(line) for line in f if line.strip()]
+
+        return []
+
+    def _update_metrics_index(self, run_dir: Path, run_id: str, metric_rows: List[Dict]):
+        """Replace this run's rows in the cross-run metrics table."""
+        entry = self._load_index().get(run_dir.name, {})
+        stem = self.base_dir / self.METRICS_INDEX
+        if not self._table_path(stem).exists():
+            self._backfill_metrics_index()
+
+        rows = [
+            {
+                'directory': run_dir.name,
+                'started_at': entry.get('started_at'),
+                **{k: v for k, v in r.items() if k not in ('config_json', 'final_state_json', 'description')},
+            }
+            for r in metric_rows
+        ]
+        existing = [r for r in self._read_table(stem) if r.get('directory') != run_dir.name]
+
+        self._write_table(stem, existing + rows)
+        self._metrics_cache = None
+
+    # ==================== Reading ====================
 
     def get_all_runs(self) -> List[Dict]:
         """
         Get list of all historical runs.
 
         Returns:
-            List of run metadata dicts
+            List of run metadata dicts (newest first)
         """
+        index = self._load_index()
         runs = []
+        for dir_name in sorted(index, reverse=True):
+            runs.append({**index[dir_name], 'directory': dir_name})
+        return runs
 
-        for d in sorted(self.base_dir.iterdir(), reverse=True):
-            if not d.is_dir():
-                continue
+    def query_metrics(
+        self,
+        run_ids: List[str] = None,
+        param_set_id: str = None,
+        columns: List[str] = None
+    ) -> List[Dict]:
+        """
+        Query the cross-run metrics table.
 
-            metadata_file = d / "run_metadata.json"
-            if metadata_file.exists():
-                try:
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                        metadata['directory'] = d.name
-                        runs.append(metadata)
-                except Exception as e:
-                    logger.warning(f"Failed to load metadata from {d}: {e}")
+        Args:
+            run_ids: Restrict to these runs (None = all runs)
+            param_set_id: Restrict to one parameter set
+            columns: Metric columns to return (None = all)
 
-        return runs
+        Returns:
+            List of rows (run_id, directory, started_at, param_set_id, ... metrics)
+        """
+        rows = self._load_metrics_rows()
+
+        if run_ids is not None:
+            wanted = set(run_ids)
+            rows = [r for r in rows if r.get('run_id') in wanted]
+        if param_set_id is not None:
+            rows = [r for r in rows if r.get('param_set_id') == param_set_id]
+        if columns is not None:
+            keys = ('run_id', 'directory', 'started_at', 'param_set_id', 'param_set_name', *columns)
+            rows = [{k: r.get(k) for k in keys} for r in rows]
+
+        return rows
+
+    def _load_metrics_rows(self) -> List[Dict]:
+        """Load the cross-run metrics table, cached by file mtime."""
+        stem = self.base_dir / self.METRICS_INDEX
+        path = self._table_path(stem)
+        if not path.exists():
+            self._backfill_metrics_index()
+            if not path.exists():
+                return []
+
+        mtime = path.stat().st_mtime
+        if self._metrics_cache is not None and self._metrics_cache[0] == mtime:
+            return self._metrics_cache[1]
+
+        rows = self._read_table(stem)
+        self._metrics_cache = (mtime, rows)
+        return rows
+
+    def _backfill_metrics_index(self):
+        """Build the cross-run metrics table from existing runs (one-time migration)."""
+        rows = []
+        for dir_name, entry in self._load_index().items():
+            run_dir = self.base_dir / dir_name
+            run_id = entry.get('run_id', dir_name)
+            for ps in self._load_param_set_results(run_dir).values():
+                rows.append({
+                    'run_id': run_id,
+                    'directory': dir_name,
+                    'started_at': entry.get('started_at'),
+                    'param_set_id': ps.get('param_set_id'),
+                    'param_set_name': ps.get('param_set_name'),
+                    **ps.get('metrics', {}),
+                })
+
+        if rows:
+            self._write_table(self.base_dir / self.METRICS_INDEX, rows)
+            logger.info(f"Backfilled metrics index with {len(rows)} rows")
+
+    def _load_param_set_results(self, run_dir: Path) -> Dict[str, Dict]:
+        """Load per-param-set results from columnar tables or legacy JSON files."""
+        param_sets: Dict[str, Dict[str, Any]] = {}
+
+        metric_rows = self._read_table(run_dir / self.METRICS_TABLE)
+        if metric_rows:
+            operations: Dict[str, List[Dict]] = {}
+            for op in self._read_table(run_dir / self.OPERATIONS_TABLE):
+                ps_id = op.pop('param_set_id', None)
+                operations.setdefault(ps_id, []).append(op)
+
+            meta_keys = ('run_id', 'param_set_id', 'param_set_name', 'description',
+                         'config_json', 'final_state_json')
+            for row in metric_rows:
+                ps_id = row.get('param_set_id')
+                metrics = {k: v for k, v in row.items() if k not in meta_keys}
+                ops = operations.get(ps_id, [])
+                final_state = json.loads(row.get('final_state_json') or '{}')
+                final_state['metrics'] = metrics
+                final_state['operation_history'] = ops
+                param_sets[ps_id] = {
+                    'param_set_id': ps_id,
+                    'param_set_name': row.get('param_set_name'),
+                    'description': row.get('description'),
+                    'config': json.loads(row.get('config_json') or '{}'),
+                    'metrics': metrics,
+                    'operation_history': ops,
+                    'final_state': final_state,
+                }
+            return param_sets
+
+        # Legacy layout: one JSON file per param set
+        for f in run_dir.glob("param_set_*.json"):
+            ps_id = f.stem.replace("param_set_", "")
+            with open(f, 'r', encoding='utf-8') as file:
+                param_sets[ps_id] = json.load(file)
+
+        return param_sets
 
     def get_run_results(self, run_id: str) -> Optional[Dict]:
         """
@@ -167,7 +516,7 @@ class ResultLogger:
             'run_id': run_id,
             'directory': run_dir.name,
             'metadata': None,
-            'param_sets': {},
+            'param_sets': self._load_param_set_results(run_dir),
             'comparison': None
         }
 
@@ -177,20 +526,33 @@ class ResultLogger:
             with open(metadata_file, 'r', encoding='utf-8') as f:
                 results['metadata'] = json.load(f)
 
-        # Load param set results
-        for f in run_dir.glob("param_set_*.json"):
-            ps_id = f.stem.replace("param_set_", "")
-            with open(f, 'r', encoding='utf-8') as file:
-                results['param_sets'][ps_id] = json.load(file)
-
         # Load comparison summary
-        comparison_file = run_dir / "comparison_summary.json"
-        if comparison_file.exists():
-            with open(comparison_file, 'r', encoding='utf-8') as f:
-                results['comparison'] = json.load(f)
+        results['comparison'] = self.get_comparison_summary(run_id, run_dir=run_dir)
 
         return results
 
+    def get_comparison_summary(self, run_id: str, run_dir: Path = None) -> Optional[Dict]:
+        """
+        Get only the comparison summary of a run (no param set tables).
+
+        Args:
+            run_id: Run identifier
+            run_dir: Run directory if already resolved
+
+        Returns:
+            Comparison summary dict or None
+        """
+        if run_dir is None:
+            run_dir = self._get_run_dir(run_id)
+            if run_dir is None:
+                return None
+
+        comparison_file = run_dir / "comparison_summary.json"
+        if not comparison_file.exists():
+            return None
+        with open(comparison_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
     def delete_run(self, run_id: str) -> bool:
         """
         Delete a run and its results.
@@ -207,6 +569,18 @@ class ResultLogger:
 
         import shutil
         shutil.rmtree(run_dir)
+
+        index = self._load_index()
+        if index.pop(run_dir.name, None) is not None:
+            self._save_index()
+
+        stem = self.base_dir / self.METRICS_INDEX
+        if self._table_path(stem).exists():
+            rows = [r for r in self._read_table(stem) if r.get('directory') != run_dir.name]
+            self._write_table(stem, rows)
+            self._metrics_cache = None
+
+        self._notify(run_dir.name)
         logger.info(f"Deleted run: {run_dir}")
         return True
 
@@ -221,27 +595,61 @@ class ResultLogger:
         Returns:
             Path to CSV file or None if run not found
         """
-        results = self.get_run_results(run_id)
-        if results is None or results['comparison'] is None:
+        summary = self.get_comparison_summary(run_id)
+        if summary is None:
             return None
 
         if output_path is None:
             run_dir = self._get_run_dir(run_id)
             output_path = str(run_dir / "comparison_export.csv")
 
-        comparison = results['comparison'].get('comparison', {})
+        comparison = summary.get('comparison', {})
         table = comparison.get('comparison_table', [])
 
         if not table:
             return None
 
-        # Write CSV
-        import csv
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            if table:
-                writer = csv.DictWriter(f, fieldnames=table[0].keys())
-                writer.writeheader()
-                writer.writerows(table)
-
+        self._write_csv(output_path, table)
         logger.info(f"Exported CSV: {output_path}")
         return output_path
+
+    def export_metrics_csv(
+        self,
+        output_path: str = None,
+        run_ids: List[str] = None,
+        param_set_id: str = None
+    ) -> Optional[str]:
+        """
+        Export cross-run metrics to CSV (one row per run and param set).
+
+        Args:
+            output_path: Optional output path
+            run_ids: Restrict to these runs (None = all runs)
+            param_set_id: Restrict to one parameter set
+
+        Returns:
+            Path to CSV file or None if there are no rows
+        """
+        rows = self.query_metrics(run_ids=run_ids, param_set_id=param_set_id)
+        if not rows:
+            return None
+
+        if output_path is None:
+            output_path = str(self.base_dir / "metrics_export.csv")
+
+        self._write_csv(output_path, rows)
+        logger.info(f"Exported metrics CSV: {output_path}")
+        return output_path
+
+    def _write_csv(self, output_path: str, rows: List[Dict]):
+        """Write rows to CSV."""
+        if pd is not None:
+            pd.DataFrame(rows).to_csv(output_path, index=False)
+            return
+
+        import csv
+        fieldnames = list(dict.fromkeys(k for row in rows for k in row))
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
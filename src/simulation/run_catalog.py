@@ -0,0 +1,298 @@
+"""
+Run Catalog
+
+In-memory, indexed catalog of simulation runs for the REST API.
+
+Built lazily from the ResultLogger run index and kept current by
+write-through notifications from ResultLogger plus a cheap mtime check
+of the index file (catches writes from other processes). Run listings
+support pagination, date/param-set filters and sorting by metric; the
+comparison tables and recommendations are served from precomputed
+per-run summaries.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from threading import RLock
+import logging
+
+from .result_logger import ResultLogger
+from .comparison_engine import ComparisonEngine, Recommendation
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunSummary:
+    """Precomputed summary of one run's comparison."""
+    directory: str
+    comparison_table: List[Dict] = field(default_factory=list)
+    recommendation: Optional[Recommendation] = None
+    duration_seconds: float = 0.0
+
+
+class RunCatalog:
+    """
+    Cached run catalog.
+
+    - Run index: loaded once, reloaded when runs_index.json changes
+    - Summaries: comparison table + recommendation per run, built on first access
+    - Details: LRU cache of full run results, validated by run directory mtime
+    """
+
+    DETAILS_CACHE_SIZE = 32
+
+    def __init__(self, result_logger: ResultLogger, comparison_engine: ComparisonEngine = None):
+        self.result_logger = result_logger
+        self.comparison_engine = comparison_engine or ComparisonEngine(result_logger)
+
+        self._lock = RLock()
+        self._loaded = False
+        self._index_mtime: Optional[float] = None
+
+        # directory name -> index entry, newest first
+        self._runs: Dict[str, Dict] = {}
+        self._ordered: List[str] = []
+
+        # directory name -> RunSummary (built lazily)
+        self._summaries: Dict[str, RunSummary] = {}
+
+        # directory name -> (dir mtime, run results)
+        self._details: "OrderedDict[str, tuple]" = OrderedDict()
+
+        # Write-through from ResultLogger
+        result_logger.add_listener(self._on_run_written)
+
+    # ==================== Invalidation ====================
+
+    def _on_run_written(self, directory: str):
+        """ResultLogger write-through: drop cached data for a run."""
+        with self._lock:
+            self._summaries.pop(directory, None)
+            self._details.pop(directory, None)
+            self._loaded = False
+
+    def invalidate(self):
+        """Drop all cached data."""
+        with self._lock:
+            self._loaded = False
+            self._summaries.clear()
+            self._details.clear()
+
+    def _ensure_loaded(self):
+        """Load or refresh the run index if it changed on disk."""
+        index_mtime = self.result_logger.get_index_mtime()
+        if self._loaded and index_mtime == self._index_mtime:
+            return
+
+        if self._loaded:
+            # Written by another process: re-read the index file
+            self.result_logger.reload_index()
+
+        runs = {}
+        for run in self.result_logger.get_all_runs():
+            runs[run['directory']] = run
+
+        # Keep summaries only for runs that still exist
+        for directory in list(self._summaries):
+            if directory not in runs:
+                del self._summaries[directory]
+
+        self._runs = runs
+        self._ordered = sorted(runs, reverse=True)
+        self._index_mtime = self.result_logger.get_index_mtime()
+        self._loaded = True
+
+    def _find_directory(self, run_id: str) -> Optional[str]:
+        """Resolve a run ID (or directory name) to its directory name."""
+        if run_id in self._runs:
+            return run_id
+        for directory in self._ordered:
+            if directory.endswith(run_id):
+                return directory
+        return None
+
+    # ==================== Summaries ====================
+
+    def _get_summary(self, directory: str) -> RunSummary:
+        """Get (building if needed) the precomputed summary of a run."""
+        summary = self._summaries.get(directory)
+        if summary is not None:
+            return summary
+
+        summary = RunSummary(directory=directory)
+        comparison = self.result_logger.get_comparison_summary(directory)
+        if comparison is not None:
+            summary.comparison_table = comparison.get('comparison', {}).get('comparison_table', [])
+            summary.duration_seconds = comparison.get('duration_seconds', 0)
+            summary.recommendation = self.comparison_engine.recommend_from_table(summary.comparison_table)
+
+        self._summaries[directory] = summary
+        return summary
+
+    def _metric_by_run(self, metric: str, param_set_id: str = None) -> Dict[str, float]:
+        """Get one metric value per run from the cross-run metrics table."""
+        values: Dict[str, float] = {}
+        for row in self.result_logger.query_metrics(param_set_id=param_set_id, columns=[metric]):
+            value = row.get(metric)
+            if value is None:
+                continue
+            directory = row.get('directory')
+            # Without a param set filter, rank each run by its best param set
+            if directory not in values or value > values[directory]:
+                values[directory] = value
+        return values
+
+    # ==================== Queries ====================
+
+    def list_runs(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        param_set_id: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        ascending: bool = False
+    ) -> Dict:
+        """
+        List runs with filtering, sorting and pagination.
+
+        Args:
+            offset: Number of runs to skip
+            limit: Max runs to return (None = all)
+            date_from: Only runs started at or after this ISO date/time
+            date_to: Only runs started at or before this ISO date/time
+            param_set_id: Only runs that include this parameter set
+            sort_by: Metric to sort by (None = newest first)
+            ascending: Sort order when sorting by metric
+
+        Returns:
+            Dict with runs, total, offset and limit
+        """
+        with self._lock:
+            self._ensure_loaded()
+
+            directories = self._ordered
+            if date_from or date_to or param_set_id:
+                filtered = []
+                for directory in directories:
+                    run = self._runs[directory]
+                    started_at = run.get('started_at') or ''
+                    if date_from and started_at < date_from:
+                        continue
+                    # Compare date-only bounds against the date prefix so the whole day is included
+                    if date_to and started_at[:len(date_to)] > date_to:
+                        continue
+                    if param_set_id and param_set_id not in (run.get('param_set_ids') or []):
+                        continue
+                    filtered.append(directory)
+                directories = filtered
+
+            values = None
+            if sort_by:
+                values = self._metric_by_run(sort_by, param_set_id)
+                with_value = [d for d in directories if d in values]
+                without_value = [d for d in directories if d not in values]
+                with_value.sort(key=lambda d: values[d], reverse=not ascending)
+                directories = with_value + without_value
+
+            total = len(directories)
+            end = None if limit is None else offset + limit
+            page = directories[offset:end]
+
+            runs = []
+            for directory in page:
+                run = dict(self._runs[directory])
+                run['param_set_count'] = len(run.get('param_set_ids') or [])
+                if values is not None:
+                    run['sort_value'] = values.get(directory)
+                runs.append(run)
+
+            return {
+                'runs': runs,
+                'total': total,
+                'offset': offset,
+                'limit': limit,
+            }
+
+    def get_run_details(self, run_id: str) -> Optional[Dict]:
+        """Get full results of a run (cached, validated by directory mtime)."""
+        with self._lock:
+            self._ensure_loaded()
+            directory = self._find_directory(run_id)
+            if directory is None:
+                # Not indexed yet (e.g. legacy layout): fall back to the logger
+                return self.result_logger.get_run_results(run_id)
+
+            run_dir = self.result_logger.base_dir / directory
+            try:
+                mtime = run_dir.stat().st_mtime
+            except FileNotFoundError:
+                return None
+
+            cached = self._details.get(directory)
+            if cached is not None and cached[0] == mtime:
+                self._details.move_to_end(directory)
+                return cached[1]
+
+            results = self.result_logger.get_run_results(directory)
+            if results is not None:
+                results['run_id'] = self._runs[directory].get('run_id', run_id)
+                self._details[directory] = (mtime, results)
+                self._details.move_to_end(directory)
+                while len(self._details) > self.DETAILS_CACHE_SIZE:
+                    self._details.popitem(last=False)
+            return results
+
+    def get_comparison(
+        self,
+        run_id: str,
+        sort_by: str = "uptime_percentage",
+        ascending: bool = False
+    ) -> Optional[Dict]:
+        """
+        Get a run's comparison table and recommendation from its summary.
+
+        Args:
+            run_id: Run identifier
+            sort_by: Metric to sort the table by
+            ascending: Sort order
+
+        Returns:
+            Dict with comparison_table and recommendation, or None if not found
+        """
+        with self._lock:
+            self._ensure_loaded()
+            directory = self._find_directory(run_id)
+            if directory is None:
+                return None
+
+            summary = self._get_summary(directory)
+            table = list(summary.comparison_table)
+            try:
+                table.sort(key=lambda x: x.get(sort_by, 0), reverse=not ascending)
+            except Exception as e:
+                logger.warning(f"Failed to sort by {sort_by}: {e}")
+
+            recommendation = summary.recommendation
+            return {
+                'comparison_table': table,
+                'recommendation': {
+                    'param_set_id': recommendation.param_set_id,
+                    'param_set_name': recommendation.param_set_name,
+                    'reason': recommendation.reason,
+                    'score': recommendation.score
+                } if recommendation else None
+            }
+
+    def get_stats(self) -> Dict:
+        """Get catalog cache statistics."""
+        with self._lock:
+            return {
+                'loaded': self._loaded,
+                'runs': len(self._runs),
+                'summaries_cached': len(self._summaries),
+                'details_cached': len(self._details),
+            }
@@ -29,6 +29,39 @@ class MarketTick:
     # Optional orderbook depth for queue position simulation
     bid_depth: List[tuple] = field(default_factory=list)  # [(price, qty), ...]
     ask_depth: List[tuple] = field(default_factory=list)
+    # Public trade prints since the previous tick
+    trades: List[tuple] = field(default_factory=list)  # [(price, qty, taker_side), ...]
+    # Lazily built price -> qty maps, shared by all subscribers of this tick
+    _levels: Dict[str, Dict[Decimal, Decimal]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def level_qty(self, side: str, price: Decimal) -> Optional[Decimal]:
+        """
+        Get displayed quantity at a price level.
+
+        Args:
+            side: "buy" (bid depth) or "sell" (ask depth)
+            price: Level price
+
+        Returns:
+            Displayed qty (0 if the level is empty within the visible depth),
+            or None if the price lies beyond the visible depth
+        """
+        depth = self.bid_depth if side == "buy" else self.ask_depth
+        levels = self._levels.get(side)
+        if levels is None:
+            levels = dict(depth)
+            self._levels[side] = levels
+
+        qty = levels.get(price)
+        if qty is not None:
+            return qty
+        if not depth:
+            return None
+
+        worst_price = depth[-1][0]
+        if side == "buy":
+            return Decimal("0") if price >= worst_price else None
+        return Decimal("0") if price <= worst_price else None
 
 
 @dataclass
@@ -64,6 +97,9 @@ class SharedMarketFeed:
         self._current_tick: Optional[MarketTick] = None
         self._current_orderbook: Optional[OrderbookSnapshot] = None
 
+        # Trade prints buffered until the next tick
+        self._pending_trades: List[tuple] = []
+
         # Control
         self._running = False
         self._task: Optional[asyncio.Task] = None
@@ -97,12 +133,19 @@ class SharedMarketFeed:
 
         self._running = True
         self._started_at = datetime.now()
+
+        # Trade prints are optional: only adapters with a public trade stream provide them
+        if hasattr(self.adapter, 'on_public_trade'):
+            self.adapter.on_public_trade(self._on_public_trade)
+
         self._task = asyncio.create_task(self._feed_loop())
         logger.info(f"Market feed started for {self.symbol}")
 
     async def stop(self):
         """Stop the market feed."""
         self._running = False
+        if hasattr(self.adapter, 'remove_public_trade_callback'):
+            self.adapter.remove_public_trade_callback(self._on_public_trade)
         if self._task:
             self._task.cancel()
             try:
@@ -134,11 +177,13 @@ class SharedMarketFeed:
                     continue
 
                 if orderbook and orderbook.bids and orderbook.asks:
+                    # Convert depth once per tick; ticks and snapshots share it
+                    bids = [(Decimal(str(p)), Decimal(str(q))) for p, q in orderbook.bids[:20]]
+                    asks = [(Decimal(str(p)), Decimal(str(q))) for p, q in orderbook.asks[:20]]
+
                     # Create market tick
-                    best_bid = Decimal(str(orderbook.bids[0][0]))
-                    best_ask = Decimal(str(orderbook.asks[0][0]))
-                    bid_qty = Decimal(str(orderbook.bids[0][1]))
-                    ask_qty = Decimal(str(orderbook.asks[0][1]))
+                    best_bid, bid_qty = bids[0]
+                    best_ask, ask_qty = asks[0]
                     mid_price = (best_bid + best_ask) / 2
 
                     # Calculate spread
@@ -153,9 +198,11 @@ class SharedMarketFeed:
                         bid_qty=bid_qty,
                         ask_qty=ask_qty,
                         spread_bps=spread_bps,
-                        bid_depth=[(Decimal(str(p)), Decimal(str(q))) for p, q in orderbook.bids[:10]],
-                        ask_depth=[(Decimal(str(p)), Decimal(str(q))) for p, q in orderbook.asks[:10]]
+                        bid_depth=bids[:10],
+                        ask_depth=asks[:10],
+                        trades=self._pending_trades
                     )
+                    self._pending_trades = []
 
                     self._current_tick = tick
 
@@ -163,8 +210,8 @@ class SharedMarketFeed:
                     self._current_orderbook = OrderbookSnapshot(
                         timestamp=tick.timestamp,
                         symbol=self.symbol,
-                        bids=orderbook.bids[:20],
-                        asks=orderbook.asks[:20],
+                        bids=bids,
+                        asks=asks,
                         mark_price=mid_price
                     )
 
@@ -179,6 +226,22 @@ class SharedMarketFeed:
 
             await asyncio.sleep(interval_sec)
 
+    async def _on_public_trade(self, symbol: str, price: Decimal, qty: Decimal, taker_side: str):
+        """Adapter callback for public trade prints."""
+        if symbol == self.symbol:
+            self.record_trade(price, qty, taker_side)
+
+    def record_trade(self, price: Decimal, qty: Decimal, taker_side: str):
+        """
+        Buffer a public trade print for the next tick.
+
+        Args:
+            price: Trade price
+            qty: Trade quantity
+            taker_side: Aggressor side ("buy" lifts asks, "sell" hits bids)
+        """
+        self._pending_trades.append((Decimal(str(price)), Decimal(str(qty)), taker_side))
+
     async def _broadcast(self, tick: MarketTick):
         """Broadcast tick to all subscribers."""
         if not self._subscribers:
@@ -220,14 +283,15 @@ class SharedMarketFeed:
         if self._current_orderbook is None:
             return 0
 
+        # Snapshot levels are already Decimal (converted once per tick)
         if side == "buy":
             depth = self._current_orderbook.bids
             # For bids, higher price = better position
             position = 1
             for level_price, _ in depth:
-                if Decimal(str(level_price)) > price:
+                if level_price > price:
                     position += 1
-                elif Decimal(str(level_price)) == price:
+                else:
                     return position
             return position
         else:
@@ -235,9 +299,9 @@ class SharedMarketFeed:
             # For asks, lower price = better position
             position = 1
             for level_price, _ in depth:
-                if Decimal(str(level_price)) < price:
+                if level_price < price:
                     position += 1
-                elif Decimal(str(level_price)) == price:
+                else:
                     return position
             return position
 
@@ -8,12 +8,13 @@ Processes market data and simulates order behavior without placing real orders.
 import asyncio
 from dataclasses import dataclass
 from typing import Dict, Optional, Any
-from decimal import Decimal
+from decimal import Decimal, ROUND_FLOOR, ROUND_CEILING
 from datetime import datetime
 import logging
 
 from .simulation_state import SimulationState, SimulatedOrder
 from .shared_market_feed import MarketTick
+from .queue_fill_model import QueueFillModel, QueueFill
 from .param_set_manager import ParamSet
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class SimulatorConfig:
     cancel_distance_bps: int = 4
     rebalance_distance_bps: int = 12
     queue_position_limit: int = 3
+    price_tick: Decimal = Decimal("0.01")
 
     # Position parameters
     order_size_btc: Decimal = Decimal("0.001")
@@ -53,6 +55,7 @@ class SimulatorConfig:
             cancel_distance_bps=quote.get('cancel_distance_bps', 4),
             rebalance_distance_bps=quote.get('rebalance_distance_bps', 12),
             queue_position_limit=quote.get('queue_position_limit', 3),
+            price_tick=Decimal(str(quote.get('price_tick', 0.01))),
             order_size_btc=Decimal(str(position.get('order_size_btc', 0.001))),
             max_position_btc=Decimal(str(position.get('max_position_btc', 0.01))),
             volatility_window_sec=volatility.get('window_sec', 5),
@@ -68,7 +71,7 @@ class SimulationExecutor:
     Processes market ticks and tracks:
     - When orders would be placed/cancelled
     - Uptime qualification
-    - Simulated fills (when price crosses order)
+    - Simulated fills (queue-position-aware, see QueueFillModel)
     - Queue position impact
     """
 
@@ -87,6 +90,9 @@ class SimulationExecutor:
         # Last known prices for order placement
         self._last_mid_price: Optional[Decimal] = None
 
+        # Queue-position-aware fill model
+        self._fill_model = QueueFillModel()
+
     async def start(self):
         """Start the simulation."""
         self._running = True
@@ -121,8 +127,9 @@ class SimulationExecutor:
                 self._paused_for_volatility = True
                 self.state.record_volatility_pause()
                 self.state.cancel_all_orders("volatility")
+                self._fill_model.clear()
             # Record tick with no active orders (volatility pause)
-            self._record_tick(mid_price)
+            self._record_tick(mid_price, tick.timestamp)
             return
         else:
             self._paused_for_volatility = False
@@ -134,7 +141,7 @@ class SimulationExecutor:
         await self._place_orders_if_needed(tick)
 
         # Record tick with current order distance for tier tracking
-        self._record_tick(mid_price)
+        self._record_tick(mid_price, tick.timestamp)
 
     async def _process_orders(self, tick: MarketTick):
         """Process existing simulated orders - check for cancels, fills, rebalances."""
@@ -142,6 +149,10 @@ class SimulationExecutor:
         best_bid = float(tick.bid_price)
         best_ask = float(tick.ask_price)
 
+        # Advance queue positions first; fills only happen once the queue ahead is exhausted
+        for fill in self._fill_model.on_tick(tick):
+            self._apply_fill(fill, tick)
+
         bid_order = self.state.get_bid_order()
         ask_order = self.state.get_ask_order()
 
@@ -149,31 +160,8 @@ class SimulationExecutor:
         if bid_order:
             bid_distance = self._calculate_distance_bps(bid_order.price, mid_price)
 
-            # Check for simulated fill:
-            # 1. Market ask dropped to our bid (someone selling at our price)
-            # 2. Market best_bid dropped BELOW our bid (price swept through our level)
-            if tick.ask_price <= bid_order.price or tick.bid_price < bid_order.price:
-                # Simulated fill!
-                spread_captured = self.config.order_distance_bps  # Approximation
-                fill_reason = '成交(ask觸及)' if tick.ask_price <= bid_order.price else '成交(價格穿越)'
-                self.state.simulate_fill(
-                    side="buy",
-                    fill_price=bid_order.price,
-                    fill_qty=bid_order.qty,
-                    spread_bps=spread_captured
-                )
-                self.state.add_operation(
-                    action='fill', side='buy',
-                    order_price=float(bid_order.price),
-                    mid_price=float(mid_price),
-                    distance_bps=bid_distance,
-                    reason=fill_reason,
-                    best_bid=best_bid, best_ask=best_ask
-                )
-                self.state.cancel_bid_order()
-
             # Check for cancel by distance (price too close)
-            elif bid_distance < self.config.cancel_distance_bps:
+            if bid_distance < self.config.cancel_distance_bps:
                 self.state.add_operation(
                     action='cancel', side='buy',
                     order_price=float(bid_order.price),
@@ -182,6 +170,7 @@ class SimulationExecutor:
                     reason=f'bps太近 ({bid_distance:.1f} < {self.config.cancel_distance_bps})',
                     best_bid=best_bid, best_ask=best_ask
                 )
+                self._fill_model.remove_order(bid_order.order_id)
                 self.state.cancel_bid_order("distance")
 
             # Check for rebalance (price moved away)
@@ -194,6 +183,7 @@ class SimulationExecutor:
                     reason=f'bps太遠 ({bid_distance:.1f} > {self.config.rebalance_distance_bps})',
                     best_bid=best_bid, best_ask=best_ask
                 )
+                self._fill_model.remove_order(bid_order.order_id)
                 self.state.cancel_bid_order()
                 self.state.record_rebalance()
 
@@ -201,31 +191,8 @@ class SimulationExecutor:
         if ask_order:
             ask_distance = self._calculate_distance_bps(ask_order.price, mid_price)
 
-            # Check for simulated fill:
-            # 1. Market bid rose to our ask (someone buying at our price)
-            # 2. Market best_ask rose ABOVE our ask (price swept through our level)
-            if tick.bid_price >= ask_order.price or tick.ask_price > ask_order.price:
-                # Simulated fill!
-                spread_captured = self.config.order_distance_bps
-                fill_reason = '成交(bid觸及)' if tick.bid_price >= ask_order.price else '成交(價格穿越)'
-                self.state.simulate_fill(
-                    side="sell",
-                    fill_price=ask_order.price,
-                    fill_qty=ask_order.qty,
-                    spread_bps=spread_captured
-                )
-                self.state.add_operation(
-                    action='fill', side='sell',
-                    order_price=float(ask_order.price),
-                    mid_price=float(mid_price),
-                    distance_bps=ask_distance,
-                    reason=fill_reason,
-                    best_bid=best_bid, best_ask=best_ask
-                )
-                self.state.cancel_ask_order()
-
             # Check for cancel by distance
-            elif ask_distance < self.config.cancel_distance_bps:
+            if ask_distance < self.config.cancel_distance_bps:
                 self.state.add_operation(
                     action='cancel', side='sell',
                     order_price=float(ask_order.price),
@@ -234,6 +201,7 @@ class SimulationExecutor:
                     reason=f'bps太近 ({ask_distance:.1f} < {self.config.cancel_distance_bps})',
                     best_bid=best_bid, best_ask=best_ask
                 )
+                self._fill_model.remove_order(ask_order.order_id)
                 self.state.cancel_ask_order("distance")
 
             # Check for rebalance
@@ -246,9 +214,47 @@ class SimulationExecutor:
                     reason=f'bps太遠 ({ask_distance:.1f} > {self.config.rebalance_distance_bps})',
                     best_bid=best_bid, best_ask=best_ask
                 )
+                self._fill_model.remove_order(ask_order.order_id)
                 self.state.cancel_ask_order()
                 self.state.record_rebalance()
 
+    def _apply_fill(self, fill: QueueFill, tick: MarketTick):
+        """Record a fill produced by the queue model."""
+        order = self.state.get_bid_order() if fill.side == "buy" else self.state.get_ask_order()
+        if order is None or order.order_id != fill.order_id:
+            return
+
+        if fill.reason == 'cross':
+            fill_reason = '成交(ask觸及)' if fill.side == "buy" else '成交(bid觸及)'
+        elif fill.reason == 'trade_through':
+            fill_reason = '成交(價格穿越)'
+        else:
+            fill_reason = '成交(排隊消耗)'
+        if not fill.complete:
+            fill_reason = '部分' + fill_reason
+
+        spread_captured = self.config.order_distance_bps  # Approximation
+        self.state.simulate_fill(
+            side=fill.side,
+            fill_price=fill.price,
+            fill_qty=fill.qty,
+            spread_bps=spread_captured
+        )
+        self.state.add_operation(
+            action='fill', side=fill.side,
+            order_price=float(fill.price),
+            mid_price=float(tick.mid_price),
+            distance_bps=self._calculate_distance_bps(fill.price, tick.mid_price),
+            reason=fill_reason,
+            best_bid=float(tick.bid_price), best_ask=float(tick.ask_price)
+        )
+
+        if fill.complete:
+            if fill.side == "buy":
+                self.state.cancel_bid_order()
+            else:
+                self.state.cancel_ask_order()
+
     async def _place_orders_if_needed(self, tick: MarketTick):
         """Place simulated orders if we don't have them."""
         mid_price = tick.mid_price
@@ -266,13 +272,13 @@ class SimulationExecutor:
             if position > 0 and ask_needs_place:
                 # Have long position, place ask to reduce
                 ask_price = self._calculate_ask_price(mid_price)
-                self.state.set_ask_order(SimulatedOrder(
+                self._set_order(SimulatedOrder(
                     order_id=f"sim_ask_{self.param_set.id}_{tick.timestamp.timestamp()}",
                     side="sell",
                     price=ask_price,
                     qty=self.config.order_size_btc,
                     distance_bps=self.config.order_distance_bps
-                ))
+                ), tick)
                 self.state.add_operation(
                     action='place', side='sell',
                     order_price=float(ask_price),
@@ -284,13 +290,13 @@ class SimulationExecutor:
             elif position < 0 and bid_needs_place:
                 # Have short position, place bid to reduce
                 bid_price = self._calculate_bid_price(mid_price)
-                self.state.set_bid_order(SimulatedOrder(
+                self._set_order(SimulatedOrder(
                     order_id=f"sim_bid_{self.param_set.id}_{tick.timestamp.timestamp()}",
                     side="buy",
                     price=bid_price,
                     qty=self.config.order_size_btc,
                     distance_bps=self.config.order_distance_bps
-                ))
+                ), tick)
                 self.state.add_operation(
                     action='place', side='buy',
                     order_price=float(bid_price),
@@ -304,13 +310,13 @@ class SimulationExecutor:
         # Normal operation - place both sides
         if bid_needs_place:
             bid_price = self._calculate_bid_price(mid_price)
-            self.state.set_bid_order(SimulatedOrder(
+            self._set_order(SimulatedOrder(
                 order_id=f"sim_bid_{self.param_set.id}_{tick.timestamp.timestamp()}",
                 side="buy",
                 price=bid_price,
                 qty=self.config.order_size_btc,
                 distance_bps=self.config.order_distance_bps
-            ))
+            ), tick)
             self.state.add_operation(
                 action='place', side='buy',
                 order_price=float(bid_price),
@@ -322,13 +328,13 @@ class SimulationExecutor:
 
         if ask_needs_place:
             ask_price = self._calculate_ask_price(mid_price)
-            self.state.set_ask_order(SimulatedOrder(
+            self._set_order(SimulatedOrder(
                 order_id=f"sim_ask_{self.param_set.id}_{tick.timestamp.timestamp()}",
                 side="sell",
                 price=ask_price,
                 qty=self.config.order_size_btc,
                 distance_bps=self.config.order_distance_bps
-            ))
+            ), tick)
             self.state.add_operation(
                 action='place', side='sell',
                 order_price=float(ask_price),
@@ -338,15 +344,27 @@ class SimulationExecutor:
                 best_bid=best_bid, best_ask=best_ask
             )
 
+    def _set_order(self, order: SimulatedOrder, tick: MarketTick):
+        """Set a simulated order and start tracking its queue position."""
+        if order.side == "buy":
+            self.state.set_bid_order(order)
+        else:
+            self.state.set_ask_order(order)
+        self._fill_model.add_order(order.order_id, order.side, order.price, order.qty, tick)
+
     def _calculate_bid_price(self, mid_price: Decimal) -> Decimal:
-        """Calculate bid price based on order_distance_bps."""
+        """Calculate bid price based on order_distance_bps (rounded down to tick)."""
         distance = Decimal(str(self.config.order_distance_bps)) / Decimal("10000")
-        return mid_price * (1 - distance)
+        price = mid_price * (1 - distance)
+        tick = self.config.price_tick
+        return (price / tick).to_integral_value(rounding=ROUND_FLOOR) * tick
 
     def _calculate_ask_price(self, mid_price: Decimal) -> Decimal:
-        """Calculate ask price based on order_distance_bps."""
+        """Calculate ask price based on order_distance_bps (rounded up to tick)."""
         distance = Decimal(str(self.config.order_distance_bps)) / Decimal("10000")
-        return mid_price * (1 + distance)
+        price = mid_price * (1 + distance)
+        tick = self.config.price_tick
+        return (price / tick).to_integral_value(rounding=ROUND_CEILING) * tick
 
     def _calculate_distance_bps(self, order_price: Decimal, mid_price: Decimal) -> float:
         """Calculate distance in basis points between order and mid price."""
@@ -379,12 +397,12 @@ class SimulationExecutor:
 
         return min(distances)  # Best (closest) order distance
 
-    def _record_tick(self, mid_price: Decimal):
+    def _record_tick(self, mid_price: Decimal, timestamp: datetime = None):
         """
         Record tick for metrics with order distance for tier tracking.
         """
         order_distance = self._get_best_order_distance(mid_price)
-        self.state.record_tick(order_distance)
+        self.state.record_tick(order_distance, timestamp)
 
     def get_state(self) -> SimulationState:
         """Get current simulation state."""
@@ -394,6 +412,10 @@ class SimulationExecutor:
         """Get current metrics as dict."""
         return self.state.metrics.to_dict()
 
+    def is_paused_for_volatility(self) -> bool:
+        """Check if quoting is paused by the volatility filter."""
+        return self._paused_for_volatility
+
     def get_status(self) -> Dict:
         """Get full status for API response."""
         return {
@@ -407,5 +429,6 @@ class SimulationExecutor:
                 'rebalance_distance_bps': self.config.rebalance_distance_bps,
                 'queue_position_limit': self.config.queue_position_limit,
             },
+            'fill_model': self._fill_model.get_stats(),
             'state': self.state.to_dict()
         }
@@ -27,7 +27,7 @@ class SimulationRunner:
     Features:
     - Shared market feed ensures all simulators see identical data
     - Each simulator has isolated state
-    - Results logged to JSON for comparison
+    - Results logged to columnar tables for comparison
     """
 
     def __init__(
@@ -59,6 +59,9 @@ class SimulationRunner:
         # Auto-stop task
         self._auto_stop_task: Optional[asyncio.Task] = None
 
+        # Last volatility-pause flag sent per param set (streaming deltas)
+        self._last_paused: Dict[str, bool] = {}
+
     async def start(
         self,
         param_set_ids: List[str],
@@ -97,6 +100,7 @@ class SimulationRunner:
 
         # Create simulators for each param set
         self._executors = {}
+        self._last_paused = {}
         for ps_id in param_set_ids:
             param_set = self.param_set_manager.get_param_set(ps_id)
             if param_set is None:
@@ -213,7 +217,7 @@ class SimulationRunner:
         return results
 
     async def _save_results(self) -> Dict:
-        """Save simulation results to JSON files."""
+        """Save simulation results via the result logger."""
         if not self._current_run_id:
             return {}
 
@@ -235,12 +239,8 @@ class SimulationRunner:
             }
             results.append(result)
 
-            # Log individual result
-            self.result_logger.log_param_set_result(
-                self._current_run_id,
-                ps_id,
-                result
-            )
+        # Log all param set results as one columnar write
+        self.result_logger.log_run_results(self._current_run_id, results)
 
         # Create comparison summary
         comparison = self._create_comparison_summary(results)
@@ -330,11 +330,8 @@ class SimulationRunner:
         """Get current run ID."""
         return self._current_run_id
 
-    def get_live_status(self) -> Dict:
-        """Get live status for all running simulations."""
-        if not self._running:
-            return {'running': False}
-
+    def _get_progress(self) -> Dict:
+        """Get run-level progress (no per-executor data)."""
         elapsed = 0
         remaining = 0
         if self._started_at:
@@ -342,14 +339,6 @@ class SimulationRunner:
             if self._duration_minutes > 0:
                 remaining = max(0, self._duration_minutes * 60 - elapsed)
 
-        executor_statuses = {}
-        for ps_id, executor in self._executors.items():
-            executor_statuses[ps_id] = executor.get_status()
-
-        market_stats = {}
-        if self._market_feed:
-            market_stats = self._market_feed.get_stats()
-
         progress_pct = 0
         if self._duration_minutes > 0:
             progress_pct = min(100, (elapsed / (self._duration_minutes * 60)) * 100)
@@ -363,10 +352,60 @@ class SimulationRunner:
             'duration_minutes': self._duration_minutes,
             'progress_pct': progress_pct,
             'param_set_count': len(self._executors),
-            'executors': executor_statuses,
-            'market_feed': market_stats
         }
 
+    def get_live_status(self) -> Dict:
+        """Get live status for all running simulations."""
+        if not self._running:
+            return {'running': False}
+
+        executor_statuses = {}
+        for ps_id, executor in self._executors.items():
+            executor_statuses[ps_id] = executor.get_status()
+
+        market_stats = {}
+        if self._market_feed:
+            market_stats = self._market_feed.get_stats()
+
+        status = self._get_progress()
+        status['executors'] = executor_statuses
+        status['market_feed'] = market_stats
+        return status
+
+    def get_progress_delta(self) -> Dict:
+        """
+        Get run progress plus per-param-set changes since the previous call.
+
+        Used by the streaming endpoint: each SimulationState tracks what changed
+        incrementally, so unchanged param sets cost only a flag check and are
+        omitted from 'params'. Consumes the pending deltas (single publisher).
+        """
+        if not self._running:
+            return {'running': False}
+
+        params = {}
+        for ps_id, executor in self._executors.items():
+            delta = executor.state.pop_delta()
+            paused = executor.is_paused_for_volatility()
+            if paused != self._last_paused.get(ps_id):
+                self._last_paused[ps_id] = paused
+                delta['paused_for_volatility'] = paused
+            if delta:
+                params[ps_id] = delta
+
+        progress = self._get_progress()
+        progress['params'] = params
+        return progress
+
+    def get_stream_snapshot(self) -> Dict:
+        """Get the full progress and comparison table for a newly connected stream client."""
+        if not self._running:
+            return {'running': False}
+
+        snapshot = self._get_progress()
+        snapshot['comparison'] = self.get_live_comparison()
+        return snapshot
+
     def get_live_comparison(self) -> List[Dict]:
         """Get live comparison table for all running simulations."""
         if not self._running:
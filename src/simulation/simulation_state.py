@@ -12,6 +12,12 @@ from datetime import datetime
 from collections import deque
 from threading import RLock
 
+from src.utils.uptime_ledger import UptimeLedger, classify_distance
+
+# Delta groups for streaming: each mutator marks the groups it touches, and
+# pop_delta() emits only the keys of the marked groups.
+DELTA_GROUPS = ('ticks', 'fills', 'orders', 'rebalance', 'volatility')
+
 
 @dataclass
 class SimulatedOrder:
@@ -76,11 +82,12 @@ class SimulationMetrics:
     # Uptime tracking
     total_ticks: int = 0
 
-    # Tier tracking by order distance (StandX rules)
-    boosted_ticks: int = 0   # 0-10 bps: 100% points
-    standard_ticks: int = 0  # 10-30 bps: 50% points
-    basic_ticks: int = 0     # 30-100 bps: 10% points
-    no_points_ticks: int = 0 # >100 bps: 0% points
+    # Time spent in each tier by order distance (StandX rules), in ms of
+    # market time; synced from the state's UptimeLedger on every tick
+    boosted_ms: float = 0.0   # 0-10 bps: 100% points
+    standard_ms: float = 0.0  # 10-30 bps: 50% points
+    basic_ms: float = 0.0     # 30-100 bps: 10% points
+    no_points_ms: float = 0.0 # >100 bps or no order: 0% points
 
     # Simulated trading
     simulated_fills: int = 0
@@ -96,16 +103,24 @@ class SimulationMetrics:
     volatility_pauses: int = 0
 
     @property
-    def qualified_ticks(self) -> int:
-        """Ticks earning any points (within 100 bps)."""
-        return self.boosted_ticks + self.standard_ticks + self.basic_ticks
+    def total_ms(self) -> float:
+        return self.boosted_ms + self.standard_ms + self.basic_ms + self.no_points_ms
+
+    @property
+    def qualified_ms(self) -> float:
+        """Time earning any points (within 100 bps)."""
+        return self.boosted_ms + self.standard_ms + self.basic_ms
+
+    def _time_pct(self, ms: float) -> float:
+        total = self.total_ms
+        if total == 0:
+            return 0.0
+        return (ms / total) * 100
 
     @property
     def uptime_percentage(self) -> float:
         """Percentage of time earning any points."""
-        if self.total_ticks == 0:
-            return 0.0
-        return (self.qualified_ticks / self.total_ticks) * 100
+        return self._time_pct(self.qualified_ms)
 
     @property
     def avg_spread_captured_bps(self) -> float:
@@ -116,23 +131,17 @@ class SimulationMetrics:
     @property
     def boosted_time_pct(self) -> float:
         """Percentage at 0-10 bps (100% points)."""
-        if self.total_ticks == 0:
-            return 0.0
-        return (self.boosted_ticks / self.total_ticks) * 100
+        return self._time_pct(self.boosted_ms)
 
     @property
     def standard_time_pct(self) -> float:
         """Percentage at 10-30 bps (50% points)."""
-        if self.total_ticks == 0:
-            return 0.0
-        return (self.standard_ticks / self.total_ticks) * 100
+        return self._time_pct(self.standard_ms)
 
     @property
     def basic_time_pct(self) -> float:
         """Percentage at 30-100 bps (10% points)."""
-        if self.total_ticks == 0:
-            return 0.0
-        return (self.basic_ticks / self.total_ticks) * 100
+        return self._time_pct(self.basic_ms)
 
     @property
     def effective_points_pct(self) -> float:
@@ -140,23 +149,22 @@ class SimulationMetrics:
         Weighted effective points percentage.
         Boosted=100%, Standard=50%, Basic=10%
         """
-        if self.total_ticks == 0:
-            return 0.0
         weighted = (
-            self.boosted_ticks * 1.0 +
-            self.standard_ticks * 0.5 +
-            self.basic_ticks * 0.1
+            self.boosted_ms * 1.0 +
+            self.standard_ms * 0.5 +
+            self.basic_ms * 0.1
         )
-        return (weighted / self.total_ticks) * 100
+        return self._time_pct(weighted)
 
     def to_dict(self) -> Dict:
         return {
             'uptime_percentage': round(self.uptime_percentage, 2),
-            'qualified_ticks': self.qualified_ticks,
             'total_ticks': self.total_ticks,
-            'boosted_ticks': self.boosted_ticks,
-            'standard_ticks': self.standard_ticks,
-            'basic_ticks': self.basic_ticks,
+            'qualified_ms': round(self.qualified_ms),
+            'total_ms': round(self.total_ms),
+            'boosted_ms': round(self.boosted_ms),
+            'standard_ms': round(self.standard_ms),
+            'basic_ms': round(self.basic_ms),
             'boosted_time_pct': round(self.boosted_time_pct, 2),
             'standard_time_pct': round(self.standard_time_pct, 2),
             'basic_time_pct': round(self.basic_time_pct, 2),
@@ -205,8 +213,15 @@ class SimulationState:
         # Thread safety (RLock allows reentrant locking)
         self._lock = RLock()
 
-        # Running uptime calculation (rolling window)
-        self._uptime_window: Deque[bool] = deque(maxlen=100)
+        # Tier time accounting: intervals are closed only when the tier changes,
+        # timestamped with market time so replayed feeds are measured correctly
+        self._uptime = UptimeLedger()
+        self._uptime_now: Optional[float] = None
+        self.rolling_uptime_sec = 60
+
+        # Streaming deltas: groups changed and operations added since the last pop_delta()
+        self._dirty = set(DELTA_GROUPS)
+        self._new_operations: Deque[OrderOperation] = deque(maxlen=50)
 
         # Timestamps
         self.started_at: Optional[datetime] = None
@@ -257,12 +272,14 @@ class SimulationState:
         with self._lock:
             self._bid_order = order
             self.metrics.orders_placed += 1
+            self._dirty.add('orders')
 
     def set_ask_order(self, order: SimulatedOrder):
         """Set simulated ask order."""
         with self._lock:
             self._ask_order = order
             self.metrics.orders_placed += 1
+            self._dirty.add('orders')
 
     def get_bid_order(self) -> Optional[SimulatedOrder]:
         """Get current simulated bid order."""
@@ -285,6 +302,7 @@ class SimulationState:
             if self._bid_order is not None:
                 self._bid_order = None
                 self.metrics.orders_cancelled += 1
+                self._dirty.add('orders')
                 if reason == "distance":
                     self.metrics.cancel_by_distance += 1
                 elif reason == "queue":
@@ -296,6 +314,7 @@ class SimulationState:
             if self._ask_order is not None:
                 self._ask_order = None
                 self.metrics.orders_cancelled += 1
+                self._dirty.add('orders')
                 if reason == "distance":
                     self.metrics.cancel_by_distance += 1
                 elif reason == "queue":
@@ -310,13 +329,15 @@ class SimulationState:
         """Record a rebalance event."""
         with self._lock:
             self.metrics.rebalance_count += 1
+            self._dirty.add('rebalance')
 
     def record_volatility_pause(self):
         """Record a volatility pause event."""
         with self._lock:
             self.metrics.volatility_pauses += 1
+            self._dirty.add('volatility')
 
-    def record_tick(self, order_distance_bps: float):
+    def record_tick(self, order_distance_bps: float, timestamp: datetime = None):
         """
         Record a simulation tick with order distance for tier tracking.
 
@@ -326,33 +347,32 @@ class SimulationState:
         - 30-100 bps: 10% points (Basic)
         - >100 bps: 0% points
 
+        Time is attributed per tier from the tick timestamps: the ledger only
+        records an event when the tier changes, so the result does not depend
+        on how often ticks arrive.
+
         Args:
             order_distance_bps: Distance of order from mid price in basis points.
                                Use -1 or None if no order is active.
+            timestamp: Market time of the tick (defaults to now)
         """
         with self._lock:
             self.metrics.total_ticks += 1
 
-            # Determine tier based on order distance
-            if order_distance_bps is None or order_distance_bps < 0:
-                # No active order
-                self.metrics.no_points_ticks += 1
-                is_qualified = False
-            elif order_distance_bps <= 10:
-                self.metrics.boosted_ticks += 1
-                is_qualified = True
-            elif order_distance_bps <= 30:
-                self.metrics.standard_ticks += 1
-                is_qualified = True
-            elif order_distance_bps <= 100:
-                self.metrics.basic_ticks += 1
-                is_qualified = True
-            else:
-                self.metrics.no_points_ticks += 1
-                is_qualified = False
+            now = (timestamp or datetime.now()).timestamp()
+            if self._uptime_now is not None:
+                now = max(now, self._uptime_now)
+            self._uptime_now = now
+            self._uptime.record(classify_distance(order_distance_bps), now)
 
-            # Update uptime window for rolling calculation
-            self._uptime_window.append(is_qualified)
+            durations = self._uptime.durations(now)
+            m = self.metrics
+            m.boosted_ms = durations['boosted'] * 1000
+            m.standard_ms = durations['standard'] * 1000
+            m.basic_ms = durations['basic'] * 1000
+            m.no_points_ms = durations['out_of_range'] * 1000
+
+            self._dirty.add('ticks')
 
     def simulate_fill(
         self,
@@ -393,18 +413,20 @@ class SimulationState:
             else:
                 self._position -= fill_qty
 
+            self._dirty.add('fills')
+
     def get_position(self) -> Decimal:
         """Get current simulated position."""
         with self._lock:
             return self._position
 
     def get_rolling_uptime(self) -> float:
-        """Get rolling uptime percentage from recent window."""
+        """Get uptime percentage over the last rolling_uptime_sec of market time."""
         with self._lock:
-            if len(self._uptime_window) == 0:
+            if self._uptime_now is None:
                 return 0.0
-            qualified = sum(1 for q in self._uptime_window if q)
-            return (qualified / len(self._uptime_window)) * 100
+            window = self._uptime.window(self.rolling_uptime_sec, self._uptime_now)
+            return UptimeLedger.summarize(window)['qualified_pct']
 
     def get_metrics(self) -> SimulationMetrics:
         """Get current simulation metrics."""
@@ -453,6 +475,7 @@ class SimulationState:
                 best_ask=best_ask
             )
             self._operation_history.appendleft(op)  # Most recent first
+            self._new_operations.append(op)
 
     def get_operation_history(self) -> List[Dict]:
         """Get operation history as list of dicts."""
@@ -465,6 +488,69 @@ class SimulationState:
             return 0.0
         return (datetime.now() - self.started_at).total_seconds()
 
+    def pop_delta(self) -> Dict:
+        """
+        Get the values changed since the previous call and reset change tracking.
+
+        Only the keys of groups touched by mutators are computed, so the cost
+        is proportional to what changed rather than to the full state. Values
+        are absolute (not increments), so applying a delta twice is harmless.
+
+        Returns:
+            Dict of changed keys (same names as to_dict/metrics), plus
+            'operations' with new operations (oldest first); empty if unchanged
+        """
+        with self._lock:
+            dirty = self._dirty
+            if not dirty and not self._new_operations:
+                return {}
+
+            m = self.metrics
+            delta: Dict = {}
+
+            if 'ticks' in dirty:
+                delta['total_ticks'] = m.total_ticks
+                delta['qualified_ms'] = round(m.qualified_ms)
+                delta['total_ms'] = round(m.total_ms)
+                delta['boosted_ms'] = round(m.boosted_ms)
+                delta['standard_ms'] = round(m.standard_ms)
+                delta['basic_ms'] = round(m.basic_ms)
+                delta['uptime_percentage'] = round(m.uptime_percentage, 2)
+                delta['boosted_time_pct'] = round(m.boosted_time_pct, 2)
+                delta['standard_time_pct'] = round(m.standard_time_pct, 2)
+                delta['basic_time_pct'] = round(m.basic_time_pct, 2)
+                delta['effective_points_pct'] = round(m.effective_points_pct, 2)
+                delta['rolling_uptime'] = round(self.get_rolling_uptime(), 2)
+
+            if 'fills' in dirty:
+                delta['simulated_fills'] = m.simulated_fills
+                delta['simulated_pnl_usd'] = float(m.simulated_pnl_usd)
+                delta['avg_spread_captured_bps'] = round(m.avg_spread_captured_bps, 2)
+                delta['position'] = float(self._position)
+
+            if 'orders' in dirty:
+                delta['orders_placed'] = m.orders_placed
+                delta['orders_cancelled'] = m.orders_cancelled
+                delta['cancel_by_distance'] = m.cancel_by_distance
+                delta['cancel_by_queue'] = m.cancel_by_queue
+                delta['has_bid'] = self._bid_order is not None
+                delta['has_ask'] = self._ask_order is not None
+                delta['bid_price'] = float(self._bid_order.price) if self._bid_order else None
+                delta['ask_price'] = float(self._ask_order.price) if self._ask_order else None
+
+            if 'rebalance' in dirty:
+                delta['rebalance_count'] = m.rebalance_count
+
+            if 'volatility' in dirty:
+                delta['volatility_pauses'] = m.volatility_pauses
+
+            if self._new_operations:
+                delta['operations'] = [op.to_dict() for op in self._new_operations]
+                self._new_operations.clear()
+
+            self._dirty = set()
+            return delta
+
     def to_dict(self) -> Dict:
         """Export state as dict for API response."""
         with self._lock:
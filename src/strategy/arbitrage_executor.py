@@ -3,18 +3,28 @@
 Automated Arbitrage Executor
 
 自動執行跨交易所套利交易
+
+由套利檢測器直接觸發 (不輪詢)：
+- 機會出現/更新時立即評估，超過 max_opportunity_age_ms 的機會不執行
+- 交易對規格在啟動時預先載入，下單前只做本地正規化 (validate_and_normalize_order)
+- 兩腿並發送出，由 LegRiskManager 追蹤成交、對帳並處理單邊敞口
+- 執行歷史保存在固定大小的環形緩衝區
 """
 import asyncio
-from typing import Dict, Optional
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 import logging
 from dataclasses import dataclass
 
-from src.adapters.base_adapter import BasePerpAdapter, OrderSide
+from src.adapters.base_adapter import BasePerpAdapter, SymbolInfo
+from src.adapters.order_validator import validate_and_normalize_order
+from src.strategy.arbitrage_legs import LegRiskManager, LegExecution, ExecutionStatus
 from src.monitor.multi_exchange_monitor import (
     MultiExchangeMonitor,
-    ArbitrageOpportunity
+    ArbitrageOpportunity,
+    ArbitrageDelta
 )
 
 
@@ -25,6 +35,9 @@ class ExecutionResult:
     opportunity: ArbitrageOpportunity
     buy_order_id: Optional[str] = None
     sell_order_id: Optional[str] = None
+    quantity: Optional[Decimal] = None
+    reaction_ms: Optional[float] = None                # 機會出現到兩腿送出的耗時
+    execution: Optional[LegExecution] = None           # 雙腿執行記錄 (成交、補單、敞口)
     actual_profit: Optional[Decimal] = None
     error_message: Optional[str] = None
     timestamp: datetime = None
@@ -45,7 +58,9 @@ class ArbitrageExecutor:
         min_profit_usd: Decimal = Decimal("5.0"),     # 最小利潤 USD
         execution_timeout: float = 5.0,                # 執行超時（秒）
         enable_auto_execute: bool = False,             # 是否自動執行
-        dry_run: bool = True                           # 模擬模式
+        dry_run: bool = True,                          # 模擬模式
+        max_opportunity_age_ms: float = 500.0,         # 機會最大年齡（毫秒）
+        history_size: int = 500                        # 執行歷史保存筆數
     ):
         """
         初始化套利執行器
@@ -58,6 +73,8 @@ class ArbitrageExecutor:
             execution_timeout: 訂單執行超時時間
             enable_auto_execute: 是否啟用自動執行
             dry_run: 模擬模式（不實際下單）
+            max_opportunity_age_ms: 超過此年齡的機會視為過期不執行
+            history_size: 執行歷史環形緩衝區大小
         """
         self.monitor = monitor
         self.adapters = adapters
@@ -66,9 +83,20 @@ class ArbitrageExecutor:
         self.execution_timeout = execution_timeout
         self.enable_auto_execute = enable_auto_execute
         self.dry_run = dry_run
+        self.max_opportunity_age_ms = max_opportunity_age_ms
+
+        # 預先載入的交易對規格: (exchange, symbol) -> SymbolInfo
+        self._specs: Dict[Tuple[str, str], Optional[SymbolInfo]] = {}
 
-        # 執行歷史
-        self.execution_history = []
+        # 執行歷史 (環形緩衝區)
+        self.execution_history: Deque[ExecutionResult] = deque(maxlen=history_size)
+
+        # 雙腿執行與敞口處理
+        self.leg_manager = LegRiskManager(
+            price_getter=self._get_executable_price,
+            fill_timeout=execution_timeout,
+            history_size=history_size
+        )
 
         # 統計
         self.stats = {
@@ -76,7 +104,10 @@ class ArbitrageExecutor:
             'successful_executions': 0,
             'failed_executions': 0,
             'total_profit': Decimal('0'),
-            'total_loss': Decimal('0')
+            'total_loss': Decimal('0'),
+            'stale_skipped': 0,
+            'validation_rejected': 0,
+            'last_reaction_ms': None
         }
 
         # 日誌
@@ -103,67 +134,121 @@ class ArbitrageExecutor:
             return
 
         self._running = True
-        self._task = asyncio.create_task(self._execution_loop())
+        await self._preload_specs()
+        self.leg_manager.attach(self.adapters)
+        self.monitor.add_opportunity_listener(self._on_opportunity_delta)
         print("🚀 Arbitrage Executor started")
 
     async def stop(self):
         """停止執行器"""
         print("\n🛑 Stopping executor...")
         self._running = False
+        self.monitor.remove_opportunity_listener(self._on_opportunity_delta)
 
         if self._task:
-            self._task.cancel()
             try:
                 await self._task
-            except asyncio.CancelledError:
+            except Exception:
                 pass
+            self._task = None
 
         print("✅ Executor stopped")
         self._print_summary()
 
-    async def _execution_loop(self):
-        """執行循環"""
-        while self._running:
-            try:
-                # 檢查是否有套利機會
-                opportunities = self.monitor.arbitrage_opportunities
+    async def _preload_specs(self):
+        """預先載入所有 (交易所, 交易對) 的規格，下單時不再請求"""
+        for exchange, adapter in self.adapters.items():
+            for symbol in self.monitor.symbols:
+                try:
+                    self._specs[(exchange.upper(), symbol)] = await adapter.get_symbol_info(symbol)
+                except Exception as e:
+                    self.logger.warning(f"Failed to load spec {exchange} {symbol}: {e}")
+                    self._specs[(exchange.upper(), symbol)] = None
+
+    def _get_executable_price(self, exchange: str, symbol: str, side: str) -> Optional[Decimal]:
+        """當前可成交價格 (買: best ask / 賣: best bid)，供 IOC 補單定價"""
+        market = self.monitor.get_market_data(exchange, symbol)
+        if market is None:
+            return None
+        return market.best_ask if side == "buy" else market.best_bid
+
+    def _get_adapter(self, exchange: str) -> Optional[BasePerpAdapter]:
+        return self.adapters.get(exchange) or self.adapters.get(exchange.upper()) or self.adapters.get(exchange.lower())
+
+    def _on_opportunity_delta(self, delta: ArbitrageDelta):
+        """檢測器回調：有新的或更新的機會時觸發執行 (同一時間只執行一筆)"""
+        if not self._running or not self.enable_auto_execute:
+            return
+        if self._task is not None and not self._task.done():
+            return
+
+        candidates = delta.added + delta.updated
+        if not candidates:
+            return
 
-                if opportunities and self.enable_auto_execute:
-                    # 選擇最佳機會
-                    best_opp = max(opportunities, key=lambda o: o.profit)
+        # 選擇最佳機會 (優先按淨利潤)
+        best_opp = max(
+            candidates,
+            key=lambda o: o.net_profit if o.net_profit is not None else o.profit * o.max_quantity
+        )
+        self._task = asyncio.create_task(self._try_execute(best_opp))
 
-                    # 檢查是否值得執行
-                    if await self._should_execute(best_opp):
-                        result = await self.execute_arbitrage(best_opp)
+    async def _try_execute(self, opportunity: ArbitrageOpportunity):
+        """檢查並執行單個機會"""
+        try:
+            if not await self._should_execute(opportunity):
+                return
+
+            result = await self.execute_arbitrage(opportunity)
+            if result.success:
+                print(f"\n✅ Arbitrage executed successfully!")
+                print(f"   Profit: ${result.actual_profit:.2f} (reaction: {result.reaction_ms:.1f}ms)")
+            elif result.error_message:
+                print(f"\n❌ Arbitrage execution failed: {result.error_message}")
+        except Exception as e:
+            self.logger.error(f"Execution error: {e}")
 
-                        if result.success:
-                            print(f"\n✅ Arbitrage executed successfully!")
-                            print(f"   Profit: ${result.actual_profit:.2f}")
-                        else:
-                            print(f"\n❌ Arbitrage execution failed: {result.error_message}")
+    def _opportunity_age_ms(self, opportunity: ArbitrageOpportunity) -> float:
+        return (datetime.now() - opportunity.timestamp).total_seconds() * 1000
 
-                await asyncio.sleep(0.5)  # 檢查頻率
+    def _expected_profit(self, opportunity: ArbitrageOpportunity, quantity: Decimal) -> Optional[Decimal]:
+        """
+        按當前深度與手續費估算成交 quantity 的淨利潤
 
-            except Exception as e:
-                self.logger.error(f"Execution loop error: {e}")
-                await asyncio.sleep(1)
+        Returns:
+            淨利潤；訂單簿不可用時按頂檔價差估算；無淨利潤返回 None
+        """
+        buy_md = self.monitor.get_market_data(opportunity.buy_exchange, opportunity.symbol)
+        sell_md = self.monitor.get_market_data(opportunity.sell_exchange, opportunity.symbol)
+        if buy_md is None or sell_md is None:
+            return opportunity.profit * quantity
+
+        sized = self.monitor.evaluator.evaluate(
+            opportunity.buy_exchange, buy_md.ask_depth,
+            opportunity.sell_exchange, sell_md.bid_depth,
+            max_qty=float(quantity)
+        )
+        if sized is None:
+            return None
+        return Decimal(str(sized.net_profit))
 
     async def _should_execute(self, opportunity: ArbitrageOpportunity) -> bool:
         """判斷是否應該執行套利"""
-        # 1. 檢查利潤是否足夠
-        potential_profit = opportunity.profit * opportunity.max_quantity
-        if potential_profit < self.min_profit_usd:
+        # 0. 過期機會不執行
+        if self._opportunity_age_ms(opportunity) > self.max_opportunity_age_ms:
+            self.stats['stale_skipped'] += 1
             return False
 
-        # 2. 檢查交易量是否足夠
-        if opportunity.max_quantity <= 0:
-            return False
-
-        # 3. 檢查交易量是否超過限制
+        # 1. 檢查交易量是否足夠 (max_quantity 已按深度與手續費計算)
         execution_qty = min(opportunity.max_quantity, self.max_position_size)
         if execution_qty <= 0:
             return False
 
+        # 2. 檢查扣除手續費、按 VWAP 計算的淨利潤是否足夠
+        expected_profit = self._expected_profit(opportunity, execution_qty)
+        if expected_profit is None or expected_profit < self.min_profit_usd:
+            return False
+
         return True
 
     async def execute_arbitrage(
@@ -179,29 +264,33 @@ class ArbitrageExecutor:
         Returns:
             ExecutionResult: 執行結果
         """
-        self.stats['total_attempts'] += 1
-
-        print(f"\n{'='*80}")
-        print(f"⚡ Executing Arbitrage")
-        print(f"{'='*80}")
-        print(f"  Symbol: {opportunity.symbol}")
-        print(f"  Buy:  {opportunity.buy_exchange.upper()} @ ${opportunity.buy_price}")
-        print(f"  Sell: {opportunity.sell_exchange.upper()} @ ${opportunity.sell_price}")
-        print(f"  Expected Profit: ${opportunity.profit * opportunity.max_quantity:.2f}")
-        print(f"{'='*80}\n")
+        # 計算執行數量，兩腿數量必須一致: 按兩邊規格正規化到共同數量 (預載規格，無網路請求)
+        execution_qty = self._normalize_leg_qty(
+            opportunity, min(opportunity.max_quantity, self.max_position_size)
+        )
+        if execution_qty is None:
+            self.stats['validation_rejected'] += 1
+            return ExecutionResult(
+                success=False,
+                opportunity=opportunity,
+                error_message="Quantity rejected by order validation"
+            )
 
-        # 計算執行數量
-        execution_qty = min(opportunity.max_quantity, self.max_position_size)
+        self.stats['total_attempts'] += 1
 
         # 模擬模式
         if self.dry_run:
+            expected_profit = self._expected_profit(opportunity, execution_qty)
+            self._print_execution(opportunity, execution_qty, expected_profit)
             print("  🔵 DRY RUN MODE - No real orders placed")
-            simulated_profit = opportunity.profit * execution_qty
+            simulated_profit = expected_profit or Decimal('0')
             result = ExecutionResult(
                 success=True,
                 opportunity=opportunity,
                 buy_order_id="DRY_RUN_BUY",
                 sell_order_id="DRY_RUN_SELL",
+                quantity=execution_qty,
+                reaction_ms=self._opportunity_age_ms(opportunity),
                 actual_profit=simulated_profit
             )
             self.stats['successful_executions'] += 1
@@ -211,48 +300,66 @@ class ArbitrageExecutor:
 
         # 實際執行
         try:
-            buy_adapter = self.adapters[opportunity.buy_exchange.lower()]
-            sell_adapter = self.adapters[opportunity.sell_exchange.lower()]
+            buy_adapter = self._get_adapter(opportunity.buy_exchange)
+            sell_adapter = self._get_adapter(opportunity.sell_exchange)
+            if buy_adapter is None or sell_adapter is None:
+                raise ValueError(f"Adapter not available: {opportunity.buy_exchange}/{opportunity.sell_exchange}")
 
-            # 並行下單（買入和賣出）
-            buy_task = buy_adapter.place_order(
-                symbol=opportunity.symbol,
-                side=OrderSide.BUY,
-                order_type="market",
-                quantity=execution_qty
-            )
+            self.leg_manager.attach(self.adapters)
+            age_ms = self._opportunity_age_ms(opportunity)
 
-            sell_task = sell_adapter.place_order(
+            # 兩腿並發送單，追蹤成交並處理敞口
+            execution = await self.leg_manager.execute(
                 symbol=opportunity.symbol,
-                side=OrderSide.SELL,
-                order_type="market",
-                quantity=execution_qty
+                quantity=execution_qty,
+                buy_exchange=opportunity.buy_exchange,
+                buy_adapter=buy_adapter,
+                sell_exchange=opportunity.sell_exchange,
+                sell_adapter=sell_adapter,
+                send_timeout=self.execution_timeout
             )
-
-            # 等待訂單執行
-            buy_order, sell_order = await asyncio.wait_for(
-                asyncio.gather(buy_task, sell_task),
-                timeout=self.execution_timeout
+            sent_at = min(
+                (leg.sent_at for leg in (execution.buy_leg, execution.sell_leg) if leg.sent_at),
+                default=None
             )
-
-            # 計算實際利潤
-            actual_buy_price = Decimal(str(buy_order.get('avg_price', opportunity.buy_price)))
-            actual_sell_price = Decimal(str(sell_order.get('avg_price', opportunity.sell_price)))
-            actual_profit = (actual_sell_price - actual_buy_price) * execution_qty
+            reaction_ms = age_ms + ((sent_at - execution.started_at.timestamp()) * 1000 if sent_at else 0)
+            self.stats['last_reaction_ms'] = reaction_ms
+            self._print_execution(opportunity, execution_qty, None)
+
+            success = execution.status in (ExecutionStatus.BALANCED, ExecutionStatus.COMPLETED)
+            actual_profit = execution.realized_profit
+            if actual_profit is None and success:
+                # 成交均價不可用時使用預期 VWAP / 頂檔價
+                buy_price = opportunity.buy_vwap or opportunity.buy_price
+                sell_price = opportunity.sell_vwap or opportunity.sell_price
+                actual_profit = (sell_price - buy_price) * execution.bought_qty
 
             result = ExecutionResult(
-                success=True,
+                success=success,
                 opportunity=opportunity,
-                buy_order_id=buy_order['order_id'],
-                sell_order_id=sell_order['order_id'],
-                actual_profit=actual_profit
+                buy_order_id=execution.buy_leg.order_id,
+                sell_order_id=execution.sell_leg.order_id,
+                quantity=execution_qty,
+                reaction_ms=reaction_ms,
+                actual_profit=actual_profit,
+                execution=execution,
+                error_message=None if success else (
+                    f"{execution.status.value} (imbalance {execution.imbalance}): "
+                    + ("; ".join(
+                        f"{leg.side} {leg.error}" for leg in (execution.buy_leg, execution.sell_leg) if leg.error
+                    ) or "no fills confirmed")
+                )
             )
 
-            self.stats['successful_executions'] += 1
-            if actual_profit > 0:
-                self.stats['total_profit'] += actual_profit
+            if success:
+                self.stats['successful_executions'] += 1
             else:
-                self.stats['total_loss'] += abs(actual_profit)
+                self.stats['failed_executions'] += 1
+            if actual_profit is not None:
+                if actual_profit > 0:
+                    self.stats['total_profit'] += actual_profit
+                else:
+                    self.stats['total_loss'] += abs(actual_profit)
 
             self.execution_history.append(result)
             return result
@@ -277,6 +384,53 @@ class ArbitrageExecutor:
                 error_message=error_msg
             )
 
+    def _print_execution(self, opportunity: ArbitrageOpportunity, quantity: Decimal, expected_profit: Optional[Decimal]):
+        """打印執行摘要 (實盤在兩腿送出後才打印，不佔用送單路徑)"""
+        print(f"\n{'='*80}")
+        print(f"⚡ Executing Arbitrage")
+        print(f"{'='*80}")
+        print(f"  Symbol: {opportunity.symbol}")
+        print(f"  Buy:  {opportunity.buy_exchange.upper()} @ ${opportunity.buy_price}")
+        print(f"  Sell: {opportunity.sell_exchange.upper()} @ ${opportunity.sell_price}")
+        print(f"  Quantity: {quantity}")
+        if expected_profit is not None:
+            print(f"  Expected Net Profit: ${expected_profit:.2f}")
+        elif opportunity.net_profit is not None:
+            print(f"  Detected Net Profit: ${opportunity.net_profit:.2f}")
+        print(f"{'='*80}\n")
+
+    def _normalize_leg_qty(self, opportunity: ArbitrageOpportunity, quantity: Decimal) -> Optional[Decimal]:
+        """
+        按兩腿交易所規格正規化數量 (使用預載規格，無網路請求)
+
+        Returns:
+            兩腿共同可用的數量，驗證失敗返回 None
+        """
+        buy_spec = self._specs.get((opportunity.buy_exchange.upper(), opportunity.symbol))
+        sell_spec = self._specs.get((opportunity.sell_exchange.upper(), opportunity.symbol))
+
+        qty = quantity
+        for _ in range(2):
+            buy_check = validate_and_normalize_order(
+                opportunity.symbol, "buy", qty, None, buy_spec,
+                best_ask=opportunity.buy_price
+            )
+            if not buy_check.ok:
+                self.logger.info(f"Buy leg rejected: {buy_check.reason}")
+                return None
+            sell_check = validate_and_normalize_order(
+                opportunity.symbol, "sell", buy_check.normalized_qty, None, sell_spec,
+                best_bid=opportunity.sell_price
+            )
+            if not sell_check.ok:
+                self.logger.info(f"Sell leg rejected: {sell_check.reason}")
+                return None
+            if sell_check.normalized_qty == buy_check.normalized_qty:
+                return sell_check.normalized_qty
+            # 賣方步長更粗: 以賣方數量再驗證一次買方
+            qty = sell_check.normalized_qty
+        return None
+
     def _print_summary(self):
         """打印執行摘要"""
         print(f"\n{'='*80}")
@@ -297,8 +451,8 @@ class ArbitrageExecutor:
 
     def get_execution_history(self):
         """獲取執行歷史"""
-        return self.execution_history
+        return list(self.execution_history)
 
     def get_stats(self):
         """獲取統計數據"""
-        return self.stats
+        return {**self.stats, 'legs': self.leg_manager.get_stats()}
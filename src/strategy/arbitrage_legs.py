@@ -0,0 +1,662 @@
+"""
+套利雙腿風控
+Arbitrage Leg-Risk Manager
+
+兩腿並發送單後，任何一腿失敗、超時或部分成交都會留下單邊敞口。本模組負責:
+- 逐腿記錄狀態 (送單、成交量、成交均價)，成交數據優先來自交易所 WS 成交推送，
+  REST get_order 作為補充 (兩腿並發對帳)
+- 每腿送單前生成 client_order_id: 送單超時的腿狀態為 UNKNOWN，以 client_order_id
+  查詢 (未成交訂單) / 撤單確認；仍無法確認時不處理另一腿，避免重複建倉
+- 訂單「查不到」不等於未成交 (市價單成交後即離開未成交列表): 對帳超時後只有交易所
+  回報結束狀態 (REST / WS) 或成交歷史確認時才採信成交量，否則標記 UNKNOWN
+- 對帳後兩腿數量不一致時，先以 IOC 限價單補齊落後的一腿 (限定滑點)，
+  仍不一致則以 IOC 反向單平掉多出的部分
+- 執行記錄保存在固定大小的環形緩衝區
+"""
+import asyncio
+import logging
+import random
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from src.adapters.base_adapter import BasePerpAdapter, Order
+
+logger = logging.getLogger(__name__)
+
+# (exchange, symbol, side) -> 當前可成交價格 (買: best ask / 賣: best bid)
+PriceGetter = Callable[[str, str, str], Optional[Decimal]]
+
+_FILLED_STATUSES = {"FILLED", "COMPLETE", "CLOSED"}
+_DEAD_STATUSES = {"CANCELLED", "CANCELED", "REJECTED", "EXPIRED"}
+
+
+def _new_client_order_id() -> str:
+    """客戶端訂單 ID (GRVT 要求 uint32 數字字串，其他交易所接受任意字串)"""
+    return str(random.randint(1, 2**32 - 1))
+
+
+class LegStatus(Enum):
+    """單腿狀態"""
+    PENDING = "pending"       # 尚未送出
+    SENT = "sent"             # 已送出，等待成交
+    PARTIAL = "partial"       # 部分成交
+    FILLED = "filled"         # 完全成交
+    DONE = "done"             # 訂單已結束 (撤銷/過期)，保留已成交部分
+    FAILED = "failed"         # 送單失敗 (交易所明確拒絕)
+    UNKNOWN = "unknown"       # 送單超時，交易所上可能存在
+
+
+class ExecutionStatus(Enum):
+    """雙腿執行狀態"""
+    RUNNING = "running"
+    BALANCED = "balanced"         # 兩腿成交量一致
+    COMPLETED = "completed"       # 以 IOC 補齊落後腿後一致
+    UNWOUND = "unwound"           # 以 IOC 平掉多出部分後一致
+    FAILED = "failed"             # 兩腿都沒有成交
+    UNHEDGED = "unhedged"         # 處理後仍有敞口 (或有腿狀態未知)，需要人工介入
+
+
+@dataclass
+class ExecutionLeg:
+    """單筆訂單 (主腿或補單)"""
+    exchange: str
+    symbol: str
+    side: str                               # "buy" / "sell"
+    target_qty: Decimal
+    role: str = "entry"                     # entry / complete / unwind
+    order_id: Optional[str] = None
+    client_order_id: Optional[str] = None
+    status: LegStatus = LegStatus.PENDING
+    filled_qty: Decimal = Decimal("0")
+    filled_notional: Decimal = Decimal("0")
+    error: Optional[str] = None
+    sent_at: Optional[float] = None
+    last_fill_at: Optional[float] = None
+    _fill_ids: set = field(default_factory=set, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def avg_price(self) -> Optional[Decimal]:
+        if self.filled_qty <= 0:
+            return None
+        return self.filled_notional / self.filled_qty
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in (LegStatus.FILLED, LegStatus.DONE, LegStatus.FAILED)
+
+    def apply_fill(self, qty: Decimal, price: Decimal, fill_id: Optional[str] = None):
+        """增量成交"""
+        if fill_id:
+            if fill_id in self._fill_ids:
+                return
+            self._fill_ids.add(fill_id)
+        self.filled_qty += qty
+        self.filled_notional += qty * price
+        self.last_fill_at = time.time()
+        self._update_status()
+
+    def apply_cumulative(self, filled_qty: Decimal, avg_price: Optional[Decimal]):
+        """累計成交 (REST 查詢或累計型推送)，只會前進不會後退"""
+        if filled_qty <= self.filled_qty:
+            return
+        if avg_price:
+            self.filled_notional = filled_qty * avg_price
+        else:
+            # 無均價時新增部分沿用當前均價
+            self.filled_notional += (filled_qty - self.filled_qty) * (self.avg_price or Decimal("0"))
+        self.filled_qty = filled_qty
+        self.last_fill_at = time.time()
+        self._update_status()
+
+    def _update_status(self):
+        self._changed.set()
+        if self.filled_qty >= self.target_qty:
+            self.status = LegStatus.FILLED
+        elif self.filled_qty > 0 and self.status in (LegStatus.SENT, LegStatus.UNKNOWN):
+            self.status = LegStatus.PARTIAL
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'exchange': self.exchange,
+            'side': self.side,
+            'role': self.role,
+            'order_id': self.order_id,
+            'client_order_id': self.client_order_id,
+            'status': self.status.value,
+            'target_qty': str(self.target_qty),
+            'filled_qty': str(self.filled_qty),
+            'avg_price': str(self.avg_price) if self.avg_price is not None else None,
+            'error': self.error,
+        }
+
+
+@dataclass
+class LegExecution:
+    """一次雙腿套利執行"""
+    execution_id: str
+    symbol: str
+    buy_leg: ExecutionLeg
+    sell_leg: ExecutionLeg
+    started_at: datetime = field(default_factory=datetime.now)
+    status: ExecutionStatus = ExecutionStatus.RUNNING
+    residual_orders: List[ExecutionLeg] = field(default_factory=list)
+    completed_at: Optional[datetime] = None
+
+    def _net(self, side: str) -> Decimal:
+        """某方向的淨成交量 (主腿 + 同向補單 - 反向平倉單)"""
+        qty = self.buy_leg.filled_qty if side == "buy" else self.sell_leg.filled_qty
+        for order in self.residual_orders:
+            if order.role == "complete" and order.side == side:
+                qty += order.filled_qty
+            elif order.role == "unwind" and order.side != side:
+                qty -= order.filled_qty
+        return qty
+
+    @property
+    def bought_qty(self) -> Decimal:
+        return self._net("buy")
+
+    @property
+    def sold_qty(self) -> Decimal:
+        return self._net("sell")
+
+    @property
+    def imbalance(self) -> Decimal:
+        """淨敞口 (正 = 多頭，負 = 空頭)"""
+        return self.bought_qty - self.sold_qty
+
+    @property
+    def realized_profit(self) -> Optional[Decimal]:
+        """按成交均價計算的套利利潤 (兩腿配對部分)"""
+        matched = min(self.buy_leg.filled_qty, self.sell_leg.filled_qty)
+        if matched <= 0 or self.buy_leg.avg_price is None or self.sell_leg.avg_price is None:
+            return None
+        return (self.sell_leg.avg_price - self.buy_leg.avg_price) * matched
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'execution_id': self.execution_id,
+            'symbol': self.symbol,
+            'status': self.status.value,
+            'started_at': self.started_at.isoformat(),
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'imbalance': str(self.imbalance),
+            'buy_leg': self.buy_leg.to_dict(),
+            'sell_leg': self.sell_leg.to_dict(),
+            'residual_orders': [o.to_dict() for o in self.residual_orders],
+        }
+
+
+class LegRiskManager:
+    """
+    雙腿執行與敞口處理
+
+    使用方式:
+        manager = LegRiskManager(price_getter=...)
+        manager.attach(adapters)                 # 註冊各交易所 WS 成交回調
+        execution = await manager.execute(symbol, qty, 'GRVT', buy_adapter, 'STANDX', sell_adapter)
+    """
+
+    def __init__(
+        self,
+        price_getter: Optional[PriceGetter] = None,
+        fill_timeout: float = 3.0,
+        poll_interval: float = 0.25,
+        complete_slippage_bps: Decimal = Decimal("10"),
+        unwind_slippage_bps: Decimal = Decimal("30"),
+        history_size: int = 500
+    ):
+        """
+        Args:
+            price_getter: 取得當前可成交價格 (用於 IOC 限價)
+            fill_timeout: 等待主腿成交的最長時間（秒）
+            poll_interval: REST 對帳間隔（秒），WS 推送到達時不需要等待
+            complete_slippage_bps: 補齊落後腿時允許的滑點
+            unwind_slippage_bps: 平掉多出部分時允許的滑點 (優先消除敞口，容忍更大)
+            history_size: 環形緩衝區大小
+        """
+        self.price_getter = price_getter
+        self.fill_timeout = fill_timeout
+        self.poll_interval = poll_interval
+        self.complete_slippage_bps = complete_slippage_bps
+        self.unwind_slippage_bps = unwind_slippage_bps
+
+        self.history: Deque[LegExecution] = deque(maxlen=history_size)
+
+        # order_id -> 正在追蹤的訂單
+        self._tracked: Dict[str, ExecutionLeg] = {}
+        # client_order_id -> 正在追蹤的訂單 (送單前登記，order_id 返回前的推送也能匹配)
+        self._tracked_cid: Dict[str, ExecutionLeg] = {}
+        # 訂單 ID 尚未返回前先到達的成交: order_id -> [(kind, args)]
+        self._early_fills: Dict[str, List[tuple]] = {}
+        self._early_fills_ts: Dict[str, float] = {}
+        self._attached: set = set()
+
+        # 統計
+        self.stats = {
+            'executions': 0,
+            'balanced': 0,
+            'completed': 0,
+            'unwound': 0,
+            'unhedged': 0,
+            'failed': 0,
+            'ws_fills': 0,
+            'rest_reconciles': 0,
+            'send_timeouts': 0,
+            'unknown_legs': 0,
+        }
+
+    # ==================== WS 成交推送 ====================
+
+    def attach(self, adapters: Dict[str, BasePerpAdapter]):
+        """註冊各交易所的 WS 成交回調 (重複調用安全)"""
+        for adapter in adapters.values():
+            if id(adapter) in self._attached:
+                continue
+            if hasattr(adapter, 'on_fill'):
+                adapter.on_fill(self._on_fill_event)
+            elif hasattr(adapter, 'on_order_update'):
+                adapter.on_order_update(self._on_fill_event)
+            else:
+                continue
+            self._attached.add(id(adapter))
+
+    async def _on_fill_event(self, event: Any):
+        """
+        處理各交易所的成交推送
+
+        - GRVT GRVTFillEvent: 增量成交 (size, price, fill_id)
+        - StandX OrderUpdate: 累計成交 (filled_qty, avg_fill_price)
+        - Order: 累計成交 (filled_qty, price)
+        """
+        order_id = str(getattr(event, 'order_id', '') or '')
+        client_order_id = str(getattr(event, 'client_order_id', '') or '')
+        if not order_id and not client_order_id:
+            return
+
+        if hasattr(event, 'size') and hasattr(event, 'fill_id'):
+            update = ('fill', Decimal(str(event.size)), Decimal(str(event.price)), event.fill_id)
+        else:
+            avg = getattr(event, 'avg_fill_price', None) or getattr(event, 'price', None)
+            update = ('cumulative', Decimal(str(getattr(event, 'filled_qty', 0) or 0)),
+                      Decimal(str(avg)) if avg else None)
+
+        leg = self._tracked.get(order_id) if order_id else None
+        if leg is None and client_order_id:
+            leg = self._tracked_cid.get(client_order_id)
+            if leg is not None and order_id and leg.order_id is None:
+                self._bind_order_id(leg, order_id)
+        if leg is None:
+            if order_id:
+                # 可能早於 place_order 返回，暫存 (短時間後丟棄)
+                self._early_fills.setdefault(order_id, []).append(update)
+                self._early_fills_ts[order_id] = time.time()
+            return
+
+        self.stats['ws_fills'] += 1
+        self._apply_update(leg, update)
+        # 累計型推送帶有訂單狀態: 撤銷/拒絕代表剩餘部分不會再成交
+        status = str(getattr(event, 'status', '') or '').upper()
+        if status in _DEAD_STATUSES and not leg.is_terminal:
+            leg.status = LegStatus.DONE
+
+    def _apply_update(self, leg: ExecutionLeg, update: tuple):
+        if update[0] == 'fill':
+            leg.apply_fill(update[1], update[2], update[3])
+        else:
+            leg.apply_cumulative(update[1], update[2])
+
+    def _bind_order_id(self, leg: ExecutionLeg, order_id: str):
+        """取得交易所 order_id 後開始以其追蹤，並套用先到的暫存成交"""
+        leg.order_id = order_id
+        self._tracked[order_id] = leg
+        for update in self._early_fills.pop(order_id, []):
+            self._apply_update(leg, update)
+        self._early_fills_ts.pop(order_id, None)
+
+    def _untrack(self, execution: LegExecution):
+        for leg in [execution.buy_leg, execution.sell_leg, *execution.residual_orders]:
+            if leg.order_id:
+                self._tracked.pop(leg.order_id, None)
+            if leg.client_order_id:
+                self._tracked_cid.pop(leg.client_order_id, None)
+        # 清理過期的暫存成交
+        cutoff = time.time() - 60
+        for order_id in [oid for oid, ts in self._early_fills_ts.items() if ts < cutoff]:
+            self._early_fills.pop(order_id, None)
+            self._early_fills_ts.pop(order_id, None)
+
+    # ==================== 執行 ====================
+
+    async def execute(
+        self,
+        symbol: str,
+        quantity: Decimal,
+        buy_exchange: str,
+        buy_adapter: BasePerpAdapter,
+        sell_exchange: str,
+        sell_adapter: BasePerpAdapter,
+        send_timeout: float = 5.0
+    ) -> LegExecution:
+        """
+        執行雙腿套利並處理敞口
+
+        Args:
+            symbol: 交易對
+            quantity: 每腿數量 (已正規化)
+            buy_exchange / buy_adapter: 買入腿
+            sell_exchange / sell_adapter: 賣出腿
+            send_timeout: 送單超時（秒）
+
+        Returns:
+            LegExecution: 執行記錄 (已寫入環形緩衝區)
+        """
+        execution = LegExecution(
+            execution_id=uuid.uuid4().hex[:12],
+            symbol=symbol,
+            buy_leg=ExecutionLeg(buy_exchange, symbol, "buy", quantity),
+            sell_leg=ExecutionLeg(sell_exchange, symbol, "sell", quantity),
+        )
+        self.stats['executions'] += 1
+        self.history.append(execution)
+        adapters = {buy_exchange: buy_adapter, sell_exchange: sell_adapter}
+
+        try:
+            # 1. 兩腿並發送單
+            await asyncio.gather(
+                self._send(execution.buy_leg, buy_adapter, "market", None, send_timeout),
+                self._send(execution.sell_leg, sell_adapter, "market", None, send_timeout),
+            )
+
+            # 2. 兩腿並發對帳 (WS 推送 + REST 補充)
+            await asyncio.gather(
+                self._reconcile(execution.buy_leg, buy_adapter, self.fill_timeout),
+                self._reconcile(execution.sell_leg, sell_adapter, self.fill_timeout),
+            )
+
+            # 3. 處理敞口
+            await self._resolve_imbalance(execution, adapters, send_timeout)
+
+        except Exception as e:
+            logger.error(f"[LegRisk] {execution.execution_id} error: {e}")
+            if execution.imbalance != 0:
+                execution.status = ExecutionStatus.UNHEDGED
+        finally:
+            self._finish(execution)
+
+        return execution
+
+    async def _send(
+        self,
+        leg: ExecutionLeg,
+        adapter: BasePerpAdapter,
+        order_type: str,
+        price: Optional[Decimal],
+        timeout: float,
+        reduce_only: bool = False
+    ):
+        """
+        送出單筆訂單，失敗時記錄在腿上 (不拋出)
+
+        送單前登記 client_order_id；部分交易所 (StandX) 下單返回時沒有 order_id，
+        之後由推送或未成交訂單查詢補上。
+        """
+        kwargs = {}
+        if order_type == "limit":
+            kwargs['time_in_force'] = "ioc"
+        if reduce_only:
+            kwargs['reduce_only'] = True
+        leg.client_order_id = _new_client_order_id()
+        self._tracked_cid[leg.client_order_id] = leg
+        leg.status = LegStatus.SENT
+        try:
+            leg.sent_at = time.time()
+            order: Order = await asyncio.wait_for(
+                adapter.place_order(
+                    symbol=leg.symbol,
+                    side=leg.side,
+                    order_type=order_type,
+                    quantity=leg.target_qty,
+                    price=price,
+                    client_order_id=leg.client_order_id,
+                    **kwargs
+                ),
+                timeout=timeout
+            )
+            if not order:
+                raise Exception("Order placement returned no order")
+            if order.order_id and leg.order_id is None:
+                self._bind_order_id(leg, str(order.order_id))
+        except asyncio.TimeoutError:
+            # 超時不代表沒下單: 狀態未知，由對帳以 client_order_id 確認
+            self.stats['send_timeouts'] += 1
+            leg.error = "send timeout"
+            if leg.status == LegStatus.SENT:
+                leg.status = LegStatus.UNKNOWN
+        except Exception as e:
+            leg.error = str(e)
+            if leg.filled_qty == 0:
+                leg.status = LegStatus.FAILED
+
+    async def _reconcile(self, leg: ExecutionLeg, adapter: BasePerpAdapter, timeout: float):
+        """等待訂單成交或結束；WS 推送直接更新，REST 定期補充"""
+        if leg.status in (LegStatus.PENDING, LegStatus.FAILED):
+            return
+
+        deadline = time.time() + timeout
+        while not leg.is_terminal and time.time() < deadline:
+            # WS 成交推送到達時立即喚醒，否則每 poll_interval 以 REST 補查
+            leg._changed.clear()
+            try:
+                await asyncio.wait_for(leg._changed.wait(), timeout=self.poll_interval)
+                continue
+            except asyncio.TimeoutError:
+                pass
+            await self._query_order(leg, adapter)
+
+        if not leg.is_terminal:
+            # 超時仍未結束: 撤單 (order_id 未知時以 client_order_id) 並以最後查詢結果為準
+            try:
+                await adapter.cancel_order(leg.symbol, order_id=leg.order_id, client_order_id=leg.client_order_id)
+            except Exception as e:
+                logger.warning(f"[LegRisk] cancel {leg.order_id or leg.client_order_id} failed: {e}")
+            await self._query_order(leg, adapter)
+            if not leg.is_terminal:
+                await self._query_trades(leg, adapter)
+            if not leg.is_terminal:
+                # 交易所未回報訂單結束: 查不到訂單可能是已成交 (未收到推送)，不能推定未成交
+                leg.status = LegStatus.UNKNOWN
+                self.stats['unknown_legs'] += 1
+                logger.error(
+                    f"[LegRisk] {leg.exchange} {leg.side} {leg.target_qty} "
+                    f"(order_id={leg.order_id}, client_order_id={leg.client_order_id}) "
+                    f"state unknown after reconcile, known filled {leg.filled_qty}"
+                )
+
+    async def _query_order(self, leg: ExecutionLeg, adapter: BasePerpAdapter):
+        """REST 查詢: 有 order_id 時 get_order，否則在未成交訂單中以 client_order_id 查找"""
+        try:
+            if leg.order_id and hasattr(adapter, 'get_order'):
+                order = await adapter.get_order(leg.order_id, leg.symbol)
+            else:
+                order = await self._find_open_order(leg, adapter)
+        except Exception as e:
+            logger.debug(f"[LegRisk] query {leg.order_id or leg.client_order_id} failed: {e}")
+            return
+        if order is None:
+            return
+
+        self.stats['rest_reconciles'] += 1
+        if leg.order_id is None and order.order_id:
+            self._bind_order_id(leg, str(order.order_id))
+        if leg.status == LegStatus.UNKNOWN:
+            # 交易所上確實有這筆訂單
+            leg.status = LegStatus.SENT
+        filled = getattr(order, 'filled_qty', None)
+        if filled is None:
+            filled = getattr(order, 'filled_quantity', None)
+        if filled:
+            leg.apply_cumulative(Decimal(str(filled)), order.price or None)
+
+        status = str(getattr(order, 'status', '')).upper()
+        if status in _FILLED_STATUSES:
+            leg.status = LegStatus.FILLED
+            if leg.filled_qty < leg.target_qty and not filled:
+                # 部分交易所 get_order 不返回成交量: 以目標數量計
+                leg.apply_cumulative(leg.target_qty, order.price or None)
+        elif status in _DEAD_STATUSES:
+            leg.status = LegStatus.DONE
+
+    async def _query_trades(self, leg: ExecutionLeg, adapter: BasePerpAdapter):
+        """以成交歷史確認成交量 (需要 order_id；只能確認已成交，查無成交不代表未成交)"""
+        if not leg.order_id or not hasattr(adapter, 'get_trades'):
+            return
+        start_ms = int((leg.sent_at or time.time()) * 1000) - 5000
+        try:
+            trades = await adapter.get_trades(leg.symbol, limit=100, start_time=start_ms)
+        except Exception as e:
+            logger.debug(f"[LegRisk] get_trades {leg.order_id} failed: {e}")
+            return
+        matched = [t for t in trades if str(t.order_id) == leg.order_id]
+        qty = sum((t.qty for t in matched), Decimal("0"))
+        if qty > 0:
+            self.stats['rest_reconciles'] += 1
+            leg.apply_cumulative(qty, sum((t.qty * t.price for t in matched), Decimal("0")) / qty)
+
+    async def _find_open_order(self, leg: ExecutionLeg, adapter: BasePerpAdapter) -> Optional[Order]:
+        """在未成交訂單中查找 (不在其中表示已結束或從未下單)"""
+        for order in await adapter.get_open_orders(leg.symbol):
+            if leg.order_id and str(order.order_id) == leg.order_id:
+                return order
+            if leg.client_order_id and str(order.client_order_id) == leg.client_order_id:
+                return order
+        return None
+
+    # ==================== 敞口處理 ====================
+
+    async def _resolve_imbalance(
+        self,
+        execution: LegExecution,
+        adapters: Dict[str, BasePerpAdapter],
+        timeout: float
+    ):
+        """兩腿不一致時，先補齊落後腿，再平掉多出部分"""
+        if self._has_unknown(execution, [execution.buy_leg, execution.sell_leg]):
+            return
+        if execution.bought_qty == 0 and execution.sold_qty == 0:
+            execution.status = ExecutionStatus.FAILED
+            return
+        if execution.imbalance == 0:
+            execution.status = ExecutionStatus.BALANCED
+            return
+
+        # 1. 補齊落後腿 (僅當該腿交易所可用: 送單失敗的腿不重試)
+        imbalance = execution.imbalance
+        lagging = execution.sell_leg if imbalance > 0 else execution.buy_leg
+        if lagging.status != LegStatus.FAILED:
+            order = await self._send_residual(execution, adapters, lagging.exchange, lagging.side,
+                                              abs(imbalance), "complete", self.complete_slippage_bps, timeout)
+            if self._has_unknown(execution, [order]):
+                return
+            if execution.imbalance == 0:
+                execution.status = ExecutionStatus.COMPLETED
+                return
+
+        # 2. 平掉多出部分 (在超額腿的交易所反向下單)
+        imbalance = execution.imbalance
+        leading = execution.buy_leg if imbalance > 0 else execution.sell_leg
+        unwind_side = "sell" if imbalance > 0 else "buy"
+        order = await self._send_residual(execution, adapters, leading.exchange, unwind_side,
+                                          abs(imbalance), "unwind", self.unwind_slippage_bps, timeout,
+                                          reduce_only=True)
+        if self._has_unknown(execution, [order]):
+            return
+
+        if execution.imbalance == 0:
+            execution.status = ExecutionStatus.UNWOUND
+        else:
+            execution.status = ExecutionStatus.UNHEDGED
+            logger.error(
+                f"[LegRisk] {execution.execution_id} {execution.symbol} still unhedged: "
+                f"{execution.imbalance} (manual action required)"
+            )
+
+    def _has_unknown(self, execution: LegExecution, legs: List[ExecutionLeg]) -> bool:
+        """有腿狀態未知時不再下單處理敞口 (該腿可能已成交，平掉另一腿反而加倍敞口)"""
+        unknown = [leg for leg in legs if leg.status == LegStatus.UNKNOWN]
+        if not unknown:
+            return False
+        execution.status = ExecutionStatus.UNHEDGED
+        logger.error(
+            f"[LegRisk] {execution.execution_id} {execution.symbol} leg state unknown "
+            f"({', '.join(f'{leg.exchange} client_order_id={leg.client_order_id}' for leg in unknown)}), "
+            f"not adjusting exposure (manual check required)"
+        )
+        return True
+
+    async def _send_residual(
+        self,
+        execution: LegExecution,
+        adapters: Dict[str, BasePerpAdapter],
+        exchange: str,
+        side: str,
+        qty: Decimal,
+        role: str,
+        slippage_bps: Decimal,
+        timeout: float,
+        reduce_only: bool = False
+    ) -> ExecutionLeg:
+        """以 IOC 限價單處理殘量 (無參考價時使用市價單)"""
+        adapter = adapters[exchange]
+        order = ExecutionLeg(exchange, execution.symbol, side, qty, role=role)
+        execution.residual_orders.append(order)
+
+        price = self.price_getter(exchange, execution.symbol, side) if self.price_getter else None
+        if price:
+            factor = slippage_bps / Decimal("10000")
+            price = price * (1 + factor) if side == "buy" else price * (1 - factor)
+            await self._send(order, adapter, "limit", price, timeout, reduce_only)
+        else:
+            await self._send(order, adapter, "market", None, timeout, reduce_only)
+
+        # IOC 立即結束，只需短暫對帳
+        await self._reconcile(order, adapter, min(self.fill_timeout, 1.0))
+        logger.info(
+            f"[LegRisk] {execution.execution_id} {role} {side} {qty} on {exchange}: "
+            f"filled {order.filled_qty} ({order.status.value})"
+        )
+        return order
+
+    def _finish(self, execution: LegExecution):
+        execution.completed_at = datetime.now()
+        if execution.status == ExecutionStatus.RUNNING:
+            execution.status = ExecutionStatus.BALANCED if execution.imbalance == 0 else ExecutionStatus.UNHEDGED
+        key = execution.status.value
+        if key in self.stats:
+            self.stats[key] += 1
+        self._untrack(execution)
+
+    # ==================== 查詢 ====================
+
+    def get_history(self, limit: Optional[int] = None) -> List[LegExecution]:
+        """最近的執行記錄 (新到舊)"""
+        items = list(reversed(self.history))
+        return items[:limit] if limit else items
+
+    def get_unhedged(self) -> List[LegExecution]:
+        """仍有敞口的執行"""
+        return [e for e in self.history if e.status == ExecutionStatus.UNHEDGED]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'tracked_orders': len(self._tracked),
+            'history_size': len(self.history),
+        }
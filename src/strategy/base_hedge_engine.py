@@ -10,10 +10,12 @@ Base Hedge Engine
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Optional, Dict, Callable, Awaitable
+from typing import Any, Optional, Dict, List, Callable, Awaitable, Tuple
 from datetime import datetime
 from enum import Enum
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -89,12 +91,53 @@ class HedgeResult:
 
     # 錯誤信息
     error_message: Optional[str] = None
+    # 有嘗試在結果不明時結束 (送單超時、成交狀態查不到)，對沖場所可能已成交；
+    # False 表示失敗均發生在送單前或被交易所明確拒絕
+    fill_unknown: bool = False
 
     # 時間戳
     started_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
 
 
+@dataclass
+class HedgeContext:
+    """
+    預熱的對沖上下文（每個來源交易對一份）
+
+    啟動時解析一次，之後由背景任務按 TTL 刷新，
+    對沖關鍵路徑只讀取這裡，不再 await 交易對驗證/合約規格查詢。
+    """
+    source_symbol: str
+    hedge_symbol: str
+    valid: bool = True                       # 對沖交易對是否存在
+    spec: Optional[Any] = None               # 合約規格（需要正規化的交易所才有）
+    refreshed_at: float = field(default_factory=time.time)
+
+    # 對沖交易所頂檔與淺層深度（滑點參考/路由成本估算，背景刷新）
+    best_bid: Optional[Decimal] = None
+    best_ask: Optional[Decimal] = None
+    bids: List[List[Decimal]] = field(default_factory=list)
+    asks: List[List[Decimal]] = field(default_factory=list)
+    book_updated_at: Optional[float] = None
+
+    @property
+    def qty_step(self) -> Optional[Decimal]:
+        return getattr(self.spec, "qty_step", None)
+
+    def reference_price(self, hedge_side: str, max_age_sec: float = 2.0) -> Optional[Decimal]:
+        """對沖方向可成交的頂檔價格（買看 ask、賣看 bid），過期返回 None"""
+        if self.book_updated_at is None or time.time() - self.book_updated_at > max_age_sec:
+            return None
+        return self.best_ask if hedge_side == "buy" else self.best_bid
+
+    def levels(self, hedge_side: str, max_age_sec: float = 2.0) -> Optional[List[List[Decimal]]]:
+        """對沖方向可吃的深度（買吃 asks、賣吃 bids），過期返回 None"""
+        if self.book_updated_at is None or time.time() - self.book_updated_at > max_age_sec:
+            return None
+        return self.asks if hedge_side == "buy" else self.bids
+
+
 class BaseHedgeEngine(ABC):
     """
     對沖引擎基類
@@ -111,6 +154,12 @@ class BaseHedgeEngine(ABC):
     RECOVERY_SUCCESS_REQUIRED = 3
     RECOVERY_CHECK_INTERVAL_SEC = 2.0
 
+    # 對沖上下文刷新
+    CONTEXT_TTL_SEC = 300                    # 交易對驗證/合約規格
+    CONTEXT_RETRY_SEC = 5.0                  # 驗證失敗 (valid=False) 的上下文重試間隔
+    CONTEXT_BOOK_INTERVAL_SEC = 1.0          # 頂檔參考價
+    CONTEXT_BOOK_DEPTH = 10                  # 保留的深度檔數
+
     def __init__(
         self,
         hedge_adapter,           # 對沖目標適配器
@@ -132,6 +181,10 @@ class BaseHedgeEngine(ABC):
         self._total_fallback = 0
         self._total_latency_ms = 0.0
 
+        # 預熱的對沖上下文
+        self._contexts: Dict[str, HedgeContext] = {}
+        self._context_task: Optional[asyncio.Task] = None
+
     @abstractmethod
     def map_symbol(self, source_symbol: str) -> str:
         """
@@ -160,6 +213,115 @@ class BaseHedgeEngine(ABC):
         """
         pass
 
+    # ==================== 對沖上下文 ====================
+
+    async def _resolve_context(self, source_symbol: str) -> HedgeContext:
+        """
+        解析對沖上下文（子類可覆寫以加入交易對驗證與合約規格）
+        """
+        return HedgeContext(source_symbol=source_symbol, hedge_symbol=self.map_symbol(source_symbol))
+
+    def get_context(self, source_symbol: str) -> Optional[HedgeContext]:
+        """讀取已預熱的上下文（不等待）"""
+        return self._contexts.get(source_symbol)
+
+    async def _ensure_context(self, source_symbol: str) -> HedgeContext:
+        """
+        讀取上下文，未預熱或上次驗證失敗時當場解析並快取
+
+        否定結果不當作有效快取: 驗證失敗可能只是 get_markets 暫時失敗，
+        每次對沖都重新解析 (市場列表本身有 TTL 快取，真正不存在的交易對成本很低)。
+        """
+        ctx = self._contexts.get(source_symbol)
+        if ctx is None or not ctx.valid:
+            fresh = await self._resolve_context(source_symbol)
+            if ctx is not None:
+                self._carry_book(fresh, ctx)
+            self._contexts[source_symbol] = ctx = fresh
+        return ctx
+
+    @staticmethod
+    def _carry_book(fresh: HedgeContext, old: HedgeContext):
+        """重新解析時沿用舊上下文的頂檔/深度"""
+        fresh.best_bid, fresh.best_ask = old.best_bid, old.best_ask
+        fresh.bids, fresh.asks = old.bids, old.asks
+        fresh.book_updated_at = old.book_updated_at
+
+    async def start_context_refresh(self, source_symbols: List[str]):
+        """
+        預熱對沖上下文並啟動背景刷新
+
+        Args:
+            source_symbols: 需要對沖的來源交易對
+        """
+        for symbol in source_symbols:
+            try:
+                self._contexts[symbol] = await self._resolve_context(symbol)
+                await self._refresh_book(self._contexts[symbol])
+                logger.info(f"Hedge context ready: {symbol} → {self._contexts[symbol].hedge_symbol}")
+            except Exception as e:
+                logger.warning(f"Failed to prepare hedge context for {symbol}: {e}")
+
+        if self._context_task is None or self._context_task.done():
+            self._context_task = asyncio.create_task(self._context_refresh_loop())
+
+    async def stop_context_refresh(self):
+        """停止背景刷新（上下文保留）"""
+        if self._context_task:
+            self._context_task.cancel()
+            try:
+                await self._context_task
+            except asyncio.CancelledError:
+                pass
+            self._context_task = None
+
+    async def _refresh_book(self, ctx: HedgeContext):
+        """更新頂檔參考價"""
+        if not ctx.hedge_symbol:
+            return
+        orderbook = await self.hedge_adapter.get_orderbook(ctx.hedge_symbol, limit=self.CONTEXT_BOOK_DEPTH)
+        if orderbook and orderbook.bids and orderbook.asks:
+            ctx.bids = orderbook.bids[:self.CONTEXT_BOOK_DEPTH]
+            ctx.asks = orderbook.asks[:self.CONTEXT_BOOK_DEPTH]
+            ctx.best_bid = ctx.bids[0][0]
+            ctx.best_ask = ctx.asks[0][0]
+            ctx.book_updated_at = time.time()
+
+    async def _context_refresh_loop(self):
+        """
+        背景刷新: 頂檔每 CONTEXT_BOOK_INTERVAL_SEC，其餘每 CONTEXT_TTL_SEC（失敗時保留舊值）；
+        驗證失敗的上下文每 CONTEXT_RETRY_SEC 重試
+        """
+        failures = 0
+        while True:
+            await asyncio.sleep(self.CONTEXT_BOOK_INTERVAL_SEC)
+            for symbol, ctx in list(self._contexts.items()):
+                try:
+                    ttl = self.CONTEXT_TTL_SEC if ctx.valid else self.CONTEXT_RETRY_SEC
+                    if time.time() - ctx.refreshed_at > ttl:
+                        fresh = await self._resolve_context(symbol)
+                        self._carry_book(fresh, ctx)
+                        self._contexts[symbol] = ctx = fresh
+                    await self._refresh_book(ctx)
+                    failures = 0
+                except Exception as e:
+                    failures += 1
+                    if failures == 1 or failures % 60 == 0:
+                        logger.warning(f"Hedge context refresh failed for {symbol} ({failures}): {e}")
+
+    def invalidate_contexts(self):
+        """標記上下文過期，下次背景刷新時重新解析（舊值在刷新前繼續使用）"""
+        for ctx in self._contexts.values():
+            ctx.refreshed_at = 0.0
+
+    def hedge_targets(self, source_symbol: str) -> List[Tuple[Any, str]]:
+        """
+        對沖倉位所在的 (適配器, 交易對) 列表
+
+        同步對沖倉位、緊急平倉時使用；多場所路由引擎會返回多個。
+        """
+        return [(self.hedge_adapter, self.map_symbol(source_symbol))]
+
     async def execute_fallback(
         self,
         side: str,
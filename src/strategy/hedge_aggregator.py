@@ -0,0 +1,274 @@
+"""
+對沖聚合器
+Hedge Aggregator
+
+逐筆對沖時，連續的小額成交 (例如 StandX 部分成交) 每筆都要付一次完整的
+execute_hedge 成本: 交易對驗證、合約規格、簽名、網路往返，以及 normalize_quantity
+的最小數量取整。本模組在微小時間窗內淨額化同一交易對的成交，只對淨敞口送出一筆對沖。
+
+送出條件 (任一滿足):
+- 窗口: 最後一筆成交後 window_ms 內沒有新成交 (滑動窗口)
+- 數量閾值: 淨敞口絕對值 >= size_threshold，立即送出
+- 最大敞口時間: 批次第一筆成交起 max_exposure_ms 必定送出，持續成交不會無限延後
+
+同一交易對同時只有一筆對沖在途，期間的成交累積到下一批；
+買賣互相抵銷為 0 時不下單。
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .base_hedge_engine import BaseHedgeEngine, HedgeResult, HedgeStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HedgeBatch:
+    """同一交易對的一批待對沖成交"""
+    symbol: str
+    fill_ids: List[str] = field(default_factory=list)
+    buy_qty: Decimal = Decimal("0")
+    buy_notional: Decimal = Decimal("0")
+    sell_qty: Decimal = Decimal("0")
+    sell_notional: Decimal = Decimal("0")
+    first_fill_at: float = field(default_factory=time.time)
+    last_fill_at: float = field(default_factory=time.time)
+    force: bool = False                      # flush() 要求立即送出
+
+    def add(self, fill_id: str, side: str, qty: Decimal, price: Decimal):
+        """加入一筆成交"""
+        self.fill_ids.append(fill_id)
+        if side == "buy":
+            self.buy_qty += qty
+            self.buy_notional += qty * price
+        else:
+            self.sell_qty += qty
+            self.sell_notional += qty * price
+        self.last_fill_at = time.time()
+
+    @property
+    def net_qty(self) -> Decimal:
+        """淨成交量 (正 = 主帳戶淨買入)"""
+        return self.buy_qty - self.sell_qty
+
+    @property
+    def fill_side(self) -> str:
+        """淨成交方向 (對沖方向相反)"""
+        return "buy" if self.net_qty > 0 else "sell"
+
+    @property
+    def qty(self) -> Decimal:
+        """需對沖的數量"""
+        return abs(self.net_qty)
+
+    @property
+    def reference_price(self) -> Decimal:
+        """淨方向成交的 VWAP (計算對沖滑點用)"""
+        if self.fill_side == "buy":
+            return self.buy_notional / self.buy_qty if self.buy_qty else Decimal("0")
+        return self.sell_notional / self.sell_qty if self.sell_qty else Decimal("0")
+
+    @property
+    def batch_id(self) -> str:
+        """單筆成交沿用原 fill_id，多筆則合成批次 ID"""
+        if len(self.fill_ids) == 1:
+            return self.fill_ids[0]
+        return f"batch_{self.fill_ids[0]}_{len(self.fill_ids)}"
+
+
+BatchResultHandler = Callable[[HedgeBatch, HedgeResult], Awaitable[None]]
+
+
+class HedgeAggregator:
+    """
+    對沖聚合器
+
+    使用方式:
+        aggregator = HedgeAggregator(hedge_engine, on_result=handle_result)
+        aggregator.submit(fill_id, "buy", qty, price, "BTC-USD")   # 同步，不等待對沖
+        await aggregator.flush()                                    # 停止前送出所有待對沖
+    """
+
+    def __init__(
+        self,
+        hedge_engine: BaseHedgeEngine,
+        on_result: BatchResultHandler,
+        window_ms: float = 30,
+        size_threshold: Optional[Decimal] = None,
+        max_exposure_ms: float = 150,
+    ):
+        """
+        Args:
+            hedge_engine: 對沖引擎
+            on_result: 每批對沖完成後的回調 (batch, result)
+            window_ms: 最後一筆成交後的等待窗口 (毫秒)，0 = 下一個事件循環即送出
+            size_threshold: 淨敞口達到此值立即送出 (None = 不限)
+            max_exposure_ms: 批次第一筆成交起最長未對沖時間 (毫秒)
+        """
+        self.hedge_engine = hedge_engine
+        self._on_result = on_result
+        self.window_ms = window_ms
+        self.size_threshold = size_threshold
+        self.max_exposure_ms = max_exposure_ms
+
+        self._pending: Dict[str, HedgeBatch] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+
+        # 統計
+        self.stats = {
+            'fills': 0,
+            'batches': 0,               # 實際送出的對沖
+            'orders_saved': 0,          # 相比逐筆對沖少送的訂單數
+            'netted_to_zero': 0,        # 買賣抵銷無需對沖的批次
+            'max_exposure_ms': 0.0,     # 觀察到的最長「首筆成交 → 送出對沖」時間
+        }
+
+    # ==================== 提交 ====================
+
+    def submit(self, fill_id: str, side: str, qty: Decimal, price: Decimal, symbol: str) -> HedgeBatch:
+        """
+        提交一筆成交 (同步，不等待對沖)
+
+        Returns:
+            該成交所在的批次
+        """
+        batch = self._pending.get(symbol)
+        if batch is None:
+            batch = HedgeBatch(symbol=symbol)
+            self._pending[symbol] = batch
+        batch.add(fill_id, side, qty, price)
+        self.stats['fills'] += 1
+
+        task = self._tasks.get(symbol)
+        if task is None or task.done():
+            self._tasks[symbol] = asyncio.create_task(self._run(symbol))
+        else:
+            self._wakeup(symbol).set()
+        return batch
+
+    def pending_qty(self, symbol: str) -> Decimal:
+        """尚未送出對沖的淨成交量 (正 = 淨買入)"""
+        batch = self._pending.get(symbol)
+        return batch.net_qty if batch else Decimal("0")
+
+    @property
+    def has_pending(self) -> bool:
+        """是否有待送出或在途的對沖"""
+        return bool(self._pending) or any(not t.done() for t in self._tasks.values())
+
+    async def flush(self):
+        """立即送出所有待對沖批次，並等待在途對沖完成"""
+        for symbol, batch in self._pending.items():
+            batch.force = True
+            self._wakeup(symbol).set()
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ==================== 批次處理 ====================
+
+    def _wakeup(self, symbol: str) -> asyncio.Event:
+        event = self._wakeups.get(symbol)
+        if event is None:
+            event = self._wakeups[symbol] = asyncio.Event()
+        return event
+
+    def _due_in(self, batch: HedgeBatch) -> float:
+        """距離批次應送出的秒數 (<= 0 表示應立即送出)"""
+        if batch.force:
+            return 0.0
+        if self.size_threshold is not None and batch.qty >= self.size_threshold:
+            return 0.0
+        deadline = min(
+            batch.last_fill_at + self.window_ms / 1000,
+            batch.first_fill_at + self.max_exposure_ms / 1000,
+        )
+        return deadline - time.time()
+
+    async def _run(self, symbol: str):
+        """單一交易對的批次循環: 等待送出條件 → 對沖 → 處理期間累積的下一批"""
+        wakeup = self._wakeup(symbol)
+        while True:
+            batch = self._pending.get(symbol)
+            if batch is None:
+                return
+
+            delay = self._due_in(batch)
+            if delay > 0:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            del self._pending[symbol]
+            await self._execute(batch)
+
+    async def _execute(self, batch: HedgeBatch):
+        """對批次淨敞口送出一筆對沖"""
+        exposure_ms = (time.time() - batch.first_fill_at) * 1000
+        self.stats['max_exposure_ms'] = max(self.stats['max_exposure_ms'], exposure_ms)
+
+        if batch.qty == 0:
+            self.stats['netted_to_zero'] += 1
+            logger.info(f"[HedgeBatch] {batch.symbol} {len(batch.fill_ids)} fills netted to zero, no hedge needed")
+            return
+
+        self.stats['batches'] += 1
+        self.stats['orders_saved'] += len(batch.fill_ids) - 1
+        if len(batch.fill_ids) > 1:
+            logger.info(
+                f"[HedgeBatch] {batch.symbol} netting {len(batch.fill_ids)} fills → "
+                f"{batch.fill_side} {batch.qty} @ {batch.reference_price:.2f} (exposure {exposure_ms:.0f}ms)"
+            )
+
+        try:
+            # 位置參數: 各引擎的交易對參數名不同 (source_symbol / standx_symbol)
+            result = await self.hedge_engine.execute_hedge(
+                batch.batch_id,
+                batch.fill_side,
+                batch.qty,
+                batch.reference_price,
+                batch.symbol,
+            )
+        except Exception as e:
+            logger.error(f"[HedgeBatch] execute_hedge error: {e}", exc_info=True)
+            result = HedgeResult(
+                success=False,
+                status=HedgeStatus.FAILED,
+                source_fill_id=batch.batch_id,
+                source_symbol=batch.symbol,
+                requested_qty=batch.qty,
+                hedge_side="sell" if batch.fill_side == "buy" else "buy",
+                error_message=str(e),
+            )
+
+        try:
+            await self._on_result(batch, result)
+        except Exception as e:
+            logger.error(f"[HedgeBatch] result handler error: {e}", exc_info=True)
+
+    async def stop(self):
+        """取消所有批次任務 (不送出待對沖，需要送出請先 flush)"""
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._pending.clear()
+
+    def get_stats(self) -> Dict:
+        """聚合統計"""
+        return {
+            **self.stats,
+            'max_exposure_ms': round(self.stats['max_exposure_ms'], 1),
+            'pending': {symbol: str(batch.net_qty) for symbol, batch in self._pending.items()},
+            'window_ms': self.window_ms,
+            'max_exposure_limit_ms': self.max_exposure_ms,
+        }
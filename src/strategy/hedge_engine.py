@@ -19,6 +19,7 @@ from datetime import datetime
 from .base_hedge_engine import (
     BaseHedgeEngine,
     BaseHedgeConfig,
+    HedgeContext,
     HedgeResult,
     HedgeStatus,
 )
@@ -143,8 +144,21 @@ class HedgeEngine(BaseHedgeEngine):
         """手動清除快取（熱更新用）"""
         self._valid_symbols = None
         self._valid_symbols_ts = None
+        self.invalidate_contexts()
         logger.info("HedgeEngine caches invalidated")
 
+    async def _resolve_context(self, source_symbol: str) -> HedgeContext:
+        """解析對沖上下文: 交易對映射 + 驗證 + 合約規格"""
+        hedge_symbol = self._match_hedge_symbol(source_symbol) or ""
+        ctx = HedgeContext(source_symbol=source_symbol, hedge_symbol=hedge_symbol)
+        if not hedge_symbol:
+            ctx.valid = False
+            return ctx
+        ctx.valid = await self._validate_hedge_symbol(hedge_symbol)
+        if ctx.valid:
+            ctx.spec = await self.hedge_adapter.get_contract_spec(hedge_symbol)
+        return ctx
+
     # ==================== 主對沖流程 ====================
 
     async def execute_hedge(
@@ -166,8 +180,11 @@ class HedgeEngine(BaseHedgeEngine):
         # 對沖方向 (反向)
         hedge_side = "sell" if fill_side == "buy" else "buy"
 
-        # 匹配對沖交易對
-        hedge_symbol = self._match_hedge_symbol(standx_symbol)
+        # 預熱的上下文（交易對映射、驗證、合約規格），未預熱或上次驗證失敗時當場解析
+        ctx = self.get_context(standx_symbol)
+        if ctx is None or not ctx.valid:
+            ctx = await self._ensure_context(standx_symbol)
+        hedge_symbol = ctx.hedge_symbol
 
         result = HedgeResult(
             success=False,
@@ -175,7 +192,7 @@ class HedgeEngine(BaseHedgeEngine):
             source_fill_id=fill_id,
             started_at=datetime.now(),
             source_symbol=standx_symbol,
-            hedge_symbol=hedge_symbol or "",
+            hedge_symbol=hedge_symbol,
             requested_qty=fill_qty,
             hedge_side=hedge_side,
         )
@@ -188,16 +205,15 @@ class HedgeEngine(BaseHedgeEngine):
             return result
 
         # 驗證交易對存在
-        if not await self._validate_hedge_symbol(hedge_symbol):
+        if not ctx.valid:
             result.status = HedgeStatus.FAILED
             result.error_message = f"Hedge symbol {hedge_symbol} not found on GRVT"
             logger.error(result.error_message)
             return result
 
-        # 獲取合約規格並正規化數量
-        spec = await self.hedge_adapter.get_contract_spec(hedge_symbol)
-        if spec:
-            normalized_qty = self.hedge_adapter.normalize_quantity(fill_qty, spec)
+        # 合約規格正規化數量
+        if ctx.spec:
+            normalized_qty = self.hedge_adapter.normalize_quantity(fill_qty, ctx.spec)
             if normalized_qty is None:
                 result.status = HedgeStatus.FAILED
                 result.error_message = f"Quantity {fill_qty} below minimum for {hedge_symbol}"
@@ -208,6 +224,17 @@ class HedgeEngine(BaseHedgeEngine):
             normalized_qty = fill_qty
             result.normalized_qty = fill_qty
 
+        # 頂檔參考價: 偏離來源成交價超過 max_slippage_bps 時提示；
+        # 查不到成交價時用它代替來源價格
+        book_price = ctx.reference_price(hedge_side)
+        if book_price and fill_price:
+            expected_slippage = self._calculate_slippage(fill_price, book_price, hedge_side)
+            if expected_slippage < -self.config.max_slippage_bps:
+                logger.warning(
+                    f"Hedge top-of-book {book_price} is {-expected_slippage:.1f} bps worse than "
+                    f"fill price {fill_price} (limit {self.config.max_slippage_bps} bps)"
+                )
+
         logger.info(f"Starting hedge: {standx_symbol} → {hedge_symbol}, {hedge_side} {normalized_qty}")
 
         # 重試執行
@@ -220,7 +247,7 @@ class HedgeEngine(BaseHedgeEngine):
                 hedge_result = await self._execute_two_phase_hedge(
                     side=hedge_side,
                     qty=normalized_qty,
-                    reference_price=fill_price,
+                    reference_price=book_price or fill_price,
                     timeout_ms=self.config.timeout_ms,
                     hedge_symbol=hedge_symbol,
                 )
@@ -254,15 +281,19 @@ class HedgeEngine(BaseHedgeEngine):
 
                 else:
                     result.error_message = hedge_result.get("error", "Unknown error")
+                    if hedge_result.get("unknown"):
+                        result.fill_unknown = True
                     logger.warning(f"Hedge attempt {attempt} failed: {result.error_message}")
 
             except asyncio.TimeoutError:
                 result.error_message = "Timeout"
                 result.status = HedgeStatus.TIMEOUT
+                result.fill_unknown = True
                 logger.warning(f"Hedge attempt {attempt} timeout")
 
             except Exception as e:
                 result.error_message = str(e)
+                result.fill_unknown = True
                 logger.error(f"Hedge attempt {attempt} error: {e}")
 
             # 重試前等待
@@ -315,7 +346,8 @@ class HedgeEngine(BaseHedgeEngine):
             logger.info(f"Hedge order placed: {order.order_id}")
 
         except asyncio.TimeoutError:
-            return {"success": False, "error": "Order placement timeout"}
+            # 請求可能已到達交易所
+            return {"success": False, "error": "Order placement timeout", "unknown": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -377,7 +409,7 @@ class HedgeEngine(BaseHedgeEngine):
         except Exception:
             pass
 
-        return {"success": False, "error": "Order status unknown after timeout"}
+        return {"success": False, "error": "Order status unknown after timeout", "unknown": True}
 
     # ==================== 風控處理 ====================
 
@@ -23,10 +23,15 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
 
 from .mm_state import MMState, OrderInfo, FillEvent, EventDeduplicator, OrderThrottle
 from .hedge_engine import HedgeEngine, HedgeResult, HedgeStatus
+from .hedge_aggregator import HedgeAggregator, HedgeBatch
+from .quote_intent import QuoteIntent
+from .order_ladder import LadderDiff, LadderLevel, LadderTargets, OrderLadder, parse_ladder_levels
+from ..adapters.base_adapter import BatchOrderResult, CancelRequest, OrderRequest
+from ..utils.hot_log import get_hot_logger
+from ..utils.trade_journal import get_trade_journal
 
 # WebSocket types (conditional import)
 try:
@@ -36,105 +41,18 @@ except ImportError:
     GRVTOrderStateEvent = None
 
 logger = logging.getLogger(__name__)
+hot_log = get_hot_logger(__name__)   # 熱路徑日誌 (取樣/限速，見 src/utils/hot_log.py)
 
 # ==================== 交易日誌設置 ====================
-# 專門記錄掛單、撤單、成交等操作的日誌
-# 每次 executor 啟動建立新的 log 檔案，方便追蹤各 session
+# 專門記錄掛單、撤單、成交等操作的結構化日誌 (JSON lines，見 src/utils/trade_journal.py)
+# 每次 executor 啟動建立新的 session 檔案；寫入由背景線程批量完成，不阻塞交易路徑
 # 注意：模組載入時不建立檔案，只有 executor.start() 呼叫時才建立
-
-# 全域變數：當前 session 的 log 檔案路徑
-_current_trade_log_file: Optional[Path] = None
-
-def _setup_trade_logger(exchange: str = "mm", create_file: bool = False):
-    """
-    設置交易日誌
-
-    Args:
-        exchange: 交易所名稱，用於檔案命名 (mm, grvt, standx)
-        create_file: 是否建立新的 log 檔案（只有 executor.start() 時設為 True）
-    """
-    global _current_trade_log_file
-
-    trade_logger = logging.getLogger("mm_trade")
-
-    # 模組載入時：只設定 logger，不建立檔案
-    if not create_file:
-        if not trade_logger.handlers:
-            trade_logger.setLevel(logging.INFO)
-            trade_logger.propagate = False
-            # 加一個 NullHandler 避免 "No handlers" 警告
-            trade_logger.addHandler(logging.NullHandler())
-        return trade_logger
-
-    # ==================== Executor 啟動時：建立新的 log 檔案 ====================
-    # 清除舊 handlers
-    for handler in trade_logger.handlers[:]:
-        handler.close()
-        trade_logger.removeHandler(handler)
-
-    trade_logger.setLevel(logging.INFO)
-    trade_logger.propagate = False
-
-    # 創建 logs 目錄
-    log_dir = Path(__file__).parent.parent.parent / "logs"
-    log_dir.mkdir(exist_ok=True)
-
-    # 依時間戳建立新檔案
-    from datetime import datetime
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = log_dir / f"mm_trades_{timestamp}.log"
-    _current_trade_log_file = log_file
-
-    # 使用 FileHandler
-    file_handler = logging.FileHandler(
-        log_file,
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.INFO)
-
-    # 格式
-    formatter = logging.Formatter(
-        '%(asctime)s | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(formatter)
-
-    trade_logger.addHandler(file_handler)
-
-    # 清理舊 log 檔案（保留最近 20 個）
-    _cleanup_old_logs(log_dir, keep_count=20)
-
-    return trade_logger
-
-
-def _cleanup_old_logs(log_dir: Path, keep_count: int = 20):
-    """清理舊的 log 檔案，只保留最近 N 個"""
-    try:
-        # 找出所有 mm_trades_*.log 檔案
-        log_files = sorted(
-            log_dir.glob("mm_trades_*.log"),
-            key=lambda f: f.stat().st_mtime,
-            reverse=True  # 最新的在前
-        )
-
-        # 刪除超過數量的舊檔案
-        for old_file in log_files[keep_count:]:
-            try:
-                old_file.unlink()
-                logger.debug(f"Cleaned up old log: {old_file.name}")
-            except Exception as e:
-                logger.warning(f"Failed to delete old log {old_file.name}: {e}")
-    except Exception as e:
-        logger.warning(f"Failed to cleanup old logs: {e}")
+trade_log = get_trade_journal()
 
 
 def get_current_trade_log_file() -> Optional[Path]:
     """獲取當前 session 的 log 檔案路徑"""
-    return _current_trade_log_file
-
-
-# 初始化 trade_log（模組載入時建立第一個檔案）
-trade_log = _setup_trade_logger()
+    return trade_log.current_file
 
 
 class ExecutorStatus(Enum):
@@ -197,6 +115,7 @@ class MMConfig:
     order_distance_bps: int = 12         # 掛單距離 mark price (保守模式，犧牲 uptime tier 換取安全)
     cancel_distance_bps: int = 5         # 價格靠近時撤單（防止成交，~$46 緩衝）
     rebalance_distance_bps: int = 18     # 價格遠離時撤單重掛
+    rebalance_replace: bool = True       # 重掛用 replace_order（先掛後撤/原生改單），盤口不留空窗
 
     # ==================== Fill Skew 參數（成交後推遠保護）====================
     # 成交後將該側訂單推遠，防止單邊行情連續被吃
@@ -217,12 +136,22 @@ class MMConfig:
     resume_check_count: int = 3                          # 連續 N 次滿足才恢復
     min_effective_max_pos_btc: Decimal = Decimal("0.001")  # effective_max_pos 下限
 
+    # WebSocket 模式下倉位由 WS 成交/倉位推送驅動 (見 position_ledger.py)，REST 只做慢速調和
+    position_reconcile_sec: float = 30.0                 # REST 倉位調和間隔（輪詢模式仍為 2 秒）
+
     # ==================== 成交後行為 ====================
     # "all": 撤銷雙邊（有對沖時用）
-    # "opposite": 只撤對手邊（通用）
+    # "opposite": 只撤對手邊（通用；階梯模式撤對手邊全部檔位）
     # "none": 不撤銷（無對沖回補模式）
     fill_cancel_policy: str = "none"
 
+    # ==================== 對沖聚合（淨額化連續成交）====================
+    # 連續部分成交只送一筆淨額對沖，減少對沖訂單數與手續費
+    hedge_batch_enabled: bool = True
+    hedge_batch_window_ms: int = 30             # 最後一筆成交後無新成交多久即送出
+    hedge_batch_max_qty: Decimal = Decimal("0.003")  # 淨敞口達到此值立即送出
+    hedge_max_exposure_ms: int = 150            # 批次第一筆成交起最長未對沖時間
+
     # Stale order reprice 參數 (避免洗單)
     stale_order_timeout_sec: int = 30           # 回補訂單過期時間
     stale_reprice_bps: Decimal = Decimal("2")   # 距離 best 超過此值才 reprice
@@ -249,6 +178,22 @@ class MMConfig:
     dry_run: bool = False                # 模擬模式
     disappear_time_sec: float = 2.0      # 訂單消失判定時間（秒）
 
+    # ==================== 報價意圖（減少重算與改單）====================
+    quote_tolerance_ticks: int = 1                    # 訂單與目標價相差在此 tick 數內不改單
+    quote_skew_bucket_bps: Decimal = Decimal("0.5")   # fill skew / 波動率分桶大小
+    quote_full_refresh_sec: float = 2.0               # 輸入不變時最長多久跑一次完整 tick
+
+    # ==================== 階梯報價（每側多檔）====================
+    ladder_enabled: bool = False                      # 啟用後取代單一 bid/ask
+    ladder_levels: str = "0:0.001,10:0.001,25:0.002"  # "額外距離bps:數量"，第一檔為單檔報價位置
+    ladder_sync_ticks: int = 10                       # WebSocket 模式下每 N 個 tick 與交易所對帳
+
+    def __setattr__(self, name, value):
+        # 任何欄位變更都遞增 version，報價快取以此判斷配置是否改變
+        object.__setattr__(self, name, value)
+        if name != "version":
+            object.__setattr__(self, "version", getattr(self, "version", 0) + 1)
+
 
 class MarketMakerExecutor:
     """
@@ -276,6 +221,28 @@ class MarketMakerExecutor:
         self.config = config or MMConfig()
         self.state = state or MMState(volatility_window_sec=self.config.volatility_window_sec)
 
+        # 報價意圖快取（目標價記憶化、tick 短路、改單容忍帶）
+        self._quote_intent = QuoteIntent(
+            tolerance_ticks=self.config.quote_tolerance_ticks,
+            full_refresh_sec=self.config.quote_full_refresh_sec,
+        )
+
+        # 階梯報價
+        self._ladder = OrderLadder()
+        self._ladder_spec: Optional[str] = None
+        self._ladder_levels: List[LadderLevel] = []
+
+        # 對沖聚合器（淨額化連續成交）
+        self._hedge_aggregator: Optional[HedgeAggregator] = None
+        if self.hedge_engine is not None and self.config.hedge_batch_enabled:
+            self._hedge_aggregator = HedgeAggregator(
+                self.hedge_engine,
+                on_result=self._on_batch_hedge_result,
+                window_ms=self.config.hedge_batch_window_ms,
+                size_threshold=self.config.hedge_batch_max_qty,
+                max_exposure_ms=self.config.hedge_max_exposure_ms,
+            )
+
         # 【新增】GRVT adapter 引用
         self.grvt = grvt_adapter
 
@@ -305,6 +272,7 @@ class MarketMakerExecutor:
         # 統計
         self._total_quotes = 0
         self._total_cancels = 0
+        self._total_replaces = 0
         self._started_at: Optional[datetime] = None
 
         # 重入保護鎖
@@ -363,24 +331,19 @@ class MarketMakerExecutor:
         self._exposure_hedge_interval: float = 10.0  # 淨敞口對沖檢查間隔（秒）
         self._exposure_hedge_threshold: Decimal = Decimal("0.0001")  # 淨敞口對沖閾值（BTC）
         self._exposure_hedging: bool = False  # 是否正在執行淨敞口對沖
+        self._last_exposure_status_log: float = 0  # 上次記錄淨敞口狀態時間
 
     # ==================== 生命週期 ====================
 
     async def start(self):
         """啟動做市"""
-        global trade_log
-
         if self._running:
             logger.warning("Executor already running")
             return
 
         # ==================== 建立新的 log 檔案 ====================
         # 每次 executor 啟動都建立新的 session log
-        trade_log = _setup_trade_logger(
-            exchange=self.config.primary_exchange,
-            create_file=True
-        )
-        log_file = get_current_trade_log_file()
+        log_file = trade_log.open_session(self.config.primary_exchange)
         logger.info(f"Trade log file: {log_file}")
 
         # 【診斷】啟動時打印完整配置
@@ -393,29 +356,24 @@ class MarketMakerExecutor:
         logger.info(f"  max_position_btc={self.config.max_position_btc}")
 
         # 交易日誌 - 啟動配置
-        trade_log.info("=" * 80)
-        trade_log.info(f"EXECUTOR_START | exchange={self.config.primary_exchange} | symbol={self.config.symbol}")
-        trade_log.info(
-            f"CONFIG | exchange={self.config.primary_exchange} | "
-            f"strategy_mode={self.config.strategy_mode} | aggressiveness={self.config.aggressiveness} | "
-            f"order_size={self.config.order_size_btc} | max_pos={self.config.max_position_btc}"
-        )
-        trade_log.info(
-            f"CONFIG | fill_skew_enabled={self.config.fill_skew_enabled} | "
-            f"fill_skew_bps={self.config.fill_skew_bps} | "
-            f"fill_skew_max_bps={self.config.fill_skew_max_bps} | "
-            f"decay_sec={self.config.fill_skew_decay_sec}"
-        )
-        trade_log.info(
-            f"CONFIG | hard_stop={self.config.hard_stop_position_btc} | "
-            f"resume_pos={self.config.resume_position_btc} | "
-            f"fill_policy={self.config.fill_cancel_policy}"
-        )
-        trade_log.info(
-            f"CONFIG | breakeven_enabled={self.config.breakeven_reversion_enabled} | "
-            f"breakeven_offset={self.config.breakeven_offset_bps}"
+        trade_log.event("EXECUTOR_START", exchange=self.config.primary_exchange, symbol=self.config.symbol)
+        trade_log.event(
+            "CONFIG",
+            exchange=self.config.primary_exchange,
+            strategy_mode=self.config.strategy_mode,
+            aggressiveness=self.config.aggressiveness,
+            order_size=self.config.order_size_btc,
+            max_pos=self.config.max_position_btc,
+            fill_skew_enabled=self.config.fill_skew_enabled,
+            fill_skew_bps=self.config.fill_skew_bps,
+            fill_skew_max_bps=self.config.fill_skew_max_bps,
+            decay_sec=self.config.fill_skew_decay_sec,
+            hard_stop=self.config.hard_stop_position_btc,
+            resume_pos=self.config.resume_position_btc,
+            fill_policy=self.config.fill_cancel_policy,
+            breakeven_enabled=self.config.breakeven_reversion_enabled,
+            breakeven_offset=self.config.breakeven_offset_bps,
         )
-        trade_log.info("=" * 80)
 
         self._status = ExecutorStatus.STARTING
 
@@ -423,6 +381,10 @@ class MarketMakerExecutor:
             # 初始化：同步狀態
             await self._initialize()
 
+            # 預熱對沖上下文（交易對映射/驗證/合約規格/頂檔），成交時不再查詢
+            if self.hedge_engine:
+                await self.hedge_engine.start_context_refresh([self.config.symbol])
+
             # 啟動主循環
             self._running = True
             self._status = ExecutorStatus.RUNNING
@@ -451,9 +413,7 @@ class MarketMakerExecutor:
 
         # 交易日誌 - 停止
         pos = self._get_primary_position()
-        trade_log.info("=" * 80)
-        trade_log.info(f"EXECUTOR_STOP | exchange={self.config.primary_exchange} | final_pos={pos}")
-        trade_log.info("=" * 80)
+        trade_log.event("EXECUTOR_STOP", exchange=self.config.primary_exchange, final_pos=pos)
         self._running = False
 
         # Stop WebSocket if running
@@ -473,8 +433,16 @@ class MarketMakerExecutor:
             except asyncio.CancelledError:
                 pass
 
+        # 送出尚在聚合窗口內的對沖，避免留下未對沖敞口
+        if self._hedge_aggregator:
+            await self._hedge_aggregator.flush()
+
+        if self.hedge_engine:
+            await self.hedge_engine.stop_context_refresh()
+
         # 撤銷所有訂單
         await self._cancel_all_orders(reason="stop")
+        self.state.stop_uptime()
 
         self._status = ExecutorStatus.STOPPED
         if self._on_status_change:
@@ -524,23 +492,35 @@ class MarketMakerExecutor:
             logger.info(f"[Cancel] Found {len(open_orders)} open orders")
             if open_orders:
                 logger.info(f"Cancelling {len(open_orders)} existing orders")
-                for order in open_orders:
-                    try:
-                        logger.info(f"[Cancel] Cancelling order: order_id={order.order_id}, client_order_id={order.client_order_id} @ {order.price}")
-                        # 傳遞 order_id 和 client_order_id，讓 adapter 決定使用哪個
-                        await self.primary.cancel_order(
-                            symbol=self.config.symbol,
-                            order_id=order.order_id,
-                            client_order_id=order.client_order_id
-                        )
-                        logger.info(f"Cancelled existing order: {order.order_id}")
-                    except Exception as e:
-                        logger.warning(f"Failed to cancel order {order.order_id}: {e}")
+                results = await self._cancel_exchange_orders(open_orders, "Cancel")
+                cancelled = sum(1 for r in results if r.success)
+                logger.info(f"Cancelled {cancelled}/{len(open_orders)} existing orders")
             else:
                 logger.info("No existing orders to cancel")
         except Exception as e:
             logger.error(f"Failed to get existing orders: {e}", exc_info=True)
 
+    async def _cancel_exchange_orders(self, orders: list, context: str) -> List[BatchOrderResult]:
+        """
+        批量撤銷交易所上的訂單 (孤兒/重複/未追蹤訂單清理)
+
+        傳遞 order_id 和 client_order_id，讓 adapter 決定使用哪個；失敗逐筆記錄。
+        """
+        if not orders:
+            return []
+        results = await self.primary.cancel_orders([
+            CancelRequest(
+                symbol=self.config.symbol,
+                order_id=order.order_id,
+                client_order_id=getattr(order, 'client_order_id', None),
+            )
+            for order in orders
+        ])
+        for result in results:
+            if not result.success:
+                logger.warning(f"[{context}] Failed to cancel {result.request.order_id}: {result.error}")
+        return results
+
     async def _init_websocket(self):
         """
         Initialize WebSocket for real-time fill detection
@@ -574,6 +554,11 @@ class MarketMakerExecutor:
                 self.primary.on_order_state(self._on_ws_order_state)
                 logger.info("[WebSocket] Registered order state callback")
 
+            # Register position callback (optional) - feeds the position ledger
+            if hasattr(self.standx, 'on_position'):
+                self.primary.on_position(self._on_ws_position)
+                logger.info("[WebSocket] Registered position callback")
+
             # Start WebSocket with the trading symbol
             # Use appropriate symbol format based on adapter type
             adapter_type = type(self.standx).__name__
@@ -740,8 +725,19 @@ class MarketMakerExecutor:
             is_maker=is_maker,
         )
 
+        # Update the position ledger first so on_fill_event sees the new position without a REST call
+        self._apply_ws_position_fill(side, fill_qty)
+
         # Clear the corresponding order from local state
-        if side == "buy":
+        if self.config.ladder_enabled:
+            found = self._ladder.find(order_id=order_id, client_order_id=client_order_id)
+            if found:
+                _, ladder_order = found
+                ladder_order.cum_filled_qty += fill_qty
+                if ladder_order.cum_filled_qty >= ladder_order.qty:
+                    self._ladder.remove(client_order_id=ladder_order.client_order_id)
+                    self._update_uptime()
+        elif side == "buy":
             self.state.clear_bid_order()
         else:
             self.state.clear_ask_order()
@@ -749,6 +745,30 @@ class MarketMakerExecutor:
         # Process the fill event
         await self.on_fill_event(internal_fill)
 
+    def _apply_ws_position_fill(self, side: str, fill_qty: Decimal):
+        """WS 成交 → 倉位帳本增量更新 (同步舊版欄位)"""
+        delta = fill_qty if str(side).lower() in ("buy", "long") else -fill_qty
+        position = self.state.apply_position_fill(self.config.primary_exchange, self.config.symbol, delta)
+        self.state.set_standx_position(position)
+
+    async def _on_ws_position(self, position_event):
+        """
+        Handle position push from WebSocket
+
+        Supports both StandX (PositionUpdate.symbol) and GRVT (GRVTPositionEvent.instrument).
+        Both report a signed size (positive = long).
+        """
+        symbol = getattr(position_event, 'symbol', None) or getattr(position_event, 'instrument', '')
+        symbol_base = self.config.symbol.upper().replace("-", "_").replace("/", "_").split("_")[0]
+        if symbol.upper().replace("-", "_").replace("/", "_").split("_")[0] != symbol_base:
+            return
+
+        position = self.state.apply_position_push(
+            self.config.primary_exchange, self.config.symbol, position_event.size
+        )
+        self.state.set_standx_position(position)
+        hot_log.debug("[WebSocket Position] %s size=%s -> ledger=%s", symbol, position_event.size, position)
+
     async def _on_ws_order_state(self, order_event):
         """
         Handle order state event from WebSocket
@@ -808,6 +828,12 @@ class MarketMakerExecutor:
 
     def _clear_order_from_state(self, order_id: str, client_order_id: str = None, record_post_only: bool = False):
         """Helper to clear order from local state by order_id or client_order_id"""
+        if self._ladder.remove(order_id=order_id, client_order_id=client_order_id):
+            self._update_uptime()
+            if record_post_only:
+                self.state.record_post_only_reject()
+            return
+
         bid = self.state.get_bid_order()
         ask = self.state.get_ask_order()
 
@@ -855,8 +881,8 @@ class MarketMakerExecutor:
 
         # 每 10 個 tick 記錄一次 WebSocket 狀態（診斷用）
         self._tick_count = getattr(self, '_tick_count', 0) + 1
-        if self._tick_count % 10 == 1:
-            logger.debug(f"[Tick] ws_enabled={self._use_websocket}, ws_connected={self._ws_connected}")
+        hot_log.count("tick")
+        hot_log.debug("[Tick] ws_enabled=%s, ws_connected=%s", self._use_websocket, self._ws_connected, every=10)
 
         # ==================== 硬停自動恢復（帶 hysteresis） ====================
         if self._status == ExecutorStatus.PAUSED and self._hard_stop_time:
@@ -923,12 +949,7 @@ class MarketMakerExecutor:
             self._last_best_ask = best_ask
             self.state.update_price(mid_price)
 
-            # 更新 uptime 統計
-            bid_order = self.state.get_bid_order()
-            ask_order = self.state.get_ask_order()
-            bid_price = bid_order.price if bid_order else None
-            ask_price = ask_order.price if ask_order else None
-            self.state.update_uptime(mid_price, bid_price, ask_price)
+            self._update_uptime()
 
         except Exception as e:
             logger.error(f"Failed to get orderbook: {e}")
@@ -961,6 +982,14 @@ class MarketMakerExecutor:
         # 所以不再需要固定間隔同步，避免重複查詢浪費 rate limit
         # 舊代碼：if self._tick_count % 5 == 0: await self._sync_open_orders()
 
+        # ==================== 報價意圖短路 ====================
+        # 容忍帶/完整刷新間隔每 tick 從配置讀取，運行時改配置立即生效
+        self._quote_intent.tolerance_ticks = self.config.quote_tolerance_ticks
+        self._quote_intent.full_refresh_sec = self.config.quote_full_refresh_sec
+        # 價格 tick、倉位、掛單、skew/波動率區間、配置都沒變時，後續流程的結果不會不同
+        if self._tick_skippable() and self._quote_intent.should_skip_tick(self._tick_inputs(best_bid, best_ask)):
+            return
+
         # 檢查波動率 (使用 hysteresis + stable period)
         volatility = self.state.get_volatility_bps()
         pause_threshold = self.config.volatility_threshold_bps
@@ -1014,6 +1043,12 @@ class MarketMakerExecutor:
                     # 仍在等待穩定期
                     return
 
+        # 階梯模式：差異改單取代以下單檔流程（撤單/排隊/保本過期/重掛/REST gate）
+        if self.config.ladder_enabled:
+            await self._tick_ladder(mid_price, best_bid, best_ask)
+            self._update_uptime()
+            return
+
         # 檢查是否需要撤單 (價格太近)
         # 只在 uptime 模式或 cancel_on_approach=True 時執行
         # rebate 模式不撤單 - 讓訂單成交以獲得 maker rebate
@@ -1092,12 +1127,16 @@ class MarketMakerExecutor:
             self.config.rebalance_distance_bps
         )
         if should_rebalance:
-            # 記錄重掛
-            if self.state.has_bid_order():
+            # 只重掛目標價移出容忍帶的一側（例如保本回補側目標價不變時保留）
+            bid_target, ask_target = self._quote_targets(mid_price, best_bid, best_ask)
+            bid = self.state.get_bid_order()
+            ask = self.state.get_ask_order()
+            if bid and self._quote_intent.needs_requote(bid.price, bid_target, self._tick_size):
                 self.state.record_rebalance("buy")
-            if self.state.has_ask_order():
+                await self._rebalance_order(bid, bid_target, best_bid, best_ask)
+            if ask and self._quote_intent.needs_requote(ask.price, ask_target, self._tick_size):
                 self.state.record_rebalance("sell")
-            await self._cancel_all_orders(reason="rebalance")
+                await self._rebalance_order(ask, ask_target, best_bid, best_ask)
 
         # 掛單（傳遞 best_bid/best_ask 以確保不穿透價差）
         await self._place_orders(mid_price, best_bid, best_ask)
@@ -1167,73 +1206,45 @@ class MarketMakerExecutor:
                 # 交易所有 bid 但本地沒有 → 取消孤兒訂單（避免重複下單）
                 if exchange_bids and not self.state.has_bid_order():
                     logger.warning(f"[REST Gate] Exchange has {len(exchange_bids)} orphan bids, cancelling")
-                    for order in exchange_bids:
-                        try:
-                            await self.primary.cancel_order(
-                                symbol=self.config.symbol,
-                                order_id=order.order_id,
-                                client_order_id=getattr(order, 'client_order_id', None)
-                            )
-                            trade_log.info(
-                                f"REST_GATE_CANCEL | exchange={self.config.primary_exchange} | side=buy | "
-                                f"order_id={order.order_id} | reason=orphan_order"
+                    for result in await self._cancel_exchange_orders(exchange_bids, "REST Gate"):
+                        if result.success:
+                            trade_log.event(
+                                "REST_GATE_CANCEL", exchange=self.config.primary_exchange, side="buy",
+                                order_id=result.request.order_id, reason="orphan_order",
                             )
-                        except Exception as e:
-                            logger.error(f"[REST Gate] Failed to cancel orphan bid: {e}")
                     exchange_bids = []  # 已取消，視為沒有
 
                 if exchange_asks and not self.state.has_ask_order():
                     logger.warning(f"[REST Gate] Exchange has {len(exchange_asks)} orphan asks, cancelling")
-                    for order in exchange_asks:
-                        try:
-                            await self.primary.cancel_order(
-                                symbol=self.config.symbol,
-                                order_id=order.order_id,
-                                client_order_id=getattr(order, 'client_order_id', None)
+                    for result in await self._cancel_exchange_orders(exchange_asks, "REST Gate"):
+                        if result.success:
+                            trade_log.event(
+                                "REST_GATE_CANCEL", exchange=self.config.primary_exchange, side="sell",
+                                order_id=result.request.order_id, reason="orphan_order",
                             )
-                            trade_log.info(
-                                f"REST_GATE_CANCEL | exchange={self.config.primary_exchange} | side=sell | "
-                                f"order_id={order.order_id} | reason=orphan_order"
-                            )
-                        except Exception as e:
-                            logger.error(f"[REST Gate] Failed to cancel orphan ask: {e}")
                     exchange_asks = []
 
                 # 交易所有多個同方向訂單 → 取消多餘的
                 if len(exchange_bids) > 1:
                     logger.warning(f"[REST Gate] Multiple bids ({len(exchange_bids)}), cancelling extras")
                     sorted_bids = sorted(exchange_bids, key=lambda o: getattr(o, 'created_at', 0), reverse=True)
-                    for order in sorted_bids[1:]:
-                        try:
-                            await self.primary.cancel_order(
-                                symbol=self.config.symbol,
-                                order_id=order.order_id,
-                                client_order_id=getattr(order, 'client_order_id', None)
-                            )
-                            trade_log.info(
-                                f"REST_GATE_CANCEL | exchange={self.config.primary_exchange} | side=buy | "
-                                f"order_id={order.order_id} | reason=duplicate"
+                    for result in await self._cancel_exchange_orders(sorted_bids[1:], "REST Gate"):
+                        if result.success:
+                            trade_log.event(
+                                "REST_GATE_CANCEL", exchange=self.config.primary_exchange, side="buy",
+                                order_id=result.request.order_id, reason="duplicate",
                             )
-                        except Exception as e:
-                            logger.error(f"[REST Gate] Failed to cancel duplicate bid: {e}")
                     exchange_bids = [sorted_bids[0]]  # 只保留最新的
 
                 if len(exchange_asks) > 1:
                     logger.warning(f"[REST Gate] Multiple asks ({len(exchange_asks)}), cancelling extras")
                     sorted_asks = sorted(exchange_asks, key=lambda o: getattr(o, 'created_at', 0), reverse=True)
-                    for order in sorted_asks[1:]:
-                        try:
-                            await self.primary.cancel_order(
-                                symbol=self.config.symbol,
-                                order_id=order.order_id,
-                                client_order_id=getattr(order, 'client_order_id', None)
-                            )
-                            trade_log.info(
-                                f"REST_GATE_CANCEL | exchange={self.config.primary_exchange} | side=sell | "
-                                f"order_id={order.order_id} | reason=duplicate"
+                    for result in await self._cancel_exchange_orders(sorted_asks[1:], "REST Gate"):
+                        if result.success:
+                            trade_log.event(
+                                "REST_GATE_CANCEL", exchange=self.config.primary_exchange, side="sell",
+                                order_id=result.request.order_id, reason="duplicate",
                             )
-                        except Exception as e:
-                            logger.error(f"[REST Gate] Failed to cancel duplicate ask: {e}")
                     exchange_asks = [sorted_asks[0]]
 
                 rest_gate_ok = True
@@ -1249,9 +1260,9 @@ class MarketMakerExecutor:
                         f"[REST Gate] {self._rest_gate_failures} consecutive failures, "
                         f"entering safe mode - skipping order placement"
                     )
-                trade_log.info(
-                    f"REST_GATE_SAFE_MODE | exchange={self.config.primary_exchange} | "
-                    f"failures={self._rest_gate_failures} | error={str(e)[:100]}"
+                trade_log.event(
+                    "REST_GATE_SAFE_MODE", exchange=self.config.primary_exchange,
+                    failures=self._rest_gate_failures, error=str(e)[:100],
                 )
                 return  # 直接返回，不下單
 
@@ -1266,41 +1277,7 @@ class MarketMakerExecutor:
         # ==================== 倉位同步（風控關鍵）====================
         # 在 hard stop 檢查前同步倉位，確保風控準確
         # 這是防止漏接成交導致風控失效的關鍵機制
-        # 節流：每 2 秒最多同步一次，避免 API 過載
-        now = time.time()
-        if now - self._last_position_sync >= self._position_sync_interval:
-            await self._sync_primary_position()
-            # 同時同步對沖帳戶倉位（用於前端顯示）
-            if self.hedge_adapter:
-                await self._sync_hedge_position()
-            self._last_position_sync = now
-
-            # ==================== 淨敞口對沖檢查 ====================
-            # 當對沖開關開啟時，檢查是否有淨敞口需要對沖
-            # 節流：每 10 秒最多檢查一次
-            # ==================== 淨敞口對沖檢查 ====================
-            time_since_last = now - self._last_exposure_hedge
-            should_check = (
-                self._hedge_enabled and
-                self.hedge_engine is not None and
-                not self._exposure_hedging and
-                time_since_last >= self._exposure_hedge_interval
-            )
-
-            # 每 30 秒記錄一次狀態（方便調試）
-            if int(now) % 30 == 0:
-                primary_pos = self.state.get_standx_position()
-                hedge_pos = self.state.get_hedge_position()
-                net = primary_pos + hedge_pos
-                logger.info(
-                    f"[ExposureHedge] Status: hedge_enabled={self._hedge_enabled}, "
-                    f"has_engine={self.hedge_engine is not None}, "
-                    f"net_exposure={net}, threshold={self._exposure_hedge_threshold}"
-                )
-
-            if should_check:
-                await self._check_and_hedge_exposure()
-                self._last_exposure_hedge = now
+        await self._sync_positions_throttled()
 
         current_position = self._get_primary_position()
         max_pos = self.config.max_position_btc
@@ -1308,16 +1285,7 @@ class MarketMakerExecutor:
 
         # ==================== 硬停檢查 ====================
         # 超過 hard_stop 全部停掛，記錄時間以便自動恢復
-        if abs(current_position) >= hard_stop:
-            logger.warning(
-                f"[RiskControl] Position {current_position} >= hard_stop {hard_stop}, "
-                f"pausing ALL orders"
-            )
-            await self._cancel_all_orders(reason="hard stop")
-            self._status = ExecutorStatus.PAUSED
-            self._hard_stop_time = time.time()  # 記錄觸發時間
-            if self._on_status_change:
-                await self._on_status_change(self._status)
+        if await self._enforce_hard_stop(current_position):
             return
 
         # ==================== Spread 保護 (rebate 模式) ====================
@@ -1346,8 +1314,8 @@ class MarketMakerExecutor:
             f"hard_stop={hard_stop}, has_bid_exchange={has_bid_on_exchange}, has_ask_exchange={has_ask_on_exchange}"
         )
 
-        # 計算報價
-        bid_price, ask_price = self._calculate_prices(mid_price, best_bid, best_ask)
+        # 計算報價（輸入未變時使用快取）
+        bid_price, ask_price = self._quote_targets(mid_price, best_bid, best_ask)
 
         # 決定是否使用 post_only
         use_post_only = self.config.post_only or self.config.strategy_mode == "rebate"
@@ -1386,6 +1354,426 @@ class MarketMakerExecutor:
         else:
             await self._place_ask(ask_price, post_only=use_post_only)
 
+    async def _sync_positions_throttled(self):
+        """
+        節流的倉位同步 + 淨敞口對沖檢查
+
+        節流：每 _position_sync_interval 秒最多同步一次，避免 API 過載
+        WebSocket 模式下主帳戶倉位由 WS 驅動，REST 只按 position_reconcile_sec 慢速調和；
+        淨敞口檢查不受此節流影響，仍每 _exposure_hedge_interval 秒以帳本倉位執行
+        """
+        now = time.time()
+        interval = self.config.position_reconcile_sec if self._use_websocket else self._position_sync_interval
+        hedge_synced = False
+        if now - self._last_position_sync >= interval:
+            await self._sync_primary_position()
+            # 同時同步對沖帳戶倉位（用於前端顯示）
+            if self.hedge_adapter:
+                await self._sync_hedge_position()
+                hedge_synced = True
+            self._last_position_sync = now
+
+        # ==================== 淨敞口對沖檢查 ====================
+        # 當對沖開關開啟時，檢查是否有淨敞口需要對沖
+        # 節流：每 10 秒最多檢查一次
+        time_since_last = now - self._last_exposure_hedge
+        # 聚合模式下成交不會設置 HEDGING: 待送出或在途的批次已計入敞口，此時跳過避免重複對沖
+        should_check = (
+            self._hedge_enabled and
+            self.hedge_engine is not None and
+            not self._exposure_hedging and
+            not (self._hedge_aggregator and self._hedge_aggregator.has_pending) and
+            time_since_last >= self._exposure_hedge_interval
+        )
+
+        # 每 30 秒記錄一次狀態（方便調試）
+        if now - self._last_exposure_status_log >= 30:
+            self._last_exposure_status_log = now
+            primary_pos = self.state.get_standx_position()
+            hedge_pos = self.state.get_hedge_position()
+            net = primary_pos + hedge_pos
+            logger.info(
+                f"[ExposureHedge] Status: hedge_enabled={self._hedge_enabled}, "
+                f"has_engine={self.hedge_engine is not None}, "
+                f"net_exposure={net}, threshold={self._exposure_hedge_threshold}"
+            )
+
+        if should_check:
+            if self._use_websocket and self.hedge_adapter and not hedge_synced:
+                # 對沖帳戶倉位沒有 WS 推送 (只在對沖完成後同步)，檢查前刷新以發現帳外變化
+                await self._sync_hedge_position()
+            await self._check_and_hedge_exposure()
+            self._last_exposure_hedge = now
+
+    async def _enforce_hard_stop(self, current_position: Decimal) -> bool:
+        """倉位超過 hard_stop 時撤銷所有訂單並暫停，返回是否觸發"""
+        hard_stop = self.config.hard_stop_position_btc
+        if abs(current_position) >= hard_stop:
+            logger.warning(
+                f"[RiskControl] Position {current_position} >= hard_stop {hard_stop}, "
+                f"pausing ALL orders"
+            )
+            await self._cancel_all_orders(reason="hard stop")
+            self._status = ExecutorStatus.PAUSED
+            self._hard_stop_time = time.time()  # 記錄觸發時間
+            if self._on_status_change:
+                await self._on_status_change(self._status)
+            return True
+        return False
+
+    # ==================== 階梯報價 ====================
+
+    def _ladder_config(self) -> List[LadderLevel]:
+        """解析後的階梯配置（配置字串變更時重新解析）"""
+        spec = self.config.ladder_levels
+        if spec != self._ladder_spec:
+            self._ladder_levels = parse_ladder_levels(spec)
+            self._ladder_spec = spec
+        return self._ladder_levels
+
+    def _ladder_targets(self, mid_price: Decimal, best_bid: Decimal, best_ask: Decimal, position: Decimal) -> LadderTargets:
+        """
+        目標階梯：第一檔沿用單檔報價（含 skew / 保本回補），之後每檔再往外 distance_bps
+
+        軟停與 rebate 模式窄 spread 的單邊規則與 _place_orders 一致。
+        """
+        import math
+        base_bid, base_ask = self._quote_targets(mid_price, best_bid, best_ask)
+        max_pos = self.config.max_position_btc
+        can_bid = position < max_pos
+        can_ask = position > -max_pos
+
+        if self.config.strategy_mode == "rebate":
+            if best_ask - best_bid < self._tick_size * Decimal(self.config.min_spread_ticks):
+                can_bid = can_bid and position <= 0
+                can_ask = can_ask and position > 0
+
+        tick = float(self._tick_size)
+        targets: LadderTargets = {}
+        prev_bid = prev_ask = None
+        for level, lv in enumerate(self._ladder_config()):
+            offset = mid_price * lv.distance_bps / Decimal("10000")
+            if can_bid:
+                price = Decimal(str(math.floor(float(base_bid - offset) / tick) * tick))
+                # 檔位價格必須嚴格遞減，避免兩檔落在同一價位
+                if prev_bid is not None and price >= prev_bid:
+                    price = prev_bid - self._tick_size
+                if price > 0:
+                    targets[("buy", level)] = (price, lv.size)
+                    prev_bid = price
+            if can_ask:
+                price = Decimal(str(math.ceil(float(base_ask + offset) / tick) * tick))
+                if prev_ask is not None and price <= prev_ask:
+                    price = prev_ask + self._tick_size
+                targets[("sell", level)] = (price, lv.size)
+                prev_ask = price
+        return targets
+
+    def _update_uptime(self):
+        """
+        以最近中間價與目前掛單更新 uptime 分層（階梯模式取最靠近盤口的一檔）
+
+        中間價變化與階梯改單時呼叫；單檔模式的掛單/撤單由 MMState 自行觸發。
+        """
+        if self._last_mid_price is None:
+            return
+        if self.config.ladder_enabled:
+            bid_order = self._ladder.best("buy")
+            ask_order = self._ladder.best("sell")
+        else:
+            bid_order = self.state.get_bid_order()
+            ask_order = self.state.get_ask_order()
+        bid_price = bid_order.price if bid_order else None
+        ask_price = ask_order.price if ask_order else None
+        self.state.update_uptime(self._last_mid_price, bid_price, ask_price)
+
+    async def _tick_ladder(self, mid_price: Decimal, best_bid: Decimal, best_ask: Decimal):
+        """階梯模式報價：對帳 → 倉位/硬停 → 目標階梯 → 差異改單"""
+        if self._status != ExecutorStatus.RUNNING:
+            return
+
+        if not self._use_websocket or self._tick_count % self.config.ladder_sync_ticks == 0:
+            if not await self._sync_ladder():
+                return
+
+        await self._sync_positions_throttled()
+        position = self._get_primary_position()
+        if await self._enforce_hard_stop(position):
+            return
+
+        targets = self._ladder_targets(mid_price, best_bid, best_ask, position)
+        diff = self._ladder.diff(targets, self._tick_size, self._quote_intent.tolerance_ticks)
+        if diff.is_empty:
+            return
+
+        if self.config.dry_run:
+            logger.info(
+                f"[DRY RUN] Ladder diff: place={len(diff.place)}, "
+                f"replace={len(diff.replace)}, cancel={len(diff.cancel)}"
+            )
+            return
+
+        await self._apply_ladder_diff(diff)
+
+    async def _sync_ladder(self) -> bool:
+        """
+        階梯與交易所對帳
+
+        - 交易所已沒有的訂單（超過 disappear_time_sec 寬限）從階梯移除
+        - 交易所有但階梯沒有的訂單視為孤兒，批量撤銷
+
+        Returns:
+            是否成功（查詢失敗時本 tick 不改單）
+        """
+        try:
+            open_orders = await self.primary.get_open_orders(self.config.symbol)
+        except Exception as e:
+            logger.error(f"[Ladder] Failed to query open orders: {e}")
+            return False
+
+        live_ids = set()
+        orphans = []
+        for order in open_orders:
+            if order.status not in ["open", "partially_filled", "new"]:
+                continue
+            found = self._ladder.find(order.order_id, getattr(order, 'client_order_id', None))
+            if found is None:
+                orphans.append(order)
+            else:
+                live_ids.add(found[1].client_order_id)
+
+        now = datetime.now()
+        for order in self._ladder.orders():
+            age = (now - order.created_at).total_seconds()
+            if order.client_order_id not in live_ids and age > self.config.disappear_time_sec:
+                logger.info(f"[Ladder] {order.side} @ {order.price} no longer on exchange, dropping")
+                self._ladder.remove(client_order_id=order.client_order_id)
+
+        if orphans:
+            logger.warning(f"[Ladder] Cancelling {len(orphans)} orphan orders")
+            for result in await self._cancel_exchange_orders(orphans, "Ladder"):
+                if result.success:
+                    trade_log.event(
+                        "LADDER_ORPHAN_CANCEL", exchange=self.config.primary_exchange,
+                        order_id=result.request.order_id,
+                    )
+        return True
+
+    @staticmethod
+    def _is_order_gone(error: Optional[str]) -> bool:
+        """撤單錯誤是否表示訂單已不存在（已成交/已撤銷）"""
+        message = (error or "").lower()
+        return any(kw in message for kw in ['not found', 'already', 'filled', 'canceled', 'cancelled', 'does not exist'])
+
+    async def _apply_ladder_diff(self, diff: LadderDiff):
+        """
+        執行階梯差異（批量）
+
+        1. 新檔位與改價檔位的新單一次 place_orders（先掛後撤，盤口不留空窗）
+        2. 多出的檔位與被替換的舊單一次 cancel_orders
+        3. 舊單撤不掉（非已成交/已撤銷）時撤回對應新單，舊單重新佔用檔位
+        交易所支援原生改單時，改價檔位直接 amend_order。
+        """
+        use_post_only = self.config.post_only or self.config.strategy_mode == "rebate"
+
+        # 節流：每側每個冷卻期只下一次新單（撤單不受限）
+        order_sides = {side for side, _, _, _ in diff.place} | {order.side for order, _, _, _ in diff.replace}
+        allowed = {side for side in order_sides if self._order_throttle.try_acquire(side)}
+        places = [item for item in diff.place if item[0] in allowed]
+        replaces = [item for item in diff.replace if item[0].side in allowed]
+
+        for side in {old.side for old, _, _, _ in replaces}:
+            self.state.record_rebalance(side)
+
+        if replaces and self.primary.supports_amend:
+            await self._amend_ladder_orders(replaces)
+            replaces = []
+
+        # ==================== 1. 批量下單 ====================
+        new_orders = [(side, level, price, qty, None) for side, level, price, qty in places]
+        new_orders += [(old.side, level, price, qty, old) for old, level, price, qty in replaces]
+        requests = [
+            OrderRequest(
+                symbol=self.config.symbol,
+                side=side,
+                order_type=self.config.order_type,
+                quantity=qty,
+                price=price,
+                time_in_force=self.config.time_in_force,
+                client_order_id=self._generate_client_order_id(),
+                params={"post_only": use_post_only},
+            )
+            for side, level, price, qty, _ in new_orders
+        ]
+        replaced: Dict[str, tuple] = {}      # 舊單 client_order_id -> (level, 新單)
+        placed = 0
+        for (side, level, price, qty, old), result in zip(new_orders, await self.primary.place_orders(requests) if requests else []):
+            if not result.success:
+                logger.warning(f"[Ladder] Failed to place {side} L{level} @ {price}: {result.error}")
+                trade_log.event(
+                    "LADDER_PLACE_FAIL", exchange=self.config.primary_exchange, side=side,
+                    level=level, price=price, error=result.error,
+                )
+                continue
+            info = OrderInfo(
+                order_id=result.order.order_id,
+                client_order_id=result.order.client_order_id or result.request.client_order_id,
+                side=side,
+                price=price,
+                qty=qty,
+                status="pending",
+            )
+            self._ladder.add(level, info)
+            placed += 1
+            if old is not None:
+                replaced[old.client_order_id] = (level, info)
+
+        # ==================== 2. 批量撤單 ====================
+        to_cancel = list(diff.cancel) + [old for old, _, _, _ in replaces if old.client_order_id in replaced]
+        rollback = []
+        cancelled = 0
+        for order, result in zip(to_cancel, await self._cancel_exchange_orders(to_cancel, "Ladder")):
+            if result.success or self._is_order_gone(result.error):
+                self._ladder.remove(client_order_id=order.client_order_id)
+                cancelled += 1
+            elif order.client_order_id in replaced:
+                rollback.append(order)
+
+        # ==================== 3. 回滾撤不掉的替換 ====================
+        if rollback:
+            new_infos = [replaced[old.client_order_id][1] for old in rollback]
+            for old, new, result in zip(rollback, new_infos, await self._cancel_exchange_orders(new_infos, "Ladder")):
+                if result.success or self._is_order_gone(result.error):
+                    self._ladder.remove(client_order_id=new.client_order_id)
+                    self._ladder.attach(old.client_order_id, replaced[old.client_order_id][0])
+
+        self._total_quotes += placed
+        self._total_cancels += cancelled
+        self._total_replaces += len(replaced) - len(rollback)
+
+        trade_log.event(
+            "LADDER", exchange=self.config.primary_exchange, placed=len(places),
+            replaced=len(replaced) - len(rollback), cancelled=len(diff.cancel),
+            rolled_back=len(rollback), best_bid=self._last_best_bid, best_ask=self._last_best_ask,
+            live=len(self._ladder),
+        )
+
+    async def _amend_ladder_orders(self, replaces: list):
+        """原生改單（並發），失敗的檔位留待下一個 tick"""
+        async def amend(old: OrderInfo, level: int, price: Decimal, qty: Decimal):
+            order = await self.primary.amend_order(
+                self.config.symbol,
+                order_id=old.order_id,
+                client_order_id=old.client_order_id,
+                price=price,
+                quantity=qty,
+                side=old.side,
+                order_type=self.config.order_type,
+            )
+            self._ladder.remove(client_order_id=old.client_order_id)
+            self._ladder.add(level, OrderInfo(
+                order_id=order.order_id or old.order_id,
+                client_order_id=order.client_order_id or old.client_order_id,
+                side=old.side,
+                price=price,
+                qty=qty,
+                status="pending",
+            ))
+
+        results = await asyncio.gather(*(amend(*item) for item in replaces), return_exceptions=True)
+        for (old, level, price, _), result in zip(replaces, results):
+            if isinstance(result, Exception):
+                logger.warning(f"[Ladder] Amend {old.side} L{level} -> {price} failed: {result}")
+            else:
+                self._total_replaces += 1
+
+    def _fill_skew_values(self, now: float) -> tuple[float, float]:
+        """
+        計算兩側 fill skew (bps)：每筆成交 fill_skew_bps，指數衰減，封頂 fill_skew_max_bps
+        """
+        half_life = self.config.fill_skew_decay_sec
+        skew_per_fill = float(self.config.fill_skew_bps)
+        max_skew = float(self.config.fill_skew_max_bps)
+
+        # 清理過期的成交記錄（超過 5 個半衰期基本無效）
+        cutoff = now - (half_life * 5)
+        self._fill_skew_bid = [t for t in self._fill_skew_bid if t > cutoff]
+        self._fill_skew_ask = [t for t in self._fill_skew_ask if t > cutoff]
+
+        # 指數衰減累積：skew = skew_per_fill * 0.5^(elapsed / half_life)
+        bid_skew = sum(skew_per_fill * 0.5 ** ((now - t) / half_life) for t in self._fill_skew_bid)
+        ask_skew = sum(skew_per_fill * 0.5 ** ((now - t) / half_life) for t in self._fill_skew_ask)
+        return min(bid_skew, max_skew), min(ask_skew, max_skew)
+
+    def _quote_inputs(self, best_bid: Decimal, best_ask: Decimal) -> tuple:
+        """影響目標報價的輸入（分桶後），作為報價快取的鍵"""
+        bucket = float(self.config.quote_skew_bucket_bps) or 0.1
+        tick = self._tick_size
+
+        skew_key = None
+        if self.config.fill_skew_enabled and (self._fill_skew_bid or self._fill_skew_ask):
+            bid_skew, ask_skew = self._fill_skew_values(time.time())
+            skew_key = (int(bid_skew / bucket), int(ask_skew / bucket))
+
+        # 波動率低於調整起點時不影響報價
+        vol_key = None
+        volatility = self.state.get_volatility_bps()
+        if volatility > self.config.volatility_threshold_bps * 0.7:
+            vol_key = int(volatility / bucket)
+
+        entry_key = None
+        if self.config.breakeven_reversion_enabled and self.state.has_entry():
+            entry_key = (self.state.get_entry_side(), self.state.get_entry_price())
+
+        return (
+            int(best_bid / tick), int(best_ask / tick), tick,
+            skew_key, vol_key, entry_key,
+            id(self.config), self.config.version,
+        )
+
+    def _quote_targets(self, mid_price: Decimal, best_bid: Decimal, best_ask: Decimal) -> tuple[Decimal, Decimal]:
+        """目標報價（輸入未變時返回快取，不重算 skew/保本/波動率）"""
+        return self._quote_intent.prices(
+            self._quote_inputs(best_bid, best_ask),
+            lambda: self._calculate_prices(mid_price, best_bid, best_ask),
+        )
+
+    def _tick_skippable(self) -> bool:
+        """本 tick 是否允許短路（需要下單、同步或處理過期回補時不可）"""
+        if self._status != ExecutorStatus.RUNNING or self._placing_bid or self._placing_ask:
+            return False
+        if self.config.ladder_enabled:
+            if not (self._ladder.has_side("buy") and self._ladder.has_side("sell")):
+                return False
+            if self._ladder.has_detached():
+                return False
+            if not self._use_websocket or self._tick_count % self.config.ladder_sync_ticks == 0:
+                return False
+        elif not (self.state.has_bid_order() and self.state.has_ask_order()):
+            return False
+        # WebSocket 模式的 REST gate 同步週期
+        if self._use_websocket and self._tick_count % 10 == 0:
+            return False
+        # 保本回補訂單已過期，需要 reprice 檢查
+        if self.config.breakeven_reversion_enabled and self.state.has_entry():
+            entry_time = self.state.get_entry_time()
+            if entry_time and time.time() - entry_time > self.config.stale_order_timeout_sec:
+                return False
+        return True
+
+    def _tick_inputs(self, best_bid: Decimal, best_ask: Decimal) -> tuple:
+        """整個 tick 的輸入：報價輸入 + 倉位 + 現有掛單"""
+        if self.config.ladder_enabled:
+            return (self._quote_inputs(best_bid, best_ask), self._get_primary_position(), self._ladder.version)
+        bid = self.state.get_bid_order()
+        ask = self.state.get_ask_order()
+        return (
+            self._quote_inputs(best_bid, best_ask),
+            self._get_primary_position(),
+            bid.client_order_id if bid else None,
+            ask.client_order_id if ask else None,
+        )
+
     def _calculate_prices(
         self,
         mid_price: Decimal,
@@ -1429,31 +1817,7 @@ class MarketMakerExecutor:
         ask_bps = base_bps
 
         if self.config.fill_skew_enabled:
-            half_life = self.config.fill_skew_decay_sec
-            skew_per_fill = float(self.config.fill_skew_bps)
-            max_skew = float(self.config.fill_skew_max_bps)
-
-            # 清理過期的成交記錄（超過 5 個半衰期基本無效）
-            cutoff = now - (half_life * 5)
-            self._fill_skew_bid = [t for t in self._fill_skew_bid if t > cutoff]
-            self._fill_skew_ask = [t for t in self._fill_skew_ask if t > cutoff]
-
-            # 計算 bid 側 skew（指數衰減累積）
-            bid_skew = 0.0
-            for fill_time in self._fill_skew_bid:
-                elapsed = now - fill_time
-                # 指數衰減：skew = skew_per_fill * 0.5^(elapsed / half_life)
-                decay = 0.5 ** (elapsed / half_life)
-                bid_skew += skew_per_fill * decay
-            bid_skew = min(bid_skew, max_skew)  # 上限
-
-            # 計算 ask 側 skew（指數衰減累積）
-            ask_skew = 0.0
-            for fill_time in self._fill_skew_ask:
-                elapsed = now - fill_time
-                decay = 0.5 ** (elapsed / half_life)
-                ask_skew += skew_per_fill * decay
-            ask_skew = min(ask_skew, max_skew)  # 上限
+            bid_skew, ask_skew = self._fill_skew_values(now)
 
             # 應用 skew（只推遠被成交的那側）
             bid_bps = base_bps + Decimal(str(bid_skew))
@@ -1478,11 +1842,11 @@ class MarketMakerExecutor:
                 )
 
                 # 交易日誌
-                trade_log.info(
-                    f"FILL_SKEW | exchange={self.config.primary_exchange} | "
-                    f"bid_fills={len(self._fill_skew_bid)} | ask_fills={len(self._fill_skew_ask)} | "
-                    f"bid_skew={bid_skew:.1f} | ask_skew={ask_skew:.1f} | "
-                    f"bid_bps={rounded_bid_bps:.1f} | ask_bps={rounded_ask_bps:.1f}"
+                trade_log.event(
+                    "FILL_SKEW", exchange=self.config.primary_exchange,
+                    bid_fills=len(self._fill_skew_bid), ask_fills=len(self._fill_skew_ask),
+                    bid_skew=round(bid_skew, 1), ask_skew=round(ask_skew, 1),
+                    bid_bps=round(rounded_bid_bps, 1), ask_bps=round(rounded_ask_bps, 1),
                 )
 
         # ==================== Step 3: 保本回補覆蓋 ====================
@@ -1517,9 +1881,9 @@ class MarketMakerExecutor:
                         f"ask_price set to {ask_price} (offset={offset_bps} bps)"
                     )
                     # 交易日誌
-                    trade_log.info(
-                        f"BREAKEVEN | exchange={self.config.primary_exchange} | entry_side=buy | entry_price={entry_price} | "
-                        f"ask_price={ask_price} | offset_bps={offset_bps}"
+                    trade_log.event(
+                        "BREAKEVEN", exchange=self.config.primary_exchange, entry_side="buy",
+                        entry_price=entry_price, ask_price=ask_price, offset_bps=offset_bps,
                     )
                 else:  # entry_side == "sell"
                     # 之前賣出 → bid 用 entry price 買回（確保不虧）
@@ -1532,9 +1896,9 @@ class MarketMakerExecutor:
                         f"bid_price set to {bid_price} (offset={offset_bps} bps)"
                     )
                     # 交易日誌
-                    trade_log.info(
-                        f"BREAKEVEN | exchange={self.config.primary_exchange} | entry_side=sell | entry_price={entry_price} | "
-                        f"bid_price={bid_price} | offset_bps={offset_bps}"
+                    trade_log.event(
+                        "BREAKEVEN", exchange=self.config.primary_exchange, entry_side="sell",
+                        entry_price=entry_price, bid_price=bid_price, offset_bps=offset_bps,
                     )
 
         # ==================== Step 4: 波動率動態調整 ====================
@@ -1682,15 +2046,15 @@ class MarketMakerExecutor:
 
             # 交易日誌
             pos = self._get_primary_position()
-            trade_log.info(
-                f"PLACE_BID | exchange={self.config.primary_exchange} | price={price} | qty={self.config.order_size_btc} | "
-                f"best_bid={self._last_best_bid} | best_ask={self._last_best_ask} | "
-                f"pos={pos} | order_id={order.order_id} | post_only={post_only}"
+            trade_log.event(
+                "PLACE_BID", exchange=self.config.primary_exchange, price=price, qty=self.config.order_size_btc,
+                best_bid=self._last_best_bid, best_ask=self._last_best_ask,
+                pos=pos, order_id=order.order_id, post_only=post_only,
             )
 
         except Exception as e:
             logger.error(f"Failed to place bid: {e}")
-            trade_log.info(f"PLACE_BID_FAIL | exchange={self.config.primary_exchange} | price={price} | error={e}")
+            trade_log.event("PLACE_BID_FAIL", exchange=self.config.primary_exchange, price=price, error=str(e))
         finally:
             self._placing_bid = False
 
@@ -1747,18 +2111,126 @@ class MarketMakerExecutor:
 
             # 交易日誌
             pos = self._get_primary_position()
-            trade_log.info(
-                f"PLACE_ASK | exchange={self.config.primary_exchange} | price={price} | qty={self.config.order_size_btc} | "
-                f"best_bid={self._last_best_bid} | best_ask={self._last_best_ask} | "
-                f"pos={pos} | order_id={order.order_id} | post_only={post_only}"
+            trade_log.event(
+                "PLACE_ASK", exchange=self.config.primary_exchange, price=price, qty=self.config.order_size_btc,
+                best_bid=self._last_best_bid, best_ask=self._last_best_ask,
+                pos=pos, order_id=order.order_id, post_only=post_only,
             )
 
         except Exception as e:
             logger.error(f"Failed to place ask: {e}")
-            trade_log.info(f"PLACE_ASK_FAIL | exchange={self.config.primary_exchange} | price={price} | error={e}")
+            trade_log.event("PLACE_ASK_FAIL", exchange=self.config.primary_exchange, price=price, error=str(e))
         finally:
             self._placing_ask = False
 
+    def _can_replace(self, side: str, target: Decimal, best_bid: Decimal, best_ask: Decimal) -> bool:
+        """
+        重掛時能否直接換成新價格的訂單
+
+        與 _place_orders 的下單條件一致：hard stop、軟停、rebate 模式窄 spread、
+        目標價穿價時都不能掛新單，只能撤單。
+        """
+        if not self.config.rebalance_replace or self._status != ExecutorStatus.RUNNING:
+            return False
+
+        position = self._get_primary_position()
+        if abs(position) >= self.config.hard_stop_position_btc:
+            return False
+        if side == "buy" and position >= self.config.max_position_btc:
+            return False
+        if side == "sell" and position <= -self.config.max_position_btc:
+            return False
+
+        if self.config.strategy_mode == "rebate":
+            if best_ask - best_bid < self._tick_size * Decimal(self.config.min_spread_ticks):
+                return False
+
+        if side == "buy":
+            return target < best_ask
+        return target > best_bid
+
+    async def _rebalance_order(self, order: OrderInfo, target: Decimal, best_bid: Decimal, best_ask: Decimal):
+        """
+        重掛單側訂單到目標價
+
+        優先 replace_order（原生改單或先掛後撤），一次往返且盤口不留空窗；
+        條件不允許或替換失敗時退回撤單，由 _place_orders 重新掛單。
+        """
+        side = order.side
+        if not self._can_replace(side, target, best_bid, best_ask):
+            await self._cancel_order(order.client_order_id, reason="rebalance")
+            return
+
+        if self.config.dry_run:
+            logger.info(f"[DRY RUN] Would replace {side}: {order.price} -> {target}")
+            return
+
+        if not self._order_throttle.try_acquire(side):
+            # 節流中保留舊單（比撤單留空窗好），下一個 tick 再試
+            logger.debug(f"[Throttle] {side} replace throttled, keeping order @ {order.price}")
+            return
+
+        use_post_only = self.config.post_only or self.config.strategy_mode == "rebate"
+        placing_attr = "_placing_bid" if side == "buy" else "_placing_ask"
+        setattr(self, placing_attr, True)
+        try:
+            new_order = await self.primary.replace_order(
+                symbol=self.config.symbol,
+                side=side,
+                quantity=self.config.order_size_btc,
+                price=target,
+                order_id=order.order_id,
+                client_order_id=order.client_order_id,
+                new_client_order_id=self._generate_client_order_id(),
+                order_type=self.config.order_type,
+                time_in_force=self.config.time_in_force,
+                post_only=use_post_only,
+            )
+        except Exception as e:
+            logger.warning(f"[Replace] {side} replace failed ({e}), falling back to cancel")
+            trade_log.event(
+                "REPLACE_FAIL", exchange=self.config.primary_exchange, side=side,
+                price=order.price, target=target, client_order_id=order.client_order_id, error=str(e),
+            )
+            await self._cancel_order(order.client_order_id, reason="rebalance")
+            return
+        finally:
+            setattr(self, placing_attr, False)
+
+        order_info = OrderInfo(
+            order_id=new_order.order_id,
+            client_order_id=new_order.client_order_id,
+            side=side,
+            price=target,
+            qty=self.config.order_size_btc,
+            status="pending",
+        )
+        if side == "buy":
+            self.state.set_bid_order(order_info)
+        else:
+            self.state.set_ask_order(order_info)
+        self._total_replaces += 1
+
+        self.state.record_operation(
+            action="rebalance",
+            side=side,
+            order_price=target,
+            best_bid=self._last_best_bid,
+            best_ask=self._last_best_ask,
+            reason=f"rebalance from {order.price}",
+        )
+
+        logger.info(
+            f"{'Bid' if side == 'buy' else 'Ask'} replaced: {order.price} -> {target} "
+            f"(order_id={new_order.order_id}, client_order_id={new_order.client_order_id})"
+        )
+        trade_log.event(
+            "REPLACE", exchange=self.config.primary_exchange, side=side,
+            old_price=order.price, price=target, qty=self.config.order_size_btc,
+            best_bid=self._last_best_bid, best_ask=self._last_best_ask,
+            old_client_order_id=order.client_order_id, order_id=new_order.order_id, post_only=use_post_only,
+        )
+
     async def _cancel_order(self, client_order_id: str, reason: str = ""):
         """
         撤銷單個訂單（帶 REST 確認機制）
@@ -1815,9 +2287,9 @@ class MarketMakerExecutor:
             logger.info(f"Cancel request sent: {client_order_id}")
 
             # 交易日誌
-            trade_log.info(
-                f"CANCEL | exchange={self.config.primary_exchange} | side={order_side} | price={order_price} | "
-                f"client_order_id={client_order_id} | reason={reason}"
+            trade_log.event(
+                "CANCEL", exchange=self.config.primary_exchange, side=order_side, price=order_price,
+                client_order_id=client_order_id, reason=reason,
             )
 
             # ==================== REST 確認取消成功 ====================
@@ -1836,9 +2308,9 @@ class MarketMakerExecutor:
 
                 if order_still_exists:
                     logger.warning(f"[Cancel Confirm] Order {client_order_id} still exists after cancel request!")
-                    trade_log.info(
-                        f"CANCEL_NOT_CONFIRMED | exchange={self.config.primary_exchange} | "
-                        f"client_order_id={client_order_id} | reason=order_still_exists"
+                    trade_log.event(
+                        "CANCEL_NOT_CONFIRMED", exchange=self.config.primary_exchange,
+                        client_order_id=client_order_id, reason="order_still_exists",
                     )
                     # 訂單還在，不清除本地 state
                     cancel_confirmed = False
@@ -1869,10 +2341,10 @@ class MarketMakerExecutor:
                 if is_filled:
                     # ==================== 訂單已成交，記錄 FILL 事件 ====================
                     logger.warning(f"[Cancel->Fill] Order {client_order_id} was FILLED during cancel!")
-                    trade_log.info(
-                        f"FILL_ON_CANCEL | exchange={self.config.primary_exchange} | "
-                        f"side={order_side} | price={order_price} | qty={order_qty} | "
-                        f"client_order_id={client_order_id} | reason=cancel_returned_filled"
+                    trade_log.event(
+                        "FILL_ON_CANCEL", exchange=self.config.primary_exchange,
+                        side=order_side, price=order_price, qty=order_qty,
+                        client_order_id=client_order_id, reason="cancel_returned_filled",
                     )
                     # 記錄成交統計（不觸發對沖，僅記錄）
                     self.state.record_fill()
@@ -1887,11 +2359,11 @@ class MarketMakerExecutor:
                         )
                 else:
                     logger.info(f"Order already gone: {client_order_id} (code={error_code})")
-                    trade_log.info(f"CANCEL_GONE | exchange={self.config.primary_exchange} | client_order_id={client_order_id} | code={error_code}")
+                    trade_log.event("CANCEL_GONE", exchange=self.config.primary_exchange, client_order_id=client_order_id, code=error_code)
                 cancel_confirmed = True  # 訂單不存在，視為取消成功
             else:
                 logger.error(f"Failed to cancel order {client_order_id}: {e}")
-                trade_log.info(f"CANCEL_FAIL | exchange={self.config.primary_exchange} | client_order_id={client_order_id} | error={e}")
+                trade_log.event("CANCEL_FAIL", exchange=self.config.primary_exchange, client_order_id=client_order_id, error=str(e))
                 cancel_confirmed = False  # 取消失敗，不清除本地 state
 
         # ==================== 根據確認結果清除本地狀態 ====================
@@ -1910,8 +2382,35 @@ class MarketMakerExecutor:
         elif ask and ask.client_order_id == client_order_id:
             self.state.clear_ask_order()
 
+    async def _cancel_ladder_side(self, side: str, reason: str = ""):
+        """撤銷階梯某一方向的所有訂單（含脫離檔位者），撤不掉的留待下一次 diff"""
+        orders = self._ladder.orders(side)
+        if not orders:
+            return
+        cancelled = 0
+        for order, result in zip(orders, await self._cancel_exchange_orders(orders, "Ladder")):
+            if result.success or self._is_order_gone(result.error):
+                self._ladder.remove(client_order_id=order.client_order_id)
+                cancelled += 1
+        self._total_cancels += cancelled
+        self._update_uptime()
+        trade_log.event(
+            "LADDER_CANCEL_SIDE", exchange=self.config.primary_exchange, side=side,
+            cancelled=cancelled, total=len(orders), reason=reason,
+        )
+
     async def _cancel_all_orders(self, reason: str = ""):
         """撤銷所有訂單"""
+        ladder_orders = self._ladder.clear()
+        if ladder_orders:
+            results = await self._cancel_exchange_orders(ladder_orders, "Ladder")
+            cancelled = sum(1 for r in results if r.success)
+            self._total_cancels += cancelled
+            trade_log.event(
+                "LADDER_CANCEL_ALL", exchange=self.config.primary_exchange,
+                cancelled=cancelled, total=len(ladder_orders), reason=reason,
+            )
+
         bid = self.state.get_bid_order()
         ask = self.state.get_ask_order()
 
@@ -1933,12 +2432,8 @@ class MarketMakerExecutor:
                 open_orders = await self.primary.get_open_orders(self.config.symbol)
                 if open_orders:
                     logger.warning(f"[Stop] Found {len(open_orders)} untracked orders, canceling...")
-                    for order in open_orders:
-                        try:
-                            await self.primary.cancel_order(self.config.symbol, order.order_id)
-                            logger.info(f"[Stop] Canceled untracked order {order.order_id}")
-                        except Exception as e:
-                            logger.warning(f"[Stop] Failed to cancel {order.order_id}: {e}")
+                    results = await self._cancel_exchange_orders(open_orders, "Stop")
+                    logger.info(f"[Stop] Canceled {sum(1 for r in results if r.success)} untracked orders")
             except Exception as e:
                 logger.warning(f"[Stop] Failed to query open orders: {e}")
 
@@ -2272,12 +2767,14 @@ class MarketMakerExecutor:
         同步主做市交易所的倉位 (使用 self.primary adapter)
 
         會同時更新：
-        1. 通用倉位 map: state.set_position(exchange, symbol, pos)
+        1. 倉位帳本: state.reconcile_position(exchange, symbol, pos, version)
+           查詢期間帳本已被 WS 更新時，REST 結果視為過期而不覆蓋
         2. 舊版倉位欄位: state.set_standx_position (for backward compat)
 
         Returns:
             同步後的倉位
         """
+        version = self.state.get_position_version(self.config.primary_exchange, self.config.symbol)
         try:
             positions = await self.primary.get_positions(self.config.symbol)
             logger.debug(f"[Sync] Got {len(positions)} positions for {self.config.symbol}")
@@ -2291,31 +2788,40 @@ class MarketMakerExecutor:
                 pos_base = pos.symbol.upper().replace("-", "_").replace("/", "_").split("_")[0]
                 if pos_base == symbol_base:
                     position_qty = Decimal(str(pos.size)) if pos.side == "long" else -Decimal(str(pos.size))
-
-                    # 更新通用倉位 map
-                    self.state.set_position(
-                        self.config.primary_exchange,
-                        self.config.symbol,
-                        position_qty
-                    )
-                    # 同時更新舊版欄位 (for backward compat)
-                    self.state.set_standx_position(position_qty)
-
                     logger.debug(
                         f"[Sync] Primary ({self.config.primary_exchange}) position: {position_qty} "
                         f"(symbol={pos.symbol}, matched base={symbol_base})"
                     )
-                    return position_qty
+                    return self._reconcile_primary_position(position_qty, version)
 
             # 沒有找到倉位，設為 0
-            self.state.set_position(self.config.primary_exchange, self.config.symbol, Decimal("0"))
-            self.state.set_standx_position(Decimal("0"))
             logger.debug(f"[Sync] Primary ({self.config.primary_exchange}) position: 0 (no {symbol_base} position found)")
-            return Decimal("0")
+            return self._reconcile_primary_position(Decimal("0"), version)
         except Exception as e:
             logger.error(f"Failed to sync primary exchange position: {e}")
             return self._get_primary_position()
 
+    def _reconcile_primary_position(self, rest_position: Decimal, version: int) -> Decimal:
+        """REST 倉位寫入帳本 (過期不覆蓋，漂移告警)，返回帳本倉位"""
+        exchange, symbol = self.config.primary_exchange, self.config.symbol
+        result = self.state.reconcile_position(exchange, symbol, rest_position, version)
+        if not result.applied:
+            logger.debug(
+                f"[Sync] Stale REST position ignored: rest={rest_position}, ledger={result.position} "
+                f"(updated by WebSocket during the request)"
+            )
+        elif result.drift:
+            logger.warning(
+                f"[PositionDrift] {exchange}/{symbol}: REST={rest_position}, "
+                f"ledger={rest_position - result.drift}, drift={result.drift} (ledger corrected to REST)"
+            )
+            trade_log.event(
+                "POSITION_DRIFT", exchange=exchange, symbol=symbol,
+                rest=rest_position, ledger=rest_position - result.drift, drift=result.drift,
+            )
+        self.state.set_standx_position(result.position)
+        return result.position
+
     async def _sync_standx_position(self) -> Decimal:
         """
         @deprecated - 使用 _sync_primary_position() 代替
@@ -2324,45 +2830,57 @@ class MarketMakerExecutor:
         """
         return await self._sync_primary_position()
 
+    def _hedge_targets(self) -> list:
+        """對沖倉位所在的 (適配器, 交易對) 列表（路由引擎可能有多個場所）"""
+        if self.hedge_engine and hasattr(self.hedge_engine, 'hedge_targets'):
+            targets = [
+                (adapter, symbol or self.config.hedge_symbol)
+                for adapter, symbol in self.hedge_engine.hedge_targets(self.config.symbol)
+                if adapter is not None
+            ]
+            if targets:
+                return targets
+        if self.hedge_adapter:
+            return [(self.hedge_adapter, self.config.hedge_symbol)]
+        return []
+
     async def _sync_hedge_position(self) -> Decimal:
-        """從對沖交易所同步實際倉位"""
-        if not self.hedge_adapter:
+        """從對沖交易所同步實際倉位（多場所時加總）"""
+        targets = self._hedge_targets()
+        if not targets:
             return Decimal("0")
+        version = self.state.get_position_version(self.config.hedge_exchange, self.config.hedge_symbol)
         try:
-            # 自動匹配交易對
-            hedge_symbol = self.config.hedge_symbol
-            if self.hedge_engine and hasattr(self.hedge_engine, 'map_symbol'):
-                hedge_symbol = self.hedge_engine.map_symbol(
-                    self.config.symbol
-                ) or hedge_symbol
-
-            positions = await self.hedge_adapter.get_positions(hedge_symbol)
-
-            # 【診斷日誌】打印所有倉位詳細信息
-            logger.info(f"[Sync] Hedge account found {len(positions)} positions for {hedge_symbol}")
-
-            for pos in positions:
-                # 【診斷日誌】打印原始倉位數據
-                logger.info(
-                    f"[Sync] Raw position: symbol={pos.symbol}, side={pos.side}, "
-                    f"size={pos.size}, entry_price={pos.entry_price}, upnl={pos.unrealized_pnl}"
-                )
+            total = Decimal("0")
+            for hedge_adapter, hedge_symbol in targets:
+                positions = await hedge_adapter.get_positions(hedge_symbol)
 
-                if hedge_symbol in pos.symbol or pos.symbol == hedge_symbol:
-                    position_qty = Decimal(str(pos.size)) if pos.side == "long" else -Decimal(str(pos.size))
+                # 【診斷日誌】打印所有倉位詳細信息
+                logger.info(f"[Sync] Hedge account found {len(positions)} positions for {hedge_symbol}")
 
-                    # 【診斷日誌】打印轉換結果
+                for pos in positions:
+                    # 【診斷日誌】打印原始倉位數據
                     logger.info(
-                        f"[Sync] Converted hedge position: {position_qty} "
-                        f"(side={pos.side}, size={pos.size})"
+                        f"[Sync] Raw position: symbol={pos.symbol}, side={pos.side}, "
+                        f"size={pos.size}, entry_price={pos.entry_price}, upnl={pos.unrealized_pnl}"
                     )
 
-                    self.state.set_hedge_position(position_qty)
-                    return position_qty
-            # 沒有找到倉位，設為 0
-            self.state.set_hedge_position(Decimal("0"))
-            logger.info("[Sync] Hedge position: 0 (no matching position found)")
-            return Decimal("0")
+                    if hedge_symbol in pos.symbol or pos.symbol == hedge_symbol:
+                        position_qty = Decimal(str(pos.size)) if pos.side == "long" else -Decimal(str(pos.size))
+
+                        # 【診斷日誌】打印轉換結果
+                        logger.info(
+                            f"[Sync] Converted hedge position: {position_qty} "
+                            f"(side={pos.side}, size={pos.size})"
+                        )
+                        total += position_qty
+                        break
+
+            self.state.reconcile_position(self.config.hedge_exchange, self.config.hedge_symbol, total, version)
+            self.state.set_hedge_position(total)
+            if total == 0:
+                logger.info("[Sync] Hedge position: 0 (no matching position found)")
+            return total
         except Exception as e:
             logger.error(f"Failed to sync hedge position: {e}")
             return self.state.get_hedge_position()
@@ -2503,9 +3021,9 @@ class MarketMakerExecutor:
                     f"[SyncOrders] BID desync: local has order {local_bid.client_order_id} "
                     f"but exchange has none, clearing local state"
                 )
-                trade_log.info(
-                    f"SYNC_CORRECTION | exchange={self.config.primary_exchange} | side=buy | action=clear_local | "
-                    f"client_order_id={local_bid.client_order_id} | reason=not_on_exchange"
+                trade_log.event(
+                    "SYNC_CORRECTION", exchange=self.config.primary_exchange, side="buy", action="clear_local",
+                    client_order_id=local_bid.client_order_id, reason="not_on_exchange",
                 )
                 self.state.clear_bid_order()
                 corrections_made = True
@@ -2519,18 +3037,11 @@ class MarketMakerExecutor:
                 # 取消這些孤兒訂單
                 for order in exchange_bids:
                     logger.warning(f"[SyncOrders] Cancelling orphan bid: {order.order_id}")
-                    trade_log.info(
-                        f"SYNC_CORRECTION | exchange={self.config.primary_exchange} | side=buy | action=cancel_orphan | "
-                        f"order_id={order.order_id} | price={order.price}"
+                    trade_log.event(
+                        "SYNC_CORRECTION", exchange=self.config.primary_exchange, side="buy", action="cancel_orphan",
+                        order_id=order.order_id, price=order.price,
                     )
-                    try:
-                        await self.primary.cancel_order(
-                            symbol=self.config.symbol,
-                            order_id=order.order_id,
-                            client_order_id=getattr(order, 'client_order_id', None)
-                        )
-                    except Exception as e:
-                        logger.error(f"[SyncOrders] Failed to cancel orphan bid: {e}")
+                await self._cancel_exchange_orders(exchange_bids, "SyncOrders")
                 corrections_made = True
 
             elif len(exchange_bids) > 1:
@@ -2540,18 +3051,11 @@ class MarketMakerExecutor:
                 sorted_bids = sorted(exchange_bids, key=lambda o: getattr(o, 'created_at', 0), reverse=True)
                 for order in sorted_bids[1:]:  # 跳過第一個（最新的）
                     logger.warning(f"[SyncOrders] Cancelling duplicate bid: {order.order_id}")
-                    trade_log.info(
-                        f"SYNC_CORRECTION | exchange={self.config.primary_exchange} | side=buy | action=cancel_duplicate | "
-                        f"order_id={order.order_id} | price={order.price}"
+                    trade_log.event(
+                        "SYNC_CORRECTION", exchange=self.config.primary_exchange, side="buy", action="cancel_duplicate",
+                        order_id=order.order_id, price=order.price,
                     )
-                    try:
-                        await self.primary.cancel_order(
-                            symbol=self.config.symbol,
-                            order_id=order.order_id,
-                            client_order_id=getattr(order, 'client_order_id', None)
-                        )
-                    except Exception as e:
-                        logger.error(f"[SyncOrders] Failed to cancel duplicate bid: {e}")
+                await self._cancel_exchange_orders(sorted_bids[1:], "SyncOrders")
                 corrections_made = True
 
             # ==================== 檢查賣單 ====================
@@ -2561,9 +3065,9 @@ class MarketMakerExecutor:
                     f"[SyncOrders] ASK desync: local has order {local_ask.client_order_id} "
                     f"but exchange has none, clearing local state"
                 )
-                trade_log.info(
-                    f"SYNC_CORRECTION | exchange={self.config.primary_exchange} | side=sell | action=clear_local | "
-                    f"client_order_id={local_ask.client_order_id} | reason=not_on_exchange"
+                trade_log.event(
+                    "SYNC_CORRECTION", exchange=self.config.primary_exchange, side="sell", action="clear_local",
+                    client_order_id=local_ask.client_order_id, reason="not_on_exchange",
                 )
                 self.state.clear_ask_order()
                 corrections_made = True
@@ -2577,18 +3081,11 @@ class MarketMakerExecutor:
                 # 取消這些孤兒訂單
                 for order in exchange_asks:
                     logger.warning(f"[SyncOrders] Cancelling orphan ask: {order.order_id}")
-                    trade_log.info(
-                        f"SYNC_CORRECTION | exchange={self.config.primary_exchange} | side=sell | action=cancel_orphan | "
-                        f"order_id={order.order_id} | price={order.price}"
+                    trade_log.event(
+                        "SYNC_CORRECTION", exchange=self.config.primary_exchange, side="sell", action="cancel_orphan",
+                        order_id=order.order_id, price=order.price,
                     )
-                    try:
-                        await self.primary.cancel_order(
-                            symbol=self.config.symbol,
-                            order_id=order.order_id,
-                            client_order_id=getattr(order, 'client_order_id', None)
-                        )
-                    except Exception as e:
-                        logger.error(f"[SyncOrders] Failed to cancel orphan ask: {e}")
+                await self._cancel_exchange_orders(exchange_asks, "SyncOrders")
                 corrections_made = True
 
             elif len(exchange_asks) > 1:
@@ -2597,18 +3094,11 @@ class MarketMakerExecutor:
                 sorted_asks = sorted(exchange_asks, key=lambda o: getattr(o, 'created_at', 0), reverse=True)
                 for order in sorted_asks[1:]:
                     logger.warning(f"[SyncOrders] Cancelling duplicate ask: {order.order_id}")
-                    trade_log.info(
-                        f"SYNC_CORRECTION | exchange={self.config.primary_exchange} | side=sell | action=cancel_duplicate | "
-                        f"order_id={order.order_id} | price={order.price}"
+                    trade_log.event(
+                        "SYNC_CORRECTION", exchange=self.config.primary_exchange, side="sell", action="cancel_duplicate",
+                        order_id=order.order_id, price=order.price,
                     )
-                    try:
-                        await self.primary.cancel_order(
-                            symbol=self.config.symbol,
-                            order_id=order.order_id,
-                            client_order_id=getattr(order, 'client_order_id', None)
-                        )
-                    except Exception as e:
-                        logger.error(f"[SyncOrders] Failed to cancel duplicate ask: {e}")
+                await self._cancel_exchange_orders(sorted_asks[1:], "SyncOrders")
                 corrections_made = True
 
             if corrections_made:
@@ -2633,7 +3123,7 @@ class MarketMakerExecutor:
 
         fill_cancel_policy:
         - "all": 撤銷雙邊（有對沖時用）
-        - "opposite": 只撤對手邊（通用）
+        - "opposite": 只撤對手邊（通用；階梯模式撤對手邊全部檔位）
         - "none": 不撤銷（無對沖回補模式）
 
         【保險絲 3】使用 try/finally 確保狀態回復
@@ -2643,12 +3133,18 @@ class MarketMakerExecutor:
             f"is_maker={fill.is_maker}, order_id={fill.order_id}"
         )
 
+        # 根據 is_maker 選擇費率（負數 = rebate，unknown 保守估計用 taker fee）
+        if fill.is_maker is True:
+            fee_bps = self.config.maker_fee_bps
+        else:
+            fee_bps = self.config.taker_fee_bps
+
         # 交易日誌 - 成交
         pos_before = self._get_primary_position()
-        trade_log.info(
-            f"FILL | exchange={self.config.primary_exchange} | side={fill.side} | price={fill.fill_price} | qty={fill.fill_qty} | "
-            f"is_maker={fill.is_maker} | pos_before={pos_before} | "
-            f"order_id={fill.order_id} | client_order_id={fill.client_order_id}"
+        trade_log.event(
+            "FILL", exchange=self.config.primary_exchange, side=fill.side, price=fill.fill_price, qty=fill.fill_qty,
+            is_maker=fill.is_maker, fee_bps=fee_bps, pos_before=pos_before,
+            order_id=fill.order_id, client_order_id=fill.client_order_id,
         )
 
         # 更新狀態
@@ -2675,21 +3171,10 @@ class MarketMakerExecutor:
 
         # ==================== Rebate 追蹤 (rebate 模式) ====================
         if self.config.strategy_mode == "rebate":
-            is_maker = fill.is_maker  # 可能是 True/False/None
-
-            # 根據 is_maker 選擇費率
-            if is_maker is True:
-                fee_bps = self.config.maker_fee_bps   # 負數 = rebate
-            elif is_maker is False:
-                fee_bps = self.config.taker_fee_bps   # 正數 = 付費
-            else:
-                # Unknown - 保守估計用 taker fee
-                fee_bps = self.config.taker_fee_bps
-
             self.state.record_rebate_fill(
                 fill.fill_qty,
                 fill.fill_price,
-                is_maker=is_maker,
+                is_maker=fill.is_maker,
                 fee_bps=fee_bps
             )
 
@@ -2704,7 +3189,9 @@ class MarketMakerExecutor:
         )
 
         # 只用一個同步方法，避免重複/混亂
-        await self._sync_primary_position()
+        # WebSocket 成交已在 _on_ws_fill 更新倉位帳本，不必再查 REST (由慢速調和兜底)
+        if not self._use_websocket:
+            await self._sync_primary_position()
 
         # ==================== 保本回補：記錄建倉價格 ====================
         if self.config.breakeven_reversion_enabled:
@@ -2783,7 +3270,11 @@ class MarketMakerExecutor:
 
         elif policy == "opposite":
             # 通用模式：只撤對手邊
-            if fill.side == "buy":
+            if self.config.ladder_enabled:
+                await self._cancel_ladder_side(
+                    "sell" if fill.side == "buy" else "buy", reason="fill opposite cancel"
+                )
+            elif fill.side == "buy":
                 ask = self.state.get_ask_order()
                 if ask:
                     await self._cancel_order(ask.client_order_id, reason="fill opposite cancel")
@@ -2829,7 +3320,8 @@ class MarketMakerExecutor:
         # 避免監控誤判系統在對沖
         should_hedge = self.hedge_engine is not None and self._hedge_enabled
 
-        if should_hedge:
+        # 聚合模式不在此等待對沖，無需進入 HEDGING
+        if should_hedge and not self._hedge_aggregator:
             self._status = ExecutorStatus.HEDGING
             if self._on_status_change:
                 await self._on_status_change(self._status)
@@ -2839,8 +3331,14 @@ class MarketMakerExecutor:
             if self._on_fill:
                 await self._on_fill(fill)
 
+            # 聚合模式：交給聚合器淨額化，對沖結果由 _on_batch_hedge_result 處理
+            if should_hedge and self._hedge_aggregator:
+                self._hedge_aggregator.submit(
+                    fill.order_id, fill.side, fill.fill_qty, fill.fill_price, self.config.symbol
+                )
+
             # 執行對沖 (如果有對沖引擎)
-            if should_hedge:
+            elif should_hedge:
                 hedge_result = await self.hedge_engine.execute_hedge(
                     fill_id=fill.order_id,
                     fill_side=fill.side,
@@ -2848,58 +3346,8 @@ class MarketMakerExecutor:
                     fill_price=fill.fill_price,
                     source_symbol=self.config.symbol,
                 )
+                await self._apply_hedge_result(hedge_result, fill.fill_price, fill.fill_qty)
 
-                # 記錄對沖結果
-                self.state.record_hedge(hedge_result.success)
-
-                # ==================== 記錄對沖成本 (rebate 模式) ====================
-                if self.config.strategy_mode == "rebate" and hedge_result.success:
-                    # 計算滑點損失
-                    if hedge_result.execution_price and hedge_result.hedge_side:
-                        # 用 hedge_side 決定 sign
-                        side_sign = Decimal("1") if hedge_result.hedge_side == "buy" else Decimal("-1")
-                        slippage_loss = (hedge_result.execution_price - fill.fill_price) * fill.fill_qty * side_sign
-                    else:
-                        # 回退：用 fill_price 估算
-                        slippage_loss = Decimal("0")
-
-                    self.state.record_hedge_cost(
-                        fee_paid=hedge_result.fee_paid,
-                        slippage_loss=slippage_loss
-                    )
-
-                # 對沖完成後，同步對沖交易所實際倉位
-                await self._sync_hedge_position()
-
-                # 如果對沖回退，重新同步主做市交易所倉位
-                if hedge_result.status in [HedgeStatus.FALLBACK, HedgeStatus.PARTIAL_FALLBACK]:
-                    await self._sync_primary_position()
-
-                # 根據對沖結果決定狀態（風控模式）
-                if hedge_result.status in [
-                    HedgeStatus.RISK_CONTROL,
-                    HedgeStatus.WAITING_RECOVERY,
-                    HedgeStatus.PARTIAL_FALLBACK,
-                    HedgeStatus.FALLBACK_FAILED,
-                ]:
-                    # 進入 PAUSED 狀態，停止掛單
-                    self._status = ExecutorStatus.PAUSED
-                    logger.warning(f"Entering PAUSED due to hedge failure: {hedge_result.status.value}")
-                    # 撤銷所有訂單
-                    await self._cancel_all_orders(reason="hedge failure")
-                    if self._on_status_change:
-                        await self._on_status_change(self._status)
-                    # 不恢復 RUNNING，等待 check_recovery
-                    return
-
-                # 觸發對沖回調
-                if self._on_hedge:
-                    await self._on_hedge(hedge_result)
-
-                logger.info(
-                    f"Hedge completed: {hedge_result.status.value}, "
-                    f"latency: {hedge_result.latency_ms:.0f}ms"
-                )
             else:
                 if self.hedge_engine is not None and not self._hedge_enabled:
                     logger.info(f"[RuntimeControl] Hedge disabled at runtime, position unhedged")
@@ -2910,12 +3358,94 @@ class MarketMakerExecutor:
             logger.error(f"Error during fill processing: {e}", exc_info=True)
 
         finally:
-            # 【保險絲 3】無論如何都恢復報價狀態
-            if should_hedge or self._status == ExecutorStatus.HEDGING:
+            # 【保險絲 3】無論如何都恢復報價狀態（對沖失敗進入的 PAUSED 保持不變）
+            if self._status == ExecutorStatus.HEDGING:
                 self._status = ExecutorStatus.RUNNING
                 if self._on_status_change:
                     await self._on_status_change(self._status)
 
+    async def _apply_hedge_result(self, hedge_result: HedgeResult, reference_price: Decimal, qty: Decimal) -> bool:
+        """
+        處理對沖結果：記錄統計與成本、同步倉位、失敗時進入 PAUSED
+
+        Args:
+            hedge_result: 對沖結果
+            reference_price: 被對沖成交的價格（聚合時為淨方向 VWAP）
+            qty: 被對沖的數量
+
+        Returns:
+            False 表示已因對沖失敗進入 PAUSED
+        """
+        # 記錄對沖結果
+        self.state.record_hedge(hedge_result.success)
+        trade_log.event(
+            "HEDGE_RESULT", source_fill_id=hedge_result.source_fill_id, symbol=hedge_result.hedge_symbol,
+            success=hedge_result.success, status=hedge_result.status, side=hedge_result.hedge_side, qty=qty,
+            ref_price=reference_price, fill_price=hedge_result.execution_price or hedge_result.fill_price,
+            fill_qty=hedge_result.fill_qty, slippage_bps=hedge_result.slippage_bps,
+            latency_ms=hedge_result.latency_ms, fee_paid=hedge_result.fee_paid,
+            attempts=hedge_result.attempts,
+        )
+
+        # ==================== 記錄對沖成本 (rebate 模式) ====================
+        if self.config.strategy_mode == "rebate" and hedge_result.success:
+            # 計算滑點損失
+            if hedge_result.execution_price and hedge_result.hedge_side:
+                # 用 hedge_side 決定 sign
+                side_sign = Decimal("1") if hedge_result.hedge_side == "buy" else Decimal("-1")
+                slippage_loss = (hedge_result.execution_price - reference_price) * qty * side_sign
+            else:
+                # 回退：用 fill_price 估算
+                slippage_loss = Decimal("0")
+
+            self.state.record_hedge_cost(
+                fee_paid=hedge_result.fee_paid,
+                slippage_loss=slippage_loss
+            )
+
+        # 對沖完成後，同步對沖交易所實際倉位
+        await self._sync_hedge_position()
+
+        # 如果對沖回退，重新同步主做市交易所倉位
+        if hedge_result.status in [HedgeStatus.FALLBACK, HedgeStatus.PARTIAL_FALLBACK]:
+            await self._sync_primary_position()
+
+        # 根據對沖結果決定狀態（風控模式）
+        if hedge_result.status in [
+            HedgeStatus.RISK_CONTROL,
+            HedgeStatus.WAITING_RECOVERY,
+            HedgeStatus.PARTIAL_FALLBACK,
+            HedgeStatus.FALLBACK_FAILED,
+        ]:
+            # 進入 PAUSED 狀態，停止掛單
+            self._status = ExecutorStatus.PAUSED
+            logger.warning(f"Entering PAUSED due to hedge failure: {hedge_result.status.value}")
+            # 撤銷所有訂單
+            await self._cancel_all_orders(reason="hedge failure")
+            if self._on_status_change:
+                await self._on_status_change(self._status)
+            # 不恢復 RUNNING，等待 check_recovery
+            return False
+
+        # 觸發對沖回調
+        if self._on_hedge:
+            await self._on_hedge(hedge_result)
+
+        logger.info(
+            f"Hedge completed: {hedge_result.status.value}, "
+            f"latency: {hedge_result.latency_ms:.0f}ms"
+        )
+        return True
+
+    async def _on_batch_hedge_result(self, batch: HedgeBatch, hedge_result: HedgeResult):
+        """聚合對沖完成回調"""
+        trade_log.event(
+            "HEDGE_BATCH", symbol=batch.symbol, fills=len(batch.fill_ids),
+            side=hedge_result.hedge_side, qty=batch.qty, ref_price=batch.reference_price,
+            status=hedge_result.status, fill_price=hedge_result.fill_price,
+        )
+        await self._apply_hedge_result(hedge_result, batch.reference_price, batch.qty)
+
     # ==================== 回調註冊 ====================
 
     def on_status_change(self, callback: Callable[[ExecutorStatus], Awaitable[None]]):
@@ -2953,10 +3483,14 @@ class MarketMakerExecutor:
             "uptime_seconds": uptime,
             "total_quotes": self._total_quotes,
             "total_cancels": self._total_cancels,
+            "total_replaces": self._total_replaces,
             "last_mid_price": float(self._last_mid_price) if self._last_mid_price else None,
             "volatility_bps": self.state.get_volatility_bps(),
             **self.state.get_stats(),
             "hedge_stats": self.hedge_engine.get_stats() if self.hedge_engine else None,
+            "hedge_batch_stats": self._hedge_aggregator.get_stats() if self._hedge_aggregator else None,
+            "quote_intent": self._quote_intent.get_stats(),
+            "ladder_orders": len(self._ladder),
             # WebSocket status
             "websocket_enabled": self._use_websocket,
             "websocket_connected": self._ws_connected,
@@ -3018,28 +3552,14 @@ class MarketMakerExecutor:
         else:
             try:
                 positions = await self.primary.get_positions(self.config.symbol)
-                if positions:
-                    for pos in positions:
-                        if pos.size > 0:
-                            close_side = "sell" if pos.side == "long" else "buy"
-                            logger.warning(f"[EmergencyClose] 主帳戶平倉: {close_side} {pos.size}")
-                            await self.primary.place_order(
-                                symbol=self.config.symbol,
-                                side=close_side,
-                                order_type="market",
-                                quantity=pos.size,
-                            )
-                            # 記錄操作歷史
-                            self.state.record_operation(
-                                action="emergency_close",
-                                side=close_side,
-                                order_price=float(pos.mark_price) if pos.mark_price else 0,
-                                best_bid=self._last_best_bid,
-                                best_ask=self._last_best_ask,
-                                reason=f"primary: {reason}",
-                            )
-                    results['primary']['success'] = True
-                    logger.info("[EmergencyClose] 主帳戶平倉完成")
+                closing = [pos for pos in positions or [] if pos.size > 0]
+                if closing:
+                    failed = await self._close_positions(self.primary, self.config.symbol, closing, f"primary: {reason}")
+                    if failed:
+                        results['primary']['error'] = "; ".join(failed)
+                    else:
+                        results['primary']['success'] = True
+                        logger.info("[EmergencyClose] 主帳戶平倉完成")
                 else:
                     results['primary']['success'] = True
                     results['primary']['error'] = "no_position"
@@ -3047,40 +3567,35 @@ class MarketMakerExecutor:
                 logger.error(f"[EmergencyClose] 主帳戶平倉失敗: {e}")
                 results['primary']['error'] = str(e)
 
-        # 2. 平倉對沖帳戶
+        # 2. 平倉對沖帳戶（各對沖場所並發）
         if not close_hedge:
             results['hedge']['success'] = True
             results['hedge']['error'] = "skipped"
-        elif self.hedge_engine and hasattr(self.hedge_engine, 'hedge_adapter'):
-            try:
-                hedge_adapter = self.hedge_engine.hedge_adapter
-                hedge_symbol = self.config.hedge_symbol or self.config.symbol
+        elif self.hedge_engine and self._hedge_targets():
+            async def close_target(hedge_adapter, hedge_symbol) -> tuple:
                 positions = await hedge_adapter.get_positions(hedge_symbol)
-                if positions:
-                    for pos in positions:
-                        if pos.size > 0:
-                            close_side = "sell" if pos.side == "long" else "buy"
-                            logger.warning(f"[EmergencyClose] 對沖帳戶平倉: {close_side} {pos.size}")
-                            await hedge_adapter.place_order(
-                                symbol=hedge_symbol,
-                                side=close_side,
-                                order_type="market",
-                                quantity=pos.size,
-                            )
-                            # 記錄操作歷史
-                            self.state.record_operation(
-                                action="emergency_close",
-                                side=close_side,
-                                order_price=float(pos.mark_price) if pos.mark_price else 0,
-                                best_bid=self._last_best_bid,
-                                best_ask=self._last_best_ask,
-                                reason=f"hedge: {reason}",
-                            )
-                    results['hedge']['success'] = True
-                    logger.info("[EmergencyClose] 對沖帳戶平倉完成")
+                closing = [pos for pos in positions or [] if pos.size > 0]
+                if not closing:
+                    return False, []
+                return True, await self._close_positions(hedge_adapter, hedge_symbol, closing, f"hedge: {reason}")
+
+            try:
+                outcomes = await asyncio.gather(
+                    *(close_target(adapter, symbol) for adapter, symbol in self._hedge_targets()),
+                    return_exceptions=True,
+                )
+                errors = [str(o) for o in outcomes if isinstance(o, Exception)]
+                errors += [err for o in outcomes if not isinstance(o, Exception) for err in o[1]]
+                closed_any = any(not isinstance(o, Exception) and o[0] for o in outcomes)
+                if errors:
+                    logger.error(f"[EmergencyClose] 對沖帳戶平倉失敗: {errors}")
+                    results['hedge']['error'] = "; ".join(errors)
                 else:
                     results['hedge']['success'] = True
-                    results['hedge']['error'] = "no_position"
+                    if closed_any:
+                        logger.info("[EmergencyClose] 對沖帳戶平倉完成")
+                    else:
+                        results['hedge']['error'] = "no_position"
             except Exception as e:
                 logger.error(f"[EmergencyClose] 對沖帳戶平倉失敗: {e}")
                 results['hedge']['error'] = str(e)
@@ -3098,6 +3613,40 @@ class MarketMakerExecutor:
 
         return results
 
+    async def _close_positions(self, adapter, symbol: str, positions: list, reason: str) -> List[str]:
+        """
+        以市價單批量平掉倉位
+
+        Returns:
+            失敗訊息列表（空 = 全部成功）
+        """
+        requests = []
+        for pos in positions:
+            close_side = "sell" if pos.side == "long" else "buy"
+            logger.warning(f"[EmergencyClose] 平倉 ({reason}): {close_side} {pos.size} {symbol}")
+            requests.append(OrderRequest(
+                symbol=symbol,
+                side=close_side,
+                order_type="market",
+                quantity=pos.size,
+            ))
+
+        failed = []
+        for pos, result in zip(positions, await adapter.place_orders(requests)):
+            if not result.success:
+                failed.append(f"{symbol} {result.request.side} {result.request.quantity}: {result.error}")
+                continue
+            # 記錄操作歷史
+            self.state.record_operation(
+                action="emergency_close",
+                side=result.request.side,
+                order_price=float(pos.mark_price) if pos.mark_price else 0,
+                best_bid=self._last_best_bid,
+                best_ask=self._last_best_ask,
+                reason=reason,
+            )
+        return failed
+
     def to_dict(self) -> dict:
         """序列化"""
         state_dict = self.state.to_dict()
@@ -3146,8 +3695,11 @@ class MarketMakerExecutor:
                 "hard_stop_position_btc": float(self.config.hard_stop_position_btc),
                 "resume_position_btc": float(self.config.resume_position_btc),
                 "fill_cancel_policy": self.config.fill_cancel_policy,
+                "ladder_enabled": self.config.ladder_enabled,
+                "ladder_levels": self.config.ladder_levels,
             },
             "state": state_dict,
+            "ladder": self._ladder.to_list(),
             "stats": self.get_stats(),
             # 運行時控制開關狀態
             "runtime_controls": {
@@ -15,6 +15,9 @@ from threading import Lock
 import time
 import logging
 
+from src.strategy.position_ledger import PositionLedger, ReconcileResult
+from src.utils.uptime_ledger import UptimeLedger, classify_distance
+
 logger = logging.getLogger(__name__)
 
 
@@ -239,8 +242,8 @@ class MMState:
         self._bid_order: Optional[OrderInfo] = None
         self._ask_order: Optional[OrderInfo] = None
 
-        # 【新增】通用倉位 map: (exchange, symbol) -> Decimal
-        self._positions: Dict[Tuple[str, str], Decimal] = {}
+        # 通用倉位帳本: (exchange, symbol) -> 倉位 (WS 驅動 + REST 調和，自帶鎖)
+        self._positions = PositionLedger()
 
         # 倉位追蹤 (保留舊欄位作為 fallback)
         self._standx_position: Decimal = Decimal("0")
@@ -279,13 +282,10 @@ class MMState:
         self._partial_fills = 0              # 部分成交次數
         self._unknown_fills_detected = 0     # 未知成交（多張消失+倉位變化）
 
-        # Uptime 分層時間追蹤 (毫秒)
-        self._boosted_time_ms = 0      # 100% 層 (0-10 bps)
-        self._standard_time_ms = 0     # 50% 層 (10-30 bps)
-        self._basic_time_ms = 0        # 10% 層 (30-100 bps)
-        self._out_of_range_time_ms = 0 # 超出範圍 (>100 bps 或無單)
-        self._total_time_ms = 0
-        self._last_uptime_check: Optional[float] = None
+        # Uptime 分層時間追蹤 (事件驅動: 只在分層改變時記帳)
+        self._uptime = UptimeLedger()
+        self._uptime_window_sec = 300          # 滾動窗口 (get_uptime_stats 的 *_5m 欄位)
+        self._uptime_inputs: Optional[Tuple] = None   # 上次分類的 (mid, bid, ask)
 
         # 操作歷史記錄 (最多保留 50 筆)
         self._operation_history: List[OperationRecord] = []
@@ -319,6 +319,7 @@ class MMState:
         """設置買單"""
         with self._lock:
             self._bid_order = order
+            self._reclassify_uptime_locked()
             if order:
                 logger.debug(f"Bid order set: {order.client_order_id} @ {order.price}")
 
@@ -326,6 +327,7 @@ class MMState:
         """設置賣單"""
         with self._lock:
             self._ask_order = order
+            self._reclassify_uptime_locked()
             if order:
                 logger.debug(f"Ask order set: {order.client_order_id} @ {order.price}")
 
@@ -353,17 +355,20 @@ class MMState:
         """清除買單"""
         with self._lock:
             self._bid_order = None
+            self._reclassify_uptime_locked()
 
     def clear_ask_order(self):
         """清除賣單"""
         with self._lock:
             self._ask_order = None
+            self._reclassify_uptime_locked()
 
     def clear_all_orders(self):
         """清除所有訂單"""
         with self._lock:
             self._bid_order = None
             self._ask_order = None
+            self._reclassify_uptime_locked()
 
     def update_order_status(self, client_order_id: str, status: str, filled_qty: Optional[Decimal] = None):
         """更新訂單狀態"""
@@ -390,21 +395,48 @@ class MMState:
         Returns:
             倉位數量 (正=long, 負=short)
         """
-        with self._lock:
-            return self._positions.get((exchange, symbol), Decimal("0"))
+        return self._positions.get(exchange, symbol)
 
     def set_position(self, exchange: str, symbol: str, pos: Decimal):
         """
-        通用倉位設定 - 必須明確傳 exchange 和 symbol
+        通用倉位設定 - 必須明確傳 exchange 和 symbol (無條件覆蓋，不做版本檢查)
 
         Args:
             exchange: 交易所名稱 ("standx", "grvt", etc.)
             symbol: 交易對
             pos: 倉位數量 (正=long, 負=short)
         """
-        with self._lock:
-            self._positions[(exchange, symbol)] = pos
-            logger.debug(f"Position set: {exchange}/{symbol} = {pos}")
+        self._positions.set(exchange, symbol, pos)
+        logger.debug(f"Position set: {exchange}/{symbol} = {pos}")
+
+    def get_position_version(self, exchange: str, symbol: str) -> int:
+        """倉位版本號 (REST 查詢前取得，交給 reconcile_position 判斷結果是否過期)"""
+        return self._positions.version(exchange, symbol)
+
+    def apply_position_fill(self, exchange: str, symbol: str, delta: Decimal) -> Decimal:
+        """WS 成交增量更新倉位 (買為正、賣為負)，返回更新後倉位"""
+        return self._positions.apply_fill(exchange, symbol, delta)
+
+    def apply_position_push(self, exchange: str, symbol: str, pos: Decimal) -> Decimal:
+        """WS 倉位推送 (絕對值)，返回更新後倉位"""
+        return self._positions.apply_push(exchange, symbol, pos)
+
+    def reconcile_position(self, exchange: str, symbol: str, pos: Decimal, version: int) -> ReconcileResult:
+        """
+        REST 倉位快照調和
+
+        Args:
+            pos: REST 返回的倉位
+            version: 發出 REST 請求前的 get_position_version()
+
+        Returns:
+            ReconcileResult (過期快照不覆蓋；帳本由 WS 驅動時附帶漂移量)
+        """
+        return self._positions.reconcile(exchange, symbol, pos, version)
+
+    def get_position_ledger(self) -> Dict:
+        """倉位帳本狀態 (各倉位版本/來源/漂移與統計)"""
+        return self._positions.to_dict()
 
     # ==================== 保本回補：Entry Price 管理 ====================
 
@@ -858,74 +890,88 @@ class MMState:
 
     def update_uptime(self, mid_price: Decimal, bid_price: Optional[Decimal], ask_price: Optional[Decimal]):
         """
-        更新 uptime 分層時間
+        更新 uptime 分層
 
         根據訂單距離中間價的 bps 分類:
         - Boosted (100%): 0-10 bps
         - Standard (50%): 10-30 bps
         - Basic (10%): 30-100 bps
         - Out of range: >100 bps 或無訂單
+
+        事件驅動: 輸入與上次相同時直接返回；分層未改變時 ledger 不記帳，
+        時長在分層改變 (或查詢) 時按實際時間戳結算，與 tick 頻率無關。
         """
-        now = time.time()
         with self._lock:
-            if self._last_uptime_check is None:
-                self._last_uptime_check = now
-                return
-
-            delta_ms = int((now - self._last_uptime_check) * 1000)
-            self._last_uptime_check = now
-            self._total_time_ms += delta_ms
-
-            # StandX Uptime Program 要求雙邊都有訂單才算 qualified
-            # 如果缺少任一邊訂單，算作 out of range
-            if bid_price is None or ask_price is None:
-                self._out_of_range_time_ms += delta_ms
-                return
-
-            # 計算訂單距離 (取買賣單中較遠的那個)
-            max_distance_bps = 0
-            if bid_price is not None and mid_price > 0:
-                bid_dist = float((mid_price - bid_price) / mid_price * 10000)
-                max_distance_bps = max(max_distance_bps, bid_dist)
-            if ask_price is not None and mid_price > 0:
-                ask_dist = float((ask_price - mid_price) / mid_price * 10000)
-                max_distance_bps = max(max_distance_bps, ask_dist)
-
-            # 根據距離分類
-            if max_distance_bps <= 10:
-                self._boosted_time_ms += delta_ms
-            elif max_distance_bps <= 30:
-                self._standard_time_ms += delta_ms
-            elif max_distance_bps <= 100:
-                self._basic_time_ms += delta_ms
-            else:
-                self._out_of_range_time_ms += delta_ms
+            self._update_uptime_locked(mid_price, bid_price, ask_price)
+
+    def _update_uptime_locked(self, mid_price: Decimal, bid_price: Optional[Decimal], ask_price: Optional[Decimal]):
+        inputs = (mid_price, bid_price, ask_price)
+        if inputs == self._uptime_inputs:
+            return
+        self._uptime_inputs = inputs
+        self._uptime.record(self._classify_uptime(mid_price, bid_price, ask_price))
+
+    @staticmethod
+    def _classify_uptime(mid_price: Decimal, bid_price: Optional[Decimal], ask_price: Optional[Decimal]) -> str:
+        """(mid, bid, ask) → uptime 分層"""
+        # StandX Uptime Program 要求雙邊都有訂單才算 qualified
+        # 如果缺少任一邊訂單，算作 out of range
+        if bid_price is None or ask_price is None or not mid_price or mid_price <= 0:
+            return 'out_of_range'
+
+        # 計算訂單距離 (取買賣單中較遠的那個)
+        bid_dist = float((mid_price - bid_price) / mid_price * 10000)
+        ask_dist = float((ask_price - mid_price) / mid_price * 10000)
+        return classify_distance(max(0.0, bid_dist, ask_dist))
+
+    def _reclassify_uptime_locked(self):
+        """
+        訂單變化後以最近一次的中間價重新分類 (需持鎖)
+
+        掛單/撤單在兩次行情之間發生時，分層在事件當下切換，而不是等下一個 tick。
+        階梯模式由執行器以階梯最佳價呼叫 update_uptime，此處僅處理單檔訂單。
+        """
+        if self._uptime_inputs is None:
+            return
+        mid_price = self._uptime_inputs[0]
+        bid_price = self._bid_order.price if self._bid_order else None
+        ask_price = self._ask_order.price if self._ask_order else None
+        self._update_uptime_locked(mid_price, bid_price, ask_price)
+
+    def stop_uptime(self):
+        """停止 uptime 計時 (執行器停止時呼叫，停止期間不計入任何分層)"""
+        with self._lock:
+            self._uptime.record(None)
+            self._uptime_inputs = None
+
+    def _uptime_stats_locked(self) -> Dict:
+        """uptime 統計 (需持鎖)"""
+        now = time.time()
+        durations = self._uptime.durations(now)
+        summary = UptimeLedger.summarize(durations)
+        window = UptimeLedger.summarize(self._uptime.window(self._uptime_window_sec, now))
+        return {
+            "boosted_time_ms": int(durations['boosted'] * 1000),
+            "standard_time_ms": int(durations['standard'] * 1000),
+            "basic_time_ms": int(durations['basic'] * 1000),
+            "out_of_range_time_ms": int(durations['out_of_range'] * 1000),
+            "total_time_ms": int(sum(durations.values()) * 1000),
+            "uptime_pct": summary['uptime_pct'],  # StandX Uptime = boosted tier
+            "boosted_pct": summary['boosted_pct'],
+            "standard_pct": summary['standard_pct'],
+            "basic_pct": summary['basic_pct'],
+            "out_of_range_pct": summary['out_of_range_pct'],
+            "effective_pts_pct": summary['effective_pts_pct'],
+            # 最近 5 分鐘
+            "uptime_5m_pct": window['uptime_pct'],
+            "effective_pts_5m_pct": window['effective_pts_pct'],
+            "uptime_tier": self._uptime.tier,
+        }
 
     def get_uptime_stats(self) -> Dict:
         """獲取 uptime 統計"""
         with self._lock:
-            total = self._total_time_ms or 1
-            boosted_pct = self._boosted_time_ms / total * 100
-            standard_pct = self._standard_time_ms / total * 100
-            basic_pct = self._basic_time_ms / total * 100
-            out_of_range_pct = self._out_of_range_time_ms / total * 100
-
-            # 有效積分百分比 (加權計算)
-            effective_pts_pct = (
-                self._boosted_time_ms * 1.0 +
-                self._standard_time_ms * 0.5 +
-                self._basic_time_ms * 0.1
-            ) / total * 100
-
-            return {
-                "uptime_pct": boosted_pct,  # StandX Uptime Program: boosted tier = qualified uptime
-                "boosted_pct": boosted_pct,
-                "standard_pct": standard_pct,
-                "basic_pct": basic_pct,
-                "out_of_range_pct": out_of_range_pct,
-                "effective_pts_pct": effective_pts_pct,
-                "total_time_ms": self._total_time_ms,
-            }
+            return self._uptime_stats_locked()
 
     def get_stats(self) -> Dict:
         """獲取統計數據"""
@@ -933,7 +979,6 @@ class MMState:
             standx_pos = float(self._standx_position)
             hedge_pos = float(self._hedge_position)
             net_pos = standx_pos + hedge_pos
-            total_time = self._total_time_ms or 1
             return {
                 "total_fills": self._total_fills,
                 "fill_count": self._fill_count,
@@ -961,21 +1006,9 @@ class MMState:
                 "orders_canceled_or_unknown": self._orders_canceled_or_unknown,
                 "partial_fills": self._partial_fills,
                 "unknown_fills_detected": self._unknown_fills_detected,
+                "position_drift_alarms": self._positions.stats['drift_alarms'],
                 # Uptime 分層統計
-                "boosted_time_ms": self._boosted_time_ms,
-                "standard_time_ms": self._standard_time_ms,
-                "basic_time_ms": self._basic_time_ms,
-                "out_of_range_time_ms": self._out_of_range_time_ms,
-                "total_time_ms": self._total_time_ms,
-                "uptime_pct": self._boosted_time_ms / total_time * 100,  # StandX Uptime = boosted tier
-                "boosted_pct": self._boosted_time_ms / total_time * 100,
-                "standard_pct": self._standard_time_ms / total_time * 100,
-                "basic_pct": self._basic_time_ms / total_time * 100,
-                "out_of_range_pct": self._out_of_range_time_ms / total_time * 100,
-                "effective_pts_pct": (
-                    (self._boosted_time_ms * 1.0 + self._standard_time_ms * 0.5 + self._basic_time_ms * 0.1)
-                    / total_time * 100
-                ),
+                **self._uptime_stats_locked(),
             }
 
     def to_dict(self) -> Dict:
@@ -999,7 +1032,6 @@ class MMState:
                 volatility = float((max_price - min_price) / avg_price * 10000) if avg_price != 0 else 0.0
 
             # 統計數據 (包含 uptime 分層統計)
-            total_time = self._total_time_ms or 1  # 避免除以 0
             stats = {
                 "total_fills": self._total_fills,
                 "fill_count": self._fill_count,
@@ -1027,21 +1059,9 @@ class MMState:
                 "orders_canceled_or_unknown": self._orders_canceled_or_unknown,
                 "partial_fills": self._partial_fills,
                 "unknown_fills_detected": self._unknown_fills_detected,
+                "position_drift_alarms": self._positions.stats['drift_alarms'],
                 # Uptime 分層統計
-                "boosted_time_ms": self._boosted_time_ms,
-                "standard_time_ms": self._standard_time_ms,
-                "basic_time_ms": self._basic_time_ms,
-                "out_of_range_time_ms": self._out_of_range_time_ms,
-                "total_time_ms": self._total_time_ms,
-                "uptime_pct": self._boosted_time_ms / total_time * 100,  # StandX Uptime = boosted tier
-                "boosted_pct": self._boosted_time_ms / total_time * 100,
-                "standard_pct": self._standard_time_ms / total_time * 100,
-                "basic_pct": self._basic_time_ms / total_time * 100,
-                "out_of_range_pct": self._out_of_range_time_ms / total_time * 100,
-                "effective_pts_pct": (
-                    (self._boosted_time_ms * 1.0 + self._standard_time_ms * 0.5 + self._basic_time_ms * 0.1)
-                    / total_time * 100
-                ),
+                **self._uptime_stats_locked(),
             }
 
         # 獲取操作歷史 (需要在鎖外調用以避免死鎖)
@@ -1082,5 +1102,6 @@ class MMState:
             "pnl_usd": float(self._realized_pnl),
             "stats": stats,
             "hedge_stats": hedge_stats,
+            "position_ledger": self._positions.to_dict(),
             "operation_history": operation_history,
         }
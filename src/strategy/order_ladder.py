@@ -0,0 +1,277 @@
+"""
+多檔階梯報價
+Order Ladder
+
+MMState 只追蹤一張 bid 與一張 ask。階梯模式每側掛 N 檔，每檔有自己的距離與數量，
+以分散訂單量、提高 uptime 分層覆蓋與隊列位置。本模組負責:
+
+- 階梯配置解析: "0:0.001,10:0.001,25:0.002" → 每檔 (額外距離 bps, 數量)
+- 索引結構: 以 client_order_id / order_id / (side, price) / (side, level) 建索引，
+  WebSocket 成交與狀態事件查找為 O(1)，與在線檔數無關
+- 差異計算: 目標階梯與現有訂單比較，只對移出容忍帶或數量改變的檔位改單，
+  新增檔位下單、多出的檔位撤單，交由批量 adapter 接口執行
+
+替換期間舊單會「脫離」檔位但仍留在索引中 (成交事件仍可查到)，確認撤單後才移除。
+撤單與回滾都失敗時留下的脫離訂單，由下一次 diff 列入撤單。
+"""
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from .mm_state import OrderInfo
+
+logger = logging.getLogger(__name__)
+
+LevelKey = Tuple[str, int]                   # (side, level)
+LadderTargets = Dict[LevelKey, Tuple[Decimal, Decimal]]   # (side, level) -> (price, qty)
+
+
+@dataclass
+class LadderLevel:
+    """單一檔位配置"""
+    distance_bps: Decimal    # 相對基準報價 (第一檔) 的額外距離
+    size: Decimal            # 該檔數量
+
+
+def parse_ladder_levels(spec: str) -> List[LadderLevel]:
+    """
+    解析階梯配置
+
+    Args:
+        spec: "distance_bps:size" 以逗號分隔，例如 "0:0.001,10:0.001,25:0.002"
+
+    Returns:
+        按距離排序的檔位列表
+    """
+    levels = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        distance, _, size = item.partition(':')
+        level = LadderLevel(distance_bps=Decimal(distance.strip()), size=Decimal(size.strip()))
+        if level.size <= 0 or level.distance_bps < 0:
+            raise ValueError(f"Invalid ladder level: {item}")
+        levels.append(level)
+    return sorted(levels, key=lambda lv: lv.distance_bps)
+
+
+@dataclass
+class LadderDiff:
+    """目標階梯與現有訂單的差異"""
+    place: List[Tuple[str, int, Decimal, Decimal]] = field(default_factory=list)              # (side, level, price, qty)
+    replace: List[Tuple[OrderInfo, int, Decimal, Decimal]] = field(default_factory=list)      # (舊單, level, price, qty)
+    cancel: List[OrderInfo] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.place or self.replace or self.cancel)
+
+    def sides(self) -> set:
+        """有變更的方向"""
+        return (
+            {side for side, _, _, _ in self.place}
+            | {order.side for order, _, _, _ in self.replace}
+            | {order.side for order in self.cancel}
+        )
+
+
+class OrderLadder:
+    """
+    階梯訂單索引 (線程安全)
+
+    使用方式:
+        ladder = OrderLadder()
+        ladder.add(0, order_info)          # 方向取自 order_info.side
+        level, order = ladder.find(order_id=..., client_order_id=...)
+        diff = ladder.diff(targets, tick_size, tolerance_ticks=1)
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._orders: Dict[str, OrderInfo] = {}           # client_order_id -> 訂單
+        self._by_order_id: Dict[str, str] = {}            # order_id -> client_order_id
+        self._by_price: Dict[Tuple[str, Decimal], str] = {}   # (side, price) -> client_order_id
+        self._by_level: Dict[LevelKey, str] = {}          # (side, level) -> client_order_id
+        self._level_of: Dict[str, LevelKey] = {}          # client_order_id -> (side, level)，脫離檔位者不在此
+        self.version = 0                                  # 每次變更遞增 (tick 短路用)
+
+    # ==================== 增刪 ====================
+
+    def add(self, level: int, order: OrderInfo):
+        """
+        加入訂單並佔用檔位
+
+        檔位原有的訂單會脫離檔位 (仍可透過 ID 查找)，等待撤單確認後 remove。
+        """
+        key = (order.side, level)
+        with self._lock:
+            previous = self._by_level.get(key)
+            if previous is not None:
+                self._level_of.pop(previous, None)
+            self._orders[order.client_order_id] = order
+            if order.order_id:
+                self._by_order_id[order.order_id] = order.client_order_id
+            self._by_price[(order.side, order.price)] = order.client_order_id
+            self._by_level[key] = order.client_order_id
+            self._level_of[order.client_order_id] = key
+            self.version += 1
+
+    def attach(self, client_order_id: str, level: int) -> bool:
+        """讓仍在索引中的訂單重新佔用檔位 (替換回滾用)"""
+        with self._lock:
+            order = self._orders.get(client_order_id)
+            if order is None:
+                return False
+            key = (order.side, level)
+            previous = self._by_level.get(key)
+            if previous is not None and previous != client_order_id:
+                self._level_of.pop(previous, None)
+            self._by_level[key] = client_order_id
+            self._level_of[client_order_id] = key
+            self.version += 1
+            return True
+
+    def remove(self, order_id: Optional[str] = None, client_order_id: Optional[str] = None) -> Optional[OrderInfo]:
+        """移除訂單，返回被移除的訂單 (不存在返回 None)"""
+        with self._lock:
+            cid = self._resolve(order_id, client_order_id)
+            if cid is None:
+                return None
+            order = self._orders.pop(cid)
+            if order.order_id and self._by_order_id.get(order.order_id) == cid:
+                del self._by_order_id[order.order_id]
+            if self._by_price.get((order.side, order.price)) == cid:
+                del self._by_price[(order.side, order.price)]
+            key = self._level_of.pop(cid, None)
+            if key is not None and self._by_level.get(key) == cid:
+                del self._by_level[key]
+            self.version += 1
+            return order
+
+    def clear(self) -> List[OrderInfo]:
+        """清空，返回所有訂單"""
+        with self._lock:
+            orders = list(self._orders.values())
+            self._orders.clear()
+            self._by_order_id.clear()
+            self._by_price.clear()
+            self._by_level.clear()
+            self._level_of.clear()
+            self.version += 1
+            return orders
+
+    # ==================== 查找 (O(1)) ====================
+
+    def _resolve(self, order_id: Optional[str], client_order_id: Optional[str]) -> Optional[str]:
+        """order_id / client_order_id → 索引中的 client_order_id (需持鎖)"""
+        if client_order_id and client_order_id in self._orders:
+            return client_order_id
+        if order_id:
+            return self._by_order_id.get(order_id)
+        return None
+
+    def find(self, order_id: Optional[str] = None, client_order_id: Optional[str] = None) -> Optional[Tuple[Optional[int], OrderInfo]]:
+        """
+        查找訂單
+
+        Returns:
+            (level, order)，脫離檔位的訂單 level 為 None；不存在返回 None
+        """
+        with self._lock:
+            cid = self._resolve(order_id, client_order_id)
+            if cid is None:
+                return None
+            key = self._level_of.get(cid)
+            return (key[1] if key else None), self._orders[cid]
+
+    def at_price(self, side: str, price: Decimal) -> Optional[OrderInfo]:
+        """某方向某價格的訂單"""
+        with self._lock:
+            cid = self._by_price.get((side, price))
+            return self._orders.get(cid) if cid else None
+
+    def at_level(self, side: str, level: int) -> Optional[OrderInfo]:
+        """佔用某檔位的訂單"""
+        with self._lock:
+            cid = self._by_level.get((side, level))
+            return self._orders.get(cid) if cid else None
+
+    def orders(self, side: Optional[str] = None) -> List[OrderInfo]:
+        """所有訂單 (含脫離檔位者)"""
+        with self._lock:
+            return [o for o in self._orders.values() if side is None or o.side == side]
+
+    def best(self, side: str) -> Optional[OrderInfo]:
+        """該方向最靠近盤口的訂單"""
+        orders = self.orders(side)
+        if not orders:
+            return None
+        return max(orders, key=lambda o: o.price) if side == "buy" else min(orders, key=lambda o: o.price)
+
+    def has_detached(self) -> bool:
+        """是否有脫離檔位、仍待撤單的訂單"""
+        with self._lock:
+            return len(self._orders) > len(self._level_of)
+
+    def has_side(self, side: str) -> bool:
+        with self._lock:
+            return any(key[0] == side for key in self._by_level)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._orders)
+
+    # ==================== 差異計算 ====================
+
+    def diff(self, targets: LadderTargets, tick_size: Decimal, tolerance_ticks: int = 1) -> LadderDiff:
+        """
+        計算目標階梯與現有訂單的差異
+
+        Args:
+            targets: (side, level) -> (price, qty)
+            tick_size: 價格 tick
+            tolerance_ticks: 價格相差在此 tick 數以內且數量相同時保留現有訂單
+
+        Returns:
+            LadderDiff (脫離檔位的訂單一律列入 cancel)
+        """
+        band = tick_size * tolerance_ticks
+        result = LadderDiff()
+        with self._lock:
+            for key, (price, qty) in targets.items():
+                cid = self._by_level.get(key)
+                if cid is None:
+                    result.place.append((key[0], key[1], price, qty))
+                    continue
+                order = self._orders[cid]
+                if abs(order.price - price) > band or order.qty != qty:
+                    result.replace.append((order, key[1], price, qty))
+
+            for key, cid in self._by_level.items():
+                if key not in targets:
+                    result.cancel.append(self._orders[cid])
+
+            # 替換時撤單與回滾都失敗而殘留的舊單
+            for cid, order in self._orders.items():
+                if cid not in self._level_of:
+                    result.cancel.append(order)
+        return result
+
+    def to_list(self) -> List[Dict]:
+        """序列化 (供前端顯示)"""
+        with self._lock:
+            items = []
+            for cid, order in self._orders.items():
+                key = self._level_of.get(cid)
+                items.append({
+                    "side": order.side,
+                    "level": key[1] if key else None,
+                    "client_order_id": cid,
+                    "price": float(order.price),
+                    "qty": float(order.qty),
+                    "status": order.status,
+                })
+        return sorted(items, key=lambda o: (o["side"], o["level"] if o["level"] is not None else -1))
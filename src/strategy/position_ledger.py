@@ -0,0 +1,252 @@
+"""
+倉位帳本
+Position Ledger
+
+倉位原本只靠 REST (_sync_primary_position / _sync_hedge_position) 取得，成交時、輪詢模式
+每個 tick、硬停恢復時都要查一次。帳本以 (exchange, symbol) 為鍵，由 WebSocket 驅動:
+
+- WS 成交: 增量更新 (apply_fill)
+- WS 倉位推送: 絕對值更新 (apply_push)
+- REST 快照: 慢速調和 (reconcile)；發出請求前取得版本號，返回時版本已變表示期間有
+  更新的 WS 資料，快照視為過期而不覆蓋
+- 漂移警報: 帳本曾由 WS 驅動而 REST 快照與帳本不一致時，返回漂移量由呼叫方告警
+
+成交事件與倉位推送的到達順序不固定。倉位 = 最近一次絕對值觀測 (base) + 之後收到的
+成交 (unconfirmed)。推送對其之前收到的所有成交具有權威性: unconfirmed 清零 (重複或
+累計型成交多算的量也一併修正)；推送相對帳本的變化中尚未由成交解釋的部分記為 credit，
+只有推送之後到達的同向成交會先抵銷 credit，避免同一筆成交被計算兩次。未配對的量在
+match_window_sec 後失效: unconfirmed 併入 base (成交是真的，只是沒有推送)，credit 丟棄
+(推送來自非成交變化)。
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PositionKey = Tuple[str, str]      # (exchange, symbol)
+
+_ZERO = Decimal("0")
+
+
+def _offset(pending: Decimal, incoming: Decimal) -> Tuple[Decimal, Decimal]:
+    """同號時互相抵銷，返回 (pending 剩餘, incoming 剩餘)"""
+    if pending == 0 or incoming == 0 or (pending > 0) != (incoming > 0):
+        return pending, incoming
+    take = min(abs(pending), abs(incoming))
+    if pending < 0:
+        take = -take
+    return pending - take, incoming - take
+
+
+@dataclass
+class PositionEntry:
+    """單一 (exchange, symbol) 的倉位記錄"""
+    base: Decimal = _ZERO               # 最近一次絕對值觀測 (REST 快照或 WS 推送)
+    unconfirmed: Decimal = _ZERO        # 最近一次絕對值觀測之後收到的 WS 成交
+    credit: Decimal = _ZERO             # 推送已反映、成交事件尚未到達的變化
+    pending_since: float = 0.0          # unconfirmed / credit 最後變動時間
+    version: int = 0                    # 每次更新遞增
+    source: str = "init"                # 最近一次更新來源: ws_fill / ws_push / rest / manual
+    updated_at: float = 0.0
+    ws_fed: bool = False                # 是否曾由 WS 驅動 (決定 REST 差異是否算漂移)
+    last_snapshot_at: float = 0.0
+    last_drift: Decimal = _ZERO
+
+    @property
+    def qty(self) -> Decimal:
+        return self.base + self.unconfirmed
+
+    def to_dict(self) -> Dict:
+        return {
+            "qty": float(self.qty),
+            "unconfirmed": float(self.unconfirmed),
+            "version": self.version,
+            "source": self.source,
+            "updated_at": self.updated_at,
+            "last_snapshot_at": self.last_snapshot_at,
+            "last_drift": float(self.last_drift),
+        }
+
+
+@dataclass
+class ReconcileResult:
+    """REST 快照調和結果"""
+    applied: bool                       # False = 快照過期，未覆蓋帳本
+    position: Decimal                   # 調和後的倉位
+    drift: Decimal = _ZERO              # REST - 帳本 (僅 applied 且帳本由 WS 驅動時非零)
+
+
+class PositionLedger:
+    """
+    倉位帳本 (線程安全)
+
+    使用方式:
+        ledger = PositionLedger()
+        ledger.apply_fill("standx", "BTC-USD", Decimal("0.001"))     # WS 成交 (買為正)
+        ledger.apply_push("standx", "BTC-USD", Decimal("0.001"))     # WS 倉位推送
+        version = ledger.version("standx", "BTC-USD")                # REST 請求前
+        result = ledger.reconcile("standx", "BTC-USD", rest_qty, version)
+    """
+
+    def __init__(self, match_window_sec: float = 5.0, drift_tolerance: Decimal = Decimal("0.0001")):
+        """
+        Args:
+            match_window_sec: 成交與推送互相配對的時間窗
+            drift_tolerance: REST 與帳本差異超過此值才算漂移
+        """
+        self.match_window_sec = match_window_sec
+        self.drift_tolerance = drift_tolerance
+        self._lock = Lock()
+        self._entries: Dict[PositionKey, PositionEntry] = {}
+
+        # 統計
+        self.stats: Dict[str, int] = {
+            'ws_fills': 0,
+            'ws_pushes': 0,
+            'snapshots': 0,
+            'stale_snapshots': 0,
+            'drift_alarms': 0,
+        }
+
+    def _entry(self, key: PositionKey) -> PositionEntry:
+        """取得或建立記錄 (需持鎖)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = PositionEntry()
+        return entry
+
+    def _expire(self, entry: PositionEntry, now: float):
+        """未配對的量超過時間窗後失效 (需持鎖)"""
+        if (entry.unconfirmed or entry.credit) and now - entry.pending_since > self.match_window_sec:
+            entry.base += entry.unconfirmed
+            entry.unconfirmed = _ZERO
+            entry.credit = _ZERO
+
+    def _touch(self, entry: PositionEntry, source: str, now: float):
+        entry.version += 1
+        entry.source = source
+        entry.updated_at = now
+
+    # ==================== 查詢 ====================
+
+    def get(self, exchange: str, symbol: str) -> Decimal:
+        with self._lock:
+            entry = self._entries.get((exchange, symbol))
+            if entry is None:
+                return _ZERO
+            self._expire(entry, time.time())
+            return entry.qty
+
+    def version(self, exchange: str, symbol: str) -> int:
+        """目前版本號 (REST 請求前取得，調和時用於判斷快照是否過期)"""
+        with self._lock:
+            entry = self._entries.get((exchange, symbol))
+            return entry.version if entry else 0
+
+    # ==================== 更新 ====================
+
+    def set(self, exchange: str, symbol: str, qty: Decimal, source: str = "manual") -> Decimal:
+        """無條件設定倉位 (清除未配對的量)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entry((exchange, symbol))
+            entry.base = qty
+            entry.unconfirmed = _ZERO
+            entry.credit = _ZERO
+            self._touch(entry, source, now)
+            return qty
+
+    def apply_fill(self, exchange: str, symbol: str, delta: Decimal) -> Decimal:
+        """
+        WS 成交增量
+
+        Args:
+            delta: 倉位變化 (買為正、賣為負)
+
+        Returns:
+            更新後的倉位
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entry((exchange, symbol))
+            self._expire(entry, now)
+            entry.credit, delta = _offset(entry.credit, delta)
+            entry.unconfirmed += delta
+            entry.pending_since = now
+            entry.ws_fed = True
+            self._touch(entry, "ws_fill", now)
+            self.stats['ws_fills'] += 1
+            return entry.qty
+
+    def apply_push(self, exchange: str, symbol: str, qty: Decimal) -> Decimal:
+        """
+        WS 倉位推送 (絕對值，覆蓋之前收到的所有成交增量)
+
+        Returns:
+            更新後的倉位 (= qty)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entry((exchange, symbol))
+            self._expire(entry, now)
+            change = qty - entry.qty
+            entry.base = qty
+            entry.unconfirmed = _ZERO
+            if change:
+                # 已收到的成交無法解釋的變化: 留給推送之後到達的成交抵銷
+                entry.credit += change
+                entry.pending_since = now
+            entry.ws_fed = True
+            self._touch(entry, "ws_push", now)
+            self.stats['ws_pushes'] += 1
+            return entry.qty
+
+    def reconcile(self, exchange: str, symbol: str, qty: Decimal, version: int) -> ReconcileResult:
+        """
+        REST 快照調和
+
+        Args:
+            qty: REST 返回的倉位
+            version: 發出 REST 請求前的版本號
+
+        Returns:
+            ReconcileResult；版本已變時 applied=False，帳本保持不變
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entry((exchange, symbol))
+            self.stats['snapshots'] += 1
+            if entry.version != version:
+                self.stats['stale_snapshots'] += 1
+                self._expire(entry, now)
+                return ReconcileResult(applied=False, position=entry.qty)
+
+            self._expire(entry, now)
+            drift = qty - entry.qty if entry.ws_fed else _ZERO
+            if abs(drift) <= self.drift_tolerance:
+                drift = _ZERO
+            else:
+                self.stats['drift_alarms'] += 1
+            entry.last_drift = drift
+            entry.last_snapshot_at = now
+            entry.base = qty
+            entry.unconfirmed = _ZERO
+            entry.credit = _ZERO
+            self._touch(entry, "rest", now)
+            return ReconcileResult(applied=True, position=qty, drift=drift)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def to_dict(self) -> Dict:
+        """序列化 (供前端/統計)"""
+        with self._lock:
+            return {
+                "positions": {f"{ex}/{sym}": entry.to_dict() for (ex, sym), entry in self._entries.items()},
+                **self.stats,
+            }
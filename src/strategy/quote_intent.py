@@ -0,0 +1,98 @@
+"""
+報價意圖快取
+Quote Intent
+
+做市主循環每個 tick 都跑完整流程 (訂單簿、波動率、撤單/重掛檢查、_place_orders 內的
+REST gate 與 _calculate_prices)。多數 tick 其實輸入完全沒變，本模組負責:
+
+- 目標價格記憶化: 以「影響報價的輸入」為鍵 (best bid/ask 的 tick 序號、fill-skew 區間、
+  波動率區間、保本回補狀態、配置版本)，輸入不變時直接返回上次的目標價
+- 整個 tick 短路: 輸入 (再加上倉位與掛單) 與上一個完整 tick 相同時跳過後續流程，
+  但每 full_refresh_sec 仍強制跑一次完整流程 (倉位同步、REST gate 等安全檢查)
+- 容忍帶: 現有訂單與目標價相差不超過 tolerance_ticks 個 tick 時不發出改單
+"""
+import time
+from decimal import Decimal
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+QuotePrices = Tuple[Decimal, Decimal]
+
+
+class QuoteIntent:
+    """報價意圖快取 (單一交易對)"""
+
+    def __init__(self, tolerance_ticks: int = 1, full_refresh_sec: float = 2.0):
+        """
+        Args:
+            tolerance_ticks: 訂單價與目標價相差在此 tick 數以內視為不需改單
+            full_refresh_sec: 輸入不變時，最長多久強制跑一次完整 tick
+        """
+        self.tolerance_ticks = tolerance_ticks
+        self.full_refresh_sec = full_refresh_sec
+
+        self._price_key: Optional[Hashable] = None
+        self._prices: Optional[QuotePrices] = None
+        self._tick_key: Optional[Hashable] = None
+        self._last_full_tick = 0.0
+
+        # 統計
+        self.stats: Dict[str, int] = {
+            'price_hits': 0,
+            'price_misses': 0,
+            'ticks_skipped': 0,
+            'ticks_full': 0,
+            'requotes_suppressed': 0,
+        }
+
+    # ==================== 目標價格 ====================
+
+    def prices(self, key: Hashable, compute: Callable[[], QuotePrices]) -> QuotePrices:
+        """輸入鍵未變時返回快取的目標價，否則重新計算"""
+        if key == self._price_key and self._prices is not None:
+            self.stats['price_hits'] += 1
+            return self._prices
+        self.stats['price_misses'] += 1
+        self._prices = compute()
+        self._price_key = key
+        return self._prices
+
+    # ==================== Tick 短路 ====================
+
+    def should_skip_tick(self, key: Hashable) -> bool:
+        """
+        是否跳過本次 tick 的後續流程
+
+        不跳過時會把 key 記為最近一次完整 tick 的輸入。
+        """
+        now = time.time()
+        if key == self._tick_key and now - self._last_full_tick < self.full_refresh_sec:
+            self.stats['ticks_skipped'] += 1
+            return True
+        self._tick_key = key
+        self._last_full_tick = now
+        self.stats['ticks_full'] += 1
+        return False
+
+    def invalidate(self):
+        """丟棄快取 (例如狀態變化、手動重設後)"""
+        self._price_key = None
+        self._prices = None
+        self._tick_key = None
+
+    # ==================== 容忍帶 ====================
+
+    def needs_requote(self, order_price: Optional[Decimal], target: Decimal, tick_size: Decimal) -> bool:
+        """訂單價與目標價相差超過容忍帶才需要改單"""
+        if order_price is None:
+            return True
+        if abs(order_price - target) > tick_size * self.tolerance_ticks:
+            return True
+        self.stats['requotes_suppressed'] += 1
+        return False
+
+    def get_stats(self) -> Dict:
+        total = self.stats['ticks_skipped'] + self.stats['ticks_full']
+        return {
+            **self.stats,
+            'skip_rate': round(self.stats['ticks_skipped'] / total * 100, 1) if total else 0.0,
+        }
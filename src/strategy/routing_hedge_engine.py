@@ -0,0 +1,476 @@
+"""
+多場所對沖路由引擎
+Routing Hedge Engine
+
+持有多個 BaseHedgeEngine 後端 (GRVT、StandX 對沖帳戶...)，每筆對沖按預估總成本選擇場所：
+- 深度: 各後端預熱上下文 (HedgeContext) 中的淺層訂單簿，估算吃單 VWAP
+- 手續費: 各場所 taker fee
+- 延遲: 近期 HedgeResult.latency_ms 的 EWMA，換算為等待期間的價格漂移成本
+
+單一場所深度不足時按「調整後價格」逐檔合併各場所深度並拆單；
+某場所失敗 (未觸發 fallback 平倉) 時，未成交部分改送次佳場所，
+失敗場所冷卻一段時間不參與路由。結果不明的失敗 (送單超時等) 可能已成交，
+先以該場所倉位變化對帳，只改送確實未成交的數量。
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, ROUND_FLOOR
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_hedge_engine import (
+    BaseHedgeEngine,
+    BaseHedgeConfig,
+    HedgeContext,
+    HedgeResult,
+    HedgeStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+# 失敗狀態嚴重程度 (合併拆單結果時取最嚴重者)
+_STATUS_SEVERITY = {
+    HedgeStatus.FALLBACK_FAILED: 6,
+    HedgeStatus.PARTIAL_FALLBACK: 5,
+    HedgeStatus.RISK_CONTROL: 4,
+    HedgeStatus.WAITING_RECOVERY: 3,
+    HedgeStatus.TIMEOUT: 2,
+    HedgeStatus.FAILED: 1,
+}
+
+# 這些失敗狀態未動用 fallback 平倉，未成交部分可改送其他場所
+# (HedgeResult.fill_unknown 時須先對帳)
+_REROUTABLE = {
+    HedgeStatus.FAILED,
+    HedgeStatus.TIMEOUT,
+    HedgeStatus.RISK_CONTROL,
+    HedgeStatus.WAITING_RECOVERY,
+}
+
+
+@dataclass
+class RoutingHedgeConfig(BaseHedgeConfig):
+    """路由對沖配置"""
+    hedge_type: str = "routing"
+
+    # 延遲成本: 每 100ms 預估的價格漂移 (bps)
+    latency_cost_bps_per_100ms: float = 0.5
+    default_latency_ms: float = 300.0        # 尚無樣本時的延遲估計
+    latency_alpha: float = 0.2               # EWMA 權重
+
+    # 拆單
+    allow_split: bool = True
+    min_split_fraction: float = 0.2          # 分配量低於總量此比例時併入主場所
+
+    # 失敗冷卻
+    route_cooldown_sec: float = 30.0
+
+    # 改送前對帳: 送單前記錄各場所倉位 (多一次倉位查詢延遲)，
+    # 結果不明的腿以倉位變化估算已成交量；關閉時結果不明的腿不改送
+    reconcile_reroute: bool = True
+    reconcile_timeout_sec: float = 1.0
+
+
+@dataclass
+class HedgeRoute:
+    """一個對沖場所"""
+    name: str
+    engine: BaseHedgeEngine
+    fee_bps: float = 5.0
+
+    latency_ms: Optional[float] = None       # EWMA
+    down_until: float = 0.0
+
+    # 統計
+    orders: int = 0
+    failures: int = 0
+    qty_routed: Decimal = Decimal("0")
+
+    @property
+    def is_down(self) -> bool:
+        return time.time() < self.down_until
+
+
+class RoutingHedgeEngine(BaseHedgeEngine):
+    """
+    多場所對沖路由
+
+    使用方式:
+        engine = RoutingHedgeEngine([
+            HedgeRoute("GRVT", grvt_engine, fee_bps=3.0),
+            HedgeRoute("STANDX_HEDGE", standx_engine, fee_bps=2.0),
+        ])
+    """
+
+    def __init__(
+        self,
+        routes: List[HedgeRoute],
+        fallback_adapter=None,
+        config: Optional[RoutingHedgeConfig] = None,
+    ):
+        if not routes:
+            raise ValueError("RoutingHedgeEngine requires at least one route")
+        super().__init__(
+            hedge_adapter=routes[0].engine.hedge_adapter,
+            fallback_adapter=fallback_adapter,
+            config=config or RoutingHedgeConfig(),
+        )
+        self.routes = routes
+
+    # ==================== 代理到後端 ====================
+
+    def map_symbol(self, source_symbol: str) -> str:
+        """主場所的交易對映射"""
+        return self.routes[0].engine.map_symbol(source_symbol)
+
+    def get_context(self, source_symbol: str) -> Optional[HedgeContext]:
+        return self.routes[0].engine.get_context(source_symbol)
+
+    async def start_context_refresh(self, source_symbols: List[str]):
+        await asyncio.gather(*(r.engine.start_context_refresh(source_symbols) for r in self.routes))
+
+    async def stop_context_refresh(self):
+        await asyncio.gather(*(r.engine.stop_context_refresh() for r in self.routes))
+
+    def invalidate_contexts(self):
+        for route in self.routes:
+            route.engine.invalidate_contexts()
+
+    def hedge_targets(self, source_symbol: str) -> List[Tuple[Any, str]]:
+        targets = []
+        for route in self.routes:
+            targets.extend(route.engine.hedge_targets(source_symbol))
+        return targets
+
+    # ==================== 路由 ====================
+
+    def _penalty(self, route: HedgeRoute) -> float:
+        """手續費 + 延遲成本 (小數)"""
+        latency = route.latency_ms if route.latency_ms is not None else self.config.default_latency_ms
+        latency_bps = latency / 100 * self.config.latency_cost_bps_per_100ms
+        return (route.fee_bps + latency_bps) / 10000
+
+    def _adjusted(self, price: float, route: HedgeRoute, hedge_side: str) -> float:
+        """調整後價格 (買: 越低越好；賣: 越高越好)"""
+        penalty = self._penalty(route)
+        return price * (1 + penalty) if hedge_side == "buy" else price * (1 - penalty)
+
+    def plan(self, source_symbol: str, hedge_side: str, qty: Decimal) -> List[Tuple[HedgeRoute, Decimal]]:
+        """
+        分配對沖數量到各場所
+
+        Returns:
+            [(route, qty), ...]，第一個為主場所
+        """
+        candidates = [r for r in self.routes if not r.is_down] or list(self.routes)
+
+        # 各場所深度 (調整後價格)
+        books: Dict[str, List[Tuple[float, float]]] = {}
+        for route in candidates:
+            ctx = route.engine.get_context(source_symbol)
+            levels = ctx.levels(hedge_side) if ctx else None
+            if levels:
+                books[route.name] = [(self._adjusted(float(p), route, hedge_side), float(q)) for p, q in levels]
+
+        if not books:
+            # 沒有任何深度: 依延遲/手續費成本與配置順序選擇
+            best = min(candidates, key=self._penalty)
+            return [(best, qty)]
+
+        # 整筆在單一場所的成本，深度不足的部分以最差檔價格估算
+        def full_cost(levels: List[Tuple[float, float]]) -> float:
+            remaining = float(qty)
+            cost = 0.0
+            for price, size in levels:
+                take = min(remaining, size)
+                cost += take * price
+                remaining -= take
+                if remaining <= 0:
+                    break
+            return cost + remaining * levels[-1][0]
+
+        by_name = {r.name: r for r in candidates}
+        costs = {name: full_cost(levels) for name, levels in books.items()}
+        primary_name = min(costs, key=costs.get) if hedge_side == "buy" else max(costs, key=costs.get)
+        primary = by_name[primary_name]
+
+        if not self.config.allow_split or len(books) < 2:
+            return [(primary, qty)]
+
+        # 逐檔合併各場所深度，取最優的價位直到滿足數量
+        merged = sorted(
+            ((price, size, name) for name, levels in books.items() for price, size in levels),
+            key=lambda x: x[0],
+            reverse=(hedge_side == "sell"),
+        )
+        allocation: Dict[str, float] = {}
+        remaining = float(qty)
+        for price, size, name in merged:
+            if remaining <= 0:
+                break
+            take = min(remaining, size)
+            allocation[name] = allocation.get(name, 0.0) + take
+            remaining -= take
+
+        # 分配量太小的場所併入主場所；非主場所數量按其 qty_step 向下取整
+        min_leg = float(qty) * self.config.min_split_fraction
+        legs: List[Tuple[HedgeRoute, Decimal]] = []
+        assigned = Decimal("0")
+        for name, amount in sorted(allocation.items(), key=lambda x: -x[1]):
+            if name == primary_name or amount < min_leg:
+                continue
+            route = by_name[name]
+            leg_qty = self._floor_to_step(route, source_symbol, Decimal(str(amount)))
+            if leg_qty > 0:
+                legs.append((route, leg_qty))
+                assigned += leg_qty
+
+        rest = qty - assigned
+        if not legs or self._floor_to_step(primary, source_symbol, rest) <= 0:
+            return [(primary, qty)]
+        return [(primary, rest)] + legs
+
+    @staticmethod
+    def _floor_to_step(route: HedgeRoute, source_symbol: str, qty: Decimal) -> Decimal:
+        ctx = route.engine.get_context(source_symbol)
+        step = ctx.qty_step if ctx else None
+        min_qty = getattr(ctx.spec, "min_qty", None) if ctx else None
+        if step:
+            qty = (qty / step).to_integral_value(rounding=ROUND_FLOOR) * step
+        if min_qty and qty < min_qty:
+            return Decimal("0")
+        return qty
+
+    # ==================== 執行 ====================
+
+    async def execute_hedge(
+        self,
+        fill_id: str,
+        fill_side: str,
+        fill_qty: Decimal,
+        fill_price: Decimal,
+        source_symbol: str,
+    ) -> HedgeResult:
+        """按路由計劃執行對沖 (拆單並發送出)"""
+        hedge_side = "sell" if fill_side == "buy" else "buy"
+        legs = self.plan(source_symbol, hedge_side, fill_qty)
+
+        if len(legs) > 1:
+            logger.info(
+                f"[HedgeRouter] Splitting {hedge_side} {fill_qty}: "
+                + ", ".join(f"{route.name}={qty}" for route, qty in legs)
+            )
+
+        # 改送前對帳用的倉位基準 (只有單一場所時無處改送，不需要)
+        baselines: List[Optional[Decimal]] = [None] * len(legs)
+        if self.config.reconcile_reroute and len(self.routes) > 1:
+            baselines = list(await asyncio.gather(*(
+                self._venue_position(route, source_symbol) for route, _ in legs
+            )))
+
+        results = await asyncio.gather(*(
+            self._execute_leg(route, fill_id if i == 0 else f"{fill_id}_{route.name}",
+                              fill_side, qty, fill_price, source_symbol)
+            for i, (route, qty) in enumerate(legs)
+        ))
+
+        # 失敗的腿改送次佳場所 (僅限未動用 fallback 的失敗；失敗場所已進入冷卻)
+        results = list(results)
+        for i, ((route, qty), result) in enumerate(zip(legs, results)):
+            if result.success or result.status not in _REROUTABLE:
+                continue
+            alternatives = [r for r in self.routes if not r.is_down]
+            if not alternatives:
+                continue
+
+            remaining = qty - (result.fill_qty or Decimal("0"))
+            if result.fill_unknown:
+                # 可能已成交: 以倉位變化對帳，查不到則交由淨敞口檢查處理
+                filled = await self._reconciled_fill(route, source_symbol, hedge_side, baselines[i])
+                if filled is None:
+                    logger.warning(
+                        f"[HedgeRouter] {route.name} failed with unknown fill ({result.error_message}), "
+                        f"cannot reconcile position, not rerouting {qty}"
+                    )
+                    continue
+                filled = min(filled, qty)
+                if filled > 0:
+                    result.fill_qty = filled
+                remaining = qty - filled
+
+            alternative = min(alternatives, key=self._penalty)
+            remaining = self._floor_to_step(alternative, source_symbol, remaining)
+            if remaining <= 0:
+                continue
+            logger.warning(
+                f"[HedgeRouter] {route.name} failed ({result.status.value}), "
+                f"rerouting {remaining}/{qty} to {alternative.name}"
+            )
+            retry = await self._execute_leg(alternative, f"{fill_id}_{alternative.name}", fill_side, remaining, fill_price, source_symbol)
+            if retry.success:
+                if result.fill_qty:
+                    # 原場所的部分成交保留在結果中
+                    result.success = True
+                    result.status = HedgeStatus.PARTIAL
+                    results.append(result)
+                results[i] = retry
+
+        if len(results) == 1:
+            return results[0]
+        return self._combine(fill_id, fill_side, fill_qty, fill_price, source_symbol, results)
+
+    async def _execute_leg(
+        self,
+        route: HedgeRoute,
+        fill_id: str,
+        fill_side: str,
+        qty: Decimal,
+        fill_price: Decimal,
+        source_symbol: str,
+    ) -> HedgeResult:
+        route.orders += 1
+        self._total_attempts += 1
+        try:
+            # 位置參數: 各引擎的交易對參數名不同 (source_symbol / standx_symbol)
+            result = await route.engine.execute_hedge(fill_id, fill_side, qty, fill_price, source_symbol)
+        except Exception as e:
+            logger.error(f"[HedgeRouter] {route.name} execute_hedge error: {e}", exc_info=True)
+            result = HedgeResult(
+                success=False,
+                status=HedgeStatus.FAILED,
+                source_fill_id=fill_id,
+                source_symbol=source_symbol,
+                requested_qty=qty,
+                hedge_side="sell" if fill_side == "buy" else "buy",
+                error_message=str(e),
+                fill_unknown=True,  # 不確定是否已送單
+            )
+
+        if result.success:
+            self._total_success += 1
+            self._total_latency_ms += result.latency_ms
+            route.qty_routed += result.fill_qty or qty
+            alpha = self.config.latency_alpha
+            route.latency_ms = (
+                result.latency_ms if route.latency_ms is None
+                else (1 - alpha) * route.latency_ms + alpha * result.latency_ms
+            )
+        else:
+            self._total_failed += 1
+            route.failures += 1
+            route.down_until = time.time() + self.config.route_cooldown_sec
+            if result.status in (HedgeStatus.PARTIAL_FALLBACK, HedgeStatus.FALLBACK):
+                self._total_fallback += 1
+        return result
+
+    async def _venue_position(self, route: HedgeRoute, source_symbol: str) -> Optional[Decimal]:
+        """場所目前的對沖倉位 (多頭為正)；查詢失敗回傳 None"""
+        total = Decimal("0")
+        try:
+            for adapter, symbol in route.engine.hedge_targets(source_symbol):
+                positions = await asyncio.wait_for(
+                    adapter.get_positions(symbol), timeout=self.config.reconcile_timeout_sec
+                )
+                for pos in positions:
+                    if symbol in pos.symbol or pos.symbol == symbol:
+                        size = Decimal(str(pos.size))
+                        total += size if pos.side == "long" else -size
+                        break
+        except Exception as e:
+            logger.warning(f"[HedgeRouter] {route.name} position query failed: {e}")
+            return None
+        return total
+
+    async def _reconciled_fill(
+        self,
+        route: HedgeRoute,
+        source_symbol: str,
+        hedge_side: str,
+        baseline: Optional[Decimal],
+    ) -> Optional[Decimal]:
+        """依倉位變化估算失敗腿實際成交量；無基準或查詢失敗回傳 None"""
+        if baseline is None:
+            return None
+        current = await self._venue_position(route, source_symbol)
+        if current is None:
+            return None
+        delta = current - baseline if hedge_side == "buy" else baseline - current
+        return max(delta, Decimal("0"))
+
+    def _combine(
+        self,
+        fill_id: str,
+        fill_side: str,
+        fill_qty: Decimal,
+        fill_price: Decimal,
+        source_symbol: str,
+        results: List[HedgeResult],
+    ) -> HedgeResult:
+        """合併拆單結果"""
+        hedge_side = "sell" if fill_side == "buy" else "buy"
+        filled = [r for r in results if r.success]
+        failed = [r for r in results if not r.success]
+
+        combined = HedgeResult(
+            success=not failed,
+            status=HedgeStatus.FILLED,
+            source_fill_id=fill_id,
+            source_symbol=source_symbol,
+            hedge_symbol=",".join(sorted({r.hedge_symbol for r in results if r.hedge_symbol})),
+            requested_qty=fill_qty,
+            normalized_qty=sum((r.normalized_qty for r in results), Decimal("0")),
+            hedge_side=hedge_side,
+            fee_paid=sum((r.fee_paid for r in results), Decimal("0")),
+            attempts=max(r.attempts for r in results),
+            latency_ms=max(r.latency_ms for r in results),
+            started_at=min(r.started_at for r in results),
+            completed_at=datetime.now(),
+        )
+
+        qty_filled = sum((r.fill_qty or r.normalized_qty for r in filled), Decimal("0"))
+        if qty_filled > 0:
+            notional = sum(((r.fill_price or fill_price) * (r.fill_qty or r.normalized_qty) for r in filled), Decimal("0"))
+            combined.fill_qty = qty_filled
+            combined.fill_price = notional / qty_filled
+            combined.execution_price = combined.fill_price
+            combined.slippage_bps = self._calculate_slippage(fill_price, combined.fill_price, hedge_side)
+            combined.order_id = ",".join(r.order_id for r in filled if r.order_id)
+
+        if failed:
+            worst = max(failed, key=lambda r: _STATUS_SEVERITY.get(r.status, 0))
+            combined.status = worst.status
+            if filled and worst.status in (HedgeStatus.FAILED, HedgeStatus.TIMEOUT):
+                combined.status = HedgeStatus.PARTIAL
+            combined.error_message = "; ".join(r.error_message for r in failed if r.error_message)
+        return combined
+
+    # ==================== 恢復檢測 ====================
+
+    async def check_recovery(self) -> bool:
+        """冷卻中的場所逐一檢測；只要有健康場所即可恢復"""
+        for route in self.routes:
+            if route.is_down and await route.engine.check_recovery():
+                route.down_until = 0.0
+                logger.info(f"[HedgeRouter] Route {route.name} recovered")
+        return any(not r.is_down for r in self.routes)
+
+    # ==================== 統計 ====================
+
+    def get_stats(self) -> dict:
+        return {
+            **super().get_stats(),
+            "routes": {
+                route.name: {
+                    "fee_bps": route.fee_bps,
+                    "latency_ms": round(route.latency_ms, 1) if route.latency_ms is not None else None,
+                    "down": route.is_down,
+                    "orders": route.orders,
+                    "failures": route.failures,
+                    "qty_routed": str(route.qty_routed),
+                    "engine": route.engine.get_stats(),
+                }
+                for route in self.routes
+            },
+        }
@@ -20,11 +20,12 @@ from .base_hedge_engine import (
     HedgeResult,
     HedgeStatus,
 )
+from ..utils.trade_journal import get_trade_journal
 
 logger = logging.getLogger(__name__)
 
-# 獲取 mm_trades 日誌（與做市策略共用同一個日誌文件）
-trade_log = logging.getLogger("mm_trade")
+# 獲取 mm_trades 日誌（與做市策略共用同一個日誌文件，背景線程寫入不阻塞對沖）
+trade_log = get_trade_journal()
 
 
 @dataclass
@@ -116,9 +117,9 @@ class StandXHedgeEngine(BaseHedgeEngine):
         )
 
         # 寫入 mm_trades 日誌
-        trade_log.info(
-            f"HEDGE_START | exchange=standx_hedge | side={hedge_side} | qty={fill_qty} | "
-            f"source_price={fill_price} | symbol={hedge_symbol} | via_proxy={via_proxy}"
+        trade_log.event(
+            "HEDGE_START", exchange="standx_hedge", side=hedge_side, qty=fill_qty,
+            source_price=fill_price, symbol=hedge_symbol, via_proxy=via_proxy,
         )
 
         # 重試執行
@@ -170,10 +171,10 @@ class StandXHedgeEngine(BaseHedgeEngine):
                     )
 
                     # 寫入 mm_trades 日誌
-                    trade_log.info(
-                        f"HEDGE_SUCCESS | exchange=standx_hedge | side={hedge_side} | qty={fill_qty} | "
-                        f"price={result.fill_price} | slippage_bps={result.slippage_bps:.1f} | "
-                        f"latency_ms={latency:.0f} | attempts={attempt} | order_id={result.order_id}"
+                    trade_log.event(
+                        "HEDGE_SUCCESS", exchange="standx_hedge", side=hedge_side, qty=fill_qty,
+                        price=result.fill_price, slippage_bps=round(result.slippage_bps, 1),
+                        latency_ms=round(latency), attempts=attempt, order_id=result.order_id,
                     )
                     return result
                 else:
@@ -183,6 +184,7 @@ class StandXHedgeEngine(BaseHedgeEngine):
             except asyncio.TimeoutError:
                 result.error_message = "Timeout"
                 result.status = HedgeStatus.TIMEOUT
+                result.fill_unknown = True  # 請求可能已到達交易所
                 logger.warning(f"[StandX Hedge] Attempt {attempt}: Timeout")
 
             except Exception as e:
@@ -199,9 +201,9 @@ class StandXHedgeEngine(BaseHedgeEngine):
         self._total_failed += 1
 
         # 寫入 mm_trades 日誌
-        trade_log.info(
-            f"HEDGE_FAILED | exchange=standx_hedge | side={hedge_side} | qty={fill_qty} | "
-            f"symbol={hedge_symbol} | attempts={self.config.max_retries} | error={result.error_message}"
+        trade_log.event(
+            "HEDGE_FAILED", exchange="standx_hedge", side=hedge_side, qty=fill_qty,
+            symbol=hedge_symbol, attempts=self.config.max_retries, error=result.error_message,
         )
 
         # 風控處理
@@ -260,19 +262,19 @@ class StandXHedgeEngine(BaseHedgeEngine):
                 logger.info(f"[StandX Hedge] Fallback success: order_id={fallback_result.get('order_id')}")
 
                 # 寫入 mm_trades 日誌
-                trade_log.info(
-                    f"HEDGE_FALLBACK | exchange=standx_main | status=success | side={fill_side} | "
-                    f"qty={reduce_qty} | symbol={source_symbol} | position_before={current_position} | "
-                    f"order_id={fallback_result.get('order_id')}"
+                trade_log.event(
+                    "HEDGE_FALLBACK", exchange="standx_main", status="success", side=fill_side,
+                    qty=reduce_qty, symbol=source_symbol, position_before=current_position,
+                    order_id=fallback_result.get('order_id'),
                 )
             else:
                 result.status = HedgeStatus.FALLBACK_FAILED
                 logger.error(f"[StandX Hedge] Fallback failed: {fallback_result.get('error')}")
 
                 # 寫入 mm_trades 日誌
-                trade_log.info(
-                    f"HEDGE_FALLBACK | exchange=standx_main | status=failed | side={fill_side} | "
-                    f"qty={reduce_qty} | symbol={source_symbol} | error={fallback_result.get('error')}"
+                trade_log.event(
+                    "HEDGE_FALLBACK", exchange="standx_main", status="failed", side=fill_side,
+                    qty=reduce_qty, symbol=source_symbol, error=fallback_result.get('error'),
                 )
         else:
             # 倉位在可接受範圍，等待恢復
@@ -283,9 +285,9 @@ class StandXHedgeEngine(BaseHedgeEngine):
             result.status = HedgeStatus.WAITING_RECOVERY
 
             # 寫入 mm_trades 日誌
-            trade_log.info(
-                f"HEDGE_WAIT | exchange=standx_hedge | status=waiting_recovery | "
-                f"position={current_position} | hard_limit={hard_limit} | symbol={source_symbol}"
+            trade_log.event(
+                "HEDGE_WAIT", exchange="standx_hedge", status="waiting_recovery",
+                position=current_position, hard_limit=hard_limit, symbol=source_symbol,
             )
 
         result.completed_at = datetime.now()
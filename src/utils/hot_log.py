@@ -0,0 +1,286 @@
+"""
+熱路徑日誌預算
+Hot-path Logging
+
+WebSocket 訂單/成交事件、下單與每個 tick 的日誌原本都以 f-string 在 INFO 直接輸出，
+即使該等級未啟用，字串仍會先被構建。本模組提供熱路徑專用的日誌介面:
+
+- 延遲格式化: 沿用 logging 的 %-參數，未輸出的行不會格式化
+- 呼叫點取樣與限速: 每個呼叫點 (預設以訊息模板區分) 每 N 次輸出一行，
+  且兩行之間至少間隔 interval 秒；輸出時附帶期間被略過的次數
+- 計數器: 高頻事件只累加計數，不產生日誌行，由 get_stats() / Web API 查詢
+- 按模組在運行時配置: 等級、取樣間隔、限速間隔，可由 /api/system/logging 調整
+
+使用方式:
+    hot = get_hot_logger(__name__)
+    hot.info("[WS] Order update: %s %s", order_id, status)      # 受模組取樣/限速配置約束
+    hot.info("[WS] Trade: %s", qty, every=100)                  # 呼叫點自訂取樣
+    hot.count("order_update")                                   # 只計數
+"""
+import logging
+import time
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Dict, Optional, Union
+
+_LEVEL_NAMES = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+
+@dataclass
+class HotLogConfig:
+    """
+    單一模組的熱路徑日誌配置
+
+    sample_every / min_interval_sec 為 None 時使用呼叫點自帶的預設值，
+    設定後覆寫該模組所有呼叫點。
+    """
+    sample_every: Optional[int] = None        # 每 N 次輸出一行 (1 = 不取樣)
+    min_interval_sec: Optional[float] = None  # 同一呼叫點兩行之間的最短間隔 (0 = 不限速)
+    enabled: bool = True                      # False 時只計數不輸出
+
+
+class _CallSite:
+    """呼叫點的取樣狀態"""
+
+    __slots__ = ('seen', 'emitted', 'pending', 'last_emit')
+
+    def __init__(self):
+        self.seen = 0
+        self.emitted = 0
+        self.pending = 0        # 上次輸出後被略過的次數
+        self.last_emit = 0.0
+
+
+class HotLogger:
+    """
+    熱路徑日誌器 (包裝標準 logging.Logger)
+
+    取樣/限速決策在格式化之前完成；等級未啟用時只遞增計數器即返回。
+    呼叫點狀態與計數器以鎖保護 (GRVT 適配器會從 to_thread 工作線程呼叫)，
+    實際輸出在鎖外進行。
+    """
+
+    def __init__(self, name: str, registry: 'HotLogRegistry'):
+        self.name = name
+        self.logger = logging.getLogger(name)
+        self._registry = registry
+        self._lock = Lock()
+        self._sites: Dict[str, _CallSite] = {}
+        self.counters: Dict[str, int] = {}
+        self._config: Optional[HotLogConfig] = None
+        self._config_version = -1
+
+    @property
+    def config(self) -> HotLogConfig:
+        """模組配置 (註冊表版本未變時使用快取，不必每次沿模組層級查找)"""
+        if self._config_version != self._registry.version:
+            self._config = self._registry.config_for(self.name)
+            self._config_version = self._registry.version
+        return self._config
+
+    # ==================== 計數器 ====================
+
+    def count(self, event: str, n: int = 1):
+        """高頻事件只計數，不輸出"""
+        with self._lock:
+            self.counters[event] = self.counters.get(event, 0) + n
+
+    # ==================== 日誌 ====================
+
+    def enabled(self, level: int = logging.DEBUG) -> bool:
+        """該等級是否會輸出 (參數本身昂貴時，呼叫方可先判斷)"""
+        return self.config.enabled and self.logger.isEnabledFor(level)
+
+    def log(
+        self,
+        level: int,
+        msg: str,
+        *args,
+        site: Optional[str] = None,
+        every: Optional[int] = None,
+        interval: Optional[float] = None,
+    ):
+        """
+        取樣/限速輸出
+
+        Args:
+            level: 日誌等級
+            msg: %-格式模板 (參數延遲格式化)
+            site: 呼叫點鍵，預設為 msg 模板本身
+            every: 呼叫點預設取樣間隔 (模組配置了 sample_every 時以配置為準)
+            interval: 呼叫點預設限速秒數 (模組配置了 min_interval_sec 時以配置為準)
+        """
+        self._log(level, msg, args, site, every, interval)
+
+    def debug(self, msg: str, *args, site: Optional[str] = None, every: Optional[int] = None, interval: Optional[float] = None):
+        self._log(logging.DEBUG, msg, args, site, every, interval)
+
+    def info(self, msg: str, *args, site: Optional[str] = None, every: Optional[int] = None, interval: Optional[float] = None):
+        self._log(logging.INFO, msg, args, site, every, interval)
+
+    def warning(self, msg: str, *args, site: Optional[str] = None, every: Optional[int] = None, interval: Optional[float] = None):
+        self._log(logging.WARNING, msg, args, site, every, interval)
+
+    def _log(self, level: int, msg: str, args: tuple, site: Optional[str], every: Optional[int], interval: Optional[float]):
+        key = site or msg
+        config = self.config
+        emit = config.enabled and self.logger.isEnabledFor(level)
+        if config.sample_every is not None:
+            every = config.sample_every
+        if config.min_interval_sec is not None:
+            interval = config.min_interval_sec
+
+        with self._lock:
+            state = self._sites.get(key)
+            if state is None:
+                state = self._sites[key] = _CallSite()
+            state.seen += 1
+            if not emit:
+                return
+
+            if every and every > 1 and (state.seen - 1) % every:
+                state.pending += 1
+                return
+            if interval and interval > 0:
+                now = time.monotonic()
+                if now - state.last_emit < interval:
+                    state.pending += 1
+                    return
+                state.last_emit = now
+
+            suppressed, seen = state.pending, state.seen
+            state.pending = 0
+            state.emitted += 1
+
+        if suppressed:
+            msg = msg + " (+%d suppressed, %d total)"
+            args = args + (suppressed, seen)
+        # stacklevel=3: 跳過 _log 與 info/debug/log，行號指向實際呼叫點
+        self.logger.log(level, msg, *args, stacklevel=3)
+
+    # ==================== 統計 ====================
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'sites': {
+                    key: {'seen': s.seen, 'emitted': s.emitted, 'suppressed': s.seen - s.emitted}
+                    for key, s in self._sites.items()
+                },
+            }
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+            self.counters.clear()
+
+
+class HotLogRegistry:
+    """熱路徑日誌器與模組配置的註冊表 (線程安全)"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._loggers: Dict[str, HotLogger] = {}
+        self._configs: Dict[str, HotLogConfig] = {}
+        self._default = HotLogConfig()
+        self.version = 0                    # 配置變更時遞增 (HotLogger 快取失效用)
+
+    def get_logger(self, name: str) -> HotLogger:
+        with self._lock:
+            hot = self._loggers.get(name)
+            if hot is None:
+                hot = self._loggers[name] = HotLogger(name, self)
+            return hot
+
+    def config_for(self, name: str) -> HotLogConfig:
+        """模組配置 (未設定時沿用最近的父模組配置，如 src.adapters → src.adapters.standx_ws_client)"""
+        config = self._configs.get(name)
+        if config is not None:
+            return config
+        while '.' in name:
+            name = name.rsplit('.', 1)[0]
+            config = self._configs.get(name)
+            if config is not None:
+                return config
+        return self._default
+
+    def configure(
+        self,
+        module: str,
+        level: Optional[Union[str, int]] = None,
+        sample_every: Optional[int] = None,
+        min_interval_sec: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ) -> Dict:
+        """
+        運行時調整模組日誌配置
+
+        Args:
+            module: 模組 (logger) 名稱，例如 "src.adapters.standx_ws_client"
+            level: 標準 logging 等級 ("DEBUG" / "INFO" / ...)，同時作用於一般日誌
+            sample_every: 每 N 次輸出一行 (0 = 恢復呼叫點預設)
+            min_interval_sec: 同一呼叫點最短輸出間隔 (負數 = 恢復呼叫點預設)
+            enabled: False 時熱路徑日誌只計數
+
+        Returns:
+            更新後的模組配置
+        """
+        if level is not None:
+            if isinstance(level, str):
+                if level.upper() not in _LEVEL_NAMES:
+                    raise ValueError(f"Invalid log level: {level}")
+                level = getattr(logging, level.upper())
+            logging.getLogger(module).setLevel(level)
+
+        with self._lock:
+            config = self._configs.get(module)
+            if config is None:
+                config = self._configs[module] = HotLogConfig(**asdict(self.config_for(module)))
+            if sample_every is not None:
+                if sample_every < 0:
+                    raise ValueError("sample_every must be >= 0")
+                config.sample_every = sample_every or None
+            if min_interval_sec is not None:
+                config.min_interval_sec = min_interval_sec if min_interval_sec >= 0 else None
+            if enabled is not None:
+                config.enabled = enabled
+            self.version += 1
+        return self.describe(module)
+
+    def describe(self, module: str) -> Dict:
+        return {
+            'module': module,
+            'level': logging.getLevelName(logging.getLogger(module).getEffectiveLevel()),
+            **asdict(self.config_for(module)),
+        }
+
+    def get_config(self) -> Dict:
+        """所有已註冊/已配置模組的配置"""
+        with self._lock:
+            modules = sorted(set(self._loggers) | set(self._configs))
+        return {module: self.describe(module) for module in modules}
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            loggers = list(self._loggers.values())
+        return {hot.name: hot.get_stats() for hot in loggers}
+
+    def reset_stats(self):
+        with self._lock:
+            loggers = list(self._loggers.values())
+        for hot in loggers:
+            hot.reset()
+
+
+_registry = HotLogRegistry()
+
+
+def get_hot_logger(name: str) -> HotLogger:
+    """取得模組的熱路徑日誌器"""
+    return _registry.get_logger(name)
+
+
+def get_hot_log_registry() -> HotLogRegistry:
+    """取得全域註冊表 (Web API 使用)"""
+    return _registry
@@ -0,0 +1,409 @@
+"""
+非同步結構化交易日誌
+Trade Journal
+
+原本 mm_trade logger 掛一個 logging.FileHandler: 每筆 FILL/HEDGE/CANCEL 先在交易路徑上
+拼接長 f-string，再同步寫檔，磁碟延遲尖峰會直接卡住對沖。本模組改為:
+
+- 呼叫端只建立 LogRecord 並放入隊列 (QueueHandler，不格式化)，不碰磁碟
+- 背景寫入線程批量取出記錄，序列化為 JSON lines (每行一個事件，欄位保留型別)，
+  每批只 flush 一次
+- 依大小 / 時間輪替檔案，並只保留最近 keep_count 個檔案 (取代 _cleanup_old_logs)
+- 隊列滿時丟棄並計數，寧可少記一筆也不阻塞交易
+
+使用方式:
+    journal = get_trade_journal()
+    journal.open_session("grvt")                         # executor.start() 時建立新檔案
+    journal.event("FILL", side="buy", price=price, qty=qty)
+    journal.info("LEGACY | key=value")                   # 舊式文本，寫入線程解析為欄位
+
+輸出範例:
+    {"ts":"2025-01-01T12:00:00.123","event":"FILL","side":"buy","price":97000.5,"qty":0.001}
+"""
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from logging.handlers import QueueHandler
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_DIR = Path(__file__).parent.parent.parent / "logs"
+FILE_PREFIX = "mm_trades_"
+
+
+def _json_default(value: Any):
+    """JSON 序列化無法直接處理的型別"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def parse_legacy_message(message: str) -> Tuple[str, Dict[str, str]]:
+    """
+    解析舊式文本日誌 "EVENT | key=value | key=value"
+
+    Returns:
+        (event, fields)，無法解析時 event 為 "MESSAGE"
+    """
+    parts = [p.strip() for p in message.split(" | ")]
+    head = parts[0]
+    if not head or "=" in head or " " in head:
+        return "MESSAGE", {"message": message}
+    fields: Dict[str, str] = {}
+    for part in parts[1:]:
+        key, sep, value = part.partition("=")
+        if sep:
+            fields[key.strip()] = value.strip()
+        elif part:
+            fields.setdefault("note", part)
+    return head, fields
+
+
+class _SessionMarker:
+    """寫入線程控制: 切換到新的 session 檔案"""
+    __slots__ = ("path",)
+
+    def __init__(self, path: Path):
+        self.path = path
+
+
+class _FlushMarker:
+    """寫入線程控制: 寫完之前的記錄後通知"""
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class _JournalQueueHandler(QueueHandler):
+    """入隊時不格式化 (格式化移到寫入線程)，隊列滿時丟棄並計數"""
+
+    def __init__(self, q: queue.Queue, journal: "TradeJournal"):
+        super().__init__(q)
+        self._journal = journal
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._journal.stats["dropped"] += 1
+
+
+class TradeJournal:
+    """
+    非同步結構化交易日誌 (線程安全)
+
+    寫入線程在第一次 open_session() 時啟動；之前的記錄直接丟棄 (與原本 NullHandler 行為一致)。
+    """
+
+    def __init__(
+        self,
+        logger_name: str = "mm_trade",
+        log_dir: Optional[Path] = None,
+        max_bytes: int = 50 * 1024 * 1024,
+        rotate_interval_sec: float = 24 * 3600,
+        keep_count: int = 20,
+        flush_interval_sec: float = 0.5,
+        max_batch: int = 500,
+        queue_size: int = 100_000,
+    ):
+        """
+        Args:
+            logger_name: 掛載 QueueHandler 的 logger (其他模組 getLogger 同名也會進入日誌)
+            log_dir: 日誌目錄
+            max_bytes: 單檔大小上限，超過即輪替
+            rotate_interval_sec: 單檔時間上限，超過即輪替
+            keep_count: 保留最近的檔案數
+            flush_interval_sec: 閒置時檢查輪替的間隔
+            max_batch: 每批最多寫入的記錄數
+            queue_size: 隊列容量，滿時丟棄
+        """
+        self.log_dir = Path(log_dir) if log_dir else DEFAULT_LOG_DIR
+        self.max_bytes = max_bytes
+        self.rotate_interval_sec = rotate_interval_sec
+        self.keep_count = keep_count
+        self.flush_interval_sec = flush_interval_sec
+        self.max_batch = max_batch
+
+        self._logger = logging.getLogger(logger_name)
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        if not self._logger.handlers:
+            # 加一個 NullHandler 避免 "No handlers" 警告
+            self._logger.addHandler(logging.NullHandler())
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._handler = _JournalQueueHandler(self._queue, self)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._atexit_registered = False
+
+        # 以下僅寫入線程存取
+        self._file = None
+        self._opened_at = 0.0
+        self._bytes = 0
+
+        self.current_file: Optional[Path] = None
+        self.stats: Dict[str, int] = {
+            "records": 0,
+            "batches": 0,
+            "dropped": 0,
+            "write_errors": 0,
+            "rotations": 0,
+        }
+
+    # ==================== 呼叫端 (交易路徑) ====================
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    def event(self, event: str, **fields):
+        """
+        記錄一個結構化事件
+
+        欄位值保持原始型別 (Decimal/Enum/datetime 在寫入線程序列化)，
+        呼叫端不做任何字串格式化。
+        """
+        if self._thread is None:
+            return
+        record = self._logger.makeRecord(
+            self._logger.name, logging.INFO, "", 0, event, None, None,
+            extra={"journal_fields": fields},
+        )
+        self._logger.handle(record)
+
+    def info(self, msg: str, *args):
+        """舊式文本日誌 (寫入線程解析為欄位)"""
+        self._logger.info(msg, *args)
+
+    def warning(self, msg: str, *args):
+        self._logger.warning(msg, *args)
+
+    def error(self, msg: str, *args):
+        self._logger.error(msg, *args)
+
+    # ==================== 生命週期 ====================
+
+    def open_session(self, exchange: str = "mm") -> Path:
+        """
+        開始新的 session 檔案 (executor.start() 時呼叫)
+
+        Returns:
+            新檔案路徑
+        """
+        with self._start_lock:
+            if self._thread is None:
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+                for handler in self._logger.handlers[:]:
+                    handler.close()
+                    self._logger.removeHandler(handler)
+                self._logger.addHandler(self._handler)
+                self._thread = threading.Thread(target=self._run, name="trade-journal", daemon=True)
+                self._thread.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+        path = self._next_path()
+        self.current_file = path
+        self._put_control(_SessionMarker(path))
+        self.event("SESSION_START", exchange=exchange, file=path.name)
+        return path
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """等待隊列中已有的記錄寫入磁碟 (阻塞，勿在交易路徑呼叫)"""
+        if self._thread is None:
+            return True
+        marker = _FlushMarker()
+        self._put_control(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """寫完剩餘記錄並停止寫入線程"""
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._put_control(_STOP)
+            thread.join(timeout)
+            self._logger.removeHandler(self._handler)
+            self._logger.addHandler(logging.NullHandler())
+            self._thread = None
+
+    def _put_control(self, item):
+        """控制訊息必須送達，隊列滿時等待"""
+        self._queue.put(item)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "queued": self._queue.qsize(),
+            "current_file": str(self.current_file) if self.current_file else None,
+        }
+
+    # ==================== 寫入線程 ====================
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval_sec)
+            except queue.Empty:
+                self._maybe_rotate()
+                continue
+
+            batch: List[logging.LogRecord] = []
+            while True:
+                if item is _STOP:
+                    self._write_batch(batch)
+                    self._close_file()
+                    return
+                if isinstance(item, _SessionMarker):
+                    self._write_batch(batch)
+                    batch = []
+                    self._open_file(item.path)
+                elif isinstance(item, _FlushMarker):
+                    self._write_batch(batch)
+                    batch = []
+                    item.done.set()
+                else:
+                    batch.append(item)
+                    if len(batch) >= self.max_batch:
+                        break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            self._maybe_rotate()
+
+    def _serialize(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "journal_fields", None)
+        if fields is None:
+            event, fields = parse_legacy_message(record.getMessage())
+        else:
+            event = record.msg
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "event": event,
+        }
+        if record.levelno >= logging.WARNING:
+            entry["level"] = record.levelname
+        entry.update(fields)
+        return json.dumps(entry, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+    def _write_batch(self, batch: List[logging.LogRecord]):
+        if not batch or self._file is None:
+            return
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self._serialize(record))
+            except Exception as e:
+                self.stats["write_errors"] += 1
+                logger.debug(f"Failed to serialize trade journal record: {e}")
+        if not lines:
+            return
+        data = "\n".join(lines) + "\n"
+        try:
+            self._file.write(data)
+            self._file.flush()
+            self._bytes += len(data)
+            self.stats["records"] += len(lines)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["write_errors"] += 1
+            logger.warning(f"Failed to write trade journal: {e}")
+
+    def _next_path(self) -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = self.log_dir / f"{FILE_PREFIX}{timestamp}.jsonl"
+        suffix = 1
+        while path.exists() or path == self.current_file:
+            path = self.log_dir / f"{FILE_PREFIX}{timestamp}_{suffix}.jsonl"
+            suffix += 1
+        return path
+
+    def _open_file(self, path: Path):
+        self._close_file()
+        try:
+            self._file = open(path, "a", encoding="utf-8")
+        except Exception as e:
+            self.stats["write_errors"] += 1
+            logger.warning(f"Failed to open trade journal {path}: {e}")
+            self._file = None
+            return
+        self._opened_at = time.time()
+        self._bytes = 0
+        self._cleanup_old_files()
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+    def _maybe_rotate(self):
+        """超過大小或時間上限時換新檔案"""
+        if self._file is None:
+            return
+        if self._bytes < self.max_bytes and time.time() - self._opened_at < self.rotate_interval_sec:
+            return
+        path = self._next_path()
+        self.current_file = path
+        self._open_file(path)
+        self.stats["rotations"] += 1
+
+    def _cleanup_old_files(self):
+        """只保留最近 keep_count 個日誌檔 (含舊版 .log)"""
+        try:
+            files = sorted(
+                self.log_dir.glob(f"{FILE_PREFIX}*"),
+                key=lambda f: f.stat().st_mtime,
+                reverse=True,
+            )
+            for old_file in files[self.keep_count:]:
+                if old_file == self.current_file:
+                    continue
+                try:
+                    old_file.unlink()
+                    logger.debug(f"Cleaned up old log: {old_file.name}")
+                except Exception as e:
+                    logger.warning(f"Failed to delete old log {old_file.name}: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to cleanup old logs: {e}")
+
+
+_journal: Optional[TradeJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_trade_journal() -> TradeJournal:
+    """全域交易日誌 (做市執行器與對沖引擎共用同一個檔案)"""
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = TradeJournal()
+    return _journal
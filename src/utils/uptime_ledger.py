@@ -0,0 +1,189 @@
+"""
+事件驅動的 Uptime 分層記帳
+Event-sourced Uptime Ledger
+
+StandX Maker Points 依訂單距離中間價分層:
+- Boosted (100%): 0-10 bps
+- Standard (50%): 10-30 bps
+- Basic (10%): 30-100 bps
+- Out of range: >100 bps 或無訂單
+
+舊做法每個 tick 取樣一次，把整段 delta 算給取樣當下的分層，準確度取決於 tick 頻率。
+本模組只在「分層改變」時記一筆事件: 上一個分層的區間 [since, ts) 被關閉並寫入
+該分層的區間列表，分層不變時 record() 只做一次比較，閒置時沒有任何成本。
+
+- 各分層的區間按時間排序且互不重疊，列表本身就是區間樹的退化形式；
+  搭配前綴和，任意時間窗的分層時長以二分查找在 O(log n) 內求得
+- 累計時長另外保存，不受區間保留期 (retention_sec) 裁剪影響
+
+非線程安全，由呼叫方 (MMState / SimulationState) 的鎖保護。
+"""
+import time
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Optional
+
+TIERS = ('boosted', 'standard', 'basic', 'out_of_range')
+
+# 各分層的積分權重
+TIER_WEIGHTS: Dict[str, float] = {
+    'boosted': 1.0,
+    'standard': 0.5,
+    'basic': 0.1,
+    'out_of_range': 0.0,
+}
+
+
+def classify_distance(distance_bps: Optional[float]) -> str:
+    """訂單距離 (bps) → 分層，None 或負數表示無訂單"""
+    if distance_bps is None or distance_bps < 0:
+        return 'out_of_range'
+    if distance_bps <= 10:
+        return 'boosted'
+    if distance_bps <= 30:
+        return 'standard'
+    if distance_bps <= 100:
+        return 'basic'
+    return 'out_of_range'
+
+
+class _TierIntervals:
+    """單一分層的時間區間 (按時間排序、互不重疊) 與時長前綴和"""
+
+    __slots__ = ('starts', 'ends', 'prefix')
+
+    def __init__(self):
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.prefix: List[float] = [0.0]     # prefix[i] = 前 i 個區間的時長總和
+
+    def append(self, start: float, end: float):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.prefix.append(self.prefix[-1] + (end - start))
+
+    def overlap(self, t0: float, t1: float) -> float:
+        """與 [t0, t1) 重疊的總時長"""
+        i = bisect_right(self.ends, t0)      # 第一個結束於 t0 之後的區間
+        j = bisect_left(self.starts, t1)     # 開始於 t1 之前的區間為 [0, j)
+        if i >= j:
+            return 0.0
+        total = self.prefix[j] - self.prefix[i]
+        total -= max(0.0, t0 - self.starts[i])
+        total -= max(0.0, self.ends[j - 1] - t1)
+        return total
+
+    def trim(self, before: float):
+        """丟棄在 before 之前結束的區間"""
+        k = bisect_right(self.ends, before)
+        if k:
+            del self.starts[:k]
+            del self.ends[:k]
+            del self.prefix[:k]
+
+
+class UptimeLedger:
+    """
+    Uptime 分層記帳
+
+    使用方式:
+        ledger = UptimeLedger()
+        ledger.record('boosted')          # 分層改變時記錄 (時間戳預設為現在)
+        ledger.durations()                # 各分層累計秒數
+        ledger.window(300)                # 最近 5 分鐘各分層秒數
+    """
+
+    def __init__(self, retention_sec: float = 86400, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            retention_sec: 區間保留時長 (只影響時間窗查詢的可回溯範圍)
+            clock: 時間來源 (模擬時可傳入行情時間)
+        """
+        self.retention_sec = retention_sec
+        self._clock = clock
+        self._intervals: Dict[str, _TierIntervals] = {tier: _TierIntervals() for tier in TIERS}
+        self._totals: Dict[str, float] = {tier: 0.0 for tier in TIERS}
+        self._tier: Optional[str] = None
+        self._since: Optional[float] = None
+        self._last_trim = 0.0
+        self.events = 0
+
+    @property
+    def tier(self) -> Optional[str]:
+        """目前分層 (尚未記錄或已停止時為 None)"""
+        return self._tier
+
+    def record(self, tier: Optional[str], ts: Optional[float] = None) -> bool:
+        """
+        記錄分層狀態
+
+        Args:
+            tier: 新分層，None 表示停止計時 (例如執行器停止)
+            ts: 事件時間戳 (秒)，預設為 clock()
+
+        Returns:
+            分層是否改變
+        """
+        if tier == self._tier:
+            return False
+        if ts is None:
+            ts = self._clock()
+
+        if self._tier is not None:
+            ts = max(ts, self._since)
+            if ts > self._since:
+                self._intervals[self._tier].append(self._since, ts)
+                self._totals[self._tier] += ts - self._since
+
+        self._tier = tier
+        self._since = ts
+        self.events += 1
+
+        if ts - self._last_trim > self.retention_sec / 10:
+            cutoff = ts - self.retention_sec
+            for intervals in self._intervals.values():
+                intervals.trim(cutoff)
+            self._last_trim = ts
+        return True
+
+    def _open_interval(self, now: float) -> float:
+        """目前分層尚未關閉的時長"""
+        if self._tier is None:
+            return 0.0
+        return max(0.0, now - self._since)
+
+    def durations(self, now: Optional[float] = None) -> Dict[str, float]:
+        """各分層累計秒數 (含尚未關閉的目前區間)"""
+        if now is None:
+            now = self._clock()
+        result = dict(self._totals)
+        if self._tier is not None:
+            result[self._tier] += self._open_interval(now)
+        return result
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Dict[str, float]:
+        """最近 seconds 秒內各分層秒數"""
+        if now is None:
+            now = self._clock()
+        t0 = now - seconds
+        result = {tier: self._intervals[tier].overlap(t0, now) for tier in TIERS}
+        if self._tier is not None and now > self._since:
+            result[self._tier] += now - max(self._since, t0)
+        return result
+
+    @staticmethod
+    def summarize(durations: Dict[str, float]) -> Dict[str, float]:
+        """秒數 → 百分比摘要 (uptime = boosted 分層，StandX Uptime Program 定義)"""
+        total = sum(durations.values())
+        if total <= 0:
+            return {
+                'uptime_pct': 0.0,
+                'qualified_pct': 0.0,
+                'effective_pts_pct': 0.0,
+                **{f'{tier}_pct': 0.0 for tier in TIERS},
+            }
+        return {
+            'uptime_pct': durations['boosted'] / total * 100,
+            'qualified_pct': (total - durations['out_of_range']) / total * 100,
+            'effective_pts_pct': sum(durations[t] * TIER_WEIGHTS[t] for t in TIERS) / total * 100,
+            **{f'{tier}_pct': durations[tier] / total * 100 for tier in TIERS},
+        }
@@ -5,14 +5,19 @@
 - POST /api/system/reinit - 重新初始化系統
 - POST /api/control/auto-execute - 控制自動執行
 - POST /api/control/live-trade - 控制實際交易
+- GET /api/system/logging - 熱路徑日誌配置與計數
+- POST /api/system/logging - 運行時調整模組日誌配置
+- POST /api/system/logging/reset - 重設熱路徑日誌計數
 """
 
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
+from src.utils.hot_log import get_hot_log_registry
 from src.web.schemas import (
     AutoExecuteRequest,
     LiveTradeRequest,
+    LogConfigRequest,
     ReinitResponse,
     SuccessResponse,
     ErrorResponse,
@@ -153,4 +158,47 @@ def register_control_routes(app, dependencies):
         except Exception as e:
             return JSONResponse({'success': False, 'error': str(e)})
 
+    @router.get("/api/system/logging")
+    async def get_logging_config():
+        """
+        獲取熱路徑日誌配置與計數
+
+        返回各模組的日誌等級、取樣/限速配置，以及各呼叫點的輸出/略過次數與事件計數器。
+        """
+        registry = get_hot_log_registry()
+        return JSONResponse({
+            'success': True,
+            'config': registry.get_config(),
+            'stats': registry.get_stats(),
+        })
+
+    @router.post("/api/system/logging", responses={400: {"model": ErrorResponse}})
+    async def update_logging_config(request_data: LogConfigRequest):
+        """
+        運行時調整模組日誌配置
+
+        - **module**: logger 名稱，設定會套用到子模組 (例如 `src.adapters`)
+        - **level**: 標準日誌等級，同時影響一般日誌
+        - **sample_every** / **min_interval_sec**: 覆寫該模組熱路徑呼叫點的取樣與限速
+        - **enabled**: false 時熱路徑日誌只計數
+        """
+        try:
+            config = get_hot_log_registry().configure(
+                request_data.module,
+                level=request_data.level,
+                sample_every=request_data.sample_every,
+                min_interval_sec=request_data.min_interval_sec,
+                enabled=request_data.enabled,
+            )
+            logger.info(f"日誌配置已更新: {config}")
+            return JSONResponse({'success': True, 'config': config})
+        except ValueError as e:
+            return JSONResponse({'success': False, 'error': str(e)}, status_code=400)
+
+    @router.post("/api/system/logging/reset", response_model=SuccessResponse)
+    async def reset_logging_stats():
+        """重設熱路徑日誌的呼叫點統計與事件計數器"""
+        get_hot_log_registry().reset_stats()
+        return JSONResponse({'success': True})
+
     app.include_router(router)
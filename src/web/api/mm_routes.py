@@ -20,6 +20,8 @@ import os
 from src.strategy.market_maker_executor import MarketMakerExecutor, MMConfig, ExecutorStatus
 from src.strategy.hedge_engine import HedgeEngine
 from src.strategy.standx_hedge_engine import StandXHedgeEngine
+from src.strategy.routing_hedge_engine import RoutingHedgeEngine, HedgeRoute
+from src.monitor.arbitrage_evaluator import DEFAULT_TAKER_FEE_BPS
 from src.utils.mm_config_manager import get_mm_config
 from src.web.schemas import (
     MMStartRequest,
@@ -34,6 +36,23 @@ from src.web.schemas import (
 
 router = APIRouter(prefix="/api/mm", tags=["market_maker"])
 
+# 對沖場所 -> (適配器鍵, 手續費鍵)
+_HEDGE_VENUES = {
+    'grvt': ('GRVT', 'GRVT'),
+    'standx_hedge': ('STANDX_HEDGE', 'STANDX'),
+}
+
+
+def _create_hedge_engine(venue: str, adapters: dict, standx):
+    """為單一對沖場所建立引擎（未連接返回 None）"""
+    adapter_key = _HEDGE_VENUES.get(venue, (None, None))[0]
+    hedge_adapter = adapters.get(adapter_key) if adapter_key else None
+    if hedge_adapter is None:
+        return None
+    if venue == 'standx_hedge':
+        return StandXHedgeEngine(hedge_adapter=hedge_adapter, fallback_adapter=standx)
+    return HedgeEngine(hedge_adapter=hedge_adapter, standx_adapter=standx)
+
 
 def register_mm_routes(app, dependencies):
     """
@@ -172,6 +191,29 @@ def register_mm_routes(app, dependencies):
             elif hedge_target == 'none':
                 logger.info("對沖已禁用 (HEDGE_TARGET=none)")
 
+            # HEDGE_ROUTES 列出額外場所時，改用多場所路由（HEDGE_TARGET 為主場所）
+            extra_venues = [
+                v.strip() for v in os.getenv('HEDGE_ROUTES', '').split(',')
+                if v.strip() and v.strip() != hedge_target
+            ]
+            if hedge_engine and extra_venues:
+                routes = [HedgeRoute(
+                    hedge_target.upper(), hedge_engine,
+                    fee_bps=DEFAULT_TAKER_FEE_BPS.get(_HEDGE_VENUES[hedge_target][1], 5.0),
+                )]
+                for venue in extra_venues:
+                    engine = _create_hedge_engine(venue, adapters, standx)
+                    if engine is None:
+                        logger.warning(f"對沖場所 {venue} 未連接或不支援，跳過")
+                        continue
+                    routes.append(HedgeRoute(
+                        venue.upper(), engine,
+                        fee_bps=DEFAULT_TAKER_FEE_BPS.get(_HEDGE_VENUES[venue][1], 5.0),
+                    ))
+                if len(routes) > 1:
+                    hedge_engine = RoutingHedgeEngine(routes, fallback_adapter=standx)
+                    logger.info(f"使用多場所對沖路由: {', '.join(r.name for r in routes)}")
+
             # 創建執行器
             mm_executor = MarketMakerExecutor(
                 standx_adapter=standx,
@@ -302,6 +344,7 @@ def register_mm_routes(app, dependencies):
                 'is_hedged': abs(standx_pos + hedge_pos) < 0.0001,
                 'last_sync': last_sync,
                 'seconds_ago': seconds_ago,
+                'ledger': state.get_position_ledger(),
             }
 
             return JSONResponse(serialize_for_json(positions))
@@ -562,7 +605,7 @@ def register_mm_routes(app, dependencies):
         觸發條件：當任一帳戶超過閾值時，自動平倉該帳戶倉位。
         """
         try:
-            from src.web.auto_dashboard import config_manager
+            from src.web.auto_dashboard import config_manager, risk_monitor
 
             data = await request.json()
             enabled = data.get('enabled')
@@ -578,6 +621,7 @@ def register_mm_routes(app, dependencies):
 
             # 取得更新後的完整配置
             new_config = config_manager.get_liquidation_protection_config()
+            risk_monitor.update_config(new_config)
             logger.info(f"[LiquidationProtection] 配置已更新: {new_config}")
 
             return JSONResponse({
@@ -592,13 +636,15 @@ def register_mm_routes(app, dependencies):
     async def get_liquidation_protection():
         """獲取爆倉保護配置和狀態"""
         try:
-            from src.web.auto_dashboard import config_manager, liquidation_state
+            from src.web.auto_dashboard import config_manager, risk_monitor
 
             config = config_manager.get_liquidation_protection_config()
             return JSONResponse({
                 **config,
-                'triggered': liquidation_state['triggered'],
-                'last_trigger_time': liquidation_state['last_trigger_time'],
+                'triggered': risk_monitor.triggered,
+                'last_trigger_time': risk_monitor.last_trigger_time,
+                'monitor': risk_monitor.get_state(),
+                'accounts': risk_monitor.snapshot(),
             })
         except Exception as e:
             return JSONResponse({'error': str(e)}, status_code=500)
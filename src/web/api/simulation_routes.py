@@ -8,14 +8,17 @@
 - POST /api/simulation/force-stop - 強制停止
 - GET /api/simulation/status - 獲取狀態
 - GET /api/simulation/comparison - 即時比較
-- GET /api/simulation/runs - 列出歷史運行
+- WS  /api/simulation/ws - 即時進度推送 (連線時快照，之後僅推送增量)
+- GET /api/simulation/runs - 列出歷史運行 (分頁、過濾、依指標排序)
 - GET /api/simulation/runs/{run_id} - 運行詳情
 - GET /api/simulation/runs/{run_id}/comparison - 運行比較表
 - DELETE /api/simulation/runs/{run_id} - 刪除運行
 """
 
 import asyncio
-from fastapi import APIRouter, Request
+import json
+from typing import Optional, Set
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 
 from src.simulation import (
@@ -23,6 +26,7 @@ from src.simulation import (
     SimulationRunner,
     ResultLogger,
     ComparisonEngine,
+    RunCatalog,
 )
 from src.web.schemas import (
     ParamSetResponse,
@@ -44,6 +48,84 @@ router = APIRouter(prefix="/api/simulation", tags=["simulation"])
 _simulation_runner = None
 _result_logger = None
 _comparison_engine = None
+_run_catalog = None
+
+# 即時進度推送: 單一發布任務，每週期序列化一次後推送給所有客戶端
+_stream_clients: Set[WebSocket] = set()
+_stream_task: Optional[asyncio.Task] = None
+
+
+def _get_run_catalog() -> RunCatalog:
+    """獲取運行目錄緩存 (與 ResultLogger 共用，寫入時自動失效)"""
+    global _result_logger, _comparison_engine, _run_catalog
+
+    if _result_logger is None:
+        _result_logger = ResultLogger()
+    if _comparison_engine is None:
+        _comparison_engine = ComparisonEngine(_result_logger)
+    if _run_catalog is None:
+        _run_catalog = RunCatalog(_result_logger, _comparison_engine)
+    return _run_catalog
+
+
+def _stream_snapshot_message() -> str:
+    """完整快照 (新連線或運行切換時發送)"""
+    if _simulation_runner is None:
+        snapshot = {'running': False}
+    else:
+        snapshot = _simulation_runner.get_stream_snapshot()
+    snapshot['type'] = 'snapshot'
+    return json.dumps(snapshot)
+
+
+async def _stream_send(clients, message: str):
+    """推送同一訊息給多個客戶端，移除已斷線者"""
+    results = await asyncio.gather(
+        *(ws.send_text(message) for ws in clients),
+        return_exceptions=True
+    )
+    for ws, result in zip(clients, results):
+        if isinstance(result, Exception):
+            _stream_clients.discard(ws)
+
+
+async def _stream_publisher(logger):
+    """
+    即時進度發布任務
+
+    每個 stream_interval_ms 從 SimulationRunner 取出增量 (各參數組只回傳變更欄位)，
+    序列化一次後廣播。運行開始/結束時改發完整快照。沒有客戶端時自動結束。
+    """
+    global _stream_task
+
+    last_run_id = _simulation_runner.get_current_run_id() if _simulation_runner else None
+
+    try:
+        while _stream_clients:
+            interval_ms = get_param_set_manager().get_simulation_config().stream_interval_ms
+            await asyncio.sleep(max(50, interval_ms) / 1000)
+
+            if not _stream_clients:
+                break
+
+            try:
+                run_id = _simulation_runner.get_current_run_id() if _simulation_runner else None
+                if run_id != last_run_id:
+                    # Run started/stopped: resync everyone with a snapshot
+                    last_run_id = run_id
+                    message = _stream_snapshot_message()
+                elif _simulation_runner is None or not _simulation_runner.is_running():
+                    continue
+                else:
+                    delta = _simulation_runner.get_progress_delta()
+                    delta['type'] = 'delta'
+                    message = json.dumps(delta)
+
+                await _stream_send(list(_stream_clients), message)
+            except Exception as e:
+                logger.error(f"Simulation stream error: {e}")
+    finally:
+        _stream_task = None
 
 
 def register_simulation_routes(app, dependencies):
@@ -166,11 +248,8 @@ def register_simulation_routes(app, dependencies):
                 logger.warning("StandX adapter not connected")
                 return JSONResponse({'success': False, 'error': 'StandX 未連接，請先連接交易所'})
 
-            # Initialize components if needed
-            if _result_logger is None:
-                _result_logger = ResultLogger()
-            if _comparison_engine is None:
-                _comparison_engine = ComparisonEngine(_result_logger)
+            # Initialize components if needed (catalog registers for write-through)
+            _get_run_catalog()
 
             # Create simulation runner
             param_set_manager = get_param_set_manager()
@@ -349,23 +428,65 @@ def register_simulation_routes(app, dependencies):
             logger.error(f"get_live_comparison error: {e}")
             return JSONResponse([])
 
-    @router.get("/runs", response_model=SimulationRunListResponse)
-    async def list_simulation_runs():
+    @router.websocket("/ws")
+    async def simulation_stream(websocket: WebSocket):
         """
-        列出所有歷史運行
+        即時進度推送
 
-        返回所有歷史模擬運行的列表。
+        連線時發送完整快照 (type=snapshot)，之後按 simulation.stream_interval_ms
+        推送增量 (type=delta): 運行進度 + params 中僅包含有變更的參數組與欄位。
+        取代輪詢 /status 與 /comparison。
         """
-        global _comparison_engine, _result_logger
+        global _stream_task
 
+        await websocket.accept()
         try:
-            if _result_logger is None:
-                _result_logger = ResultLogger()
-            if _comparison_engine is None:
-                _comparison_engine = ComparisonEngine(_result_logger)
+            await websocket.send_text(_stream_snapshot_message())
+            _stream_clients.add(websocket)
+            if _stream_task is None:
+                _stream_task = asyncio.create_task(_stream_publisher(logger))
+
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.debug(f"Simulation stream client error: {e}")
+        finally:
+            _stream_clients.discard(websocket)
+
+    @router.get("/runs", response_model=SimulationRunListResponse)
+    async def list_simulation_runs(
+        offset: int = 0,
+        limit: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        param_set_id: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        ascending: bool = False,
+    ):
+        """
+        列出歷史運行
 
-            runs = _comparison_engine.get_all_runs()
-            return JSONResponse({'runs': runs})
+        從內存目錄返回歷史模擬運行列表。
+
+        - **offset** / **limit**: 分頁（limit 不填則返回全部）
+        - **date_from** / **date_to**: 依開始時間過濾（ISO 日期或時間）
+        - **param_set_id**: 只返回包含此參數組的運行
+        - **sort_by**: 依指標排序（如 effective_points_pct），預設最新優先
+        """
+        try:
+            catalog = _get_run_catalog()
+            result = catalog.list_runs(
+                offset=max(0, offset),
+                limit=limit,
+                date_from=date_from,
+                date_to=date_to,
+                param_set_id=param_set_id,
+                sort_by=sort_by,
+                ascending=ascending,
+            )
+            return JSONResponse(result)
 
         except Exception as e:
             return JSONResponse({'success': False, 'error': str(e)}, status_code=500)
@@ -377,15 +498,8 @@ def register_simulation_routes(app, dependencies):
 
         返回指定運行 ID 的完整結果數據。
         """
-        global _comparison_engine, _result_logger
-
         try:
-            if _result_logger is None:
-                _result_logger = ResultLogger()
-            if _comparison_engine is None:
-                _comparison_engine = ComparisonEngine(_result_logger)
-
-            results = _comparison_engine.get_run_details(run_id)
+            results = _get_run_catalog().get_run_details(run_id)
             if results is None:
                 return JSONResponse({'success': False, 'error': '運行記錄不存在'}, status_code=404)
 
@@ -403,26 +517,13 @@ def register_simulation_routes(app, dependencies):
 
         - **sort_by**: 排序欄位（uptime_percentage, total_pnl, fill_count）
         """
-        global _comparison_engine, _result_logger
-
         try:
-            if _result_logger is None:
-                _result_logger = ResultLogger()
-            if _comparison_engine is None:
-                _comparison_engine = ComparisonEngine(_result_logger)
+            # Served from the catalog's precomputed per-run summary
+            comparison = _get_run_catalog().get_comparison(run_id, sort_by=sort_by)
+            if comparison is None:
+                return JSONResponse({'comparison_table': [], 'recommendation': None})
 
-            table = _comparison_engine.get_comparison_table(run_id, sort_by=sort_by)
-            recommendation = _comparison_engine.get_recommendation(run_id)
-
-            return JSONResponse({
-                'comparison_table': table,
-                'recommendation': {
-                    'param_set_id': recommendation.param_set_id,
-                    'param_set_name': recommendation.param_set_name,
-                    'reason': recommendation.reason,
-                    'score': recommendation.score
-                } if recommendation else None
-            })
+            return JSONResponse(comparison)
 
         except Exception as e:
             return JSONResponse({'success': False, 'error': str(e)}, status_code=500)
@@ -434,12 +535,9 @@ def register_simulation_routes(app, dependencies):
 
         從歷史記錄中刪除指定的運行結果。
         """
-        global _result_logger
-
         try:
-            if _result_logger is None:
-                _result_logger = ResultLogger()
-
+            # Deleting through the shared logger invalidates the catalog
+            _get_run_catalog()
             success = _result_logger.delete_run(run_id)
             if success:
                 return JSONResponse({'success': True})
@@ -31,6 +31,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.adapters.factory import create_adapter
 from src.adapters.base_adapter import BasePerpAdapter
 from src.monitor.multi_exchange_monitor import MultiExchangeMonitor
+from src.monitor.risk_monitor import RiskMonitor
 from src.strategy.arbitrage_executor import ArbitrageExecutor
 from src.strategy.market_maker_executor import MarketMakerExecutor, MMConfig, ExecutorStatus
 from src.strategy.hedge_engine import HedgeEngine, HedgeConfig
@@ -43,32 +44,22 @@ from src.simulation import (
 from src.web.api import register_all_routes
 from src.web.config_manager import ConfigManager
 from src.web.system_manager import SystemManager
+from src.web.dashboard_stream import DashboardStream
 
 # 全局變量
 mm_executor: Optional[MarketMakerExecutor] = None
-connected_clients: List[WebSocket] = []
+dashboard_stream = DashboardStream()  # WebSocket 客戶端與推送協議 (v1 完整 / v2 增量)
 
-# Orderbook 緩存 (避免 rate limiting)
-_orderbook_cache: Dict[str, dict] = {}  # {exchange_symbol: {'data': ..., 'timestamp': ...}}
-_orderbook_cache_ttl = 2.0  # 緩存 2 秒
-
-# 風險數據緩存 (避免 rate limiting)
-_risk_data_cache: Dict[str, dict] = {}  # {account_name: {'data': ..., 'timestamp': ...}}
-_risk_data_cache_ttl = 5.0  # 緩存 5 秒，降低 API 請求頻率
+# 控制台訂單簿 (交易所, 交易對)，從共享 MarketDataHub 讀取
+_dashboard_orderbooks = [
+    ('STANDX', 'BTC-USD'),
+    ('GRVT', 'BTC_USDT_Perp'),
+]
 
 # 警告日誌頻率限制 (避免刷屏)
 _warning_log_last_time: Dict[str, float] = {}
 _warning_log_interval = 60.0  # 每 60 秒最多警告一次
 
-# 爆倉保護狀態 (使用 dict 來避免模組重導入問題)
-# 從環境變數讀取初始狀態
-liquidation_state = {
-    'enabled': os.getenv('LIQUIDATION_PROTECTION_ENABLED', 'false').lower() == 'true',
-    'triggered': False,  # 是否已觸發過（避免重複觸發）
-    'last_trigger_time': 0.0,  # 上次觸發時間（冷卻期用）
-    'cooldown_sec': 60.0,  # 觸發冷卻期（60秒內不重複觸發）
-}
-
 mm_status = {
     'running': False,
     'status': 'stopped',
@@ -109,6 +100,14 @@ def get_system_status():
     return system_manager.system_status
 
 
+# 背景風控監測 (爆倉保護，與控制台是否連線無關)
+risk_monitor = RiskMonitor(
+    adapters_getter=get_adapters,
+    executor_getter=lambda: mm_executor,
+    config_getter=config_manager.get_liquidation_protection_config,
+)
+
+
 # 委託函數 (保持向後兼容)
 async def init_system():
     """初始化系統"""
@@ -144,7 +143,7 @@ async def broadcast_data():
     logger.info("📡 廣播任務已啟動")
     while True:
         try:
-            client_count = len(connected_clients)
+            client_count = dashboard_stream.client_count
             monitor = get_monitor()
             adapters = get_adapters()
             executor = get_executor()
@@ -174,39 +173,16 @@ async def broadcast_data():
                             'spread_pct': float(market.spread_pct)
                         }
 
-                # 獲取 StandX 訂單簿深度
-                if 'STANDX' in adapters:
-                    try:
-                        standx = adapters['STANDX']
-                        ob = await standx.get_orderbook('BTC-USD', depth=50)
-                        if ob and ob.bids and ob.asks:
-                            bids = [[float(b[0]), float(b[1])] for b in ob.bids[:50]]
-                            asks = [[float(a[0]), float(a[1])] for a in ob.asks[:50]]
-                            data['orderbooks']['STANDX'] = {
-                                'BTC-USD': {
-                                    'bids': bids,
-                                    'asks': asks
-                                }
-                            }
-                    except Exception as e:
-                        logger.warning(f"獲取 StandX 訂單簿失敗: {e}")
-
-                # 獲取 GRVT 訂單簿深度
-                if 'GRVT' in adapters:
-                    try:
-                        grvt = adapters['GRVT']
-                        ob = await grvt.get_orderbook('BTC_USDT_Perp', limit=50)
-                        if ob and ob.bids and ob.asks:
-                            bids = [[float(b[0]), float(b[1])] for b in ob.bids[:50]]
-                            asks = [[float(a[0]), float(a[1])] for a in ob.asks[:50]]
-                            data['orderbooks']['GRVT'] = {
-                                'BTC_USDT_Perp': {
-                                    'bids': bids,
-                                    'asks': asks
-                                }
-                            }
-                    except Exception as e:
-                        logger.warning(f"獲取 GRVT 訂單簿失敗: {e}")
+                # 訂單簿深度 (有訂閱者才讀，來自共享數據中心，不直接請求交易所)
+                if dashboard_stream.wants('orderbooks'):
+                    hub = system_manager.market_data_hub
+                    for exchange_name, symbol in _dashboard_orderbooks:
+                        if exchange_name not in adapters:
+                            continue
+                        snapshot = hub.peek(exchange_name, symbol)
+                        if snapshot:
+                            bids, asks = snapshot.top(50)
+                            data['orderbooks'][exchange_name] = {symbol: {'bids': bids, 'asks': asks}}
 
                 # Debug: 打印發送的數據
                 if data['market_data']:
@@ -228,7 +204,8 @@ async def broadcast_data():
                 # StandX 做市商狀態
                 data['mm_status'] = mm_status.copy()
                 if mm_executor:
-                    data['mm_executor'] = serialize_for_json(mm_executor.to_dict())
+                    if dashboard_stream.wants('mm'):
+                        data['mm_executor'] = serialize_for_json(mm_executor.to_dict())
                     # 添加運行時控制狀態到 mm_status
                     data['mm_status']['hedge_enabled'] = mm_executor.is_hedge_enabled()
                     data['mm_status']['instant_close_enabled'] = mm_executor.is_instant_close_enabled()
@@ -267,141 +244,14 @@ async def broadcast_data():
                         'seconds_ago': seconds_ago,
                     }
 
-                    # 讀取爆倉保護閾值配置
-                    liq_config = config_manager.get_liquidation_protection_config()
-                    danger_margin_ratio = liq_config['margin_ratio_threshold'] / 100  # 轉為小數
-                    danger_liq_distance = liq_config['liq_distance_threshold']  # 百分比
-                    warning_margin_ratio = danger_margin_ratio * 0.625  # 預設 50% (80% * 0.625)
-                    warning_liq_distance = danger_liq_distance * 2  # 預設 10% (5% * 2)
-
-                    # 餘額、PnL 和風險數據從 adapter 查詢（帶緩存避免 rate limiting）
+                    # 餘額、PnL 和風險數據由背景風控監測提供 (不在廣播週期內查詢 REST)
+                    risk = risk_monitor.snapshot()
                     if 'STANDX' in adapters:
-                        now = time.time()
-                        cache_key = 'STANDX'
-                        cached = _risk_data_cache.get(cache_key)
-
-                        # 檢查緩存是否有效
-                        if cached and (now - cached.get('timestamp', 0)) < _risk_data_cache_ttl:
-                            # 使用緩存數據，但更新 btc 持倉（這個是即時的）
-                            positions['standx'] = cached['data'].copy()
-                            positions['standx']['btc'] = standx_pos
-                        else:
-                            # 緩存過期，重新查詢
-                            try:
-                                balance = await adapters['STANDX'].get_balance()
-                                positions_list = await adapters['STANDX'].get_positions('BTC-USD')
-
-                                # 計算 margin ratio
-                                margin_ratio = float(balance.used_margin / balance.equity) if balance.equity > 0 else 0
-
-                                # 清算價格和距離
-                                liq_price = None
-                                liq_distance_pct = None
-                                mark_price = None
-                                if positions_list:
-                                    pos = positions_list[0]
-                                    mark_price = float(pos.mark_price) if pos.mark_price else None
-                                    if pos.liquidation_price and pos.mark_price and float(pos.mark_price) > 0:
-                                        liq_price = float(pos.liquidation_price)
-                                        liq_distance_pct = abs(float(pos.mark_price) - liq_price) / float(pos.mark_price) * 100
-
-                                # 風險等級判斷（使用可配置閾值）
-                                risk_level = 'safe'
-                                if margin_ratio > danger_margin_ratio or (liq_distance_pct is not None and liq_distance_pct < danger_liq_distance):
-                                    risk_level = 'danger'
-                                elif margin_ratio > warning_margin_ratio or (liq_distance_pct is not None and liq_distance_pct < warning_liq_distance):
-                                    risk_level = 'warning'
-
-                                standx_data = {
-                                    'btc': standx_pos,
-                                    'equity': float(balance.equity),
-                                    'pnl': float(balance.unrealized_pnl),
-                                    'used_margin': float(balance.used_margin),
-                                    'margin_ratio': margin_ratio,
-                                    'liq_price': liq_price,
-                                    'liq_distance_pct': liq_distance_pct,
-                                    'mark_price': mark_price,
-                                    'risk_level': risk_level,
-                                }
-                                positions['standx'] = standx_data
-
-                                # 更新緩存
-                                _risk_data_cache[cache_key] = {'data': standx_data, 'timestamp': now}
-                            except Exception as e:
-                                logger.debug(f"查詢 StandX 風險數據失敗: {e}")
-                                # 如果查詢失敗但有緩存，繼續使用緩存
-                                if cached:
-                                    positions['standx'] = cached['data'].copy()
-                                    positions['standx']['btc'] = standx_pos
+                        positions['standx'] = risk['standx']
 
                     # 對沖帳戶 (STANDX_HEDGE)
                     if 'STANDX_HEDGE' in adapters:
-                        logger.debug(f"STANDX_HEDGE adapter found, fetching data...")
-                        now = time.time()
-                        cache_key = 'STANDX_HEDGE'
-                        cached = _risk_data_cache.get(cache_key)
-
-                        # 檢查緩存是否有效
-                        if cached and (now - cached.get('timestamp', 0)) < _risk_data_cache_ttl:
-                            # 使用緩存數據，但更新 btc 持倉
-                            positions['hedge'] = cached['data'].copy()
-                            positions['hedge']['btc'] = hedge_pos
-                        else:
-                            try:
-                                balance = await adapters['STANDX_HEDGE'].get_balance()
-                                positions_list = await adapters['STANDX_HEDGE'].get_positions('BTC-USD')
-
-                                # 計算 margin ratio
-                                margin_ratio = float(balance.used_margin / balance.equity) if balance.equity > 0 else 0
-
-                                # 清算價格和距離
-                                liq_price = None
-                                liq_distance_pct = None
-                                mark_price = None
-                                if positions_list:
-                                    pos = positions_list[0]
-                                    mark_price = float(pos.mark_price) if pos.mark_price else None
-                                    if pos.liquidation_price and pos.mark_price and float(pos.mark_price) > 0:
-                                        liq_price = float(pos.liquidation_price)
-                                        liq_distance_pct = abs(float(pos.mark_price) - liq_price) / float(pos.mark_price) * 100
-
-                                # 風險等級判斷（使用可配置閾值）
-                                risk_level = 'safe'
-                                if margin_ratio > danger_margin_ratio or (liq_distance_pct is not None and liq_distance_pct < danger_liq_distance):
-                                    risk_level = 'danger'
-                                elif margin_ratio > warning_margin_ratio or (liq_distance_pct is not None and liq_distance_pct < warning_liq_distance):
-                                    risk_level = 'warning'
-
-                                hedge_data = {
-                                    'btc': hedge_pos,
-                                    'equity': float(balance.equity),
-                                    'pnl': float(balance.unrealized_pnl),
-                                    'used_margin': float(balance.used_margin),
-                                    'margin_ratio': margin_ratio,
-                                    'liq_price': liq_price,
-                                    'liq_distance_pct': liq_distance_pct,
-                                    'mark_price': mark_price,
-                                    'risk_level': risk_level,
-                                }
-                                positions['hedge'] = hedge_data
-
-                                # 更新緩存
-                                _risk_data_cache[cache_key] = {'data': hedge_data, 'timestamp': now}
-                            except Exception as e:
-                                logger.warning(f"查詢對沖帳戶風險數據失敗: {e}")
-                                # 如果查詢失敗但有緩存，繼續使用緩存
-                                if cached:
-                                    positions['hedge'] = cached['data'].copy()
-                                    positions['hedge']['btc'] = hedge_pos
-                                else:
-                                    # 無緩存時設置錯誤狀態
-                                    positions['hedge'] = {
-                                        'btc': hedge_pos,
-                                        'error': str(e),
-                                        'equity': 0,
-                                        'pnl': 0,
-                                        'margin_ratio': 0,
-                                    }
+                        positions['hedge'] = risk['hedge']
                     else:
                         # STANDX_HEDGE 未連接 - 頻率限制警告日誌
                         warn_key = 'STANDX_HEDGE_not_connected'
@@ -430,49 +280,6 @@ async def broadcast_data():
                     hedge_pnl = positions.get('hedge', {}).get('pnl', 0) or 0
                     positions['total_pnl'] = standx_pnl + hedge_pnl
 
-                    # 【爆倉保護】檢測是否需要緊急平倉
-                    standx_risk = positions.get('standx', {}).get('risk_level', 'safe')
-                    hedge_risk = positions.get('hedge', {}).get('risk_level', 'safe')
-
-                    # 使用已讀取的爆倉保護配置
-                    if liq_config['enabled'] and mm_executor and mm_executor._running:
-                        now = time.time()
-                        # 檢查是否任一帳戶處於危險狀態
-                        primary_danger = standx_risk == 'danger'
-                        hedge_danger = hedge_risk == 'danger'
-
-                        if primary_danger or hedge_danger:
-                            # 檢查冷卻期
-                            if now - liquidation_state['last_trigger_time'] > liquidation_state['cooldown_sec']:
-                                logger.warning(f"[LiquidationProtection] 檢測到爆倉風險! standx={standx_risk}, hedge={hedge_risk}")
-                                # 觸發緊急平倉（只平有危險的帳戶）
-                                reason_parts = []
-                                if primary_danger:
-                                    standx_data = positions.get('standx', {})
-                                    reason_parts.append(f"主帳戶: margin={standx_data.get('margin_ratio', 0)*100:.1f}%, liq_dist={standx_data.get('liq_distance_pct', 'N/A')}")
-                                if hedge_danger:
-                                    hedge_data = positions.get('hedge', {})
-                                    reason_parts.append(f"對沖帳戶: margin={hedge_data.get('margin_ratio', 0)*100:.1f}%, liq_dist={hedge_data.get('liq_distance_pct', 'N/A')}")
-
-                                reason = "; ".join(reason_parts)
-                                try:
-                                    # 只平有危險的帳戶
-                                    result = await mm_executor.emergency_close_all(
-                                        reason=reason,
-                                        close_primary=primary_danger,
-                                        close_hedge=hedge_danger,
-                                    )
-                                    logger.warning(f"[LiquidationProtection] 緊急平倉結果: {result}")
-                                    liquidation_state['last_trigger_time'] = now
-                                    liquidation_state['triggered'] = True
-                                except Exception as e:
-                                    logger.error(f"[LiquidationProtection] 緊急平倉失敗: {e}")
-                        else:
-                            # 風險解除，重置觸發標記
-                            if liquidation_state['triggered']:
-                                logger.info("[LiquidationProtection] 風險已解除，重置觸發狀態")
-                                liquidation_state['triggered'] = False
-
                 data['mm_positions'] = positions
 
                 # 成交歷史 (從 executor.state 讀取)
@@ -481,18 +288,8 @@ async def broadcast_data():
                 else:
                     data['fill_history'] = []
 
-                # 廣播
-                disconnected = []
-                for client in connected_clients:
-                    try:
-                        await client.send_json(data)
-                    except Exception as e:
-                        logger.debug(f"發送失敗: {e}")
-                        disconnected.append(client)
-
-                # 移除斷開的客戶端
-                for client in disconnected:
-                    connected_clients.remove(client)
+                # 廣播 (每週期序列化一次，共用緩衝區)
+                await dashboard_stream.publish(data)
 
             await asyncio.sleep(1)  # 1秒更新一次
 
@@ -507,6 +304,7 @@ async def lifespan(app: FastAPI):
     global simulation_runner
     # 啟動
     await init_system()
+    await risk_monitor.start()
     asyncio.create_task(broadcast_data())
     yield
     # 關閉 - 確保所有組件正確停止
@@ -523,6 +321,8 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error stopping simulation runner: {e}")
 
+    await risk_monitor.stop()
+
     # 使用 system_manager 關閉系統
     await system_manager.shutdown()
 
@@ -535,8 +335,8 @@ app = FastAPI(lifespan=lifespan)
 # 註冊模組路由
 from src.web.modules.orderbook_monitor import register_routes as register_orderbook_routes
 from src.web.modules.strategy_analyzer import register_routes as register_strategy_routes
-register_orderbook_routes(app, get_adapters)
-register_strategy_routes(app, get_adapters)
+register_orderbook_routes(app, get_adapters, system_manager.market_data_hub)
+register_strategy_routes(app, get_adapters, system_manager.market_data_hub)
 
 # 準備 API 路由依賴項
 def _get_mm_executor():
@@ -616,21 +416,31 @@ npm run build</pre>
 _LEGACY_HTML_REMOVED = True  # 標記舊代碼已移除
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket 連接"""
+async def websocket_endpoint(websocket: WebSocket, v: int = 1, topics: Optional[str] = None, format: str = "json"):
+    """
+    WebSocket 連接
+
+    - v=1 (預設): 每秒推送完整數據 (舊版格式)
+    - v=2: 增量協議，topics=market,orderbooks,... 選擇主題，format=msgpack 使用二進位編碼
+      (詳見 src/web/dashboard_stream.py)
+    """
     await websocket.accept()
-    connected_clients.append(websocket)
+    dashboard_stream.add_client(
+        websocket,
+        version=v,
+        topics=topics.split(',') if topics else None,
+        binary=format == 'msgpack',
+    )
     try:
         while True:
-            await websocket.receive_text()
+            dashboard_stream.handle_control(websocket, await websocket.receive_text())
     except WebSocketDisconnect:
         pass  # 正常斷開
     except Exception as e:
         logger.debug(f"WebSocket error: {e}")
     finally:
-        # 安全移除：可能已經在 broadcast_data 中被移除
-        if websocket in connected_clients:
-            connected_clients.remove(websocket)
+        # 安全移除：可能已經在推送時被移除
+        dashboard_stream.remove_client(websocket)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,319 @@
+"""
+控制台 WebSocket 推送協議
+
+每個廣播週期只序列化一次，所有客戶端共用同一個緩衝區。
+
+協議版本:
+- v1 (預設，向後兼容): 每週期推送完整 JSON，與舊版 /ws 格式相同
+- v2: 按主題 (topic) 訂閱，連線時推送快照，之後只推送變更部分
+    - 訂單簿: 價位差異 [[price, size], ...]，size=0 表示刪除該價位
+    - 其他主題: JSON Merge Patch (RFC 7396)，null 表示刪除欄位，陣列整體替換
+    - 可選 msgpack 二進位編碼 (需安裝 msgpack，否則回退 JSON)
+
+v2 訊息格式:
+    {"v": 2, "type": "snapshot" | "delta", "seq": n, "topics": {topic: payload}}
+
+客戶端控制訊息 (JSON 文字):
+    {"op": "subscribe", "topics": ["market", "orderbooks"], "format": "json" | "msgpack"}
+    {"op": "resync"}   # 請求完整快照 (例如客戶端本地狀態出錯時)
+
+seq 為發布週期序號；無變更的週期不發送 delta，因此序號不連續屬正常。
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from fastapi import WebSocket
+
+try:
+    import msgpack
+    _HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    _HAS_MSGPACK = False
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 2
+
+# 主題 -> 舊版完整訊息中的欄位
+TOPIC_KEYS: Dict[str, Tuple[str, ...]] = {
+    'system': ('timestamp', 'system_status'),
+    'market': ('market_data',),
+    'orderbooks': ('orderbooks',),
+    'opportunities': ('opportunities',),
+    'stats': ('stats', 'executor_stats'),
+    'mm': ('mm_status', 'mm_executor'),
+    'positions': ('mm_positions',),
+    'fills': ('fill_history',),
+}
+ALL_TOPICS: FrozenSet[str] = frozenset(TOPIC_KEYS)
+
+# 每週期都會變化的欄位: 不參與比較，主題有其他變更時才一併發送
+_VOLATILE_KEYS = ('timestamp',)
+
+# merge_patch 的「無變化」標記
+_UNCHANGED = object()
+
+
+@dataclass
+class StreamClient:
+    """已連線的控制台客戶端"""
+    websocket: WebSocket
+    version: int = 1
+    topics: FrozenSet[str] = ALL_TOPICS
+    binary: bool = False
+    needs_snapshot: bool = True
+
+
+def merge_patch(old: Any, new: Any) -> Any:
+    """
+    計算 JSON Merge Patch (RFC 7396)
+
+    Returns:
+        將 old 轉為 new 的 patch；無變化時返回 _UNCHANGED
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch = {}
+        for key, value in new.items():
+            if key not in old:
+                patch[key] = value
+                continue
+            sub = merge_patch(old[key], value)
+            if sub is not _UNCHANGED:
+                patch[key] = sub
+        for key in old:
+            if key not in new:
+                patch[key] = None
+        return patch if patch else _UNCHANGED
+    if old == new:
+        return _UNCHANGED
+    # 注意: 依 RFC 7396，值變為 None 時客戶端會刪除該欄位 (讀取時視同 null)
+    return new
+
+
+def _book_levels(levels: List) -> Dict[float, float]:
+    return {level[0]: level[1] for level in levels}
+
+
+def book_diff(old: Optional[Dict], new: Dict) -> Optional[Dict]:
+    """
+    計算單一訂單簿的價位差異
+
+    Args:
+        old: 上次的 {'bids': [[p, s], ...], 'asks': [...]} (None = 全量)
+        new: 本次的訂單簿
+
+    Returns:
+        {'bids': [[p, s], ...], 'asks': [...]}，size=0 表示刪除；無變化返回 None
+    """
+    if old is None:
+        return new
+
+    diff = {}
+    for side in ('bids', 'asks'):
+        old_levels = _book_levels(old.get(side, []))
+        new_levels = _book_levels(new.get(side, []))
+        changes = [[p, s] for p, s in new_levels.items() if old_levels.get(p) != s]
+        changes.extend([p, 0] for p in old_levels if p not in new_levels)
+        if changes:
+            diff[side] = changes
+    return diff or None
+
+
+class DashboardStream:
+    """
+    控制台推送中心
+
+    broadcast_data 每週期調用 publish()，這裡負責:
+    - 計算各主題相對上一週期的差異 (每週期一次，與客戶端數量無關)
+    - 按 (版本, 主題集合, 編碼) 分組，每組只編碼一次
+    - 共用同一緩衝區並發推送給組內所有客戶端
+    """
+
+    def __init__(self):
+        self._clients: Dict[WebSocket, StreamClient] = {}
+        self._last: Dict[str, Any] = {}   # topic -> 上次發布的內容
+        self._seq = 0
+
+        # 統計
+        self.messages_encoded = 0
+        self.bytes_sent = 0
+
+    # ==================== 客戶端管理 ====================
+
+    def add_client(
+        self,
+        websocket: WebSocket,
+        version: int = 1,
+        topics: Optional[List[str]] = None,
+        binary: bool = False
+    ) -> StreamClient:
+        """註冊客戶端 (v1 固定訂閱全部主題)"""
+        client = StreamClient(websocket=websocket, version=version)
+        if version >= PROTOCOL_VERSION:
+            self._configure(client, topics, binary)
+        self._clients[websocket] = client
+        return client
+
+    def remove_client(self, websocket: WebSocket):
+        """移除客戶端"""
+        self._clients.pop(websocket, None)
+
+    def handle_control(self, websocket: WebSocket, text: str):
+        """處理客戶端控制訊息 (subscribe / resync)"""
+        client = self._clients.get(websocket)
+        if client is None or client.version < PROTOCOL_VERSION:
+            return
+        try:
+            message = json.loads(text)
+        except (ValueError, TypeError):
+            return
+        if not isinstance(message, dict):
+            return
+
+        op = message.get('op')
+        if op == 'subscribe':
+            fmt = message.get('format')
+            binary = client.binary if fmt is None else fmt == 'msgpack'
+            self._configure(client, message.get('topics'), binary)
+        elif op == 'resync':
+            client.needs_snapshot = True
+
+    def _configure(self, client: StreamClient, topics: Optional[List[str]], binary: bool):
+        if topics:
+            client.topics = frozenset(t for t in topics if t in ALL_TOPICS)
+        client.binary = binary and _HAS_MSGPACK
+        client.needs_snapshot = True
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def wants(self, topic: str) -> bool:
+        """是否有任何客戶端訂閱此主題 (用於跳過昂貴的數據收集)"""
+        return any(topic in c.topics for c in self._clients.values())
+
+    # ==================== 發布 ====================
+
+    async def publish(self, data: Dict[str, Any]):
+        """
+        發布一個週期的數據
+
+        Args:
+            data: 舊版完整訊息格式的 dict (未訂閱的主題可省略)
+        """
+        if not self._clients:
+            return
+
+        sections = {
+            topic: {key: data[key] for key in keys if key in data}
+            for topic, keys in TOPIC_KEYS.items()
+        }
+
+        # 每主題差異只計算一次
+        deltas: Dict[str, Any] = {}
+        for topic, section in sections.items():
+            if not section:
+                continue
+            delta = self._topic_delta(topic, self._last.get(topic), section)
+            if delta is not None:
+                deltas[topic] = delta
+            self._last[topic] = section
+
+        self._seq += 1
+
+        # 按 (版本, 主題, 編碼, 快照) 分組，每組編碼一次
+        groups: Dict[tuple, List[StreamClient]] = {}
+        for client in self._clients.values():
+            if client.version < PROTOCOL_VERSION:
+                key = (1, None, False, False)
+            else:
+                key = (client.version, client.topics, client.binary, client.needs_snapshot)
+                client.needs_snapshot = False
+            groups.setdefault(key, []).append(client)
+
+        sends = []
+        for (version, topics, binary, snapshot), clients in groups.items():
+            if version < PROTOCOL_VERSION:
+                payload = json.dumps(data, separators=(',', ':'))
+            else:
+                source = sections if snapshot else deltas
+                body = {t: source[t] for t in topics if t in source and source[t]}
+                if not body and not snapshot:
+                    continue
+                payload = self._encode({
+                    'v': PROTOCOL_VERSION,
+                    'type': 'snapshot' if snapshot else 'delta',
+                    'seq': self._seq,
+                    'topics': body,
+                }, binary)
+            self.messages_encoded += 1
+            sends.extend((client, payload) for client in clients)
+
+        await self._send_all(sends)
+
+    def _topic_delta(self, topic: str, old: Optional[Dict], new: Dict) -> Optional[Dict]:
+        """計算單一主題的差異"""
+        if topic == 'orderbooks':
+            old_books = (old or {}).get('orderbooks', {})
+            patch = {}
+            for exchange, symbols in new.get('orderbooks', {}).items():
+                for symbol, book in symbols.items():
+                    diff = book_diff(old_books.get(exchange, {}).get(symbol), book)
+                    if diff:
+                        patch.setdefault(exchange, {})[symbol] = diff
+            return {'orderbooks': patch} if patch else None
+
+        if old is None:
+            return new
+        patch = merge_patch(
+            {k: v for k, v in old.items() if k not in _VOLATILE_KEYS},
+            {k: v for k, v in new.items() if k not in _VOLATILE_KEYS},
+        )
+        patch = {} if patch is _UNCHANGED else patch
+        for key in _VOLATILE_KEYS:
+            if key in new and patch:
+                patch[key] = new[key]
+        return patch or None
+
+    def _encode(self, message: Dict, binary: bool):
+        if binary:
+            return msgpack.packb(message, use_bin_type=True)
+        return json.dumps(message, separators=(',', ':'))
+
+    async def _send_all(self, sends: List[Tuple[StreamClient, Any]]):
+        """並發推送，移除已斷線的客戶端"""
+        if not sends:
+            return
+
+        async def _send(client: StreamClient, payload):
+            if isinstance(payload, bytes):
+                await client.websocket.send_bytes(payload)
+            else:
+                await client.websocket.send_text(payload)
+
+        results = await asyncio.gather(
+            *(_send(client, payload) for client, payload in sends),
+            return_exceptions=True
+        )
+        for (client, payload), result in zip(sends, results):
+            if isinstance(result, Exception):
+                logger.debug(f"發送失敗: {result}")
+                self.remove_client(client.websocket)
+            else:
+                self.bytes_sent += len(payload)
+
+    def get_stats(self) -> Dict:
+        """推送統計"""
+        return {
+            'clients': len(self._clients),
+            'v2_clients': sum(1 for c in self._clients.values() if c.version >= PROTOCOL_VERSION),
+            'msgpack_available': _HAS_MSGPACK,
+            'seq': self._seq,
+            'messages_encoded': self.messages_encoded,
+            'bytes_sent': self.bytes_sent,
+        }
@@ -6,6 +6,8 @@ StandX 訂單簿監控模組
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse, HTMLResponse
 
+from src.monitor.market_data_hub import BookSnapshot
+
 router = APIRouter(prefix="/api/orderbook", tags=["orderbook_monitor"])
 
 # 模組配置
@@ -238,13 +240,14 @@ const OrderbookMonitor = {
 """
 
 
-def register_routes(app, adapters_getter):
+def register_routes(app, adapters_getter, market_data_hub=None):
     """
     註冊做市商模組的 API 路由
 
     Args:
         app: FastAPI 應用
         adapters_getter: 獲取 adapters 字典的函數
+        market_data_hub: 共享訂單簿數據源 (MarketDataHub)，未提供時直接請求交易所
     """
 
     @router.get("/data/{exchange}/{symbol}")
@@ -257,26 +260,29 @@ def register_routes(app, adapters_getter):
             if exchange_upper not in adapters:
                 return JSONResponse({'error': f'Exchange {exchange} not found'}, status_code=404)
 
-            adapter = adapters[exchange_upper]
-            orderbook = await adapter.get_orderbook(symbol, depth=20)
-
-            # 計算統計數據
-            bids = [[float(p), float(q)] for p, q in orderbook.bids[:20]]
-            asks = [[float(p), float(q)] for p, q in orderbook.asks[:20]]
+            if market_data_hub is not None:
+                # 共享快照 (統計已預先計算)
+                snapshot = await market_data_hub.get_book(exchange_upper, symbol)
+                if snapshot is None:
+                    return JSONResponse({'error': 'No orderbook data'}, status_code=503)
+            else:
+                orderbook = await adapters[exchange_upper].get_orderbook(symbol, limit=20)
+                snapshot = BookSnapshot.from_orderbook(exchange_upper, symbol, orderbook)
 
-            best_bid = bids[0][0] if bids else 0
-            best_ask = asks[0][0] if asks else 0
-            spread = best_ask - best_bid if best_bid and best_ask else 0
-            spread_pct = (spread / best_bid * 100) if best_bid else 0
-            mid_price = (best_bid + best_ask) / 2 if best_bid and best_ask else 0
+            bids, asks = snapshot.top(20)
+            best_bid = snapshot.best_bid
+            best_ask = snapshot.best_ask
+            spread = snapshot.spread
+            spread_pct = snapshot.spread_pct
+            mid_price = snapshot.mid_price
 
             # 計算總量
-            bid_volume = sum(q for p, q in bids)
-            ask_volume = sum(q for p, q in asks)
+            bid_volume = snapshot.bid_volume
+            ask_volume = snapshot.ask_volume
             total_volume = bid_volume + ask_volume
 
             # 買賣比例和市場傾向
-            imbalance = bid_volume / ask_volume if ask_volume > 0 else 0
+            imbalance = snapshot.imbalance or 0
             if imbalance > 1.2:
                 bias = "買方主導 📈"
             elif imbalance < 0.8:
@@ -287,7 +293,7 @@ def register_routes(app, adapters_getter):
             return JSONResponse({
                 'exchange': exchange_upper,
                 'symbol': symbol,
-                'timestamp': orderbook.timestamp.isoformat(),
+                'timestamp': snapshot.orderbook.timestamp.isoformat(),
                 'bids': bids,
                 'asks': asks,
                 'stats': {
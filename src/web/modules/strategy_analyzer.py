@@ -15,6 +15,8 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 import time
 
+from src.monitor.market_data_hub import BookSnapshot
+
 router = APIRouter(prefix="/api/strategy", tags=["strategy_analyzer"])
 
 # 模組配置
@@ -422,9 +424,14 @@ const StrategyAnalyzer = {
 """
 
 
-def register_routes(app, adapters_getter):
+def register_routes(app, adapters_getter, market_data_hub=None):
     """
     註冊策略分析模組的 API 路由
+
+    Args:
+        app: FastAPI 應用
+        adapters_getter: 獲取 adapters 字典的函數
+        market_data_hub: 共享訂單簿數據源 (MarketDataHub)，未提供時直接請求交易所
     """
     global simulation_stats, last_quote, analysis_start_time
 
@@ -440,12 +447,16 @@ def register_routes(app, adapters_getter):
             if exchange_upper not in adapters:
                 return JSONResponse({'error': f'Exchange {exchange} not found'}, status_code=404)
 
-            adapter = adapters[exchange_upper]
-            orderbook = await adapter.get_orderbook(symbol, depth=20)
+            if market_data_hub is not None:
+                snapshot = await market_data_hub.get_book(exchange_upper, symbol)
+                if snapshot is None:
+                    return JSONResponse({'error': 'No orderbook data'}, status_code=400)
+            else:
+                orderbook = await adapters[exchange_upper].get_orderbook(symbol, limit=20)
+                snapshot = BookSnapshot.from_orderbook(exchange_upper, symbol, orderbook)
 
             # 計算訂單簿數據
-            bids = [[float(p), float(q)] for p, q in orderbook.bids[:20]]
-            asks = [[float(p), float(q)] for p, q in orderbook.asks[:20]]
+            bids, asks = snapshot.top(20)
 
             if not bids or not asks:
                 return JSONResponse({'error': 'No orderbook data'}, status_code=400)
@@ -485,9 +496,7 @@ def register_routes(app, adapters_getter):
             # 記錄歷史數據
             simulation_stats.recent_spreads.append(current_spread_bps)
 
-            bid_volume = sum(q for p, q in bids)
-            ask_volume = sum(q for p, q in asks)
-            imbalance = bid_volume / ask_volume if ask_volume > 0 else 1
+            imbalance = snapshot.imbalance if snapshot.imbalance is not None else 1
             simulation_stats.recent_imbalances.append(imbalance)
 
             # 計算 Maker Hours
@@ -18,6 +18,7 @@ from .config import (
 from .control import (
     AutoExecuteRequest,
     LiveTradeRequest,
+    LogConfigRequest,
     ReinitResponse,
 )
 from .mm import (
@@ -70,6 +71,7 @@ __all__ = [
     # Control
     "AutoExecuteRequest",
     "LiveTradeRequest",
+    "LogConfigRequest",
     "ReinitResponse",
     # MM
     "MMStartRequest",
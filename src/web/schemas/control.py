@@ -5,6 +5,7 @@ Covers:
 - POST /api/system/reinit
 - POST /api/control/auto-execute
 - POST /api/control/live-trade
+- POST /api/system/logging
 """
 
 from typing import Optional, Any
@@ -21,6 +22,15 @@ class LiveTradeRequest(BaseModel):
     enabled: bool = Field(..., description="Whether to enable live trading (disables dry-run)")
 
 
+class LogConfigRequest(BaseModel):
+    """Request body for POST /api/system/logging."""
+    module: str = Field(..., description="Logger name, e.g. src.adapters.standx_ws_client (parents apply to children)")
+    level: Optional[str] = Field(default=None, description="Standard logging level: DEBUG / INFO / WARNING / ERROR / CRITICAL")
+    sample_every: Optional[int] = Field(default=None, ge=0, description="Hot-path lines: emit one per N events (0 = call-site default)")
+    min_interval_sec: Optional[float] = Field(default=None, description="Hot-path lines: minimum seconds between lines per call site (negative = call-site default)")
+    enabled: Optional[bool] = Field(default=None, description="False = hot-path lines are only counted")
+
+
 class ReinitResponse(BaseModel):
     """Response for POST /api/system/reinit."""
     success: bool = Field(..., description="Whether reinitialization succeeded")
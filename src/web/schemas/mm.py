@@ -138,6 +138,7 @@ class MMPositionResponse(BaseModel):
     is_hedged: Optional[bool] = Field(default=None, description="Whether position is hedged")
     last_sync: Optional[float] = Field(default=None, description="Last position sync timestamp")
     seconds_ago: Optional[float] = Field(default=None, description="Seconds since last sync")
+    ledger: Optional[dict[str, Any]] = Field(default=None, description="Position ledger: per-position version/source/drift and counters")
 
     model_config = {
         "json_schema_extra": {
@@ -145,11 +145,16 @@ class SimulationRunSummary(BaseModel):
     ended_at: Optional[str] = Field(default=None, description="End time ISO format")
     duration_seconds: Optional[float] = Field(default=None, description="Duration in seconds")
     param_set_count: int = Field(default=0, description="Number of parameter sets tested")
+    directory: Optional[str] = Field(default=None, description="Run directory name")
+    sort_value: Optional[float] = Field(default=None, description="Value of the sort metric (when sorting by metric)")
 
 
 class SimulationRunListResponse(BaseModel):
     """Response for GET /api/simulation/runs."""
     runs: list[SimulationRunSummary] = Field(default_factory=list, description="List of simulation runs")
+    total: int = Field(default=0, description="Total runs matching the filters")
+    offset: int = Field(default=0, description="Pagination offset")
+    limit: Optional[int] = Field(default=None, description="Pagination limit (null = all)")
 
 
 class SimulationRunDetailResponse(BaseModel):
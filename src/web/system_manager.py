@@ -15,6 +15,7 @@ from dotenv import load_dotenv
 from src.adapters.factory import create_adapter
 from src.adapters.base_adapter import BasePerpAdapter
 from src.monitor.multi_exchange_monitor import MultiExchangeMonitor
+from src.monitor.market_data_hub import MarketDataHub
 from src.strategy.arbitrage_executor import ArbitrageExecutor
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,8 @@ class SystemManager:
         self.monitor: Optional[MultiExchangeMonitor] = None
         self.executor: Optional[ArbitrageExecutor] = None
         self.adapters: Dict[str, BasePerpAdapter] = {}
+        # 共享訂單簿數據源 (控制台、訂單簿監控、策略分析、監控器共用)
+        self.market_data_hub = MarketDataHub(lambda: self.adapters)
         self.system_status = {
             'running': False,
             'auto_execute': False,
@@ -114,7 +117,8 @@ class SystemManager:
 
         # 加載對沖帳戶（StandX Hedge）
         hedge_target = os.getenv('HEDGE_TARGET', 'grvt')
-        if hedge_target == 'standx_hedge':
+        hedge_routes = [v.strip() for v in os.getenv('HEDGE_ROUTES', '').split(',')]
+        if hedge_target == 'standx_hedge' or 'standx_hedge' in hedge_routes:
             hedge_token = os.getenv('STANDX_HEDGE_API_TOKEN')
             hedge_key = os.getenv('STANDX_HEDGE_ED25519_PRIVATE_KEY')
             if hedge_token and hedge_key:
@@ -189,7 +193,8 @@ class SystemManager:
             adapters=monitor_adapters,
             symbols=unified_symbols,
             update_interval=2.0,
-            min_profit_pct=0.1
+            min_profit_pct=0.1,
+            market_data_hub=self.market_data_hub
         )
 
         # 創建執行器
@@ -295,8 +300,9 @@ class SystemManager:
                     logger.warning(f"⚠️  斷開 {exchange_key} 連接時出錯: {e}")
             del self.adapters[exchange_key]
 
-        if exchange_key in self.monitor.adapters:
-            del self.monitor.adapters[exchange_key]
+        self.monitor.remove_exchange(exchange_key)
+
+        self.market_data_hub.invalidate(exchange_key)
 
         logger.info(f"✅ {exchange_key} 已從監控系統移除")
 
@@ -425,6 +431,7 @@ class SystemManager:
         """關閉系統"""
         if self.monitor:
             await self.monitor.stop()
+        await self.market_data_hub.stop()
         if self.executor:
             await self.executor.stop()
 
@@ -528,7 +535,8 @@ class SystemManager:
 
         # 重新連接對沖帳戶（StandX Hedge）
         hedge_target = os.getenv('HEDGE_TARGET', 'grvt')
-        if hedge_target == 'standx_hedge':
+        hedge_routes = [v.strip() for v in os.getenv('HEDGE_ROUTES', '').split(',')]
+        if hedge_target == 'standx_hedge' or 'standx_hedge' in hedge_routes:
             hedge_token = os.getenv('STANDX_HEDGE_API_TOKEN')
             hedge_key = os.getenv('STANDX_HEDGE_ED25519_PRIVATE_KEY')
             if hedge_token and hedge_key:
@@ -603,6 +611,8 @@ class SystemManager:
                 if name != 'STANDX_HEDGE'
             }
             self.monitor.adapters = monitor_adapters
+        if self.executor:
+            self.executor.adapters = self.adapters
 
         # === 第三步：斷開舊的連接（已不再被引用）===
         logger.info("  🔌 斷開舊連接...")